@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Doxygen コメント 字下げレベル・セパレータ 一括チェック・修正ツール
+
+check-doxygen-indent.py と check-doxygen-separators.py の規則を 1 回の走査で適用する。
+ファイル システムの走査、各ファイルの読み込みと Doxygen コメント ブロックの抽出は 1 回ずつで、
+両方の規則が同じトークン列を使う。ファイルは並行処理する (DOXYFW_JOBS で上限を指定可能)。
+
+  - 字下げ規則: .h ファイルの Doxygen コメントで、後続行の字下げレベルが /** + 1 と一致するか
+  - セパレータ規則: @file を含まない Doxygen コメントにセパレータ行がないか
+
+ディレクトリの走査は check-doxygen-separators.py と同じ (ビルド出力等のディレクトリを除外)。
+
+使用例:
+  check-doxygen-comments.py --check app
+  check-doxygen-comments.py --dry-run app
+  check-doxygen-comments.py --fix app
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from doxygen_comment_lint import RULE_INDENT, RULE_SEPARATORS, lint_files, walk_source_files
+
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+
+
+def report_result(result, mode):
+    """1 ファイルの結果を出力し、対象の行数を返します。"""
+    if result.error:
+        print(f"警告: ファイルを読み込めません: {result.path} ({result.error})", file=sys.stderr)
+        return 0
+
+    if mode == "check":
+        indent_count = 0
+        for issue in result.indent_issues:
+            for mismatch in issue["mismatches"]:
+                indent_count += 1
+                print(
+                    f"{result.path}:{mismatch['line_num']}: 検出: "
+                    f"Doxygen コメントの字下げレベルが一致しません "
+                    f"(indent={mismatch['actual_indent']}, expected={mismatch['expected_indent']}, "
+                    f"block start: {issue['doc_start_line']})"
+                )
+    else:
+        indent_count = len(result.indent_modifications)
+        if mode == "dry-run":
+            for modification in result.indent_modifications:
+                before = modification["before"]
+                after = modification["after"]
+                print(
+                    f"{result.path}:{modification['line_num']}: 修正予定: "
+                    f"字下げ {len(before) - len(before.lstrip())} → {len(after) - len(after.lstrip())}"
+                )
+
+    separator_count = result.separator_count
+    if mode in {"check", "dry-run"}:
+        action = "削除予定" if mode == "dry-run" else "検出"
+        for issue in result.separator_issues:
+            for line_number in issue.separator_lines:
+                print(
+                    f"{result.path}:{line_number}: {action}: "
+                    f"@file 以外の Doxygen コメントにセパレータ行があります "
+                    f"(block start: {issue.block_start_line})"
+                )
+        return indent_count + separator_count
+
+    if result.write_error:
+        print(f"エラー: ファイルを書き込めません: {result.path} ({result.write_error})", file=sys.stderr)
+    elif result.written:
+        print(
+            f"修正: {result.path} (字下げ {indent_count} 行修正, セパレータ {separator_count} 行削除)"
+        )
+    return indent_count + separator_count
+
+
+def parse_args():
+    """コマンドライン引数を解析します。"""
+    parser = argparse.ArgumentParser(
+        description="Doxygen コメントの字下げレベルとセパレータ行を 1 回の走査でチェック・修正します。"
+    )
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
+        "--check",
+        action="store_const",
+        const="check",
+        dest="mode",
+        help="チェックのみ行います (既定)。",
+    )
+    mode_group.add_argument(
+        "--dry-run",
+        action="store_const",
+        const="dry-run",
+        dest="mode",
+        help="修正内容を表示します。ファイルは変更しません。",
+    )
+    mode_group.add_argument(
+        "--fix",
+        action="store_const",
+        const="fix",
+        dest="mode",
+        help="字下げを統一し、セパレータ行を削除します。",
+    )
+    parser.add_argument(
+        "--include-single-line",
+        action="store_true",
+        default=False,
+        help="字下げ規則で末尾コメント (/** ... */ が同一行) も対象に含めます (既定: 除外)。",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        help="チェック対象のファイルまたはディレクトリ。",
+    )
+    parser.set_defaults(mode="check")
+    return parser.parse_args()
+
+
+def main():
+    """エントリーポイント。"""
+    args = parse_args()
+    files = walk_source_files(args.paths)
+    if not files:
+        print("対象ファイルはありません。")
+        return 0
+
+    total = 0
+    for result in lint_files(
+        files,
+        {RULE_INDENT, RULE_SEPARATORS},
+        args.mode,
+        skip_single_line_comments=not args.include_single_line,
+    ):
+        total += report_result(result, args.mode)
+
+    if args.mode == "fix":
+        print(f"完了: {total} 行を修正しました。")
+        return 0
+
+    if total == 0:
+        print("OK: Doxygen コメントの字下げレベルとセパレータ行に問題はありません。")
+        return 0
+
+    print(f"NG: {total} 行の問題が残っています。")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,8 @@ Doxygen コメント字下げレベル統一チェック・修正ツール
   - /** の字下げレベルから */ までの間で、すべての行の字下げレベルが統一されているかチェック
   - 不統一な場合、修正オプションで自動修正
   - --dry-run オプションで修正内容を表示（実際には修正しない）
+  - 走査と規則の適用は doxygen_comment_lint.py の共通エンジンで行い、ファイルを並行処理する
+    (セパレータ行のチェックと同時に行う場合は check-doxygen-comments.py を使用)
 
 使用例：
   check-doxygen-indent.py --check <file>           # チェック モード (既定)
@@ -15,35 +17,18 @@ Doxygen コメント字下げレベル統一チェック・修正ツール
 """
 
 import sys
-import os
-import re
 import argparse
 from pathlib import Path
 
+from doxygen_comment_lint import RULE_INDENT, lint_file, lint_files
+
 
 sys.stdout.reconfigure(encoding="utf-8")
 sys.stderr.reconfigure(encoding="utf-8")
 
 
-def get_indent_level(line):
-    """行の字下げレベルを取得（スペース数）"""
-    match = re.match(r'^( *)', line)
-    return len(match.group(1)) if match else 0
-
-
-def is_inline_doxygen_comment_start(line):
-    """メンバーやマクロの横に書くインライン Doxygen コメントかどうかを返す"""
-    return re.search(r'/\*\*<', line) is not None
-
-
-def skip_to_comment_end(lines, index):
-    """コメント終了行の次の行インデックスを返す"""
-    while index < len(lines):
-        if re.search(r'\*/', lines[index]):
-            return index + 1
-        index += 1
-
-    return index
+def _print_read_error(result):
+    print(f"⚠️  ファイルが読み込めません: {result.path} ({result.error})", file=sys.stderr)
 
 
 def scan_file(filepath, skip_single_line_comments=True):
@@ -57,89 +42,10 @@ def scan_file(filepath, skip_single_line_comments=True):
     Returns:
         list: 不一致が見つかったコメントブロックのリスト
     """
-    issues = []
-    
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except (IOError, UnicodeDecodeError) as e:
-        print(f"⚠️  ファイルが読み込めません: {filepath} ({e})", file=sys.stderr)
-        return issues
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Doxygen コメント開始行を見つけた場合
-        if re.search(r'/\*\*', line):
-            # メンバーやマクロの横に書く /**< ... */ は字下げ基準が異なるため対象外
-            if is_inline_doxygen_comment_start(line):
-                i = skip_to_comment_end(lines, i)
-                continue
-
-            # 末尾コメント (/** ... */ が同一行) の場合はスキップ (オプション)
-            if skip_single_line_comments and re.search(r'/\*\*.*\*/', line):
-                i += 1
-                continue
-            
-            doc_start_indent = get_indent_level(line)
-            expected_indent = doc_start_indent + 1  # 標準的には /** の深さ + 1
-            line_num = i + 1
-            
-            # 直後の連続するコメント行をチェック
-            j = i + 1
-            has_mismatch = False
-            mismatch_details = []
-            
-            while j < len(lines):
-                next_line = lines[j]
-                
-                # コメント終了行か?
-                if re.search(r'\*/', next_line):
-                    # 終了行も字下げレベルをチェック
-                    end_indent = get_indent_level(next_line)
-                    if end_indent != expected_indent:
-                        has_mismatch = True
-                        mismatch_details.append({
-                            'line_num': j + 1,
-                            'actual_indent': end_indent,
-                            'expected_indent': expected_indent,
-                            'snippet': next_line.rstrip(),
-                            'is_closing': True
-                        })
-                    break
-                
-                # コメント内容行か? (* で始まる行)
-                if re.match(r'^\s*\*', next_line):
-                    next_indent = get_indent_level(next_line)
-                    
-                    # 期待値と異なるかつ、スキップすべき空行でない場合
-                    if next_indent != expected_indent and next_line.strip() != '*':
-                        has_mismatch = True
-                        mismatch_details.append({
-                            'line_num': j + 1,
-                            'actual_indent': next_indent,
-                            'expected_indent': expected_indent,
-                            'snippet': next_line.rstrip(),
-                            'is_closing': False
-                        })
-                
-                j += 1
-            
-            if has_mismatch:
-                issues.append({
-                    'file': filepath,
-                    'doc_start_line': line_num,
-                    'doc_start_indent': doc_start_indent,
-                    'expected_indent': expected_indent,
-                    'mismatches': mismatch_details
-                })
-            
-            i = j + 1
-        else:
-            i += 1
-    
-    return issues
+    result = lint_file(filepath, {RULE_INDENT}, "check", skip_single_line_comments)
+    if result.error:
+        _print_read_error(result)
+    return result.indent_issues
 
 
 def fix_file(filepath, dry_run=False, skip_single_line_comments=True):
@@ -154,109 +60,21 @@ def fix_file(filepath, dry_run=False, skip_single_line_comments=True):
     Returns:
         tuple: (修正が必要だったか, 修正内容のリスト)
     """
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except (IOError, UnicodeDecodeError) as e:
-        print(f"⚠️  ファイルが読み込めません: {filepath} ({e})", file=sys.stderr)
-        return False, []
-    
-    modified = False
-    modifications = []
-    original_lines = lines.copy()
-    i = 0
-    
-    while i < len(lines):
-        line = lines[i]
-        
-        # Doxygen コメント開始行を見つけた場合
-        if re.search(r'/\*\*', line):
-            # メンバーやマクロの横に書く /**< ... */ は字下げ基準が異なるため対象外
-            if is_inline_doxygen_comment_start(line):
-                i = skip_to_comment_end(lines, i)
-                continue
+    mode = "dry-run" if dry_run else "fix"
+    result = lint_file(filepath, {RULE_INDENT}, mode, skip_single_line_comments, newline=None)
+    if result.error:
+        _print_read_error(result)
+    return bool(result.indent_modifications), result.indent_modifications
 
-            # 末尾コメント (/** ... */ が同一行) の場合はスキップ (オプション)
-            if skip_single_line_comments and re.search(r'/\*\*.*\*/', line):
-                i += 1
-                continue
-            
-            doc_start_indent = get_indent_level(line)
-            target_indent = doc_start_indent + 1  # 目標インデント
-            
-            # 直後の連続するコメント行を修正
-            j = i + 1
-            while j < len(lines):
-                next_line = lines[j]
-                
-                # コメント終了行か?
-                if re.search(r'\*/', next_line):
-                    # 終了行も字下げレベルを修正
-                    current_indent = get_indent_level(next_line)
-                    if current_indent != target_indent:
-                        # 行末の改行記号を抽出
-                        has_newline = next_line.endswith('\n')
-                        line_without_newline = next_line.rstrip('\n')
-                        
-                        # 先頭のスペースを削除してから、目標インデントを追加
-                        content_match = re.match(r'^ *(\*.*)$', line_without_newline)
-                        if content_match:
-                            content = content_match.group(1)
-                            fixed_line = ' ' * target_indent + content
-                            if has_newline:
-                                fixed_line += '\n'
-                            
-                            if not dry_run:
-                                lines[j] = fixed_line
-                            
-                            modified = True
-                            modifications.append({
-                                'line_num': j + 1,
-                                'before': next_line,
-                                'after': fixed_line
-                            })
-                    break
-                
-                # コメント内容行か? (* で始まる行)
-                if re.match(r'^\s*\*', next_line):
-                    current_indent = get_indent_level(next_line)
-                    
-                    # インデントが異なる場合は修正
-                    if current_indent != target_indent:
-                        # 行末の改行記号を抽出
-                        has_newline = next_line.endswith('\n')
-                        line_without_newline = next_line.rstrip('\n')
-                        
-                        # 先頭のスペースを削除してから、目標インデントを追加
-                        content_match = re.match(r'^ *(\*.*)$', line_without_newline)
-                        if content_match:
-                            content = content_match.group(1)
-                            fixed_line = ' ' * target_indent + content
-                            if has_newline:
-                                fixed_line += '\n'
-                            
-                            if not dry_run:
-                                lines[j] = fixed_line
-                            
-                            modified = True
-                            modifications.append({
-                                'line_num': j + 1,
-                                'before': next_line,
-                                'after': fixed_line
-                            })
-                
-                j += 1
-            
-            i = j + 1
-        else:
-            i += 1
-    
-    # 修正が必要な場合は、ファイルに書き込み (dry_run でない場合)
-    if modified and not dry_run:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
-    
-    return modified, modifications
+
+def lint_headers(header_files, mode, skip_single_line_comments):
+    """ヘッダー ファイル群を並行してリントし、FileResult をファイル順に列挙"""
+    for result in lint_files(header_files, {RULE_INDENT}, mode, skip_single_line_comments, newline=None):
+        if result.error:
+            _print_read_error(result)
+        if result.write_error:
+            print(f"❌ エラー: ファイルを書き込めません: {result.path} ({result.write_error})", file=sys.stderr)
+        yield result
 
 
 def format_rel_path(filepath, base_dir=None):
@@ -419,12 +237,11 @@ def main():
         fixed_count = 0
         total_mods = 0
         
-        for header in header_files:
-            modified, modifications = fix_file(str(header), dry_run=False, skip_single_line_comments=skip_single_line)
-            if modified:
+        for result in lint_headers(header_files, "fix", skip_single_line):
+            if result.indent_modifications:
                 fixed_count += 1
-                total_mods += len(modifications)
-                all_files_with_mods.append((str(header), modifications))
+                total_mods += len(result.indent_modifications)
+                all_files_with_mods.append((str(result.path), result.indent_modifications))
         
         if fixed_count:
             print(f"✅ {fixed_count} ファイルを修正しました ({total_mods} 行)")
@@ -441,10 +258,9 @@ def main():
         
         all_files_with_mods = []
         
-        for header in header_files:
-            modified, modifications = fix_file(str(header), dry_run=True, skip_single_line_comments=skip_single_line)
-            if modified:
-                all_files_with_mods.append((str(header), modifications))
+        for result in lint_headers(header_files, "dry-run", skip_single_line):
+            if result.indent_modifications:
+                all_files_with_mods.append((str(result.path), result.indent_modifications))
         
         return print_fix_preview(all_files_with_mods)
     
@@ -453,9 +269,8 @@ def main():
         print(f"🔍 チェックモード: {len(header_files)} ファイルをスキャン中...\n")
         
         all_issues = []
-        for header in header_files:
-            issues = scan_file(str(header), skip_single_line_comments=skip_single_line)
-            all_issues.extend(issues)
+        for result in lint_headers(header_files, "check", skip_single_line):
+            all_issues.extend(result.indent_issues)
         
         return print_check_results(all_issues, header_files)
 
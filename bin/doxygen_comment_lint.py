@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Doxygen コメント リンターの共通エンジン
+
+check-doxygen-indent.py (字下げレベル統一)、check-doxygen-separators.py (セパレータ行)、
+check-doxygen-comments.py (両方) が共有する。
+
+各ファイルは 1 回だけ読み込み、/** と */ を含む行の位置 (トークン列) を 1 回だけ求める。
+字下げ規則とセパレータ規則はこのトークン列から Doxygen コメント ブロックを辿る。
+/** を含まないファイルは行分割もせずに終える。
+ファイル間は独立しているため、CPU 数 (DOXYFW_JOBS 指定時はその値まで) のプロセスで並行処理する。
+並行数は templates/doxyfw_jobs.py で求めるため、bin/ と同じ階層 (framework/doxyfw/) に templates/ が必要。
+"""
+
+import os
+import re
+import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# DOXYFW_JOBS の解釈は templates/doxyfw_jobs.py を共有する (bin/ と同じ階層に templates/ が必要)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "templates"))
+
+from doxyfw_jobs import worker_count  # noqa: E402
+
+
+SOURCE_EXTENSIONS = {
+    ".c",
+    ".cc",
+    ".cpp",
+    ".cxx",
+    ".h",
+    ".hh",
+    ".hpp",
+}
+
+# 字下げ規則の対象拡張子
+INDENT_EXTENSIONS = {".h"}
+
+SKIP_DIRS = {
+    ".git",
+    ".vs",
+    "bin",
+    "Debug",
+    "Release",
+    "node_modules",
+    "obj",
+    "pages",
+}
+
+RULE_INDENT = "indent"
+RULE_SEPARATORS = "separators"
+
+SEPARATOR_RE = re.compile(r"^\s*\*\s*\*{10,}\s*$")
+DOXYGEN_ONE_LINE_RE = re.compile(r"/\*\*.*\*/")
+COMMENT_LINE_RE = re.compile(r"^\s*\*")
+FIXABLE_LINE_RE = re.compile(r"^ *(\*.*)$")
+
+# これ未満のファイル数ではプロセスを起動せずに処理する
+PARALLEL_MIN_FILES = 32
+
+
+@dataclass(frozen=True)
+class SeparatorIssue:
+    block_start_line: int
+    separator_lines: tuple[int, ...]
+
+
+@dataclass
+class CommentTokens:
+    """ファイルの行と、/** を含む行・*/ を含む行の 0 始まりインデックス。"""
+
+    lines: list
+    starts: list
+    closes: list
+
+    def next_close(self, index):
+        """index 以降で最初に */ を含む行を返す。なければ None。"""
+        position = bisect_left(self.closes, index)
+        if position < len(self.closes):
+            return self.closes[position]
+        return None
+
+
+@dataclass
+class FileResult:
+    """1 ファイルのリント結果。"""
+
+    path: Path
+    error: str = ""
+    write_error: str = ""
+    indent_issues: list = field(default_factory=list)
+    indent_modifications: list = field(default_factory=list)
+    separator_issues: list = field(default_factory=list)
+    written: bool = False
+
+    @property
+    def separator_count(self):
+        return sum(len(issue.separator_lines) for issue in self.separator_issues)
+
+
+def split_lines(text):
+    """readlines() と同じく改行 (\\n) のみで分割し、各行の改行を残した行リストを返す。"""
+    parts = text.split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+def tokenize(lines):
+    """行リストから /** 行と */ 行の位置を求める。"""
+    starts = []
+    closes = []
+    for index, line in enumerate(lines):
+        if "/**" in line:
+            starts.append(index)
+        if "*/" in line:
+            closes.append(index)
+    return CommentTokens(lines, starts, closes)
+
+
+def get_indent_level(line):
+    """行の字下げレベルを取得 (先頭スペース数)"""
+    return len(line) - len(line.lstrip(" "))
+
+
+def _walk_blocks(tokens, handle_start):
+    """/** 行を先頭から辿り、handle_start(index) が返す行から次の /** 行を探す。"""
+    starts = tokens.starts
+    position = 0
+    while position < len(starts):
+        resume = handle_start(starts[position])
+        position = bisect_left(starts, resume, position + 1)
+
+
+def check_indent(tokens, skip_single_line_comments=True, filepath=""):
+    """
+    字下げレベルの不一致を検出し、同時に修正内容も求める
+
+    /** の字下げレベル + 1 を後続のコメント行 (* で始まる行) と終了行 (*/) の期待値とする。
+    メンバーやマクロの横に書く /**< ... */ は字下げ基準が異なるため対象外。
+
+    Args:
+        tokens: tokenize() の結果
+        skip_single_line_comments: True の場合、末尾コメント (/** ... */ が同一行) は除外
+        filepath: 検出結果に記録するファイルパス
+
+    Returns:
+        tuple: (不一致が見つかったコメントブロックのリスト, 修正内容のリスト)
+            チェックでは空行相当の * のみの行を除外するが、修正では字下げを揃える
+    """
+    lines = tokens.lines
+    line_count = len(lines)
+    issues = []
+    modifications = []
+
+    def check_line(j, expected_indent, is_closing, mismatch_details):
+        line = lines[j]
+        actual_indent = get_indent_level(line)
+        if actual_indent == expected_indent:
+            return
+
+        if is_closing or line.strip() != "*":
+            mismatch_details.append({
+                "line_num": j + 1,
+                "actual_indent": actual_indent,
+                "expected_indent": expected_indent,
+                "snippet": line.rstrip(),
+                "is_closing": is_closing,
+            })
+
+        # 先頭のスペースを削除してから、目標インデントを追加
+        has_newline = line.endswith("\n")
+        content_match = FIXABLE_LINE_RE.match(line.rstrip("\n"))
+        if content_match:
+            fixed_line = " " * expected_indent + content_match.group(1)
+            if has_newline:
+                fixed_line += "\n"
+            modifications.append({
+                "line_num": j + 1,
+                "before": line,
+                "after": fixed_line,
+            })
+
+    def handle_start(i):
+        line = lines[i]
+
+        # メンバーやマクロの横に書く /**< ... */ は字下げ基準が異なるため対象外
+        if "/**<" in line:
+            close = tokens.next_close(i)
+            return line_count if close is None else close + 1
+
+        # 末尾コメント (/** ... */ が同一行) の場合はスキップ (オプション)
+        if skip_single_line_comments and DOXYGEN_ONE_LINE_RE.search(line):
+            return i + 1
+
+        doc_start_indent = get_indent_level(line)
+        expected_indent = doc_start_indent + 1  # 標準的には /** の深さ + 1
+        close = tokens.next_close(i + 1)
+        end = line_count if close is None else close
+        mismatch_details = []
+
+        # 直後の連続するコメント行をチェック
+        for j in range(i + 1, end):
+            if COMMENT_LINE_RE.match(lines[j]):
+                check_line(j, expected_indent, False, mismatch_details)
+        # 終了行も字下げレベルをチェック
+        if close is not None:
+            check_line(close, expected_indent, True, mismatch_details)
+
+        if mismatch_details:
+            issues.append({
+                "file": filepath,
+                "doc_start_line": i + 1,
+                "doc_start_indent": doc_start_indent,
+                "expected_indent": expected_indent,
+                "mismatches": mismatch_details,
+            })
+
+        return end + 1
+
+    _walk_blocks(tokens, handle_start)
+    return issues, modifications
+
+
+def check_separators(tokens):
+    """@file を含まない Doxygen コメント内の不要なセパレータ行を検出します。"""
+    lines = tokens.lines
+    issues = []
+
+    def handle_start(index):
+        if DOXYGEN_ONE_LINE_RE.search(lines[index]):
+            return index + 1
+
+        block_end = tokens.next_close(index)
+        if block_end is None:
+            return index + 1
+
+        block_lines = lines[index : block_end + 1]
+        if any("@file" in block_line for block_line in block_lines):
+            return block_end + 1
+
+        separator_lines = tuple(
+            line_number
+            for line_number, block_line in enumerate(block_lines, start=index + 1)
+            if SEPARATOR_RE.match(block_line)
+        )
+        if separator_lines:
+            issues.append(
+                SeparatorIssue(
+                    block_start_line=index + 1,
+                    separator_lines=separator_lines,
+                )
+            )
+
+        return block_end + 1
+
+    _walk_blocks(tokens, handle_start)
+    return issues
+
+
+def apply_fixes(lines, indent_modifications, separator_issues):
+    """字下げ修正を反映し、セパレータ行を削除した行リストを返す。"""
+    fixed_lines = list(lines)
+    for modification in indent_modifications:
+        fixed_lines[modification["line_num"] - 1] = modification["after"]
+
+    remove_lines = {
+        line_number
+        for issue in separator_issues
+        for line_number in issue.separator_lines
+    }
+    if not remove_lines:
+        return fixed_lines
+
+    return [
+        line
+        for line_number, line in enumerate(fixed_lines, start=1)
+        if line_number not in remove_lines
+    ]
+
+
+def rules_for(path, rules):
+    """ファイルに適用する規則の集合を返す。字下げ規則は .h のみが対象。"""
+    if Path(path).suffix not in INDENT_EXTENSIONS:
+        return rules - {RULE_INDENT}
+    return rules
+
+
+def lint_file(path, rules, mode="check", skip_single_line_comments=True, newline=""):
+    """
+    1 ファイルを読み込み、指定された規則でチェックまたは修正する
+
+    Args:
+        path: 対象ファイルパス
+        rules: 適用する規則 (RULE_INDENT / RULE_SEPARATORS) の集合
+        mode: "check"、"dry-run"、"fix" のいずれか
+        skip_single_line_comments: 字下げ規則で末尾コメントを除外するか
+        newline: 修正時の書き込みに使う改行指定 (open() の newline)
+
+    Returns:
+        FileResult
+    """
+    result = FileResult(Path(path))
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            text = file.read()
+    except (OSError, UnicodeDecodeError) as error:
+        result.error = str(error)
+        return result
+
+    if "/**" not in text:
+        return result
+
+    tokens = tokenize(split_lines(text))
+    if RULE_INDENT in rules:
+        result.indent_issues, result.indent_modifications = check_indent(
+            tokens, skip_single_line_comments, str(path)
+        )
+    if RULE_SEPARATORS in rules:
+        result.separator_issues = check_separators(tokens)
+        # 削除するセパレータ行の字下げ修正は反映されないため、修正内容と件数から除く
+        remove_lines = {
+            line_number
+            for issue in result.separator_issues
+            for line_number in issue.separator_lines
+        }
+        result.indent_modifications = [
+            modification
+            for modification in result.indent_modifications
+            if modification["line_num"] not in remove_lines
+        ]
+
+    if mode == "fix" and (result.indent_modifications or result.separator_issues):
+        fixed_lines = apply_fixes(tokens.lines, result.indent_modifications, result.separator_issues)
+        try:
+            with open(path, "w", encoding="utf-8", newline=newline) as file:
+                file.writelines(fixed_lines)
+            result.written = True
+        except OSError as error:
+            result.write_error = str(error)
+
+    return result
+
+
+def _lint_task(task):
+    path, rules, mode, skip_single_line_comments, newline = task
+    return lint_file(path, rules_for(path, rules), mode, skip_single_line_comments, newline)
+
+
+def lint_files(paths, rules, mode="check", skip_single_line_comments=True, newline=""):
+    """
+    ファイル群をリントし、FileResult をファイルの順に列挙する
+
+    字下げ規則は .h ファイルにのみ適用する。
+    """
+    tasks = [(path, frozenset(rules), mode, skip_single_line_comments, newline) for path in paths]
+    workers = worker_count(len(tasks))
+    if workers <= 1 or len(tasks) < PARALLEL_MIN_FILES:
+        for task in tasks:
+            yield _lint_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        yield from executor.map(_lint_task, tasks, chunksize=chunksize)
+
+
+def is_source_file(path):
+    """チェック対象のソース ファイルかどうかを返します。"""
+    return path.is_file() and path.suffix in SOURCE_EXTENSIONS
+
+
+def walk_source_files(paths, extensions=SOURCE_EXTENSIONS):
+    """ファイル システムを 1 回走査し、チェック対象ファイルを重複なしで列挙します。"""
+    files = set()
+    for path in paths:
+        if path.is_file():
+            if path.suffix in extensions:
+                files.add(path)
+            continue
+
+        if not path.is_dir():
+            continue
+
+        for root, dirs, filenames in os.walk(path):
+            dirs[:] = [name for name in dirs if name not in SKIP_DIRS]
+            root_path = Path(root)
+            if "docs" in root_path.parts and "doxybook2" in root_path.parts:
+                continue
+
+            for filename in filenames:
+                if os.path.splitext(filename)[1] in extensions:
+                    candidate = root_path / filename
+                    if candidate.is_file():
+                        files.add(candidate)
+
+    return sorted(files)
+
@@ -0,0 +1,13 @@
+#!/bin/sh
+
+# Doxygen の INPUT_FILTER から入力ファイルごとに起動される前段フィルター。
+# Doxygen はファイルごとにフィルターを起動するため、Python の起動コストが
+# 入力ファイル数だけ積み上がる。input-filter.py が内容を書き換えるのは
+# ```plantuml フェンスを含むファイルと、改行の正規化が必要な CR を含む
+# ファイルだけであり、それ以外は末尾に改行を 1 つ加えて出力するだけになる。
+# 対象外のファイルは grep と cat だけで同じ結果を出力し、Python を起動しない。
+cr=$(printf '\r')
+if LC_ALL=C grep -q -F -e '```plantuml' -e "$cr" "$1"; then
+    exec python3 "${0%/*}/input-filter.py" "$1"
+fi
+cat "$1" && echo
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+list-doxygen-inputs.py - Doxygen の INPUT が指すファイルの一覧
+
+Doxyfile (と Doxyfile.part) の INPUT、FILE_PATTERNS、RECURSIVE、EXCLUDE、
+EXCLUDE_PATTERNS を読み、Doxygen が入力として読むファイルを
+`<パス> <サイズ> <更新日時>` の形式で 1 行ずつ出力する。
+
+run_doxyfw_make.sh が入力マニフェストに含めるために使う。
+DOXYGEN_RUNDIR 配下はマニフェストで別途列挙しているため、ここでは
+DOXYGEN_RUNDIR の外を指す INPUT だけを列挙する。
+
+Doxyfile は指定順に読み、後の `=` は前の設定を上書きし、`+=` は追加する。
+値の中の `$(VAR)` は環境変数で展開する。
+
+使用方法:
+    python3 list-doxygen-inputs.py <doxygen_rundir> <doxyfile> [<doxyfile> ...]
+"""
+
+import fnmatch
+import glob
+import os
+import re
+import sys
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+
+INPUT_TAGS = ("INPUT", "FILE_PATTERNS", "RECURSIVE", "EXCLUDE", "EXCLUDE_PATTERNS")
+TAG_PATTERN = re.compile(r"^\s*([A-Z_][A-Z0-9_]*)\s*(\+?=)(.*)$")
+ENV_PATTERN = re.compile(r"\$\(([A-Za-z_][A-Za-z0-9_]*)\)")
+
+
+def split_values(text):
+    """Doxyfile の値を空白区切りで分割する。二重引用符で囲んだ値は空白を含められる。"""
+    values = []
+    for quoted, bare in re.findall(r'"([^"]*)"|(\S+)', text):
+        value = quoted if quoted else bare
+        value = ENV_PATTERN.sub(lambda m: os.environ.get(m.group(1), ""), value)
+        if value:
+            values.append(value)
+    return values
+
+
+def read_doxyfile_tags(paths):
+    """
+    Doxyfile を順に読み、INPUT_TAGS の値を返す。
+
+    @return {タグ名: [値, ...]} (設定されていないタグは含まない)
+    """
+    tags = {}
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        # 行末の `\` は次の行へ続く
+        text = re.sub(r"\\[ \t]*\r?\n", " ", text)
+        for line in text.splitlines():
+            if line.lstrip().startswith("#"):
+                continue
+            match = TAG_PATTERN.match(line)
+            if not match or match.group(1) not in INPUT_TAGS:
+                continue
+            name, op, value = match.groups()
+            values = split_values(value)
+            if op == "+=":
+                tags.setdefault(name, []).extend(values)
+            else:
+                tags[name] = values
+    return tags
+
+
+def is_within(path, root):
+    """path が root 自身かその配下なら True を返す。"""
+    try:
+        return os.path.commonpath([path, root]) == root
+    except ValueError:
+        return False
+
+
+def list_input_files(rundir, tags):
+    """DOXYGEN_RUNDIR の外を指す INPUT のうち、Doxygen が読むファイルの絶対パスを返す。"""
+    rundir = os.path.realpath(rundir)
+    file_patterns = tags.get("FILE_PATTERNS") or ["*"]
+    recursive = (tags.get("RECURSIVE") or ["NO"])[0].upper() == "YES"
+    excludes = [
+        os.path.realpath(os.path.join(rundir, path)) for path in tags.get("EXCLUDE", [])
+    ]
+    exclude_patterns = tags.get("EXCLUDE_PATTERNS", [])
+
+    def excluded(path):
+        if any(is_within(path, exclude) for exclude in excludes):
+            return True
+        return any(fnmatch.fnmatch(path, pattern) for pattern in exclude_patterns)
+
+    files = set()
+    for entry in tags.get("INPUT", []):
+        pattern = os.path.join(rundir, entry)
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = os.path.realpath(match)
+            if is_within(path, rundir) or excluded(path):
+                continue
+            if os.path.isfile(path):
+                # 明示したファイルは FILE_PATTERNS に関わらず読まれる
+                files.add(path)
+                continue
+            if not os.path.isdir(path):
+                continue
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(
+                    name for name in dirnames
+                    if not excluded(os.path.join(dirpath, name))
+                ) if recursive else []
+                for name in filenames:
+                    file_path = os.path.join(dirpath, name)
+                    if excluded(file_path):
+                        continue
+                    if any(fnmatch.fnmatch(name, p) for p in file_patterns):
+                        files.add(file_path)
+    return sorted(files)
+
+
+def main(argv):
+    if len(argv) < 3:
+        print(
+            "Usage: list-doxygen-inputs.py <doxygen_rundir> <doxyfile> [<doxyfile> ...]",
+            file=sys.stderr,
+        )
+        return 2
+
+    tags = read_doxyfile_tags(argv[2:])
+    for path in list_input_files(argv[1], tags):
+        stat = os.stat(path)
+        print("{0} {1} {2}".format(path, stat.st_size, stat.st_mtime_ns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
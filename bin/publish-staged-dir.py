@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+publish-staged-dir.py - ステージング済み出力の差分公開
+
+一時ディレクトリに生成した Doxygen / Doxybook2 の出力ツリーを、公開先ツリーと
+内容ハッシュで比較し、変更のあったファイルだけを置き換える。
+変更のないファイルは inode と更新日時を保つため、下流の静的サイト生成や rsync
+による配布が全ファイルを変更扱いにしない。
+
+公開の途中状態は、公開先直下のマーカー ファイルで表す。
+
+- 公開開始時に、新しいマニフェストを .doxyfw-manifest.pending として書き出す
+- 変更ファイルの置換 (rename) と不要ファイルの削除を行う
+- 最後に .doxyfw-manifest.pending を .doxyfw-manifest へ rename で差し替える
+
+.doxyfw-manifest.pending が存在する間は公開途中であり、配布側はこのマーカーの
+有無で公開の完了を判定できる。中断された場合も、次回の公開で差分が再計算され
+公開先は完全な状態へ収束する。
+
+内容ハッシュの計算 (計画) と rename / 削除 (適用) は別々に実行できる。
+run_doxyfw_make.sh は計画をシグナルの保留区間の前に済ませ、区間内では
+計画ファイルに従った rename と削除だけを行う。
+
+複数の実行が共有する公開先 (依存関係レポートの静的ファイル) は --shared で
+計画する。ファイル名に内容ハッシュを含むため同名のファイルは同じ内容であり、
+追加と置換だけを行い、マーカーは書かない。どのレポートからも参照されなくなった
+ファイルは、すべての公開の適用後に --prune で削除する。
+
+使用方法:
+    python3 publish-staged-dir.py <stage_dir> <final_dir>
+    python3 publish-staged-dir.py --plan <plan_file> [--shared] <stage_dir> <final_dir>
+    python3 publish-staged-dir.py --apply <plan_file>
+    python3 publish-staged-dir.py --prune <final_dir> <reference_glob> [<reference_glob> ...]
+"""
+
+import errno
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+
+MANIFEST_NAME = ".doxyfw-manifest"
+PENDING_MANIFEST_NAME = MANIFEST_NAME + ".pending"
+TEMP_SUFFIX = ".doxyfw-tmp"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """ファイル内容の SHA-256 を 16 進文字列で返す。"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_tree(root_dir):
+    """ツリー配下のファイルとディレクトリを相対パス (POSIX 区切り) で列挙する。
+
+    Returns:
+        (files, dirs): files は相対パスからファイル サイズへの辞書、dirs は相対パスの集合。
+        公開マーカーと置換用一時ファイルは対象外とする。
+    """
+    files = {}
+    dirs = set()
+    root_text = str(root_dir)
+
+    for current, dir_names, file_names in os.walk(root_text):
+        rel_dir = os.path.relpath(current, root_text)
+        prefix = "" if rel_dir == "." else rel_dir.replace(os.sep, "/") + "/"
+        for name in dir_names:
+            dirs.add(prefix + name)
+        for name in file_names:
+            if not prefix and name in (MANIFEST_NAME, PENDING_MANIFEST_NAME):
+                continue
+            if name.endswith(TEMP_SUFFIX):
+                continue
+            files[prefix + name] = os.lstat(os.path.join(current, name)).st_size
+
+    return files, dirs
+
+
+def plan_publish(stage_dir, final_dir, shared=False):
+    """公開に必要な操作を計算する。
+
+    サイズが異なるファイルはハッシュを計算せずに変更ありと判定する。
+    公開先がディレクトリでない場合は、ツリーごと移動する計画 (mode: new) とする。
+    shared の場合は、他の実行が配置したファイルを残すため削除の対象を持たない
+    計画 (mode: shared) とする。
+
+    Returns:
+        dict: stage_dir / final_dir、mode ("incremental"、"new" または "shared")、
+        manifest (相対パス → ハッシュ)、changed (置換するファイル)、
+        stale_files / stale_dirs (削除するファイルとディレクトリ)、
+        stage_dirs (ステージング側のディレクトリ) を持つ辞書。
+    """
+    incremental = shared or (final_dir.is_dir() and not final_dir.is_symlink())
+    stage_files, stage_dirs = scan_tree(stage_dir)
+    final_files, final_dirs = scan_tree(final_dir) if final_dir.is_dir() else ({}, set())
+
+    manifest = {}
+    changed = []
+    for rel_path in sorted(stage_files):
+        stage_hash = file_digest(stage_dir / rel_path)
+        manifest[rel_path] = stage_hash
+        final_size = final_files.get(rel_path)
+        if final_size is None or final_size != stage_files[rel_path]:
+            changed.append(rel_path)
+            continue
+        if file_digest(final_dir / rel_path) != stage_hash:
+            changed.append(rel_path)
+
+    stale_files = sorted(path for path in final_files if path not in stage_files)
+    # 子から先に削除できるよう深い順に並べる
+    stale_dirs = sorted(
+        (path for path in final_dirs if path not in stage_dirs),
+        key=lambda path: (-path.count("/"), path),
+    )
+
+    if shared:
+        stale_files = []
+        stale_dirs = []
+
+    return {
+        "stage_dir": str(stage_dir),
+        "final_dir": str(final_dir),
+        "mode": "shared" if shared else "incremental" if incremental else "new",
+        "manifest": manifest,
+        "changed": changed,
+        "stale_files": stale_files,
+        "stale_dirs": stale_dirs,
+        "stage_dirs": sorted(stage_dirs),
+    }
+
+
+def write_plan(path, plan):
+    """計画を JSON で書き出す。"""
+    tmp_path = path.with_name(path.name + TEMP_SUFFIX)
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(plan, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def read_plan(path):
+    """write_plan で書き出した計画を読み込む。"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(path, manifest):
+    """マニフェストを sha256sum 互換の形式で書き出す。"""
+    tmp_path = path.with_name(path.name + TEMP_SUFFIX)
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        for rel_path in sorted(manifest):
+            f.write("{}  {}\n".format(manifest[rel_path], rel_path))
+    os.replace(tmp_path, path)
+
+
+def remove_path(path):
+    """ファイル、シンボリック リンク、ディレクトリのいずれでも削除する。"""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.exists() or path.is_symlink():
+        path.unlink()
+
+
+def replace_file(src, dest):
+    """src を dest へ rename で置き換える。
+
+    公開先に同名のディレクトリがあれば先に削除する。別ファイル システムへの
+    移動で rename が使えない場合は、公開先と同じディレクトリへ一時ファイルとして
+    コピーしてから rename する。
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.is_dir() and not dest.is_symlink():
+        shutil.rmtree(dest)
+
+    try:
+        os.replace(src, dest)
+        return
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+
+    tmp_path = dest.with_name(dest.name + TEMP_SUFFIX)
+    shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+def prepare_parent_dirs(final_dir, rel_path):
+    """rel_path の親ディレクトリ位置に残っている通常ファイルを除去する。"""
+    parts = rel_path.split("/")[:-1]
+    current = final_dir
+    for part in parts:
+        current = current / part
+        if current.is_symlink() or (current.exists() and not current.is_dir()):
+            current.unlink()
+
+
+def apply_incremental(plan):
+    """計画に従い、ステージング済みツリーを公開先へ差分で反映する。ハッシュは計算しない。"""
+    stage_dir = Path(plan["stage_dir"])
+    final_dir = Path(plan["final_dir"])
+
+    write_manifest(final_dir / PENDING_MANIFEST_NAME, plan["manifest"])
+
+    for rel_path in plan["stale_files"]:
+        remove_path(final_dir / rel_path)
+    for rel_path in plan["stale_dirs"]:
+        remove_path(final_dir / rel_path)
+    for rel_path in plan["changed"]:
+        prepare_parent_dirs(final_dir, rel_path)
+        replace_file(stage_dir / rel_path, final_dir / rel_path)
+
+    # 空のディレクトリは差分の対象にならないため、ステージング側に合わせて作成する
+    for rel_path in plan["stage_dirs"]:
+        target = final_dir / rel_path
+        if not target.is_dir():
+            prepare_parent_dirs(final_dir, rel_path + "/")
+            target.mkdir(parents=True, exist_ok=True)
+
+    os.replace(final_dir / PENDING_MANIFEST_NAME, final_dir / MANIFEST_NAME)
+    shutil.rmtree(stage_dir, ignore_errors=True)
+
+
+def apply_shared(plan):
+    """共有の公開先へ、変更のあったファイルだけを rename で配置する。削除は行わない。"""
+    stage_dir = Path(plan["stage_dir"])
+    final_dir = Path(plan["final_dir"])
+
+    final_dir.mkdir(parents=True, exist_ok=True)
+    for rel_path in plan["changed"]:
+        replace_file(stage_dir / rel_path, final_dir / rel_path)
+    shutil.rmtree(stage_dir, ignore_errors=True)
+
+
+def prune_unreferenced(final_dir, reference_globs):
+    """final_dir 直下のファイルのうち、どの参照元にも名前が現れないものを削除する。
+
+    参照元は reference_globs の順に読む。公開前のステージング側を先に、公開先を
+    後に指定すると、読み取りの間に公開された参照元も見落とさない。
+
+    Returns:
+        削除したファイル名のリスト。
+    """
+    if not final_dir.is_dir():
+        return []
+
+    references = []
+    for pattern in reference_globs:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    references.append(f.read())
+            except OSError:
+                continue
+    reference_text = "\n".join(references)
+
+    removed = []
+    for entry in sorted(os.listdir(final_dir)):
+        path = final_dir / entry
+        if entry.endswith(TEMP_SUFFIX) or not path.is_file() or entry in reference_text:
+            continue
+        path.unlink()
+        removed.append(entry)
+    return removed
+
+
+def apply_new(plan):
+    """公開先が存在しない場合は、マニフェストを付けてツリーごと移動する。"""
+    stage_dir = Path(plan["stage_dir"])
+    final_dir = Path(plan["final_dir"])
+
+    if final_dir.exists() or final_dir.is_symlink():
+        remove_path(final_dir)
+    write_manifest(stage_dir / MANIFEST_NAME, plan["manifest"])
+    final_dir.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(stage_dir), str(final_dir))
+
+
+def apply_plan(plan):
+    """計画の rename と削除を実行し、結果を出力する。"""
+    if plan["mode"] == "incremental":
+        apply_incremental(plan)
+    elif plan["mode"] == "shared":
+        apply_shared(plan)
+    else:
+        apply_new(plan)
+
+    print(
+        "[publish-staged-dir] {}: files={} replaced={} removed={}".format(
+            plan["final_dir"],
+            len(plan["manifest"]),
+            len(plan["changed"]),
+            len(plan["stale_files"]),
+        )
+    )
+
+
+def usage():
+    print(
+        "Usage: python3 publish-staged-dir.py [--plan <plan_file> [--shared]] <stage_dir> <final_dir>\n"
+        "       python3 publish-staged-dir.py --apply <plan_file>\n"
+        "       python3 publish-staged-dir.py --prune <final_dir> <reference_glob> [<reference_glob> ...]",
+        file=sys.stderr,
+    )
+    return 2
+
+
+def main(argv):
+    args = argv[1:]
+    if args[:1] == ["--apply"]:
+        if len(args) != 2:
+            return usage()
+        apply_plan(read_plan(Path(args[1])))
+        return 0
+    if args[:1] == ["--prune"]:
+        if len(args) < 3:
+            return usage()
+        final_dir = Path(args[1])
+        removed = prune_unreferenced(final_dir, args[2:])
+        print("[publish-staged-dir] {}: pruned={}".format(final_dir, len(removed)))
+        return 0
+
+    plan_path = None
+    shared = False
+    if args[:1] == ["--plan"]:
+        if len(args) < 2:
+            return usage()
+        plan_path = Path(args[1])
+        args = args[2:]
+        if args[:1] == ["--shared"]:
+            shared = True
+            args = args[1:]
+    if len(args) != 2:
+        return usage()
+
+    stage_dir = Path(args[0])
+    final_dir = Path(args[1])
+
+    if not stage_dir.is_dir():
+        print("ERROR: Staged output does not exist: {}".format(stage_dir), file=sys.stderr)
+        return 1
+
+    plan = plan_publish(stage_dir, final_dir, shared)
+    if plan_path is not None:
+        write_plan(plan_path, plan)
+    else:
+        apply_plan(plan)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+run-subcategories.py - 大分類配下の全 Doxyfile.part* を並行生成する
+
+app/<CATEGORY>/prod/ の Doxyfile.part と Doxyfile.part.<SUBCATEGORY> を列挙し、
+それぞれの生成 (doxyfw の make) を並行して実行する。
+各生成の出力は行単位で [<CATEGORY_ID>] を前置して表示し、終了後に終了コードと
+警告件数をまとめて表示する。
+
+同時実行数は次の最小値とする。
+
+- CPU 数
+- 利用可能メモリ / DOXYFW_JOB_MEMORY_MB (既定 1024 MB)
+- DOXYFW_JOBS (指定時)
+- GNU Make の jobserver から取得できたトークン数 + 1 (make -j 配下の場合)
+
+使用方法:
+    python3 run-subcategories.py <doxygen_rundir> <doxygen_workdir> <category>
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+
+DOXYFW_DIR = Path(__file__).resolve().parents[1]
+DOXYFILE_PART_NAME = "Doxyfile.part"
+DEFAULT_JOB_MEMORY_MB = 1024
+JOBSERVER_AUTH_RE = re.compile(r"--jobserver-(?:auth|fds)=(\S+)")
+# ファイル システムの更新日時の粒度 (粗いクロック) による誤差の許容範囲
+MTIME_TOLERANCE_SECONDS = 1.0
+
+
+def discover_subcategories(rundir):
+    """Doxyfile.part* を列挙し、SUBCATEGORY 名のリストを返す。
+
+    Doxyfile.part は空文字列 (SUBCATEGORY なし) として先頭に置く。
+    """
+    subcategories = []
+    if (rundir / DOXYFILE_PART_NAME).is_file():
+        subcategories.append("")
+
+    prefix = DOXYFILE_PART_NAME + "."
+    for path in sorted(rundir.glob(prefix + "*")):
+        if path.is_file():
+            subcategories.append(path.name[len(prefix):])
+
+    return subcategories
+
+
+def category_id(category, subcategory):
+    """makefile の CATEGORY_ID と同じ規則で識別子を返す。"""
+    return "{}_{}".format(category, subcategory) if subcategory else category
+
+
+def warn_file_path(workdir, subcategory):
+    """makefile の DOXY_WARN_BASENAME と同じ規則で警告ファイルのパスを返す。"""
+    if subcategory:
+        return workdir / "doxy_{}.warn".format(subcategory)
+    return workdir / "doxy.warn"
+
+
+def count_warnings(path, since=None):
+    """警告ファイルの空行以外の行数を返す。
+
+    since (time.time() の値) を指定した場合、それより前に更新されたファイルは
+    以前の実行が残したものとして数えない (生成が警告ファイルを書く前に失敗した場合など)。
+    """
+    if not path.is_file():
+        return 0
+    if since is not None and path.stat().st_mtime < since - MTIME_TOLERANCE_SECONDS:
+        return 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def available_memory_mb():
+    """/proc/meminfo の MemAvailable を MB で返す。取得できない場合は None。"""
+    try:
+        with open("/proc/meminfo", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def read_positive_int(environ, name):
+    """環境変数を正の整数として読む。未指定や不正値の場合は None。"""
+    value = environ.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        print("Warning: {} is not an integer: {}".format(name, value), file=sys.stderr)
+        return None
+    return number if number > 0 else None
+
+
+def compute_job_limit(job_count, environ):
+    """CPU 数、メモリ、DOXYFW_JOBS から同時実行数の上限を求める。"""
+    limit = os.cpu_count() or 1
+
+    job_memory_mb = read_positive_int(environ, "DOXYFW_JOB_MEMORY_MB") or DEFAULT_JOB_MEMORY_MB
+    memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        limit = min(limit, max(1, memory_mb // job_memory_mb))
+
+    explicit = read_positive_int(environ, "DOXYFW_JOBS")
+    if explicit is not None:
+        limit = min(limit, explicit)
+
+    return max(1, min(limit, job_count))
+
+
+class JobServerClient:
+    """GNU Make の jobserver からトークンを取得・返却する。
+
+    make -j 配下では、このプロセス自身が 1 トークンを暗黙に保持している。
+    2 つ目以降の並行ジョブは jobserver から 1 バイト読み出してトークンを取得し、
+    終了時に同じバイトを書き戻す。jobserver が利用できない場合は何もしない。
+    see: https://www.gnu.org/software/make/manual/html_node/POSIX-Jobserver.html
+    """
+
+    def __init__(self, read_fd=None, write_fd=None):
+        self.read_fd = read_fd
+        self.write_fd = write_fd
+        self.lock = threading.Lock()
+        self.implicit_in_use = False
+
+    @classmethod
+    def from_makeflags(cls, makeflags):
+        """MAKEFLAGS から jobserver を開く。見つからない場合は無効な client を返す。"""
+        match = None
+        for match in JOBSERVER_AUTH_RE.finditer(makeflags or ""):
+            pass
+        if match is None:
+            return cls()
+
+        auth = match.group(1)
+        try:
+            if auth.startswith("fifo:"):
+                fd = os.open(auth[len("fifo:"):], os.O_RDWR)
+                return cls(fd, fd)
+            read_text, write_text = auth.split(",", 1)
+            read_fd = int(read_text)
+            write_fd = int(write_text)
+            if read_fd < 0 or write_fd < 0:
+                return cls()
+            os.fstat(read_fd)
+            os.fstat(write_fd)
+            return cls(read_fd, write_fd)
+        except (OSError, ValueError):
+            # レシピ行に + がない場合、jobserver の fd は子プロセスへ渡されない
+            return cls()
+
+    @property
+    def enabled(self):
+        return self.read_fd is not None
+
+    def acquire(self):
+        """トークンを取得する。暗黙トークンを使う場合は None を返す。"""
+        with self.lock:
+            if not self.implicit_in_use:
+                self.implicit_in_use = True
+                return None
+        if not self.enabled:
+            return b""
+        while True:
+            try:
+                token = os.read(self.read_fd, 1)
+            except InterruptedError:
+                continue
+            if token:
+                return token
+
+    def release(self, token):
+        """acquire で得たトークンを返却する。"""
+        if token is None:
+            with self.lock:
+                self.implicit_in_use = False
+            return
+        if token and self.enabled:
+            os.write(self.write_fd, token)
+
+
+class PrefixedPrinter:
+    """複数ジョブの出力を行単位で混在させずに表示する。"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def write_line(self, prefix, line):
+        with self.lock:
+            self.stream.write("[{}] {}\n".format(prefix, line))
+            self.stream.flush()
+
+
+def build_make_command(make, category, subcategory):
+    """1 つの Doxyfile.part* を生成する make コマンドを返す。"""
+    command = [make, "--no-print-directory", "-C", str(DOXYFW_DIR), "CATEGORY={}".format(category)]
+    if subcategory:
+        command.append("SUBCATEGORY={}".format(subcategory))
+    return command
+
+
+def run_job(command, label, printer, jobserver):
+    """ジョブを実行し、(終了コード, 経過秒, 開始時刻) を返す。"""
+    token = jobserver.acquire()
+    started_at = time.time()
+    started = time.monotonic()
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+        )
+        for raw_line in process.stdout:
+            printer.write_line(label, raw_line.decode("utf-8", errors="replace").rstrip("\r\n"))
+        exit_code = process.wait()
+    except OSError as exc:
+        printer.write_line(label, "ERROR: failed to start {}: {}".format(command[0], exc))
+        exit_code = 127
+    finally:
+        jobserver.release(token)
+    return exit_code, time.monotonic() - started, started_at
+
+
+def run_subcategories(jobs, job_limit, jobserver, printer=None, summary_stream=None):
+    """ジョブを並行実行し、集約した終了コードを返す。
+
+    Args:
+        jobs: (label, command, warn_path) のリスト
+        job_limit: 同時実行数の上限
+        jobserver: JobServerClient
+    """
+    printer = printer or PrefixedPrinter(sys.stdout)
+    summary_stream = summary_stream or sys.stdout
+
+    with ThreadPoolExecutor(max_workers=job_limit) as executor:
+        futures = [
+            executor.submit(run_job, command, label, printer, jobserver)
+            for label, command, _ in jobs
+        ]
+        results = [future.result() for future in futures]
+
+    summary_stream.write("[run-subcategories] summary (jobs={})\n".format(job_limit))
+    aggregated_exit = 0
+    total_warnings = 0
+    for (label, _, warn_path), (exit_code, elapsed, started_at) in zip(jobs, results):
+        # このジョブの開始後に書かれた警告ファイルだけを数える
+        warnings = count_warnings(warn_path, started_at) if warn_path else 0
+        total_warnings += warnings
+        status = "ok" if exit_code == 0 else "FAILED (exit {})".format(exit_code)
+        summary_stream.write(
+            "  {}: {} warnings={} time={:.1f}s\n".format(label, status, warnings, elapsed)
+        )
+        if exit_code != 0 and aggregated_exit == 0:
+            aggregated_exit = exit_code
+    failed = sum(1 for exit_code, _, _ in results if exit_code != 0)
+    summary_stream.write(
+        "[run-subcategories] total={} failed={} warnings={}\n".format(
+            len(jobs), failed, total_warnings
+        )
+    )
+    summary_stream.flush()
+
+    return aggregated_exit
+
+
+def main(argv):
+    if len(argv) != 4:
+        print(
+            "Usage: python3 run-subcategories.py <doxygen_rundir> <doxygen_workdir> <category>",
+            file=sys.stderr,
+        )
+        return 2
+
+    rundir = Path(argv[1])
+    workdir = Path(argv[2])
+    category = argv[3]
+
+    if not category:
+        print("ERROR: CATEGORY is required to run subcategories.", file=sys.stderr)
+        return 2
+
+    subcategories = discover_subcategories(rundir)
+    if not subcategories:
+        print(
+            "ERROR: No Doxyfile.part* found in {}".format(rundir),
+            file=sys.stderr,
+        )
+        return 2
+
+    make = os.environ.get("MAKE") or "make"
+    jobs = [
+        (
+            category_id(category, subcategory),
+            build_make_command(make, category, subcategory),
+            warn_file_path(workdir, subcategory),
+        )
+        for subcategory in subcategories
+    ]
+
+    job_limit = compute_job_limit(len(jobs), os.environ)
+    jobserver = JobServerClient.from_makeflags(os.environ.get("MAKEFLAGS", ""))
+
+    return run_subcategories(jobs, job_limit, jobserver)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
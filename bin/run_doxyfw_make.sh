@@ -51,6 +51,10 @@ esac
 
 run_tmp_root=""
 lock_dir=""
+lock_fd=""
+lock_ticket=""
+input_manifest=""
+published_generation_before=""
 cleanup_done=0
 temp_doxyfile=""
 warn_logfile=""
@@ -114,9 +118,7 @@ cleanup() {
     if [ -n "${SKIP_MARKER:-}" ]; then
         rm -f "$SKIP_MARKER"
     fi
-    if [ -n "$lock_dir" ] && [ -d "$lock_dir" ]; then
-        rmdir "$lock_dir" 2>/dev/null || true
-    fi
+    release_lock
     if [ -n "${DOXYFW_LOCK_ROOT:-}" ]; then
         rmdir "$DOXYFW_LOCK_ROOT" 2>/dev/null || true
     fi
@@ -137,15 +139,187 @@ on_signal() {
     exit "$signal_exit"
 }
 
+# 実行キー (DOXYFW_RUNTIME_KEY) 単位の排他ロック。
+# flock が使える環境では、到着順に待ち行列を作る CLH 方式のキュー ロックを使う。
+# 各実行は自分のチケット ファイルを flock で保持したまま、直前に並んだ実行の
+# チケット ファイルの flock が解放されるまでブロックして待つ。ポーリングを
+# 行わず、到着順 (FIFO) に取得できる。flock はプロセスの終了時にカーネルが
+# 解放するため、異常終了した実行のロックが残り続けることはない。
+# see: https://man7.org/linux/man-pages/man1/flock.1.html
 acquire_lock() {
-    lock_path="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.lock"
+    if [ -n "$lock_fd" ] || [ -n "$lock_dir" ]; then
+        return 0
+    fi
     mkdir -p "$DOXYFW_LOCK_ROOT"
-    while ! mkdir "$lock_path" 2>/dev/null; do
+    if command -v flock >/dev/null 2>&1; then
+        acquire_queue_lock
+    else
+        acquire_spin_lock
+    fi
+}
+
+acquire_queue_lock() {
+    local queue_lock="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.queue"
+    local tail_file="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.tail"
+    local predecessor=""
+    local queue_fd
+    local predecessor_fd
+
+    lock_ticket=$(mktemp "$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.ticket.XXXXXX") || return 1
+    exec {lock_fd}>"$lock_ticket"
+    flock -x "$lock_fd"
+
+    # 待ち行列の末尾の登録だけを短いロックで保護する
+    exec {queue_fd}>"$queue_lock"
+    flock -x "$queue_fd"
+    if [ -f "$tail_file" ]; then
+        predecessor=$(cat "$tail_file")
+    fi
+    printf '%s\n' "$lock_ticket" > "$tail_file"
+    exec {queue_fd}>&-
+
+    # 直前の実行は、後続が存在する場合は自分のチケット ファイルを削除しない。
+    # 異常終了した実行のチケット ファイルは flock が即座に取得できる。
+    if [ -n "$predecessor" ] && [ -f "$predecessor" ]; then
+        exec {predecessor_fd}<"$predecessor"
+        if ! flock -n -x "$predecessor_fd"; then
+            echo "Waiting for another Doxygen run of $DOXYFW_RUNTIME_KEY to finish..."
+            flock -x "$predecessor_fd"
+        fi
+        exec {predecessor_fd}<&-
+        rm -f "$predecessor"
+    fi
+}
+
+# flock を利用できない環境向けの mkdir によるロック。
+# 保持している実行の PID を記録し、そのプロセスが存在しなければ回収する。
+# PID を書き込んだディレクトリを rename で配置するため、ロックには常に PID がある。
+# 回収は rename で退避してから削除する。複数の実行が同時に回収しようとしても
+# 退避できるのは 1 つだけで、退避したロックの PID が回収対象と異なる
+# (別の実行が取得し直した) 場合は元に戻す。
+acquire_spin_lock() {
+    local lock_path="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.lock"
+    local candidate="$lock_path.new.$$"
+    local stale="$lock_path.stale.$$"
+    local owner_pid
+
+    rm -rf "$candidate" "$stale"
+    mkdir "$candidate" || return 1
+    printf '%s\n' "$$" > "$candidate/pid"
+    while ! mv -T "$candidate" "$lock_path" 2>/dev/null; do
+        owner_pid=$(cat "$lock_path/pid" 2>/dev/null || true)
+        if [ -n "$owner_pid" ] && ! kill -0 "$owner_pid" 2>/dev/null &&
+            mv -T "$lock_path" "$stale" 2>/dev/null; then
+            if [ "$(cat "$stale/pid" 2>/dev/null || true)" = "$owner_pid" ]; then
+                echo "Warning: Removing stale lock of $DOXYFW_RUNTIME_KEY held by PID $owner_pid." >&2
+                rm -rf "$stale"
+            else
+                mv -T "$stale" "$lock_path" 2>/dev/null || rm -rf "$stale"
+            fi
+            continue
+        fi
         sleep 0.05
     done
     lock_dir="$lock_path"
 }
 
+release_lock() {
+    local queue_lock="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.queue"
+    local tail_file="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.tail"
+    local queue_fd
+
+    if [ -n "$lock_fd" ]; then
+        # 後続がいなければ末尾の登録とチケット ファイルを片付ける。
+        # 後続がいる場合のチケット ファイルは後続が削除する。
+        exec {queue_fd}>"$queue_lock"
+        flock -x "$queue_fd"
+        if [ -f "$tail_file" ] && [ "$(cat "$tail_file")" = "$lock_ticket" ]; then
+            rm -f "$tail_file" "$lock_ticket"
+        fi
+        exec {queue_fd}>&-
+        exec {lock_fd}>&-
+        lock_fd=""
+        lock_ticket=""
+    fi
+    if [ -n "$lock_dir" ] && [ -d "$lock_dir" ]; then
+        # 回収されて別の実行が取得し直したロックは削除しない
+        if [ "$(cat "$lock_dir/pid" 2>/dev/null || true)" = "$$" ]; then
+            rm -f "$lock_dir/pid"
+            rmdir "$lock_dir" 2>/dev/null || true
+        fi
+        lock_dir=""
+    fi
+}
+
+# 入力マニフェスト (Doxyfile、Doxyfile.part、出力先、DOXYGEN_RUNDIR 配下、
+# DOXYGEN_RUNDIR の外を指す INPUT 配下とフレームワークの makefile、
+# doxybook2-config.json、templates/、bin/ のファイル一覧とサイズ、更新日時) の
+# ハッシュを返す。
+# 同じ実行キーで同一入力の生成を重複して実行しないための比較に使う。
+# INPUT の一覧を取得できない場合は空を返し、出力の再利用を行わない。
+compute_input_manifest() {
+    local input_listing
+
+    if ! command -v sha256sum >/dev/null 2>&1; then
+        return 0
+    fi
+    if [ -z "${DOXYGEN_INPUT_LISTER:-}" ]; then
+        return 0
+    fi
+    if ! input_listing=$(python3 "$DOXYGEN_INPUT_LISTER" "$DOXYGEN_RUNDIR" \
+            "$MAKEFILE_DIR/Doxyfile" "$DOXYFILE_PART"); then
+        return 0
+    fi
+    {
+        cat "$MAKEFILE_DIR/Doxyfile"
+        if [ -f "$DOXYFILE_PART" ]; then
+            cat "$DOXYFILE_PART"
+        fi
+        printf '%s\n' "$DOCS_DOXYGEN_DIR" "$DOCS_DOXYBOOK2_DIR" \
+            "${DEPENDENCY_PAGE_TEMPLATE:-}" "${DEPENDENCY_PAGE_LANGS:-}"
+        if [ -d "$DOXYGEN_RUNDIR" ]; then
+            (cd "$DOXYGEN_RUNDIR" && find . -type f -printf '%p %s %T@\n' | LC_ALL=C sort)
+        fi
+        printf '%s\n' "$input_listing"
+        # 生成に使うフレームワーク自身のスクリプトとテンプレート。更新されたら再生成する。
+        (cd "$MAKEFILE_DIR" && find makefile doxybook2-config.json templates bin \
+            -name __pycache__ -prune -o -type f -printf '%p %s %T@\n' 2>/dev/null | LC_ALL=C sort)
+    } | sha256sum | cut -d ' ' -f 1
+}
+
+# 公開記録 (<世代> <入力マニフェスト>) の世代を返す。記録がなければ 0。
+read_published_generation() {
+    local record="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.published"
+    local generation=""
+
+    if [ -f "$record" ]; then
+        generation=$(awk 'NR == 1 { print $1 }' "$record")
+    fi
+    printf '%s\n' "${generation:-0}"
+}
+
+read_published_manifest() {
+    local record="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.published"
+
+    if [ -f "$record" ]; then
+        awk 'NR == 1 { print $2 }' "$record"
+    fi
+}
+
+# ロック保持中に、公開した入力マニフェストを次の世代として記録する。
+record_published_manifest() {
+    local record="$DOXYFW_LOCK_ROOT/$DOXYFW_RUNTIME_KEY.published"
+    local generation
+
+    if [ -z "$input_manifest" ]; then
+        rm -f "$record"
+        return 0
+    fi
+    generation=$(read_published_generation)
+    printf '%s %s\n' "$((generation + 1))" "$input_manifest" > "$record.$$"
+    mv -f "$record.$$" "$record"
+}
+
 to_doxygen_path() {
     path_value="$1"
 
@@ -156,26 +330,41 @@ to_doxygen_path() {
     fi
 }
 
-replace_dir() {
+# ステージング済みの出力を公開先へ反映する。
+# 公開先を丸ごと差し替えると全ファイルの inode と更新日時が変わり、下流の
+# 静的サイト生成や rsync 配布がすべてを変更扱いにする。内容ハッシュが変わった
+# ファイルだけを rename で置き換え、不要になったファイルを削除する。
+# 公開の完了は公開先直下の .doxyfw-manifest の差し替えで示す。
+# 公開の計画: 両ツリーの内容ハッシュを比較し、置換と削除の対象を計画ファイルへ書き出す
+plan_replace_dir() {
     stage_dir="$1"
     final_dir="$2"
-    parent_dir=$(dirname "$final_dir")
-    backup_dir="$final_dir.doxyfw-old.$PPID.$RANDOM"
+    plan_file="$3"
 
     if [ ! -d "$stage_dir" ]; then
         echo "ERROR: Staged Doxygen output does not exist: $stage_dir" >&2
         return 1
     fi
 
-    mkdir -p "$parent_dir"
-    rm -rf "$backup_dir"
-    if [ -d "$final_dir" ]; then
-        mv "$final_dir" "$backup_dir"
-    fi
-    if [ -d "$stage_dir" ]; then
-        mv "$stage_dir" "$final_dir"
+    python3 "$STAGED_DIR_PUBLISHER" --plan "$plan_file" "$stage_dir" "$final_dir"
+}
+
+# 公開の適用: 計画ファイルに従って rename と削除だけを行う (ハッシュは計算しない)
+apply_replace_dir() {
+    python3 "$STAGED_DIR_PUBLISHER" --apply "$1"
+}
+
+# 依存関係レポートの共有の静的ファイル (DEPENDENCY_ASSET_DIR) のうち、公開済みの
+# レポートとステージング中のレポートのいずれの index.html からも参照されない
+# ファイルを削除する。ステージング側を先に読むため、読み取りの間に公開された
+# 他の実行のレポートが参照するファイルも削除しない。
+prune_dependency_assets() {
+    if [ -z "${DEPENDENCY_ASSET_DIR:-}" ] || [ -z "${DEPENDENCY_ASSET_REFERENCES:-}" ]; then
+        return 0
     fi
-    rm -rf "$backup_dir"
+    python3 "$STAGED_DIR_PUBLISHER" --prune "$DEPENDENCY_ASSET_DIR" \
+        "$DOXYFW_TMP_ROOT/*/run.*/doxygen/dependency/index.html" \
+        "$DEPENDENCY_ASSET_REFERENCES"
 }
 
 replace_warn_file() {
@@ -207,6 +396,10 @@ remove_obsolete_outputs() {
     if [ -n "$APP_DOCS_DIR" ]; then
         rmdir "$APP_DOCS_DIR" 2>/dev/null || true
     fi
+    prune_dependency_assets
+    if [ -n "${DEPENDENCY_ASSET_DIR:-}" ]; then
+        rmdir "$DEPENDENCY_ASSET_DIR" 2>/dev/null || true
+    fi
     rmdir "$WORKSPACE_DIR/pages/doxygen" 2>/dev/null || true
     rmdir "$WORKSPACE_DIR/docs/doxybook2" 2>/dev/null || true
 }
@@ -217,11 +410,18 @@ prepare_doxyfile() {
     local warn_logfile_doxy="$3"
     local xml_work_dir_doxy="$4"
     local docs_doxygen_stage_dir_doxy="$5"
+    local input_filter_command="python3 $INPUT_FILTER_ABS"
+
+    # Windows の Doxygen はフィルターを cmd.exe 経由で起動するため、sh による
+    # 前段フィルターは使わず、従来どおり Python のフィルターを直接指定する。
+    if [ "$doxyfw_is_windows" -eq 0 ] && [ -n "${INPUT_FILTER_FAST_ABS:-}" ]; then
+        input_filter_command="sh $INPUT_FILTER_FAST_ABS"
+    fi
 
     sed -e "s|^\(OUTPUT_DIRECTORY[[:space:]]*=\).*|\1 $docs_doxygen_stage_dir_doxy/|" \
         -e "s|^\(XML_OUTPUT[[:space:]]*=\).*|\1 $xml_work_dir_doxy|" \
         -e "s|^\(GENERATE_TAGFILE[[:space:]]*=\).*|\1 $xml_work_dir_doxy/doxyfw.tag|" \
-        -e "s|^\(INPUT_FILTER[[:space:]]*=\).*|\1 \"python3 $INPUT_FILTER_ABS\"|" \
+        -e "s|^\(INPUT_FILTER[[:space:]]*=\).*|\1 \"$input_filter_command\"|" \
         -e "s|^\(WARN_LOGFILE[[:space:]]*=\).*|\1 $warn_logfile_doxy|" \
         "$input_doxyfile" > "$output_file"
 }
@@ -231,6 +431,18 @@ trap 'on_signal 130' INT
 trap 'on_signal 143' TERM
 trap 'on_signal 129' HUP
 
+# 同じ実行キーの生成は直列化する。待っている間に同一入力の生成が完了して
+# 公開された場合は、その結果を再利用して生成を省略する。
+input_manifest=$(compute_input_manifest)
+published_generation_before=$(read_published_generation)
+acquire_lock
+if [ -n "$input_manifest" ] &&
+    [ "$(read_published_generation)" != "$published_generation_before" ] &&
+    [ "$(read_published_manifest)" = "$input_manifest" ]; then
+    echo "Info: An identical Doxygen run of $DOXYFW_RUNTIME_KEY finished while waiting. Reusing its output."
+    exit 0
+fi
+
 tmp_base_dir="$DOXYFW_TMP_ROOT/$DOXYFW_RUNTIME_KEY"
 mkdir -p "$tmp_base_dir"
 run_tmp_root=$(mktemp -d "$tmp_base_dir/run.XXXXXX") || exit 1
@@ -238,6 +450,7 @@ run_tmp_root=$(mktemp -d "$tmp_base_dir/run.XXXXXX") || exit 1
 xml_work_dir="$run_tmp_root/xml"
 docs_doxygen_stage_dir="$run_tmp_root/doxygen"
 docs_doxybook2_stage_dir="$run_tmp_root/doxybook2"
+dependency_asset_stage_dir="$run_tmp_root/dependency-assets"
 doxy_warn_stage="$run_tmp_root/$DOXY_WARN_BASENAME"
 
 mkdir -p "$xml_work_dir" "$docs_doxygen_stage_dir"
@@ -248,8 +461,9 @@ docs_doxygen_stage_dir_doxy=$(to_doxygen_path "$docs_doxygen_stage_dir")
 
 if ! command -v doxygen >/dev/null 2>&1; then
     echo "Warning: doxygen command not found. Skipping documentation generation."
-    acquire_lock
     remove_obsolete_outputs
+    input_manifest=""
+    record_published_manifest
     exit 0
 fi
 
@@ -326,6 +540,12 @@ if [ -f "$xml_work_dir/index.xml" ] && grep -q '<compound ' "$xml_work_dir/index
     fi
     dependency_git_link_host_provider=$(parse_yaml_config_value "$WORKSPACE_DIR/.vscode/git_link.yaml" "gitLinkHostProvider")
     export GIT_LINK_HOST_PROVIDER="$dependency_git_link_host_provider"
+    # 共有の静的ファイルはレポートと同様にステージングし、公開の適用で配置する
+    dependency_asset_dir=""
+    if [ -n "${DEPENDENCY_ASSET_DIR:-}" ]; then
+        dependency_asset_dir="$dependency_asset_stage_dir"
+    fi
+    DEPENDENCY_ASSET_DIR="$dependency_asset_dir" \
     python3 "$DEPENDENCY_REPORT_GENERATOR" "$xml_work_dir" "$docs_doxygen_stage_dir/dependency" "$CATEGORY_ID" "$dependency_source_dir" "$DEPENDENCY_PAGE_TEMPLATE" "$DEPENDENCY_PAGE_LANGS" 2> "$dependency_warn_log"
     dependency_report_exit=$?
     if [ -s "$dependency_warn_log" ]; then
@@ -371,23 +591,44 @@ else
 fi
 rm -f "$SKIP_MARKER"
 
-# 公開置換の途中でシグナルの trap が実行されると、退避の mv と差し替えの
-# mv の間で中断した場合に、公開済み出力が退避ディレクトリに残ったまま
-# 公開先から消失する。置換の区間ではシグナルを記録するだけにとどめ、
-# 置換の完了後に改めて処理する。区間の内容は mv と rm だけであり、
-# 短時間で完了するため中断の応答性への影響は小さい。
+# 両ツリーの内容ハッシュの比較は時間がかかるため、シグナルを保留する区間の前に
+# 計画として済ませる。計画の途中で中断しても公開先は変更されない。
+doxygen_publish_plan="$run_tmp_root/doxygen.publish-plan"
+plan_replace_dir "$docs_doxygen_stage_dir" "$DOCS_DOXYGEN_DIR" "$doxygen_publish_plan" || exit $?
+dependency_asset_publish_plan=""
+if [ -n "${DEPENDENCY_ASSET_DIR:-}" ] && [ -d "$dependency_asset_stage_dir" ]; then
+    dependency_asset_publish_plan="$run_tmp_root/dependency-assets.publish-plan"
+    python3 "$STAGED_DIR_PUBLISHER" --plan "$dependency_asset_publish_plan" --shared \
+        "$dependency_asset_stage_dir" "$DEPENDENCY_ASSET_DIR" || exit $?
+fi
+doxybook2_publish_plan=""
+if [ -d "$docs_doxybook2_stage_dir" ]; then
+    doxybook2_publish_plan="$run_tmp_root/doxybook2.publish-plan"
+    plan_replace_dir "$docs_doxybook2_stage_dir" "$DOCS_DOXYBOOK2_DIR" "$doxybook2_publish_plan" || exit $?
+fi
+
+# 計画の適用の途中でシグナルの trap が実行されると、rename と削除が一部だけ
+# 反映された公開先 (新旧のファイルが混在した状態) と公開途中のマーカーが残り、
+# 公開記録も更新されない。適用の区間ではシグナルを記録するだけにとどめ、
+# 適用と公開記録の完了後に改めて処理する。区間の内容は計画済みの変更ファイルの
+# rename と不要ファイルの削除だけであり、短時間で完了するため中断の応答性への影響は小さい。
 publish_pending_signal=""
 trap 'publish_pending_signal=130' INT
 trap 'publish_pending_signal=143' TERM
 trap 'publish_pending_signal=129' HUP
-acquire_lock
-replace_dir "$docs_doxygen_stage_dir" "$DOCS_DOXYGEN_DIR" || exit $?
-if [ -d "$docs_doxybook2_stage_dir" ]; then
-    replace_dir "$docs_doxybook2_stage_dir" "$DOCS_DOXYBOOK2_DIR" || exit $?
+# レポートが参照する静的ファイルを、レポートより先に配置する
+if [ -n "$dependency_asset_publish_plan" ]; then
+    apply_replace_dir "$dependency_asset_publish_plan" || exit $?
+fi
+apply_replace_dir "$doxygen_publish_plan" || exit $?
+if [ -n "$doxybook2_publish_plan" ]; then
+    apply_replace_dir "$doxybook2_publish_plan" || exit $?
 else
     rm -rf "$DOCS_DOXYBOOK2_DIR"
 fi
+prune_dependency_assets || exit $?
 replace_warn_file "$doxy_warn_stage" "$DOXY_WARN_OUTPUT"
+record_published_manifest
 if [ -n "$APP_DOCS_DIR" ]; then
     rmdir "$APP_DOCS_DIR" 2>/dev/null || true
 fi
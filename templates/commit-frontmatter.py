@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+commit-frontmatter.py - 登録済みの front matter 更新を md ごとに 1 回でまとめて書き込む
+
+inject-source-origin.py (git-origin) や inject-doxygen-url.py (doxygen-page-url) は
+--batch <batch_file> を指定すると md を書き換えず、更新内容を batch ファイルへ登録する。
+このスクリプトは batch ファイルの更新を md ごとにまとめ、各 md を 1 回だけ読み書きする。
+数千件の md に対して段ごとに読み込みと書き換えを繰り返さずに済む。
+
+batch ファイルは 1 行 1 件の JSON ({"path": md のパス, "key": キー, "value": 値}) で、
+同じ md への更新は登録順に適用する。各更新の結果は段ごとに直接書き込んだ場合と同じで、
+既存の同名キーは置換し、front matter が無ければ新規生成する。
+適用後、batch ファイルは削除する。
+md ごとの書き込みは独立しているため、スレッド プールで並行して行う。
+
+使用方法:
+    python3 commit-frontmatter.py <batch_file>
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from doxyfw_jobs import worker_count
+from frontmatter_updates import commit_file, read_batch
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+
+
+def main():
+    """エントリ ポイント。"""
+    if len(sys.argv) != 2:
+        print("使用方法: commit-frontmatter.py <batch_file>", file=sys.stderr)
+        sys.exit(1)
+
+    batch_path = sys.argv[1]
+    if not os.path.isfile(batch_path):
+        print("front matter の更新はありません。")
+        return
+
+    updates = read_batch(batch_path)
+    targets = []
+    skipped = 0
+    for md_path, file_updates in updates.items():
+        if not os.path.isfile(md_path):
+            print("  -> 警告: front matter の更新対象が見つかりません: {0}".format(md_path))
+            skipped += 1
+            continue
+        targets.append((md_path, file_updates))
+
+    workers = worker_count(len(targets))
+    if workers <= 1:
+        for md_path, file_updates in targets:
+            commit_file(md_path, file_updates)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda target: commit_file(*target), targets))
+
+    os.remove(batch_path)
+    print("front matter を {0} 件の md に書き込みました。".format(len(updates) - skipped))
+
+
+if __name__ == "__main__":
+    main()
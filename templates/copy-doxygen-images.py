@@ -7,87 +7,260 @@ copy-doxygen-images.py - Doxybook2 がコピーしなかった Doxygen 画像の
 Doxygen XML の <image type="html" name="..."> を走査し、XML 出力ディレクトリに
 コピー済みの画像を Doxybook2 出力ディレクトリ直下の images/ へ補完する。
 
+画像名の収集は XML を木構造へ展開せず、バイト列を mmap して <image> タグだけを
+正規表現で拾う。画像はバイト コピーせず、ハード リンク → reflink →
+copy_file_range → 通常コピーの順に、使える最も軽い方法で配置する。
+images/ に既に同じサイズ・同じハッシュのファイルがあればそのまま残す。
+
+--manifest を指定すると、処理後の images/ のファイル名一覧を 1 行 1 件で書き出す。
+postprocess.sh はこの一覧を画像分散配置の対象集合として使い、images/ を調べ直さない。
+
 使用方法:
-    python3 copy-doxygen-images.py <xml_dir> <docs_dir>
+    python3 copy-doxygen-images.py [--manifest <manifest_file>] <xml_dir> <docs_dir>
 """
 
+import hashlib
+import mmap
+import os
+import re
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from xml.etree import ElementTree as ET
+
+from doxyfw_jobs import worker_count
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 sys.stdout.reconfigure(encoding="utf-8")
 sys.stderr.reconfigure(encoding="utf-8")
 
+IMAGE_TAG_RE = re.compile(rb"<image\b([^>]*)>")
+ATTRIBUTE_RE = re.compile(rb"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+XML_ENTITY_RE = re.compile(r"&(#x[0-9A-Fa-f]+|#[0-9]+|amp|lt|gt|quot|apos);")
+XML_ENTITIES = {"amp": "&", "lt": "<", "gt": ">", "quot": '"', "apos": "'"}
+
+# Linux の FICLONE ioctl (btrfs / XFS などで reflink を作成する)
+FICLONE = 0x40049409
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _unescape_xml(text):
+    """XML の定義済み実体参照と文字参照を復元する。"""
+
+    def replace(match):
+        entity = match.group(1)
+        if entity.startswith("#x"):
+            return chr(int(entity[2:], 16))
+        if entity.startswith("#"):
+            return chr(int(entity[1:]))
+        return XML_ENTITIES[entity]
+
+    return XML_ENTITY_RE.sub(replace, text)
+
+
+def scan_html_image_names(xml_file):
+    """1 つの Doxygen XML から HTML 用画像名を集める。"""
+    names = set()
+
+    with open(xml_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return names
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data.find(b"<image") < 0:
+                return names
+            for tag in IMAGE_TAG_RE.finditer(data):
+                attributes = {}
+                for attribute in ATTRIBUTE_RE.finditer(tag.group(1)):
+                    value = attribute.group(2)
+                    if value is None:
+                        value = attribute.group(3)
+                    attributes[attribute.group(1)] = value
+                if attributes.get(b"type") != b"html":
+                    continue
+
+                name = attributes.get(b"name")
+                if not name:
+                    continue
+
+                names.add(_unescape_xml(name.decode("utf-8")))
+
+    return names
+
 
 def iter_html_image_names(xml_dir):
     """Doxygen XML に含まれる HTML 用画像名を重複なしで列挙する。"""
     names = set()
 
     for xml_file in sorted(xml_dir.glob("*.xml")):
+        names |= scan_html_image_names(xml_file)
+
+    for name in sorted(names):
+        yield name
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def same_content(src, dest):
+    """dest が src と同一ファイル、またはサイズとハッシュが一致すれば True を返す。"""
+    try:
+        if os.path.samefile(src, dest):
+            return True
+        if src.stat().st_size != dest.stat().st_size:
+            return False
+    except OSError:
+        return False
+    return _file_digest(src) == _file_digest(dest)
+
+
+def _clone_or_copy_range(src, dest):
+    """reflink、なければ copy_file_range で src の内容を dest へ書き込む。"""
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return "reflink"
+            except OSError:
+                pass
+
+        copy_file_range = getattr(os, "copy_file_range", None)
+        if copy_file_range is None:
+            shutil.copyfileobj(fsrc, fdst)
+            return "copy"
+
+        remaining = os.fstat(fsrc.fileno()).st_size
         try:
-            root = ET.parse(xml_file).getroot()
-        except ET.ParseError as exc:
-            print(
-                "Warning: failed to parse Doxygen XML: {}: {}".format(xml_file, exc),
-                file=sys.stderr,
-            )
-            continue
+            while remaining > 0:
+                copied = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+            return "copy"
+        return "copy_file_range"
 
-        for image in root.iter("image"):
-            if image.get("type") != "html":
-                continue
 
-            name = image.get("name")
-            if not name:
-                continue
+def publish_image(src, dest):
+    """
+    src を dest へ配置する。
 
-            names.add(name)
+    ハード リンクを優先し、別デバイスなどで作れなければ reflink、
+    copy_file_range、通常コピーの順に試す。リンク以外はタイム スタンプ等も複製する。
 
-    for name in sorted(names):
-        yield name
+    @return 使用した方法 ("hardlink"、"reflink"、"copy_file_range"、"copy")
+    """
+    try:
+        os.link(src, dest)
+        return "hardlink"
+    except OSError:
+        pass
+
+    method = _clone_or_copy_range(src, dest)
+    shutil.copystat(src, dest)
+    return method
+
+
+def _publish_one(xml_dir, images_dir, name):
+    """1 画像を配置し、(状態, 方法) を返す。"""
+    src = xml_dir / name
+    if not src.is_file():
+        return "missing", None
+
+    dest = images_dir / name
+    replaced = False
+    if dest.exists():
+        if same_content(src, dest):
+            return "kept", None
+        dest.unlink()
+        replaced = True
+
+    method = publish_image(src, dest)
+    return ("replaced" if replaced else "copied"), method
 
 
-def copy_missing_images(xml_dir, docs_dir):
-    """XML 側に存在し、Doxybook2 出力に欠けている画像をコピーする。"""
+def write_manifest(images_dir, manifest_path):
+    """images/ 直下のファイル名一覧を manifest_path へ書き出す。"""
+    names = []
+    if images_dir.is_dir():
+        with os.scandir(images_dir) as entries:
+            names = sorted(entry.name for entry in entries if entry.is_file())
+
+    with open(manifest_path, "w", encoding="utf-8", newline="\n") as f:
+        for name in names:
+            f.write(name + "\n")
+
+
+def copy_missing_images(xml_dir, docs_dir, manifest_path=None):
+    """XML 側に存在し、Doxybook2 出力に欠けている画像を配置する。"""
     images_dir = docs_dir / "images"
     copied = 0
     missing = 0
 
-    for name in iter_html_image_names(xml_dir):
-        src = xml_dir / name
-        if not src.is_file():
+    names = list(iter_html_image_names(xml_dir))
+    if names and any((xml_dir / name).is_file() for name in names):
+        images_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = worker_count(len(names))
+    if workers <= 1:
+        results = [_publish_one(xml_dir, images_dir, name) for name in names]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(lambda name: _publish_one(xml_dir, images_dir, name), names)
+            )
+
+    for name, (status, method) in zip(names, results):
+        if status == "missing":
             missing += 1
             print(
-                "Warning: Doxygen image is referenced but not found: {}".format(src),
+                "Warning: Doxygen image is referenced but not found: {}".format(xml_dir / name),
                 file=sys.stderr,
             )
-            continue
-
-        dest = images_dir / name
-        if dest.exists():
-            continue
-
-        images_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dest)
-        copied += 1
-        print("  Copied Doxygen image: {}".format(name))
+        elif status == "copied":
+            copied += 1
+            print("  Copied Doxygen image: {} ({})".format(name, method))
+        elif status == "replaced":
+            copied += 1
+            print("  Replaced mismatched Doxygen image: {} ({})".format(name, method))
 
     print("[copy-doxygen-images] copied={} missing={}".format(copied, missing))
 
+    if manifest_path is not None:
+        write_manifest(images_dir, manifest_path)
+
     return 0
 
 
 def main(argv):
-    if len(argv) != 3:
+    args = argv[1:]
+    manifest_path = None
+    if len(args) >= 2 and args[0] == "--manifest":
+        manifest_path = Path(args[1])
+        args = args[2:]
+
+    if len(args) != 2:
         print(
-            "Usage: python3 copy-doxygen-images.py <xml_dir> <docs_dir>",
+            "Usage: python3 copy-doxygen-images.py [--manifest <manifest_file>] <xml_dir> <docs_dir>",
             file=sys.stderr,
         )
         return 2
 
-    xml_dir = Path(argv[1])
-    docs_dir = Path(argv[2])
+    xml_dir = Path(args[0])
+    docs_dir = Path(args[1])
 
     if not xml_dir.is_dir():
         print("ERROR: XML directory not found: {}".format(xml_dir), file=sys.stderr)
@@ -100,7 +273,7 @@ def main(argv):
         )
         return 1
 
-    return copy_missing_images(xml_dir, docs_dir)
+    return copy_missing_images(xml_dir, docs_dir, manifest_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+doxyfw_jobs.py - 並行処理のワーカー数の共通処理
+
+templates/ のスクリプトと bin/doxygen_comment_lint.py が共有する。
+CPU 数を上限とし、環境変数 DOXYFW_JOBS (正の整数) が指定されていればその値までに抑える。
+"""
+
+import os
+
+
+def worker_count(task_count):
+    """CPU 数と DOXYFW_JOBS から並行処理のワーカー数を求める。タスク数を超えず、最小 1。"""
+    limit = os.cpu_count() or 1
+    jobs_text = os.environ.get("DOXYFW_JOBS", "")
+    if jobs_text.isdigit() and int(jobs_text) > 0:
+        limit = min(limit, int(jobs_text))
+    return max(1, min(limit, task_count))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+frontmatter_updates.py - md の front matter 更新の共通処理
+
+inject-source-origin.py、inject-doxygen-url.py、commit-frontmatter.py が共有する。
+
+  - set_frontmatter_value: 行リストの先頭 front matter ブロックへ `key: "value"` を設定する
+  - write_frontmatter_updates: 更新を md へ直接書き込むか、batch ファイルへ登録する
+  - read_batch / commit_file: batch ファイルの更新を md ごとにまとめて書き込む
+
+batch ファイルは 1 行 1 件の JSON ({"path": md のパス, "key": キー, "value": 値}) で、
+同じ md への更新は登録順に適用する。
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from doxyfw_jobs import worker_count
+
+
+def set_frontmatter_value(lines, key, value):
+    """
+    md の行リストの先頭 front matter ブロックへ `key: "value"` を設定した行リストを返す。
+
+    既存の同名キーがあれば置換する。front matter が無ければ新規生成する。
+
+    @param[in] lines  md の行リスト (各行は改行を含む)
+    @param[in] key    設定するキー名
+    @param[in] value  設定する値 (文字列)
+
+    @return 更新後の行リスト
+    """
+    new_line = '{0}: "{1}"\n'.format(key, value)
+
+    if lines and lines[0].rstrip("\r\n") == "---":
+        close_index = None
+        for i in range(1, len(lines)):
+            if lines[i].rstrip("\r\n") == "---":
+                close_index = i
+                break
+        if close_index is not None:
+            body = lines[1:close_index]
+            body = [ln for ln in body if not ln.lstrip().startswith(key + ":")]
+            body.append(new_line)
+            return [lines[0]] + body + lines[close_index:]
+
+    return ["---\n", new_line, "---\n"] + lines
+
+
+def commit_file(md_path, updates):
+    """md を 1 回読み込み、updates [(key, value), ...] をすべて適用して 1 回で書き戻す。"""
+    with open(md_path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    for key, value in updates:
+        lines = set_frontmatter_value(lines, key, value)
+
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+def inject_frontmatter(md_path, key, value):
+    """md の先頭 front matter ブロックへ `key: "value"` を挿入して書き戻す。"""
+    commit_file(md_path, [(key, value)])
+
+
+def write_frontmatter_updates(updates, batch_path=None):
+    """
+    front matter の更新 [(md_path, key, value), ...] を書き込む。
+
+    batch_path が指定された場合は md を書き換えず、batch ファイルへ追記する。
+    """
+    if batch_path is None:
+        # 各 md の更新は独立しているため、ファイル I/O を並行させる。
+        # 1 つの md への更新は 1 件なので、同じ md を同時に書き換えることはない。
+        workers = worker_count(len(updates))
+        if workers <= 1:
+            for md_path, key, value in updates:
+                inject_frontmatter(md_path, key, value)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda update: inject_frontmatter(*update), updates))
+        return
+
+    with open(batch_path, "a", encoding="utf-8") as f:
+        for md_path, key, value in updates:
+            entry = {"path": md_path, "key": key, "value": value}
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def read_batch(batch_path):
+    """
+    batch ファイルを読み込み、md ごとの更新リストを返す。
+
+    @return {md_path: [(key, value), ...]} (md は最初に登録された順、更新は登録順)
+    """
+    updates = {}
+    with open(batch_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            updates.setdefault(entry["path"], []).append((entry["key"], entry["value"]))
+    return updates
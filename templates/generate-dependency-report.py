@@ -6,16 +6,23 @@ generate-dependency-report.py - Doxygen XML から依存関係レポートを生
 
 使用方法:
     python3 generate-dependency-report.py <xml_directory> <output_directory> [category_id]
+    python3 generate-dependency-report.py merge <output_directory> <report_directory>...
+    python3 generate-dependency-report.py diff <old_report_directory> <new_report_directory> <output_directory>
 """
 
 from __future__ import annotations
 
+import contextlib
 import csv
+import functools
+import hashlib
 import html
 import json
 import os
+import posixpath
 import re
 import shutil
+import sqlite3
 import subprocess
 import sys
 import urllib.parse
@@ -24,7 +31,7 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 sys.stdout.reconfigure(encoding="utf-8")
 sys.stderr.reconfigure(encoding="utf-8")
@@ -39,6 +46,12 @@ GRAPH_ASSETS = (
     "cytoscape-cola.js",
     "cytoscape-cola.LICENSE.txt",
 )
+VIEWER_ASSETS = (
+    "dependency-report.css",
+    "dependency-report.js",
+)
+DEFAULT_ASSET_DIR_NAME = "assets"
+ASSET_HASH_LENGTH = 12
 
 
 @dataclass
@@ -54,6 +67,7 @@ class FunctionInfo:
     is_exported: bool
     html_url: str = ""
     source_url: str = ""
+    git_url: str = ""
     brief: str = ""
     callees: Set[str] = field(default_factory=set)
     callers: Set[str] = field(default_factory=set)
@@ -491,9 +505,33 @@ def collect_macros(xml_dir: Path) -> Dict[str, MacroInfo]:
     return macros
 
 
-def warn_macro_reference_cycle(stack: List[str], macro_id: str, macros: Dict[str, MacroInfo]) -> None:
-    cycle_start = stack.index(macro_id) if macro_id in stack else 0
-    cycle_ids = stack[cycle_start:] + [macro_id]
+@dataclass
+class MacroExpansion:
+    targets: Dict[str, Set[str]]
+    max_depth: int = 0
+    cycle_count: int = 0
+
+
+def macro_reference_cycle_path(component: List[str], macro_edges: Dict[str, Set[str]]) -> List[str]:
+    """循環している define の成分から、先頭の define に戻る参照経路を 1 つ返す。"""
+    start = min(component)
+    members = set(component)
+    parents: Dict[str, str] = {}
+    queue = [start]
+    for macro_id in queue:
+        for refid in sorted(macro_edges[macro_id] & members):
+            if refid == start:
+                path = [macro_id]
+                while path[-1] != start:
+                    path.append(parents[path[-1]])
+                return list(reversed(path)) + [start]
+            if refid not in parents:
+                parents[refid] = macro_id
+                queue.append(refid)
+    return [start, start]
+
+
+def warn_macro_reference_cycle(cycle_ids: List[str], macros: Dict[str, MacroInfo]) -> None:
     cycle_names = [macros[mid].name if mid in macros else mid for mid in cycle_ids]
     print(
         "Warning: macro-reference-cycle detected: {}".format(" -> ".join(cycle_names)),
@@ -504,56 +542,60 @@ def warn_macro_reference_cycle(stack: List[str], macro_id: str, macros: Dict[str
 def build_macro_target_map(
     macros: Dict[str, MacroInfo],
     function_ids: Set[str],
-) -> Dict[str, Set[str]]:
-    resolved: Dict[str, Set[str]] = {}
-    warned_cycles: Set[Tuple[str, ...]] = set()
-
-    def resolve(macro_id: str, stack: List[str]) -> Set[str]:
-        cached = resolved.get(macro_id)
-        if cached is not None:
-            return set(cached)
-        if macro_id in stack:
-            cycle_start = stack.index(macro_id)
-            cycle_key = tuple(stack[cycle_start:] + [macro_id])
-            if cycle_key not in warned_cycles:
-                warned_cycles.add(cycle_key)
-                warn_macro_reference_cycle(stack, macro_id, macros)
-            return set()
-
-        macro = macros.get(macro_id)
-        if macro is None:
-            return set()
+) -> MacroExpansion:
+    """define ごとに、initializer の参照をたどって到達する関数の集合を求める。
 
+    define の参照関係を強連結成分へ縮約し、参照先の成分から順に 1 回ずつ解決する。
+    循環している define は同じ成分としてまとめ、成分内のいずれかから到達できる関数を共有する。
+    返す集合は成分内の define で同じオブジェクトを共有するため、呼び出し元で変更しないこと。
+    """
+    macro_edges = {macro_id: {refid for refid in macro.refs if refid in macros} for macro_id, macro in macros.items()}
+    expansion = MacroExpansion(targets={})
+    depths: Dict[str, int] = {}
+
+    # tarjan_scc は参照先の成分を先に返すため、この順で解決すれば参照先は解決済みになる
+    for component in tarjan_scc(sorted(macros), macro_edges):
+        members = set(component)
+        if len(component) > 1 or component[0] in macro_edges[component[0]]:
+            expansion.cycle_count += 1
+            warn_macro_reference_cycle(macro_reference_cycle_path(component, macro_edges), macros)
         targets: Set[str] = set()
-        next_stack = stack + [macro_id]
-        for refid in macro.refs:
-            if refid in function_ids:
-                targets.add(refid)
-            elif refid in macros:
-                targets.update(resolve(refid, next_stack))
-
-        resolved[macro_id] = set(targets)
-        return set(targets)
-
-    for macro_id in macros:
-        resolve(macro_id, [])
-    return resolved
+        depth = 0
+        for macro_id in component:
+            for refid in macros[macro_id].refs:
+                if refid in function_ids:
+                    targets.add(refid)
+                elif refid in macros and refid not in members:
+                    targets.update(expansion.targets[refid])
+                    depth = max(depth, depths[refid])
+        depth += 1
+        for macro_id in component:
+            expansion.targets[macro_id] = targets
+            depths[macro_id] = depth
+        expansion.max_depth = max(expansion.max_depth, depth)
+
+    return expansion
 
 
 def expand_macro_references(raw_functions: Dict[str, FunctionInfo], macros: Dict[str, MacroInfo]) -> None:
     if not macros:
         return
-    macro_targets = build_macro_target_map(macros, set(raw_functions.keys()))
-    if not macro_targets:
-        return
+    expansion = build_macro_target_map(macros, set(raw_functions.keys()))
+    print(
+        "Macro expansion: macros={}, max depth={}, cycles={}".format(
+            len(macros),
+            expansion.max_depth,
+            expansion.cycle_count,
+        )
+    )
 
-    macro_ids = set(macros.keys())
+    macro_targets = expansion.targets
     for info in raw_functions.values():
         expanded = set(info.callees)
         for callee_id in info.callees:
-            if callee_id not in macro_ids:
+            if callee_id not in macro_targets:
                 continue
-            expanded.update(macro_targets.get(callee_id, set()))
+            expanded.update(macro_targets[callee_id])
         info.callees = expanded
 
 
@@ -818,6 +860,8 @@ def collect_functions(xml_dir: Path) -> Dict[str, FunctionInfo]:
 
 
 def tarjan_scc(nodes: Iterable[str], edges: Dict[str, Set[str]]) -> List[List[str]]:
+    # 再帰の代わりに (ノード, 未走査の呼び出し先) の作業スタックでたどる。
+    # 複数カテゴリーを統合した深い呼び出し連鎖でも Python の再帰上限に達しない。
     index = 0
     stack: List[str] = []
     on_stack: Set[str] = set()
@@ -825,7 +869,7 @@ def tarjan_scc(nodes: Iterable[str], edges: Dict[str, Set[str]]) -> List[List[st
     lowlinks: Dict[str, int] = {}
     result: List[List[str]] = []
 
-    def strong_connect(node: str) -> None:
+    def enter(node: str) -> None:
         nonlocal index
         indices[node] = index
         lowlinks[node] = index
@@ -833,26 +877,37 @@ def tarjan_scc(nodes: Iterable[str], edges: Dict[str, Set[str]]) -> List[List[st
         stack.append(node)
         on_stack.add(node)
 
-        for target in edges.get(node, set()):
-            if target not in indices:
-                strong_connect(target)
-                lowlinks[node] = min(lowlinks[node], lowlinks[target])
-            elif target in on_stack:
-                lowlinks[node] = min(lowlinks[node], indices[target])
-
-        if lowlinks[node] == indices[node]:
-            component = []
-            while True:
-                popped = stack.pop()
-                on_stack.remove(popped)
-                component.append(popped)
-                if popped == node:
+    for root in nodes:
+        if root in indices:
+            continue
+        enter(root)
+        work = [(root, iter(edges.get(root, set())))]
+        while work:
+            node, targets = work[-1]
+            descended = False
+            for target in targets:
+                if target not in indices:
+                    enter(target)
+                    work.append((target, iter(edges.get(target, set()))))
+                    descended = True
                     break
-            result.append(component)
-
-    for node in nodes:
-        if node not in indices:
-            strong_connect(node)
+                if target in on_stack:
+                    lowlinks[node] = min(lowlinks[node], indices[target])
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+            if lowlinks[node] == indices[node]:
+                component = []
+                while True:
+                    popped = stack.pop()
+                    on_stack.remove(popped)
+                    component.append(popped)
+                    if popped == node:
+                        break
+                result.append(component)
 
     return result
 
@@ -917,8 +972,15 @@ DEPENDENCY_LEVEL_BASES = {
 }
 
 CYCLE_DEPENDENCY_LEVEL_BASE = 9000
+# データ指紋 (meta.fingerprint) の対象キーと桁数。
+FINGERPRINT_KEYS = ("functions", "edges", "fileEdges", "files", "directories", "sccs")
+FINGERPRINT_LENGTH = 16
+# 推移閉包 (reachability) として出力する要素数の上限。超える場合は出力しない。
+REACHABILITY_MAX_ENTRIES = 500000
 
 
+# ファイル パスの種類は呼び出し関係ごとに何度も判定するため、パス単位で結果を再利用する。
+@functools.lru_cache(maxsize=None)
 def path_area(file_path: str) -> str:
     parts = [part for part in normalize_path(file_path).split("/") if part]
     if "libsrc" in parts:
@@ -932,6 +994,7 @@ def path_area(file_path: str) -> str:
     return "other"
 
 
+@functools.lru_cache(maxsize=None)
 def call_area(file_path: str) -> str:
     area = path_area(file_path)
     if area in {"include", "include_internal"}:
@@ -1054,31 +1117,42 @@ def compute_dependency_depths(
 ) -> Dict[str, Optional[int]]:
     depths: Dict[str, Optional[int]] = {}
     visiting: Set[str] = set()
+    # 走査中ノードごとの呼び出し先の最大深さ。tarjan_scc と同じく作業スタックでたどる。
+    max_depths: Dict[str, int] = {}
 
-    def visit(func_id: str) -> Optional[int]:
-        if func_id in depths:
-            return depths[func_id]
-        if func_id in cycle_map:
-            depths[func_id] = None
-            return None
-        if func_id in visiting:
-            depths[func_id] = None
-            return None
-
-        visiting.add(func_id)
-        max_depth = -1
-        for callee_id in functions[func_id].callees:
-            callee_depth = visit(callee_id)
-            if callee_depth is None:
-                callee_depth = 0
-            max_depth = max(max_depth, callee_depth)
-        visiting.remove(func_id)
-
-        depths[func_id] = max_depth + 1
-        return depths[func_id]
-
-    for func_id in functions:
-        visit(func_id)
+    for root in functions:
+        if root in depths:
+            continue
+        if root in cycle_map:
+            depths[root] = None
+            continue
+        visiting.add(root)
+        max_depths[root] = -1
+        work = [(root, iter(functions[root].callees))]
+        while work:
+            func_id, callees = work[-1]
+            descended = False
+            for callee_id in callees:
+                if callee_id in depths:
+                    callee_depth = depths[callee_id]
+                elif callee_id in cycle_map or callee_id in visiting:
+                    depths[callee_id] = None
+                    callee_depth = None
+                else:
+                    visiting.add(callee_id)
+                    max_depths[callee_id] = -1
+                    work.append((callee_id, iter(functions[callee_id].callees)))
+                    descended = True
+                    break
+                max_depths[func_id] = max(max_depths[func_id], callee_depth if callee_depth is not None else 0)
+            if descended:
+                continue
+            work.pop()
+            visiting.remove(func_id)
+            depths[func_id] = max_depths.pop(func_id) + 1
+            if work:
+                parent_id = work[-1][0]
+                max_depths[parent_id] = max(max_depths[parent_id], int(depths[func_id]))
 
     return depths
 
@@ -1117,11 +1191,125 @@ def compute_dependency_level(
     return base + dependency_depth
 
 
+def offsets_table(rows: List[List[int]]) -> Dict[str, List[int]]:
+    offsets = [0]
+    values: List[int] = []
+    for row in rows:
+        values.extend(row)
+        offsets.append(len(values))
+    return {"offsets": offsets, "values": values}
+
+
+def build_reachability(
+    function_ids: List[str],
+    callees: Dict[str, Set[str]],
+    limit: int = REACHABILITY_MAX_ENTRIES,
+) -> Optional[Dict[str, object]]:
+    """呼び出し関係を強連結成分で縮約し、成分ごとの推移閉包を返す。
+
+    ビューアーは「すべて」の深さ指定で、呼び出し元 / 呼び出し先をこの閉包の参照だけで求める。
+    関数と成分は function_ids の位置 (レポートの functions 配列の添字) で表す。
+    閉包の要素数の合計が limit を超える場合は None を返し、ビューアーは従来の探索に戻る。
+    """
+    position = {func_id: index for index, func_id in enumerate(function_ids)}
+    # tarjan_scc は到達先の成分を先に返すため、成分番号の昇順が呼び出し先側からの処理順になる
+    components = tarjan_scc(function_ids, callees)
+    component_of = [0] * len(function_ids)
+    for component_index, component in enumerate(components):
+        for func_id in component:
+            component_of[position[func_id]] = component_index
+
+    successors: List[Set[int]] = [set() for _ in components]
+    predecessors: List[Set[int]] = [set() for _ in components]
+    for func_id in function_ids:
+        source = component_of[position[func_id]]
+        for callee_id in callees.get(func_id, set()):
+            target = component_of[position[callee_id]]
+            if target != source:
+                successors[source].add(target)
+                predecessors[target].add(source)
+
+    # 到達先は成分番号の整列済みリストで疎に持つ。メモリと処理量は閉包の要素数に比例し、
+    # 要素数が上限を超えた時点で打ち切るため、上限がメモリと処理量の両方を抑える。
+    entry_count = 0
+
+    def close_over(neighbors: List[Set[int]], order: Iterable[int]) -> Optional[List[List[int]]]:
+        nonlocal entry_count
+        closure: List[List[int]] = [[] for _ in components]
+        for component_index in order:
+            reach: Set[int] = set()
+            for neighbor in neighbors[component_index]:
+                reach.add(neighbor)
+                reach.update(closure[neighbor])
+                if entry_count + len(reach) > limit:
+                    return None
+            entry_count += len(reach)
+            closure[component_index] = sorted(reach)
+        return closure
+
+    callee_closure = close_over(successors, range(len(components)))
+    if callee_closure is None:
+        return None
+    caller_closure = close_over(predecessors, reversed(range(len(components))))
+    if caller_closure is None:
+        return None
+
+    return {
+        "component": component_of,
+        "members": offsets_table([sorted(position[func_id] for func_id in component) for component in components]),
+        "callees": offsets_table(callee_closure),
+        "callers": offsets_table(caller_closure),
+    }
+
+
+def build_directory_hierarchy(file_rows: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """ファイル パスのディレクトリ階層を、配下全体の集計値とともに返す。
+
+    ビューアーの全体マップは、ファイル数が多い場合にディレクトリを折りたたんだ 1 ノードとして表示する。
+    """
+    directories: Dict[str, Dict[str, object]] = {}
+    for row in file_rows:
+        parts = str(row["path"]).split("/")[:-1]
+        for depth in range(1, len(parts) + 1):
+            path = "/".join(parts[:depth])
+            directory = directories.get(path)
+            if directory is None:
+                directory = {
+                    "path": path,
+                    "parent": "/".join(parts[: depth - 1]),
+                    "depth": depth,
+                    "fileCount": 0,
+                    "functionCount": 0,
+                    "edgeCount": 0,
+                }
+                directories[path] = directory
+            directory["fileCount"] = int(directory["fileCount"]) + 1
+            directory["functionCount"] = int(directory["functionCount"]) + int(row["functionCount"])
+            directory["edgeCount"] = int(directory["edgeCount"]) + int(row["edgeCount"])
+    return [directories[path] for path in sorted(directories)]
+
+
+def data_fingerprint(data: Dict[str, object]) -> str:
+    """生成時刻などを除いたレポート データの指紋を返す。
+
+    ビューアーは全体マップの配置を、この指紋が一致する間だけ再利用する。
+    json.dumps は C 実装の一括エンコードを使うため、iterencode で断片を流すより速い。
+    """
+    payload = json.dumps(
+        {key: data[key] for key in FINGERPRINT_KEYS if key in data},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:FINGERPRINT_LENGTH]
+
+
 def build_report_data(
     xml_dir: Path,
     output_dir: Path,
     category_id: str,
     source_dir: Optional[Path] = None,
+    reachability_limit: int = REACHABILITY_MAX_ENTRIES,
 ) -> Dict[str, object]:
     all_functions = collect_functions(xml_dir)
 
@@ -1134,10 +1322,12 @@ def build_report_data(
 
     owned_to_external_callees: Dict[str, List[Dict[str, str]]] = {}
     for fid, info in functions.items():
-        ext_names: List[str] = sorted(
-            {all_functions[cid].name for cid in info.callees if cid in external_ids}
-        )
-        owned_to_external_callees[fid] = [{"name": n} for n in ext_names]
+        # 外部関数の宣言位置。統合レポート (merge) で他カテゴリーの関数へ解決するときの手掛かりにする。
+        ext_files: Dict[str, str] = {}
+        for cid in sorted(cid for cid in info.callees if cid in external_ids):
+            phantom = all_functions[cid]
+            ext_files.setdefault(phantom.name, phantom.file)
+        owned_to_external_callees[fid] = [{"name": n, "file": ext_files[n]} for n in sorted(ext_files)]
         for cid in info.callees:
             if cid in external_ids:
                 phantom = all_functions[cid]
@@ -1146,6 +1336,44 @@ def build_report_data(
                     warn_phantom_shadows_internal(info, phantom, internal)
         info.callees = {cid for cid in info.callees if cid not in external_ids}
 
+    file_briefs = collect_file_briefs(xml_dir)
+    file_compound_ids = collect_file_compound_ids(xml_dir)
+    git_url_resolver = GitUrlResolver(source_dir)
+    for info in functions.values():
+        info.git_url = git_url_resolver.url_for(info.file, info.line)
+
+    def file_attributes(file_path: str) -> Dict[str, str]:
+        return {
+            "brief": file_briefs.get(file_path, ""),
+            "htmlUrl": build_file_html_url(file_compound_ids.get(file_path, "")),
+            "sourceUrl": build_file_source_url(file_compound_ids.get(file_path, "")),
+            "gitUrl": git_url_resolver.url_for(file_path),
+        }
+
+    meta: Dict[str, object] = {
+        "categoryId": category_id,
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "xmlDir": normalize_path(str(xml_dir)),
+        "outputDir": normalize_path(str(output_dir)),
+        # 相対ファイル パスの基準。統合レポート (merge) でカテゴリー間の同一ソースを判定する。
+        "sourceDir": normalize_path(str(source_dir.resolve())) if source_dir is not None else "",
+        "source": "doxygen-xml",
+    }
+    return assemble_report_data(functions, owned_to_external_callees, file_attributes, meta, reachability_limit)
+
+
+def assemble_report_data(
+    functions: Dict[str, FunctionInfo],
+    external_callees: Dict[str, List[Dict[str, str]]],
+    file_attributes: Callable[[str], Dict[str, str]],
+    meta: Dict[str, object],
+    reachability_limit: int = REACHABILITY_MAX_ENTRIES,
+) -> Dict[str, object]:
+    """呼び出し関係を確定した関数群から、レポートのデータ全体を組み立てる。
+
+    functions の callees は functions 内の ID だけを含むこと。callers はここで作り直す。
+    file_attributes はファイル パスから brief / htmlUrl / sourceUrl / gitUrl を返す。
+    """
     for info in functions.values():
         info.callers = set()
     for caller_id, info in functions.items():
@@ -1156,9 +1384,6 @@ def build_report_data(
     cycle_map, sccs = detect_cycle_groups(functions)
     cycle_group_sizes = {str(scc["id"]): int(scc["size"]) for scc in sccs}
     depths = compute_dependency_depths(functions, cycle_map)
-    file_briefs = collect_file_briefs(xml_dir)
-    file_compound_ids = collect_file_compound_ids(xml_dir)
-    git_url_resolver = GitUrlResolver(source_dir)
 
     function_rows: List[Dict[str, object]] = []
     edges: List[Dict[str, object]] = []
@@ -1207,10 +1432,10 @@ def build_report_data(
             "cycleGroupSize": cycle_group_size,
             "htmlUrl": info.html_url,
             "sourceUrl": info.source_url,
-            "gitUrl": git_url_resolver.url_for(info.file, info.line),
+            "gitUrl": info.git_url,
             "brief": info.brief,
-            "externalCallees": owned_to_external_callees.get(func_id, []),
-            "externalCalleeCount": len(owned_to_external_callees.get(func_id, [])),
+            "externalCallees": external_callees.get(func_id, []),
+            "externalCalleeCount": len(external_callees.get(func_id, [])),
         }
         function_rows.append(row)
         file_groups[info.file].append(row)
@@ -1241,6 +1466,11 @@ def build_report_data(
         )
     )
     edges.sort(key=lambda row: (row["callerFile"], row["caller"], row["callee"]))
+    reachability = build_reachability(
+        [str(row["id"]) for row in function_rows],
+        {func_id: info.callees for func_id, info in functions.items()},
+        reachability_limit,
+    )
 
     file_edge_map: Dict[Tuple[str, str], Dict[str, object]] = {}
     for edge in edges:
@@ -1276,6 +1506,7 @@ def build_report_data(
             area_counts[str(row["sourceArea"])] += 1
         if area_counts:
             dominant_area = max(sorted(area_counts), key=lambda key: (area_counts[key], key))
+        attributes = file_attributes(file_path)
         file_rows.append(
             {
                 "path": file_path,
@@ -1287,10 +1518,10 @@ def build_report_data(
                 "levels": dict(sorted(level_counts.items())),
                 "classes": dict(sorted(class_counts.items())),
                 "areas": dict(sorted(area_counts.items())),
-                "brief": file_briefs.get(file_path, ""),
-                "htmlUrl": build_file_html_url(file_compound_ids.get(file_path, "")),
-                "sourceUrl": build_file_source_url(file_compound_ids.get(file_path, "")),
-                "gitUrl": git_url_resolver.url_for(file_path),
+                "brief": attributes.get("brief", ""),
+                "htmlUrl": attributes.get("htmlUrl", ""),
+                "sourceUrl": attributes.get("sourceUrl", ""),
+                "gitUrl": attributes.get("gitUrl", ""),
             }
         )
 
@@ -1304,43 +1535,485 @@ def build_report_data(
         "leafCount": sum(1 for row in function_rows if row["inScopeCalleeCount"] == 0),
     }
 
-    return {
-        "meta": {
-            "categoryId": category_id,
-            "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-            "xmlDir": normalize_path(str(xml_dir)),
-            "outputDir": normalize_path(str(output_dir)),
-            "source": "doxygen-xml",
-        },
+    data: Dict[str, object] = {
+        "meta": meta,
         "summary": summary,
         "functions": function_rows,
         "edges": edges,
         "fileEdges": file_edges,
         "files": file_rows,
+        "directories": build_directory_hierarchy(file_rows),
         "sccs": sccs,
+        "reachability": reachability,
+    }
+    meta["fingerprint"] = data_fingerprint(data)
+    return data
+
+
+MERGED_CATEGORY_ID = "merged"
+
+
+def load_report_data(report_dir: Path) -> Dict[str, object]:
+    """出力済みレポートのデータを読み込む。dependency-data.json がなければ .js から読む。"""
+    json_path = report_dir / "dependency-data.json"
+    if json_path.is_file():
+        with json_path.open(encoding="utf-8") as f:
+            return json.load(f)
+    text = (report_dir / "dependency-data.js").read_text(encoding="utf-8")
+    if not text.startswith(DATA_JS_PREFIX):
+        raise ValueError(f"unexpected dependency data format: {report_dir / 'dependency-data.js'}")
+    return json.loads(text[len(DATA_JS_PREFIX):].rstrip().rstrip(";"))
+
+
+def rebase_report_url(url: str, report_dir: Path, output_dir: Path) -> str:
+    """レポート相対の URL を統合レポートの出力先からの相対 URL に付け替える。"""
+    if not url or urllib.parse.urlsplit(url).scheme or url.startswith(("/", "#")):
+        return url
+    path, sep, fragment = url.partition("#")
+    rebased = os.path.relpath(os.path.normpath(os.path.join(os.path.abspath(report_dir), path)), os.path.abspath(output_dir))
+    return Path(rebased).as_posix() + sep + fragment
+
+
+def choose_external_target(
+    caller: FunctionInfo,
+    entry: Dict[str, str],
+    candidates: List[FunctionInfo],
+) -> Optional[FunctionInfo]:
+    """外部呼び出し先の名前と宣言ファイルから、統合後の関数を 1 つに絞り込む。
+
+    同名の候補が複数ある場合は宣言ファイル (同じパスまたは同じ拡張子抜きのファイル名) で絞り、
+    それでも複数なら公開関数を優先する。1 つに決まらなければ外部呼び出し先のまま残す。
+    """
+    candidates = [candidate for candidate in candidates if candidate.id != caller.id]
+    declared_file = normalize_path(entry.get("file", ""))
+    if len(candidates) > 1 and declared_file:
+        declared_stem = os.path.splitext(declared_file.rsplit("/", 1)[-1])[0]
+        narrowed = [
+            candidate
+            for candidate in candidates
+            if candidate.file.endswith("/" + declared_file)
+            or os.path.splitext(candidate.file.rsplit("/", 1)[-1])[0] == declared_stem
+        ]
+        if narrowed:
+            candidates = narrowed
+    if len(candidates) > 1:
+        exported = [candidate for candidate in candidates if candidate.is_exported]
+        if exported:
+            candidates = exported
+    if len(candidates) == 1:
+        return candidates[0]
+    if candidates:
+        print(
+            "Warning: ambiguous external callee: {} called from {} ({}) matches {}".format(
+                entry.get("name", ""),
+                caller.name,
+                caller.file,
+                ", ".join(sorted(candidate.file for candidate in candidates)),
+            ),
+            file=sys.stderr,
+        )
+    return None
+
+
+def resolve_external_callees(
+    functions: Dict[str, FunctionInfo],
+    external_callees: Dict[str, List[Dict[str, str]]],
+) -> int:
+    """外部呼び出し先を、統合した他カテゴリーの関数への呼び出し関係に置き換える。
+
+    static 関数は翻訳単位の外から呼べないため候補にしない。解決した件数を返す。
+    """
+    by_name: Dict[str, List[FunctionInfo]] = defaultdict(list)
+    for info in functions.values():
+        if not info.is_static:
+            by_name[info.name].append(info)
+    resolved = 0
+    for func_id, entries in external_callees.items():
+        caller = functions[func_id]
+        remaining = []
+        for entry in entries:
+            target = choose_external_target(caller, entry, by_name.get(entry.get("name", ""), []))
+            if target is None:
+                remaining.append(entry)
+                continue
+            caller.callees.add(target.id)
+            resolved += 1
+        external_callees[func_id] = remaining
+    return resolved
+
+
+def source_identity(source_dir: str, file_path: str) -> Optional[str]:
+    """レポート内のファイル パスから、カテゴリーに依らないソースの所在 (絶対パス) を返す。
+
+    絶対パスはそのまま、相対パスはレポートの sourceDir を基準に解決する。
+    基準が無く所在を決められない場合は None を返す。
+    """
+    path = normalize_path(file_path)
+    if not posixpath.isabs(path) and not re.match(r"[A-Za-z]:/", path):
+        if not source_dir:
+            return None
+        path = f"{normalize_path(source_dir).rstrip('/')}/{path}"
+    return posixpath.normpath(path)
+
+
+def merge_report_data(
+    report_dirs: List[Path],
+    output_dir: Path,
+    reachability_limit: int = REACHABILITY_MAX_ENTRIES,
+) -> Dict[str, object]:
+    """出力済みの複数レポートを 1 つの呼び出しグラフに統合する。
+
+    ファイル パスには先頭にカテゴリー ID を付けてカテゴリー間で区別する。
+    ただし、ソースの所在 (source_identity) と名前、行が同じ関数を含むファイルは、
+    小分類どうしなど同じソースを共有するものとみなし、先に読み込んだカテゴリーの関数と
+    ファイルにまとめる。所在を決められないファイルはまとめない。
+    同じカテゴリー ID の別ソースのレポートは、ファイル パスの先頭を "<カテゴリー ID>:2" 等にする。
+    関数 ID が他カテゴリーの別関数と重なる場合は "<カテゴリー ID>:" を前置し、
+    それでも重なる場合は ":2"、":3"、... を付ける。
+    """
+    functions: Dict[str, FunctionInfo] = {}
+    external_callees: Dict[str, List[Dict[str, str]]] = {}
+    merged_files: Dict[str, Dict[str, str]] = {}
+    key_to_id: Dict[Tuple[str, str, Optional[int]], str] = {}
+    categories: List[str] = []
+    # ファイル パスの先頭に付けた名前ごとの sourceDir。所在が異なるレポートとは共有しない。
+    prefix_sources: Dict[str, str] = {}
+
+    for report_dir in report_dirs:
+        report = load_report_data(report_dir)
+        report_meta = report.get("meta", {})
+        category = str(report_meta.get("categoryId") or report_dir.resolve().parent.name)
+        categories.append(category)
+        source_dir = str(report_meta.get("sourceDir") or "")
+        prefix = category
+        suffix = 2
+        while prefix in prefix_sources and (not source_dir or prefix_sources[prefix] != source_dir):
+            prefix = f"{category}:{suffix}"
+            suffix += 1
+        prefix_sources[prefix] = source_dir
+
+        def function_key(row: Dict[str, object]) -> Optional[Tuple[str, str, Optional[int]]]:
+            identity = source_identity(source_dir, str(row["file"]))
+            if identity is None:
+                return None
+            return (identity, str(row["name"]), row["line"])
+
+        # 既存の関数と同じソースの関数を含むファイルは、既存のファイルへまとめる。
+        file_map: Dict[str, str] = {}
+        for row in report["functions"]:
+            key = function_key(row)
+            existing_id = key_to_id.get(key) if key is not None else None
+            if existing_id is not None:
+                file_map.setdefault(str(row["file"]), functions[existing_id].file)
+        for row in report["files"]:
+            merged_path = file_map.setdefault(str(row["path"]), f"{prefix}/{row['path']}")
+            if merged_path not in merged_files:
+                merged_files[merged_path] = {
+                    "brief": row.get("brief", ""),
+                    "htmlUrl": rebase_report_url(row.get("htmlUrl", ""), report_dir, output_dir),
+                    "sourceUrl": rebase_report_url(row.get("sourceUrl", ""), report_dir, output_dir),
+                    "gitUrl": row.get("gitUrl", ""),
+                }
+
+        local_ids: Dict[str, str] = {}
+        for row in report["functions"]:
+            key = function_key(row)
+            merged_id = key_to_id.get(key) if key is not None else None
+            if merged_id is None:
+                merged_id = str(row["id"])
+                if merged_id in functions:
+                    prefixed_id = f"{category}:{merged_id}"
+                    merged_id = prefixed_id
+                    suffix = 2
+                    while merged_id in functions:
+                        merged_id = f"{prefixed_id}:{suffix}"
+                        suffix += 1
+                merged_path = file_map[str(row["file"])]
+                functions[merged_id] = FunctionInfo(
+                    id=merged_id,
+                    name=row["name"],
+                    file=merged_path,
+                    line=row["line"],
+                    body_file=merged_path,
+                    body_line=row["line"],
+                    compound_id="",
+                    is_static=bool(row["isStatic"]),
+                    is_exported=bool(row["isExported"]),
+                    html_url=rebase_report_url(row.get("htmlUrl", ""), report_dir, output_dir),
+                    source_url=rebase_report_url(row.get("sourceUrl", ""), report_dir, output_dir),
+                    git_url=row.get("gitUrl", ""),
+                    brief=row.get("brief", ""),
+                )
+                if key is not None:
+                    key_to_id[key] = merged_id
+                external_callees[merged_id] = []
+            known = {entry["name"] for entry in external_callees[merged_id]}
+            external_callees[merged_id].extend(
+                entry for entry in row.get("externalCallees", []) if entry["name"] not in known
+            )
+            local_ids[str(row["id"])] = merged_id
+        for edge in report["edges"]:
+            functions[local_ids[str(edge["caller"])]].callees.add(local_ids[str(edge["callee"])])
+
+    resolved = resolve_external_callees(functions, external_callees)
+    for entries in external_callees.values():
+        entries.sort(key=lambda entry: entry["name"])
+
+    meta: Dict[str, object] = {
+        "categoryId": MERGED_CATEGORY_ID,
+        "categories": categories,
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "outputDir": normalize_path(str(output_dir)),
+        "source": "merged-reports",
+        "resolvedExternalCallCount": resolved,
     }
+    return assemble_report_data(
+        functions,
+        external_callees,
+        lambda file_path: merged_files.get(file_path, {}),
+        meta,
+        reachability_limit,
+    )
+
+
+DIFF_JSON_FILE_NAME = "dependency-diff.json"
+DIFF_HTML_FILE_NAME = "dependency-diff.html"
+# 差分 HTML の表ごとの最大行数。超えた分は JSON だけに出力する。
+DIFF_HTML_MAX_ROWS = 2000
 
 
-def write_data_js(output_dir: Path, data: Dict[str, object]) -> None:
-    text = json.dumps(data, ensure_ascii=False, indent=2)
-    (output_dir / "dependency-data.js").write_text(
-        "window.DoxyfwDependencyData = " + text + ";\n",
-        encoding="utf-8",
+def report_function_keys(report: Dict[str, object]) -> Dict[str, str]:
+    """関数 ID から、ビルド間で関数を対応付けるキー (ファイル + 名前) への対応を返す。
+
+    dedupe_key と同じくファイルと名前で関数を識別するが、行番号はビルド間で変わるため使わない。
+    同じファイルに同名の関数が複数ある場合は、行順の連番 (#2, #3, ...) を付けて区別する。
+    """
+    groups: Dict[Tuple[str, str], List[Dict[str, object]]] = defaultdict(list)
+    for row in report["functions"]:
+        groups[(str(row["file"]), str(row["name"]))].append(row)
+    keys: Dict[str, str] = {}
+    for (file_path, name), rows in groups.items():
+        rows.sort(key=lambda row: (row["line"] is None, row["line"] or 0, str(row["id"])))
+        for ordinal, row in enumerate(rows, start=1):
+            keys[str(row["id"])] = f"{file_path}::{name}" + (f"#{ordinal}" if ordinal > 1 else "")
+    return keys
+
+
+def diff_report_data(old: Dict[str, object], new: Dict[str, object]) -> Dict[str, object]:
+    """2 つのレポートの構造差分を返す。
+
+    関数はファイル + 名前のキーで対応付け、呼び出し関係と循環グループはキーの集合どうしの
+    差集合で比較する。関数の組み合わせを総当たりで比べないため、件数に比例した時間で終わる。
+    """
+    old_keys = report_function_keys(old)
+    new_keys = report_function_keys(new)
+    old_rows = {old_keys[str(row["id"])]: row for row in old["functions"]}
+    new_rows = {new_keys[str(row["id"])]: row for row in new["functions"]}
+
+    def edge_set(report: Dict[str, object], keys: Dict[str, str]) -> Set[Tuple[str, str]]:
+        return {(keys[str(edge["caller"])], keys[str(edge["callee"])]) for edge in report["edges"]}
+
+    def scc_set(report: Dict[str, object], keys: Dict[str, str]) -> Set[frozenset]:
+        return {frozenset(keys[str(func_id)] for func_id in scc["functions"]) for scc in report["sccs"]}
+
+    def function_ref(key: str, row: Dict[str, object]) -> Dict[str, object]:
+        return {"key": key, "name": row["name"], "file": row["file"], "line": row["line"]}
+
+    old_edges = edge_set(old, old_keys)
+    new_edges = edge_set(new, new_keys)
+    added_edges = sorted(new_edges - old_edges)
+    removed_edges = sorted(old_edges - new_edges)
+
+    caller_changes: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: {"addedCallers": [], "removedCallers": []})
+    for caller, callee in added_edges:
+        caller_changes[callee]["addedCallers"].append(caller)
+    for caller, callee in removed_edges:
+        caller_changes[callee]["removedCallers"].append(caller)
+
+    old_sccs = scc_set(old, old_keys)
+    new_sccs = scc_set(new, new_keys)
+
+    level_changes = []
+    for key in sorted(old_rows.keys() & new_rows.keys()):
+        old_row = old_rows[key]
+        new_row = new_rows[key]
+        if old_row["dependencyLevel"] == new_row["dependencyLevel"] and old_row["dependencyClass"] == new_row["dependencyClass"]:
+            continue
+        level_changes.append(
+            {
+                **function_ref(key, new_row),
+                "oldLevel": old_row["dependencyLevel"],
+                "newLevel": new_row["dependencyLevel"],
+                "oldClass": old_row["dependencyClass"],
+                "newClass": new_row["dependencyClass"],
+            }
+        )
+
+    result: Dict[str, object] = {
+        "meta": {
+            "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "old": {key: old.get("meta", {}).get(key) for key in ("categoryId", "generatedAt", "fingerprint")},
+            "new": {key: new.get("meta", {}).get(key) for key in ("categoryId", "generatedAt", "fingerprint")},
+        },
+        "addedFunctions": [function_ref(key, new_rows[key]) for key in sorted(new_rows.keys() - old_rows.keys())],
+        "removedFunctions": [function_ref(key, old_rows[key]) for key in sorted(old_rows.keys() - new_rows.keys())],
+        "addedEdges": [{"caller": caller, "callee": callee} for caller, callee in added_edges],
+        "removedEdges": [{"caller": caller, "callee": callee} for caller, callee in removed_edges],
+        "callerChanges": [{"function": key, **caller_changes[key]} for key in sorted(caller_changes)],
+        "newSccs": sorted((sorted(members) for members in new_sccs - old_sccs), key=lambda members: (-len(members), members)),
+        "resolvedSccs": sorted((sorted(members) for members in old_sccs - new_sccs), key=lambda members: (-len(members), members)),
+        "levelChanges": level_changes,
+    }
+    result["summary"] = {
+        name + "Count": len(result[name])
+        for name in (
+            "addedFunctions",
+            "removedFunctions",
+            "addedEdges",
+            "removedEdges",
+            "callerChanges",
+            "newSccs",
+            "resolvedSccs",
+            "levelChanges",
+        )
+    }
+    return result
+
+
+def write_diff_html(output_dir: Path, diff: Dict[str, object]) -> None:
+    """差分を静的な表として HTML に書き出す。"""
+    meta = diff["meta"]
+    sections: List[str] = []
+
+    def table(title: str, headers: List[str], rows: List[List[object]]) -> None:
+        parts = [f"<section><h2>{html.escape(title)} ({len(rows)})</h2>"]
+        if not rows:
+            parts.append("<p>変更はありません。</p></section>")
+            sections.append("".join(parts))
+            return
+        parts.append("<table><thead><tr>")
+        parts.extend(f"<th>{html.escape(header)}</th>" for header in headers)
+        parts.append("</tr></thead><tbody>")
+        for row in rows[:DIFF_HTML_MAX_ROWS]:
+            parts.append("<tr>" + "".join(f"<td>{html.escape('' if value is None else str(value))}</td>" for value in row) + "</tr>")
+        parts.append("</tbody></table>")
+        if len(rows) > DIFF_HTML_MAX_ROWS:
+            parts.append(f"<p>先頭 {DIFF_HTML_MAX_ROWS} 件を表示しています。すべての変更は {DIFF_JSON_FILE_NAME} を参照してください。</p>")
+        parts.append("</section>")
+        sections.append("".join(parts))
+
+    table("追加された関数", ["関数", "ファイル", "行"], [[row["name"], row["file"], row["line"]] for row in diff["addedFunctions"]])
+    table("削除された関数", ["関数", "ファイル", "行"], [[row["name"], row["file"], row["line"]] for row in diff["removedFunctions"]])
+    table(
+        "level の変化",
+        ["関数", "ファイル", "変更前 level", "変更後 level", "変更前の分類", "変更後の分類"],
+        [[row["name"], row["file"], row["oldLevel"], row["newLevel"], row["oldClass"], row["newClass"]] for row in diff["levelChanges"]],
+    )
+    table("新しい循環グループ", ["関数数", "関数"], [[len(members), ", ".join(members)] for members in diff["newSccs"]])
+    table("解消した循環グループ", ["関数数", "関数"], [[len(members), ", ".join(members)] for members in diff["resolvedSccs"]])
+    table(
+        "呼び出し元の増減",
+        ["関数", "追加された呼び出し元", "削除された呼び出し元"],
+        [[row["function"], ", ".join(row["addedCallers"]), ", ".join(row["removedCallers"])] for row in diff["callerChanges"]],
     )
+    table("追加された呼び出し関係", ["呼び出し元", "呼び出し先"], [[row["caller"], row["callee"]] for row in diff["addedEdges"]])
+    table("削除された呼び出し関係", ["呼び出し元", "呼び出し先"], [[row["caller"], row["callee"]] for row in diff["removedEdges"]])
 
+    def label(side: Dict[str, object]) -> str:
+        return html.escape("{} ({})".format(side.get("categoryId") or "doxygen", side.get("generatedAt") or ""))
+
+    text = f"""<!doctype html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<title>依存関係の差分</title>
+<style>
+body {{ font-family: sans-serif; margin: 1.5rem; }}
+table {{ border-collapse: collapse; margin-bottom: 0.5rem; }}
+th, td {{ border: 1px solid #ccc; padding: 0.25rem 0.5rem; text-align: left; vertical-align: top; }}
+th {{ background: #f3f3f3; }}
+</style>
+</head>
+<body>
+<h1>依存関係の差分</h1>
+<p>変更前: {label(meta["old"])}<br>変更後: {label(meta["new"])}</p>
+{"".join(sections)}
+</body>
+</html>
+"""
+    (output_dir / DIFF_HTML_FILE_NAME).write_text(text, encoding="utf-8")
+
+
+def diff_reports(old_report_dir: Path, new_report_dir: Path, output_dir: Path) -> Dict[str, object]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    diff = diff_report_data(load_report_data(old_report_dir), load_report_data(new_report_dir))
+    (output_dir / DIFF_JSON_FILE_NAME).write_text(json.dumps(diff, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    write_diff_html(output_dir, diff)
+    return diff
 
-def write_data_json(output_dir: Path, data: Dict[str, object]) -> None:
-    text = json.dumps(data, ensure_ascii=False, indent=2)
-    (output_dir / "dependency-data.json").write_text(text + "\n", encoding="utf-8")
 
+DATA_JS_PREFIX = "window.DoxyfwDependencyData = "
+# 書き込み前にためる JSON 断片の数。iterencode の断片は数バイト単位と細かいため、
+# ある程度まとめてから書き出して write 呼び出しを減らす。
+STREAM_CHUNK_COUNT = 4096
+# DEPENDENCY_SKIP_VARIANTS で省略できる派生出力。
+# 省略したファイルは、ビューアーのダウンロード時にメモリー上のデータから生成し直す。
+SKIPPABLE_VARIANTS = ("bom", "json")
+
+
+def write_data_files(output_dir: Path, data: Dict[str, object], include_json: bool = True) -> None:
+    """dependency-data.js と dependency-data.json を 1 回の符号化で書き出す。
+
+    JSON 全体を文字列として組み立てず、iterencode の断片を両方のファイルへ順次書き込む。
+    """
+    js_path = output_dir / "dependency-data.js"
+    json_path = output_dir / "dependency-data.json"
+    with contextlib.ExitStack() as stack:
+        js_file = stack.enter_context(js_path.open("w", encoding="utf-8"))
+        sinks = [js_file]
+        json_file = None
+        if include_json:
+            json_file = stack.enter_context(json_path.open("w", encoding="utf-8"))
+            sinks.append(json_file)
+        js_file.write(DATA_JS_PREFIX)
+        pending: List[str] = []
+        for chunk in json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(data):
+            pending.append(chunk)
+            if len(pending) >= STREAM_CHUNK_COUNT:
+                text = "".join(pending)
+                pending.clear()
+                for sink in sinks:
+                    sink.write(text)
+        text = "".join(pending)
+        for sink in sinks:
+            sink.write(text)
+        js_file.write(";\n")
+        if json_file is not None:
+            json_file.write("\n")
+    if not include_json and json_path.exists():
+        json_path.unlink()
+
+
+def write_csv(output_dir: Path, data: Dict[str, object], include_bom: bool = True) -> None:
+    """関数一覧とファイル一覧の CSV を書き出す。
+
+    BOM なしと BOM ありの両方を出力する場合も、行の整形は 1 回だけ行い同じ値を各ファイルへ書き込む。
+    """
 
-def write_csv(output_dir: Path, data: Dict[str, object]) -> None:
-    def write_dict_csv(file_name: str, encoding: str, fieldnames: List[str], rows: Iterable[Dict[str, object]]) -> None:
-        with (output_dir / file_name).open("w", encoding=encoding, newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in rows:
-                writer.writerow({field: row.get(field, "") for field in fieldnames})
+    def write_rows_csv(base_name: str, fieldnames: List[str], rows: Iterable[List[object]]) -> None:
+        bom_path = output_dir / (base_name + "-utf8-bom.csv")
+        with contextlib.ExitStack() as stack:
+            outputs = [stack.enter_context((output_dir / (base_name + ".csv")).open("w", encoding="utf-8", newline=""))]
+            if include_bom:
+                outputs.append(stack.enter_context(bom_path.open("w", encoding="utf-8-sig", newline="")))
+            writers = [csv.writer(f) for f in outputs]
+            for writer in writers:
+                writer.writerow(fieldnames)
+            for values in rows:
+                for writer in writers:
+                    writer.writerow(values)
+        if not include_bom and bom_path.exists():
+            bom_path.unlink()
 
     function_fields = [
         "dependencyLevel",
@@ -1367,8 +2040,11 @@ def write_csv(output_dir: Path, data: Dict[str, object]) -> None:
         "gitUrl",
         "brief",
     ]
-    write_dict_csv("dependency-functions.csv", "utf-8", function_fields, data["functions"])
-    write_dict_csv("dependency-functions-utf8-bom.csv", "utf-8-sig", function_fields, data["functions"])
+    write_rows_csv(
+        "dependency-functions",
+        function_fields,
+        ([row.get(field, "") for field in function_fields] for row in data["functions"]),
+    )
 
     file_fields = [
         "path",
@@ -1385,27 +2061,238 @@ def write_csv(output_dir: Path, data: Dict[str, object]) -> None:
         "sourceUrl",
         "gitUrl",
     ]
-    file_rows = []
-    for row in data["files"]:
-        file_rows.append(
-            {
-                "path": row["path"],
-                "functionCount": row["functionCount"],
-                "exportCount": row["exportCount"],
-                "staticCount": row["staticCount"],
-                "edgeCount": row["edgeCount"],
-                "dominantArea": row["dominantArea"],
-                "levels": json.dumps(row["levels"], ensure_ascii=False, sort_keys=True),
-                "classes": json.dumps(row["classes"], ensure_ascii=False, sort_keys=True),
-                "areas": json.dumps(row["areas"], ensure_ascii=False, sort_keys=True),
-                "brief": row.get("brief", ""),
-                "htmlUrl": row.get("htmlUrl", ""),
-                "sourceUrl": row.get("sourceUrl", ""),
-                "gitUrl": row.get("gitUrl", ""),
-            }
+    write_rows_csv(
+        "dependency-files",
+        file_fields,
+        (
+            [
+                row["path"],
+                row["functionCount"],
+                row["exportCount"],
+                row["staticCount"],
+                row["edgeCount"],
+                row["dominantArea"],
+                json.dumps(row["levels"], ensure_ascii=False, sort_keys=True),
+                json.dumps(row["classes"], ensure_ascii=False, sort_keys=True),
+                json.dumps(row["areas"], ensure_ascii=False, sort_keys=True),
+                row.get("brief", ""),
+                row.get("htmlUrl", ""),
+                row.get("sourceUrl", ""),
+                row.get("gitUrl", ""),
+            ]
+            for row in data["files"]
+        ),
+    )
+
+
+SQLITE_FILE_NAME = "dependency.sqlite"
+
+SQLITE_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE functions (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    file TEXT NOT NULL,
+    line INTEGER,
+    is_static INTEGER NOT NULL,
+    is_exported INTEGER NOT NULL,
+    dependency_level INTEGER,
+    dependency_rank INTEGER,
+    dependency_depth INTEGER,
+    dependency_class TEXT,
+    source_area TEXT,
+    max_callee_area TEXT,
+    dominant_call_kind TEXT,
+    in_scope_callee_count INTEGER,
+    in_scope_caller_count INTEGER,
+    same_file_callee_count INTEGER,
+    cross_file_callee_count INTEGER,
+    scc_id TEXT,
+    cycle_group_size INTEGER,
+    html_url TEXT,
+    source_url TEXT,
+    git_url TEXT,
+    brief TEXT
+);
+CREATE INDEX functions_file ON functions (file);
+CREATE INDEX functions_name ON functions (name);
+CREATE INDEX functions_scc_id ON functions (scc_id);
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    function_count INTEGER,
+    export_count INTEGER,
+    static_count INTEGER,
+    edge_count INTEGER,
+    dominant_area TEXT,
+    levels TEXT,
+    classes TEXT,
+    areas TEXT,
+    brief TEXT,
+    html_url TEXT,
+    source_url TEXT,
+    git_url TEXT
+);
+CREATE TABLE edges (
+    caller TEXT NOT NULL,
+    callee TEXT NOT NULL,
+    same_file INTEGER NOT NULL,
+    call_kind TEXT,
+    caller_area TEXT,
+    callee_area TEXT,
+    caller_file TEXT NOT NULL,
+    callee_file TEXT NOT NULL,
+    PRIMARY KEY (caller, callee)
+);
+CREATE INDEX edges_callee ON edges (callee);
+CREATE INDEX edges_caller_file ON edges (caller_file);
+CREATE INDEX edges_callee_file ON edges (callee_file);
+CREATE TABLE file_edges (
+    from_file TEXT NOT NULL,
+    to_file TEXT NOT NULL,
+    weight INTEGER NOT NULL,
+    PRIMARY KEY (from_file, to_file)
+);
+CREATE INDEX file_edges_to_file ON file_edges (to_file);
+CREATE TABLE sccs (
+    id TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+CREATE TABLE scc_functions (
+    scc_id TEXT NOT NULL,
+    function_id TEXT NOT NULL,
+    PRIMARY KEY (scc_id, function_id)
+);
+CREATE INDEX scc_functions_function_id ON scc_functions (function_id);
+CREATE TABLE external_callees (
+    function_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (function_id, name)
+);
+CREATE INDEX external_callees_name ON external_callees (name);
+"""
+
+
+def write_sqlite(output_dir: Path, data: Dict[str, object]) -> Path:
+    """レポート データを正規化したテーブルとして dependency.sqlite へ書き出す。
+
+    呼び出し元、呼び出し先、ファイルの各列に索引を張り、JSON を読み込まずに SQL で
+    問い合わせられるようにする。category ごとのデータベースは ATTACH で結合できる。
+    """
+    target = output_dir / SQLITE_FILE_NAME
+    temp_path = output_dir / (SQLITE_FILE_NAME + ".tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+    connection = sqlite3.connect(str(temp_path))
+    committed = False
+    try:
+        connection.executescript(SQLITE_SCHEMA)
+        meta = data.get("meta", {})
+        connection.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [(str(key), str(value)) for key, value in sorted(meta.items())],
+        )
+        connection.executemany(
+            "INSERT INTO functions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    row["id"],
+                    row["name"],
+                    row["file"],
+                    row["line"],
+                    int(bool(row["isStatic"])),
+                    int(bool(row["isExported"])),
+                    row["dependencyLevel"],
+                    row["dependencyRank"],
+                    row["dependencyDepth"],
+                    row["dependencyClass"],
+                    row["sourceArea"],
+                    row["maxCalleeArea"],
+                    row["dominantCallKind"],
+                    row["inScopeCalleeCount"],
+                    row["inScopeCallerCount"],
+                    row["sameFileCalleeCount"],
+                    row["crossFileCalleeCount"],
+                    row["sccId"],
+                    row["cycleGroupSize"],
+                    row.get("htmlUrl", ""),
+                    row.get("sourceUrl", ""),
+                    row.get("gitUrl", ""),
+                    row.get("brief", ""),
+                )
+                for row in data["functions"]
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    row["path"],
+                    row["functionCount"],
+                    row["exportCount"],
+                    row["staticCount"],
+                    row["edgeCount"],
+                    row["dominantArea"],
+                    json.dumps(row["levels"], ensure_ascii=False, sort_keys=True),
+                    json.dumps(row["classes"], ensure_ascii=False, sort_keys=True),
+                    json.dumps(row["areas"], ensure_ascii=False, sort_keys=True),
+                    row.get("brief", ""),
+                    row.get("htmlUrl", ""),
+                    row.get("sourceUrl", ""),
+                    row.get("gitUrl", ""),
+                )
+                for row in data["files"]
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO edges VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    edge["caller"],
+                    edge["callee"],
+                    int(bool(edge["sameFile"])),
+                    edge["callKind"],
+                    edge["callerArea"],
+                    edge["calleeArea"],
+                    edge["callerFile"],
+                    edge["calleeFile"],
+                )
+                for edge in data["edges"]
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO file_edges VALUES (?, ?, ?)",
+            ((edge["fromFile"], edge["toFile"], edge["weight"]) for edge in data["fileEdges"]),
+        )
+        connection.executemany(
+            "INSERT INTO sccs VALUES (?, ?)",
+            ((scc["id"], scc["size"]) for scc in data["sccs"]),
+        )
+        connection.executemany(
+            "INSERT INTO scc_functions VALUES (?, ?)",
+            ((scc["id"], func_id) for scc in data["sccs"] for func_id in scc["functions"]),
         )
-    write_dict_csv("dependency-files.csv", "utf-8", file_fields, file_rows)
-    write_dict_csv("dependency-files-utf8-bom.csv", "utf-8-sig", file_fields, file_rows)
+        connection.executemany(
+            "INSERT OR IGNORE INTO external_callees VALUES (?, ?, ?)",
+            (
+                (row["id"], callee["name"], callee.get("file", ""))
+                for row in data["functions"]
+                for callee in row.get("externalCallees", [])
+            ),
+        )
+        connection.commit()
+        committed = True
+    finally:
+        connection.close()
+        # 書き出しに失敗した一時ファイルは残さず、コミットを終えたものだけを配置する
+        if not committed:
+            with contextlib.suppress(OSError):
+                temp_path.unlink()
+    os.replace(temp_path, target)
+    return target
 
 
 def collect_git_info(source_dir: Optional[Path]) -> str:
@@ -1441,12 +2328,35 @@ def collect_git_info(source_dir: Optional[Path]) -> str:
     return f"{branch} ({short_hash}{dirty})"
 
 
-def write_html(output_dir: Path, category_id: str, git_info: str = "") -> None:
+def write_html(
+    output_dir: Path,
+    category_id: str,
+    git_info: str = "",
+    asset_urls: Optional[Dict[str, str]] = None,
+) -> None:
+    """ビューアーの HTML を書き出す。
+
+    CSS、JavaScript、グラフ描画ライブラリは asset_urls (論理名 → URL) が指す
+    外部ファイルとして参照し、index.html にはページ構造とカテゴリ名だけを置く。
+    asset_urls を省略した場合は、出力ディレクトリ直下の論理名をそのまま参照する。
+    """
+    asset_urls = asset_urls or {name: name for name in VIEWER_ASSETS + GRAPH_ASSETS}
     title = "依存関係レポート"
     escaped_category = html.escape(category_id or "doxygen")
     if git_info:
         escaped_category += " " + html.escape(git_info)
     js_category = json.dumps(category_id or "doxygen", ensure_ascii=False)
+    style_url = html.escape(asset_urls["dependency-report.css"])
+    script_url = html.escape(asset_urls["dependency-report.js"])
+    cytoscape_url = html.escape(asset_urls["cytoscape.min.js"])
+    webcola_url = html.escape(asset_urls["webcola.min.js"])
+    cytoscape_cola_url = html.escape(asset_urls["cytoscape-cola.js"])
+    # ライセンス ファイルも index.html から参照し、共有の配置先で参照の有無から不要判定できるようにする
+    license_links = "\n".join(
+        f'  <link rel="license" href="{html.escape(asset_urls[name])}">'
+        for name in GRAPH_ASSETS
+        if name.endswith(".LICENSE.txt")
+    )
     html_text = f"""<!doctype html>
 <html lang="ja">
 <head>
@@ -1455,10 +2365,12 @@ def write_html(output_dir: Path, category_id: str, git_info: str = "") -> None:
   <title>{title}</title>
   <link rel="stylesheet" href="../doxygen.css">
   <script src="dependency-data.js"></script>
-  <script src="cytoscape.min.js"></script>
-  <script src="webcola.min.js"></script>
-  <script src="cytoscape-cola.js"></script>
+  <script src="{cytoscape_url}"></script>
+  <script src="{webcola_url}"></script>
+  <script src="{cytoscape_cola_url}"></script>
+{license_links}
   <script>
+    window.DoxyfwDependencyCategory = {js_category};
     (function () {{
       "use strict";
       const key = "doxyfw-dependency-theme";
@@ -1474,912 +2386,7 @@ def write_html(output_dir: Path, category_id: str, git_info: str = "") -> None:
       document.documentElement.setAttribute("data-theme", theme);
     }}());
   </script>
-  <style>
-    :root {{
-      color-scheme: light;
-      --dep-page-bg: #ffffff;
-      --dep-text: #111827;
-      --dep-muted: #596579;
-      --dep-border: #d8dee8;
-      --dep-bg: #f7f9fc;
-      --dep-accent: #0e639c;
-      --dep-warning: #a16207;
-      --dep-danger: #b91c1c;
-      --dep-input-bg: #ffffff;
-      --dep-input-text: #1f2937;
-      --dep-input-border: #b8c2d1;
-      --dep-input-focus: #0e639c;
-      --dep-table-scrollbar-thumb: #888888;
-      --dep-table-scrollbar-thumb-hover: #757575;
-      --dep-filter-warning-bg: #fef3c7;
-      --dep-filter-warning-text: #713f12;
-      --dep-badge-text: #111827;
-      --dep-badge-leaf-bg: #dcfce7;
-      --dep-badge-leaf-border: #16a34a;
-      --dep-badge-local-bg: #e0f2fe;
-      --dep-badge-local-border: #0284c7;
-      --dep-badge-cycle-bg: #fee2e2;
-      --dep-badge-cycle-border: #dc2626;
-      --dep-badge-caller-bg: #fef3c7;
-      --dep-badge-caller-border: #d97706;
-      --dep-badge-library-bg: #eef2ff;
-      --dep-badge-library-border: #4f46e5;
-      --dep-badge-source-bg: #f3e8ff;
-      --dep-badge-source-border: #9333ea;
-      --dep-graph-bg: #ffffff;
-      --dep-graph-label-bg: #ffffff;
-      --dep-graph-text: #111827;
-      --dep-graph-parent-text: #1f2937;
-      --dep-graph-node-bg: #dbeafe;
-      --dep-graph-node-border: #2563eb;
-      --dep-graph-file-bg: #f8fafc;
-      --dep-graph-file-border: #64748b;
-      --dep-graph-muted-file-bg: #f8fafc;
-      --dep-graph-muted-file-border: #dbe4f0;
-      --dep-graph-muted-file-text: #a8b4c3;
-      --dep-graph-parent-bg: #f1f5f9;
-      --dep-graph-edge: #64748b;
-      --dep-graph-muted-edge: #e2e8f0;
-      --dep-graph-active-edge: #334155;
-      --dep-graph-emphasis-edge: #111827;
-      --dep-graph-leaf-bg: #dcfce7;
-      --dep-graph-leaf-border: #16a34a;
-      --dep-graph-local-bg: #e0f2fe;
-      --dep-graph-local-border: #0284c7;
-      --dep-graph-caller-bg: #fef3c7;
-      --dep-graph-caller-border: #d97706;
-      --dep-graph-danger-bg: #fee2e2;
-      --dep-graph-danger-border: #dc2626;
-      --dep-graph-library-bg: #eef2ff;
-      --dep-graph-library-border: #4f46e5;
-      --dep-graph-muted-library-bg: #f7f9ff;
-      --dep-graph-muted-library-border: #d5ddff;
-      --dep-graph-source-bg: #f3e8ff;
-      --dep-graph-source-border: #9333ea;
-      --dep-graph-muted-source-bg: #fbf5ff;
-      --dep-graph-muted-source-border: #eadcff;
-    }}
-    :root[data-theme="dark"] {{
-      color-scheme: dark;
-      --dep-page-bg: #1e1e1e;
-      --dep-text: #d4d4d4;
-      --dep-muted: #9b9b9b;
-      --dep-border: #3c3c3c;
-      --dep-bg: #252526;
-      --dep-accent: #3794d8;
-      --dep-warning: #cca700;
-      --dep-danger: #f48771;
-      --dep-input-bg: #1e1e1e;
-      --dep-input-text: #d4d4d4;
-      --dep-input-border: #3c3c3c;
-      --dep-input-focus: #3794d8;
-      --dep-table-scrollbar-thumb: #676767;
-      --dep-table-scrollbar-thumb-hover: #787878;
-      --dep-filter-warning-bg: #3a3314;
-      --dep-filter-warning-text: #d7ba7d;
-      --dep-badge-text: #d4d4d4;
-      --dep-badge-leaf-bg: #163b2b;
-      --dep-badge-leaf-border: #4ec9b0;
-      --dep-badge-local-bg: #17364a;
-      --dep-badge-local-border: #4fc1ff;
-      --dep-badge-cycle-bg: #4b2525;
-      --dep-badge-cycle-border: #f48771;
-      --dep-badge-caller-bg: #3f321b;
-      --dep-badge-caller-border: #d7ba7d;
-      --dep-badge-library-bg: #2d2a4a;
-      --dep-badge-library-border: #9cdcfe;
-      --dep-badge-source-bg: #3b2a4a;
-      --dep-badge-source-border: #c586c0;
-      --dep-graph-bg: #1e1e1e;
-      --dep-graph-label-bg: #252526;
-      --dep-graph-text: #d4d4d4;
-      --dep-graph-parent-text: #d4d4d4;
-      --dep-graph-node-bg: #264f78;
-      --dep-graph-node-border: #3794ff;
-      --dep-graph-file-bg: #252526;
-      --dep-graph-file-border: #858585;
-      --dep-graph-muted-file-bg: #171717;
-      --dep-graph-muted-file-border: #242424;
-      --dep-graph-muted-file-text: #505050;
-      --dep-graph-parent-bg: #2d2d30;
-      --dep-graph-edge: #858585;
-      --dep-graph-muted-edge: #2d2d2d;
-      --dep-graph-active-edge: #c5c5c5;
-      --dep-graph-emphasis-edge: #f3f4f6;
-      --dep-graph-leaf-bg: #163b2b;
-      --dep-graph-leaf-border: #4ec9b0;
-      --dep-graph-local-bg: #17364a;
-      --dep-graph-local-border: #4fc1ff;
-      --dep-graph-caller-bg: #3f321b;
-      --dep-graph-caller-border: #d7ba7d;
-      --dep-graph-danger-bg: #4b2525;
-      --dep-graph-danger-border: #f48771;
-      --dep-graph-library-bg: #2d2a4a;
-      --dep-graph-library-border: #9cdcfe;
-      --dep-graph-muted-library-bg: #1f1f22;
-      --dep-graph-muted-library-border: #2a3134;
-      --dep-graph-source-bg: #3b2a4a;
-      --dep-graph-source-border: #c586c0;
-      --dep-graph-muted-source-bg: #211f22;
-      --dep-graph-muted-source-border: #2e282e;
-    }}
-    body {{
-      margin: 0;
-      font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-      background: var(--dep-page-bg);
-      color: var(--dep-text);
-      scrollbar-color: color-mix(in srgb, var(--dep-accent) 55%, var(--dep-input-border)) var(--dep-input-bg);
-      scrollbar-width: auto;
-    }}
-    body::-webkit-scrollbar,
-    .dep-table-wrap::-webkit-scrollbar,
-    .dep-detail::-webkit-scrollbar {{
-      width: 14px;
-      height: 14px;
-    }}
-    body::-webkit-scrollbar-track,
-    .dep-table-wrap::-webkit-scrollbar-track,
-    .dep-detail::-webkit-scrollbar-track {{
-      background: var(--dep-input-bg);
-    }}
-    body::-webkit-scrollbar-thumb,
-    .dep-table-wrap::-webkit-scrollbar-thumb,
-    .dep-detail::-webkit-scrollbar-thumb {{
-      border: 2px solid var(--dep-input-bg);
-      border-radius: 999px;
-      background: color-mix(in srgb, var(--dep-accent) 55%, var(--dep-input-border));
-    }}
-    body::-webkit-scrollbar-thumb:hover,
-    .dep-table-wrap::-webkit-scrollbar-thumb:hover,
-    .dep-detail::-webkit-scrollbar-thumb:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 75%, var(--dep-input-border));
-    }}
-    .dep-table-wrap::-webkit-scrollbar-thumb,
-    .dep-detail::-webkit-scrollbar-thumb {{
-      background: var(--dep-table-scrollbar-thumb);
-    }}
-    .dep-table-wrap::-webkit-scrollbar-thumb:hover,
-    .dep-detail::-webkit-scrollbar-thumb:hover {{
-      background: var(--dep-table-scrollbar-thumb-hover);
-    }}
-    main {{
-      max-width: min(2000px, 96vw);
-      margin: 0 auto;
-      padding: 20px;
-    }}
-    h1 {{
-      font-size: 1.6rem;
-      margin: 0;
-    }}
-    .dep-title-row {{
-      display: flex;
-      align-items: flex-start;
-      justify-content: space-between;
-      gap: 12px;
-      margin: 0 0 12px;
-    }}
-    .dep-meta {{
-      color: var(--dep-muted);
-      display: inline;
-      font-size: 1rem;
-      font-weight: 400;
-      margin-left: 10px;
-    }}
-    .dep-summary {{
-      display: grid;
-      grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-      gap: 8px;
-      margin-bottom: 18px;
-    }}
-    .dep-metric {{
-      display: flex;
-      align-items: baseline;
-      gap: 8px;
-      border: 1px solid var(--dep-border);
-      border-radius: 6px;
-      padding: 10px;
-      background: var(--dep-bg);
-    }}
-    .dep-metric strong {{
-      font-size: 1.35rem;
-    }}
-    .dep-controls {{
-      display: grid;
-      grid-template-columns: minmax(220px, 1fr) repeat(6, minmax(110px, 170px)) auto;
-      gap: 8px;
-      margin-bottom: 12px;
-    }}
-    .dep-file-controls {{
-      grid-template-columns: minmax(220px, 1fr) repeat(5, minmax(110px, 170px)) auto;
-    }}
-    .dep-downloads {{
-      display: flex;
-      gap: 8px;
-      flex-wrap: wrap;
-      justify-content: flex-end;
-    }}
-    .dep-title-actions {{
-      display: flex;
-      gap: 8px;
-      flex-wrap: wrap;
-      justify-content: flex-end;
-    }}
-    .dep-download-menu {{
-      position: relative;
-    }}
-    .dep-download-menu.open > .dep-download-menu-button {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-bg));
-      border-color: var(--dep-accent);
-      color: var(--dep-accent);
-    }}
-    .dep-download-menu-items {{
-      position: absolute;
-      right: 0;
-      top: calc(100% + 4px);
-      z-index: 20;
-      min-width: 160px;
-      display: grid;
-      gap: 4px;
-      padding: 6px;
-      border: 1px solid var(--dep-border);
-      border-radius: 4px;
-      background: var(--dep-bg);
-      box-shadow: 0 6px 18px rgba(0, 0, 0, 0.18);
-    }}
-    .dep-download-menu-items[hidden] {{
-      display: none;
-    }}
-    .dep-download-menu-items .dep-download {{
-      border-color: transparent;
-      background: transparent;
-      justify-content: flex-start;
-    }}
-    .dep-download,
-    .dep-download-menu-button,
-    .dep-theme-toggle {{
-      display: inline-flex;
-      align-items: center;
-      padding: 4px 10px;
-      border: 1px solid var(--dep-border);
-      border-radius: 4px;
-      background: var(--dep-bg);
-      color: var(--dep-input-text);
-      text-decoration: none;
-      font: inherit;
-      font-size: 0.9rem;
-      cursor: pointer;
-    }}
-    .dep-download:hover,
-    .dep-download-menu-button:hover,
-    .dep-theme-toggle:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-bg));
-      border-color: var(--dep-accent);
-      color: var(--dep-accent);
-    }}
-    .dep-download-menu-items .dep-download:hover {{
-      border-color: transparent;
-    }}
-    .dep-settings-items {{
-      min-width: 140px;
-    }}
-    .dep-settings-label {{
-      padding: 4px 8px 2px;
-      font-size: 11px;
-      color: var(--dep-muted);
-    }}
-    .dep-settings-items button.dep-menu-option {{
-      display: block;
-      width: 100%;
-      border: 0;
-      border-radius: 4px;
-      padding: 4px 8px 4px 24px;
-      background: transparent;
-      color: var(--dep-input-text);
-      cursor: pointer;
-      font: inherit;
-      font-size: 0.9rem;
-      text-align: left;
-      position: relative;
-    }}
-    .dep-settings-items button.dep-menu-option:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-input-bg));
-      color: var(--dep-accent);
-    }}
-    .dep-settings-items button.dep-menu-option.checked::before {{
-      content: "\\2713";
-      position: absolute;
-      left: 8px;
-    }}
-    input, select {{
-      width: 100%;
-      box-sizing: border-box;
-      min-height: 34px;
-      border: 1px solid var(--dep-input-border);
-      border-radius: 4px;
-      padding: 6px 8px;
-      background: var(--dep-input-bg);
-      color: var(--dep-input-text);
-      color-scheme: inherit;
-    }}
-    select {{
-      padding-right: 32px;
-    }}
-    input:focus, select:focus {{
-      border-color: var(--dep-input-focus);
-      box-shadow: 0 0 0 2px color-mix(in srgb, var(--dep-input-focus) 18%, transparent);
-      outline: none;
-    }}
-    select option {{
-      background: var(--dep-input-bg);
-      color: var(--dep-input-text);
-      padding-right: 24px;
-    }}
-    .dep-layout {{
-      display: grid;
-      grid-template-columns: minmax(0, 1fr) 340px;
-      gap: 14px;
-      align-items: start;
-    }}
-    .dep-table-panel {{
-      min-width: 0;
-    }}
-    .dep-filter-notice {{
-      display: none;
-      align-items: center;
-      justify-content: space-between;
-      gap: 10px;
-      margin-bottom: 8px;
-      border: 1px solid color-mix(in srgb, var(--dep-warning) 45%, var(--dep-border));
-      border-radius: 6px;
-      padding: 8px 10px;
-      background: var(--dep-filter-warning-bg);
-      color: var(--dep-filter-warning-text);
-    }}
-    .dep-filter-notice.visible {{
-      display: flex;
-    }}
-    .dep-neighbor-button,
-    .dep-filter-clear {{
-      border: 1px solid var(--dep-input-border);
-      border-radius: 4px;
-      background: var(--dep-input-bg);
-      color: var(--dep-input-text);
-      cursor: pointer;
-      font: inherit;
-    }}
-    .dep-filter-clear {{
-      flex: 0 0 auto;
-      min-height: 34px;
-      padding: 6px 12px;
-      white-space: nowrap;
-    }}
-    .dep-filter-clear:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-bg));
-      border-color: var(--dep-input-focus);
-      color: var(--dep-input-focus);
-    }}
-    .dep-table-wrap {{
-      overflow: auto;
-      border: 1px solid var(--dep-border);
-      border-radius: 6px;
-      max-height: calc(100vh - 310px);
-      scrollbar-color: var(--dep-table-scrollbar-thumb) var(--dep-input-bg);
-      scrollbar-width: auto;
-    }}
-    table {{
-      width: 100%;
-      border-collapse: collapse;
-      font-size: 0.9rem;
-    }}
-    th, td {{
-      padding: 5px 7px;
-      border-bottom: 1px solid var(--dep-border);
-      vertical-align: top;
-      white-space: nowrap;
-    }}
-    th {{
-      position: sticky;
-      top: 0;
-      background: var(--dep-bg);
-      text-align: left;
-      z-index: 1;
-    }}
-    .dep-sort-button {{
-      display: inline-flex;
-      align-items: center;
-      gap: 4px;
-      border: 0;
-      padding: 0;
-      background: transparent;
-      color: inherit;
-      cursor: pointer;
-      font: inherit;
-      font-weight: 600;
-      text-align: inherit;
-    }}
-    .dep-sort-button:hover {{
-      color: var(--dep-accent);
-    }}
-    .dep-sort-mark {{
-      display: inline-block;
-      min-width: 1em;
-      color: var(--dep-accent);
-      font-size: 0.78rem;
-      line-height: 1;
-    }}
-    .dep-num {{
-      font-variant-numeric: tabular-nums;
-      text-align: right;
-    }}
-    tr {{
-      cursor: pointer;
-    }}
-    tr:hover {{
-      background: color-mix(in srgb, var(--dep-border) 30%, transparent);
-    }}
-    tr.selected, tr.selected:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 18%, transparent);
-    }}
-    .dep-file {{
-      max-width: 420px;
-      overflow: hidden;
-      text-overflow: ellipsis;
-    }}
-    .badge {{
-      display: inline-block;
-      border-radius: 999px;
-      padding: 2px 6px;
-      border: 1px solid var(--dep-border);
-      background: var(--dep-bg);
-      color: var(--dep-badge-text);
-      font-size: 0.74rem;
-      line-height: 1.2;
-    }}
-    .badge.leaf-static,
-    .badge.include-static-leaf,
-    .badge.include-internal-static-leaf,
-    .badge.leaf-global {{
-      background: var(--dep-badge-leaf-bg);
-      border-color: var(--dep-badge-leaf-border);
-    }}
-    .badge.file-local {{
-      background: var(--dep-badge-local-bg);
-      border-color: var(--dep-badge-local-border);
-    }}
-    .badge.cycle {{
-      background: var(--dep-badge-cycle-bg);
-      border-color: var(--dep-badge-cycle-border);
-    }}
-    .badge.libsrc-file-caller,
-    .badge.src-file-caller,
-    .badge.other-to-libsrc-caller,
-    .badge.cross-area-caller {{
-      background: var(--dep-badge-caller-bg);
-      border-color: var(--dep-badge-caller-border);
-    }}
-    .badge.area-library {{
-      background: var(--dep-badge-library-bg);
-      border-color: var(--dep-badge-library-border);
-    }}
-    .badge.area-source {{
-      background: var(--dep-badge-source-bg);
-      border-color: var(--dep-badge-source-border);
-    }}
-    .dep-detail {{
-      border: 1px solid var(--dep-border);
-      border-radius: 6px;
-      padding: 12px;
-      min-height: 240px;
-      background: var(--dep-bg);
-      box-sizing: border-box;
-      display: flex;
-      flex-direction: column;
-    }}
-    .dep-detail-body {{
-      flex: 1 1 auto;
-      min-height: 0;
-    }}
-    .dep-detail-footer {{
-      flex: 0 0 auto;
-      text-align: right;
-      padding-top: 8px;
-    }}
-    .dep-detail-copy {{
-      border: 1px solid var(--dep-border);
-      border-radius: 4px;
-      padding: 4px 12px;
-      background: var(--dep-input-bg);
-      color: var(--dep-input-text);
-      font: inherit;
-      font-size: 0.85rem;
-      cursor: pointer;
-    }}
-    .dep-detail-copy:hover:not(:disabled) {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-bg));
-      border-color: var(--dep-input-focus);
-      color: var(--dep-input-focus);
-    }}
-    .dep-detail-copy:disabled {{
-      cursor: default;
-      color: var(--dep-muted);
-    }}
-    .dep-detail h2 {{
-      margin: 0 0 8px;
-      font-size: 1.05rem;
-      overflow-wrap: anywhere;
-    }}
-    .dep-detail .dep-brief {{
-      margin: 0 0 12px;
-      color: var(--dep-text);
-      font-size: 0.95rem;
-      line-height: 1.5;
-      white-space: pre-wrap;
-    }}
-    .dep-detail dl {{
-      display: grid;
-      grid-template-columns: 120px minmax(0, 1fr);
-      gap: 6px 10px;
-      margin: 0 0 12px;
-    }}
-    .dep-detail dt {{
-      color: var(--dep-muted);
-    }}
-    .dep-detail dd {{
-      margin: 0;
-      overflow-wrap: anywhere;
-    }}
-    .dep-detail a {{
-      color: var(--dep-accent);
-      overflow-wrap: anywhere;
-    }}
-    .dep-detail a:hover {{
-      color: var(--dep-accent);
-      text-decoration-thickness: 2px;
-    }}
-    .dep-neighbors {{
-      display: grid;
-      grid-template-columns: 1fr;
-      gap: 10px;
-    }}
-    .dep-neighbors ul {{
-      margin: 4px 0 0;
-      padding-left: 18px;
-    }}
-    .dep-neighbor-button {{
-      max-width: 100%;
-      padding: 0;
-      border-color: transparent;
-      background: transparent;
-      color: var(--dep-accent);
-      text-align: left;
-      text-decoration: none;
-      white-space: normal;
-      overflow-wrap: anywhere;
-    }}
-    .dep-neighbor-button:hover {{
-      border-color: transparent;
-      color: var(--dep-accent);
-      text-decoration: none;
-    }}
-    .dep-neighbors small {{
-      overflow-wrap: anywhere;
-    }}
-    .dep-external-callee {{
-      color: var(--dep-muted);
-      overflow-wrap: anywhere;
-    }}
-    .dep-empty {{
-      color: var(--dep-muted);
-    }}
-    .dep-tabs {{
-      display: flex;
-      gap: 6px;
-      margin: 0 0 12px;
-      border-bottom: 1px solid var(--dep-border);
-    }}
-    .dep-tab {{
-      min-height: 34px;
-      border: 1px solid transparent;
-      border-bottom: 0;
-      border-radius: 6px 6px 0 0;
-      padding: 6px 12px;
-      background: transparent;
-      color: var(--dep-input-text);
-      cursor: pointer;
-      font: inherit;
-    }}
-    .dep-tab.active {{
-      border-color: var(--dep-border);
-      background: var(--dep-bg);
-      color: var(--dep-accent);
-      font-weight: 600;
-    }}
-    .dep-panel {{
-      display: none;
-    }}
-    .dep-panel.active {{
-      display: block;
-    }}
-    .dep-graph-layout {{
-      display: grid;
-      grid-template-columns: minmax(0, 1fr) 340px;
-      gap: 14px;
-      align-items: start;
-    }}
-    .dep-graph-shell {{
-      position: relative;
-      min-width: 0;
-    }}
-    .dep-graph-toolbar {{
-      position: absolute;
-      top: 10px;
-      left: 10px;
-      z-index: 40;
-      display: flex;
-      flex-wrap: wrap;
-      align-items: center;
-      gap: 8px;
-    }}
-    /* inert 時はツールバー コンテナを hit-test 可能なまま残し、ボタンだけ無効化する。
-       コンテナへ pointer-events:none を付けるとクリックが背後のグラフへ貫通し、レイアウト
-       中の物理クリックが背景タップ (選択解除) を発火させてしまうため、ボタンで吸収する。 */
-    .dep-graph-shell.controls-inert .dep-graph-toolbar button {{
-      pointer-events: none;
-      cursor: default;
-      opacity: 0.55;
-    }}
-    .dep-graph-toolbar button {{
-      min-height: 30px;
-      border: 1px solid var(--dep-input-border);
-      border-radius: 4px;
-      padding: 4px 8px;
-      background: var(--dep-input-bg);
-      color: var(--dep-input-text);
-      cursor: pointer;
-      font: inherit;
-    }}
-    .dep-graph-toolbar button:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-bg));
-      border-color: var(--dep-input-focus);
-      color: var(--dep-input-focus);
-    }}
-    .dep-graph {{
-      position: relative;
-      width: 100%;
-      height: calc(100vh - 260px);
-      min-height: 520px;
-      border: 1px solid var(--dep-border);
-      border-radius: 6px;
-      background: var(--dep-graph-bg);
-    }}
-    .dep-graph-hidden-notice {{
-      position: absolute;
-      right: 10px;
-      bottom: 10px;
-      z-index: 30;
-      display: none;
-      padding: 4px 10px;
-      border: 1px solid var(--dep-border);
-      border-radius: 4px;
-      background: var(--dep-input-bg);
-      color: var(--dep-input-text);
-      font: inherit;
-      font-size: 0.78rem;
-      cursor: pointer;
-    }}
-    .dep-graph-hidden-notice.visible {{
-      display: block;
-    }}
-    .dep-graph-hidden-notice:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-input-bg));
-      color: var(--dep-accent);
-      border-color: var(--dep-accent);
-    }}
-    .dep-graph.layout-initializing::after,
-    .dep-graph.layout-relayouting::after {{
-      position: absolute;
-      top: 50%;
-      left: 50%;
-      transform: translate(-50%, -50%);
-      color: var(--dep-muted);
-      font-size: 0.95rem;
-      padding: 8px 12px;
-      border: 1px solid var(--dep-border);
-      border-radius: 6px;
-      background: color-mix(in srgb, var(--dep-bg) 82%, transparent);
-      box-shadow: 0 8px 24px rgba(0, 0, 0, 0.18);
-      pointer-events: none;
-      z-index: 20;
-    }}
-    .dep-graph.layout-initializing::after {{
-      content: "初期化しています...";
-    }}
-    .dep-graph.layout-relayouting::after {{
-      content: "レイアウトしています...";
-    }}
-    .dep-graph.layout-initializing::after,
-    .dep-graph.layout-relayouting::after {{
-      inset: 0;
-      transform: none;
-      border: 0;
-      border-radius: 0;
-      background: var(--dep-graph-bg);
-      box-shadow: none;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-    }}
-    .dep-graph.layout-initializing canvas,
-    .dep-graph.layout-relayouting canvas {{
-      opacity: 0;
-    }}
-    .dep-graph-note {{
-      color: var(--dep-muted);
-      margin: 0 0 8px;
-    }}
-    .dep-graph-detail ul {{
-      margin: 6px 0 0;
-      padding-left: 18px;
-    }}
-    .dep-graph-detail li {{
-      margin: 2px 0;
-      overflow-wrap: anywhere;
-    }}
-    .dep-graph-context-menu {{
-      position: fixed;
-      z-index: 1000;
-      display: none;
-      min-width: 180px;
-      border: 1px solid var(--dep-border);
-      border-radius: 6px;
-      padding: 4px;
-      background: var(--dep-input-bg);
-      box-shadow: 0 10px 24px rgba(15, 23, 42, 0.18);
-    }}
-    .dep-graph-context-menu.visible {{
-      display: block;
-    }}
-    .dep-graph-context-menu button {{
-      display: block;
-      width: 100%;
-      min-height: 30px;
-      border: 0;
-      border-radius: 4px;
-      padding: 6px 8px;
-      background: transparent;
-      color: var(--dep-input-text);
-      cursor: pointer;
-      font: inherit;
-      text-align: left;
-    }}
-    .dep-graph-context-menu button:hover {{
-      background: color-mix(in srgb, var(--dep-accent) 12%, var(--dep-input-bg));
-      color: var(--dep-accent);
-    }}
-    .dep-graph-context-menu-separator {{
-      height: 0;
-      margin: 4px 4px;
-      border-top: 1px solid var(--dep-border);
-    }}
-    .dep-graph-context-menu-label {{
-      padding: 6px 8px 2px;
-      font-size: 11px;
-      color: var(--dep-muted);
-    }}
-    .dep-graph-context-menu button.dep-menu-option {{
-      padding-left: 24px;
-      position: relative;
-    }}
-    .dep-graph-context-menu button.dep-menu-option.checked::before {{
-      content: "\\2713";
-      position: absolute;
-      left: 8px;
-    }}
-    @media (min-width: 981px) {{
-      html, body {{
-        height: 100%;
-        overflow: hidden;
-      }}
-      main {{
-        box-sizing: border-box;
-        height: 100vh;
-        display: flex;
-        flex-direction: column;
-        overflow: hidden;
-      }}
-      .dep-summary {{
-        flex: 0 0 auto;
-      }}
-      .dep-tabs {{
-        flex: 0 0 auto;
-      }}
-      .dep-panel.active {{
-        flex: 1 1 auto;
-        min-height: 0;
-        display: flex;
-        flex-direction: column;
-      }}
-      .dep-controls {{
-        flex: 0 0 auto;
-      }}
-      .dep-layout,
-      .dep-graph-layout {{
-        flex: 1 1 auto;
-        min-height: 0;
-        align-items: stretch;
-      }}
-      .dep-table-panel {{
-        display: flex;
-        flex-direction: column;
-        min-height: 0;
-      }}
-      .dep-graph-shell {{
-        min-height: 0;
-      }}
-      .dep-filter-notice {{
-        flex: 0 0 auto;
-      }}
-      .dep-table-wrap {{
-        max-height: 100%;
-        overflow: auto;
-        scrollbar-width: auto;
-      }}
-      /* スクロールは本文 (dep-detail-body) 側で行い、コピー ボタン (footer) は
-         ペイン右下に固定表示する。 */
-      .dep-detail {{
-        max-height: 100%;
-        overflow: hidden;
-      }}
-      .dep-detail-body {{
-        overflow: auto;
-        scrollbar-width: auto;
-        scrollbar-color: var(--dep-table-scrollbar-thumb) var(--dep-input-bg);
-      }}
-      .dep-table-wrap {{
-        scrollbar-color: var(--dep-table-scrollbar-thumb) var(--dep-input-bg);
-      }}
-      .dep-table-wrap {{
-        flex: 1 1 auto;
-        min-height: 0;
-      }}
-      .dep-graph {{
-        height: 100%;
-        min-height: 0;
-      }}
-    }}
-    @media (max-width: 980px) {{
-      main {{
-        padding: 12px;
-      }}
-      .dep-title-row {{
-        flex-direction: column;
-        align-items: stretch;
-      }}
-      .dep-downloads {{
-        justify-content: flex-start;
-      }}
-      .dep-download-menu-items {{
-        left: 0;
-        right: auto;
-      }}
-      .dep-title-actions {{
-        justify-content: flex-start;
-      }}
-      .dep-controls, .dep-layout, .dep-graph-layout {{
-        grid-template-columns: 1fr;
-      }}
-      .dep-table-wrap {{
-        max-height: none;
-      }}
-      .dep-graph {{
-        height: 70vh;
-        min-height: 420px;
-      }}
-      .dep-metric {{
-        display: block;
-      }}
-    }}
-  </style>
+  <link rel="stylesheet" href="{style_url}">
 </head>
 <body>
 <main>
@@ -2563,4704 +2570,61 @@ def write_html(output_dir: Path, category_id: str, git_info: str = "") -> None:
     </div>
   </section>
 </main>
-<script>
-(function () {{
-  "use strict";
-  // 表示はページ読み込み時の dependency-data.js を断面として固定する。
-  const data = window.DoxyfwDependencyData || {{ summary: {{}}, functions: [], edges: [] }};
-  const functions = data.functions || [];
-  const edges = data.edges || [];
-  const files = data.files || [];
-  const sccs = data.sccs || [];
-  // make docs 発行のシングルページ md HTML への URL テンプレート ({{variant}} を置換して使う)。
-  // 空のときは page リンク機能と設定メニューを無効にする。
-  const pageUrlTemplate = data.pageUrlTemplate || "";
-  const pageLanguages = (data.pageLanguages && data.pageLanguages.length > 0) ? data.pageLanguages : ["ja", "en"];
-  const byId = new Map(functions.map((fn) => [fn.id, fn]));
-  const baseOrder = new Map(functions.map((fn, index) => [fn.id, index]));
-  const sccById = new Map(sccs.map((scc) => [scc.id, scc]));
-  const fileByPath = new Map(files.map((file) => [file.path, file]));
-  const functionsByFile = new Map();
-  const callees = new Map();
-  const callers = new Map();
-  for (const fn of functions) {{
-    if (!functionsByFile.has(fn.file)) functionsByFile.set(fn.file, []);
-    functionsByFile.get(fn.file).push(fn);
-  }}
-  // edgesByFunctionId は全体マップの関数選択時に、全エッジの線形走査を避けて
-  // 表示関数の近傍エッジだけを列挙するための隣接リスト (caller 側・callee 側の両方に登録)。
-  const edgesByFunctionId = new Map();
-  for (const edge of edges) {{
-    if (!callees.has(edge.caller)) callees.set(edge.caller, []);
-    if (!callers.has(edge.callee)) callers.set(edge.callee, []);
-    callees.get(edge.caller).push(edge.callee);
-    callers.get(edge.callee).push(edge.caller);
-    if (!edgesByFunctionId.has(edge.caller)) edgesByFunctionId.set(edge.caller, []);
-    if (!edgesByFunctionId.has(edge.callee)) edgesByFunctionId.set(edge.callee, []);
-    edgesByFunctionId.get(edge.caller).push(edge);
-    if (edge.callee !== edge.caller) edgesByFunctionId.get(edge.callee).push(edge);
-  }}
-  const fileEdges = (data.fileEdges && data.fileEdges.length > 0) ? data.fileEdges : buildFileEdges(edges);
-  const fileEdgeByKey = new Map(fileEdges.map((edge) => [edge.id, {{ data: edge }}]));
-  const edgePairsByFileKey = new Map();
-  for (const edge of edges) {{
-    if (edge.callerFile === edge.calleeFile) continue;
-    const key = overviewEdgeKey(edge.callerFile, edge.calleeFile);
-    if (!edgePairsByFileKey.has(key)) edgePairsByFileKey.set(key, []);
-    edgePairsByFileKey.get(key).push(edge);
-  }}
-  for (const pairs of edgePairsByFileKey.values()) {{
-    pairs.sort((a, b) => compareText(a.callerFile, b.callerFile) || compareText(a.caller, b.caller) || compareText(a.callee, b.callee));
-  }}
-  const OVERVIEW_SYNC_CHUNK_SIZE = 100;
-  // processOverviewChunks の 1 フレームあたりの処理時間予算 (ms)。
-  const OVERVIEW_CHUNK_FRAME_BUDGET_MS = 8;
-  // 位置アニメーションの時間。
-  const OVERVIEW_ANIMATION_MS = 430;
-  // 状態クラス (ミュート等) のフェードの時間。
-  const OVERVIEW_FADE_MS = 215;
-
-  const summary = document.getElementById("summary");
-  const rows = document.getElementById("functionRows");
-  const fileRows = document.getElementById("fileRows");
-  const detail = document.getElementById("detail");
-  const fileDetail = document.getElementById("fileDetail");
-  const search = document.getElementById("search");
-  const levelFilter = document.getElementById("levelFilter");
-  const classFilter = document.getElementById("classFilter");
-  const exportFilter = document.getElementById("exportFilter");
-  const staticFilter = document.getElementById("staticFilter");
-  const areaFilter = document.getElementById("areaFilter");
-  const fileFilter = document.getElementById("fileFilter");
-  const filterNotice = document.getElementById("filterNotice");
-  const clearFilters = document.getElementById("clearFilters");
-  const clearHiddenFunctionFilters = document.getElementById("clearHiddenFunctionFilters");
-  const fileSearch = document.getElementById("fileSearch");
-  const fileLevelFilter = document.getElementById("fileLevelFilter");
-  const fileClassFilter = document.getElementById("fileClassFilter");
-  const fileExportFilter = document.getElementById("fileExportFilter");
-  const fileStaticFilter = document.getElementById("fileStaticFilter");
-  const fileAreaFilter = document.getElementById("fileAreaFilter");
-  const fileFilterNotice = document.getElementById("fileFilterNotice");
-  const clearFileFilters = document.getElementById("clearFileFilters");
-  const clearHiddenFileFilters = document.getElementById("clearHiddenFileFilters");
-  const sortButtons = Array.from(document.querySelectorAll("[data-sort-key]"));
-  const fileSortButtons = Array.from(document.querySelectorAll("[data-file-sort-key]"));
-  const tabButtons = Array.from(document.querySelectorAll("[data-tab-target]"));
-  const tabPanels = Array.from(document.querySelectorAll(".dep-panel"));
-  const overviewGraph = document.getElementById("overviewGraph");
-  const overviewGraphShell = overviewGraph ? overviewGraph.closest(".dep-graph-shell") : null;
-  const overviewDetail = document.getElementById("overviewDetail");
-  const overviewFit = document.getElementById("overviewFit");
-  const overviewRelayout = document.getElementById("overviewRelayout");
-  const overviewReset = document.getElementById("overviewReset");
-  const overviewGraphMenu = document.getElementById("overviewGraphMenu");
-  const overviewHiddenNotice = document.getElementById("overviewHiddenNotice");
-  const reportCategory = {js_category};
-  const themeStorageKey = "doxyfw-dependency-theme";
-  let selectedId = "";
-  let selectedFilePath = "";
-  let selectedEdgeKey = "";
-  let sortState = {{ key: "level", direction: "asc" }};
-  let fileSortState = {{ key: "path", direction: "asc" }};
-  let activeTab = "functionListPanel";
-  let currentTheme = document.documentElement.getAttribute("data-theme") === "dark" ? "dark" : "light";
-  let overviewCy = null;
-  let overviewLayoutInitialized = false;
-  let overviewPositionAnimation = null;
-  let overviewActiveLayout = null;
-  let overviewLayoutRunning = false;
-  let overviewLayoutToken = 0;
-  let overviewSyncToken = 0;
-  // cola (Phase B) の実起動回数。テスト専用フックが Phase B のスキップを確定的に
-  // 検証するために参照する (通常描画では未使用)。
-  let overviewLayoutRunCount = 0;
-  // 直近レイアウトが cola へ投入したノード数と、その純計算時間 (ms)。テスト専用フックが
-  // 部分コレクション化の効果 (投入ノード数の削減・時間短縮) を測るために参照する。
-  let overviewLastLayoutNodeCount = 0;
-  let overviewLastLayoutDurationMs = 0;
-  let overviewRelayoutRevealToken = 0;
-  let overviewRenderedSelectionSignature = null;
-  let overviewPendingSelectionSignature = null;
-  // 画面に「状態クラス (強調・ミュート) が適用済み」の選択署名。rendered は Phase B/C の
-  // 完了まで更新されず、pending は適用前から目標を指すため、状態クラスの遷移判定
-  // (deferStateClassChanges / clearingSelection) の「直前状態」にはどちらも使えない。
-  // Phase A (非遅延時) と Phase C (遅延クラス適用後) で更新する。
-  let overviewVisualStateSignature = null;
-  // 全体マップの背景右クリックメニューで切り替える、呼び出し元/先の表示深さ。
-  // 0 = 非表示、1 = 1 つ先 (既定)、Infinity = すべて。URL・永続化は行わないページ内一時設定。
-  let overviewCallerDepth = 1;
-  let overviewCalleeDepth = 1;
-  // 全体マップで「非表示」にしたファイル。UI 用語は非表示だが実体はノード・エッジを
-  // 削除し描画を軽くする。値は非表示時のファイル ノード位置 (復活時の元位置復元用)。
-  let hiddenOverviewFiles = new Map();
-  // 復活させるファイルへ、次の sync で与える元位置を一時的に保持する。
-  let overviewRestorePositions = new Map();
-  // 操作割り込みで中止されたレイアウトの移動対象 (seed のままになった関数ノード id) を一時的に
-  // 保持する。中止 (stopOverviewActiveLayout) 時に記録し、次の sync で movingNodeIds へ再投入して
-  // Phase B をやり直す。自然完了したレイアウトは記録しないため、grab によるアニメーション中断など
-  // 中止を伴わないケースには影響しない。再投入した sync で消費・クリアする。
-  let overviewPendingRelayoutNodeIds = new Set();
-  // 右クリック対象のファイル ノード (メニューの「このファイルを非表示」で使う)。
-  let overviewMenuTargetFile = "";
-  let overviewLayoutWatchdog = null;
-  let overviewInteractionStateBeforeLayout = null;
-  let overviewDraggingNodeIds = new Set();
-  let overviewUserMovedNodePositions = new Map();
-  let overviewFunctionGrabInterruptedLayout = false;
-  let overviewDeferredPositionAnimation = null;
-  let overviewDragRevision = 0;
-  let overviewSyncAfterDrag = false;
-  let overviewLastClassUpdatePlan = null;
-  let overviewSuppressBackgroundTapUntil = 0;
-  let previousSelectedRowVisible = false;
-  let previousSelectedFileRowVisible = false;
-  let pendingFunctionListScroll = false;
-  let pendingFileListScroll = false;
-
-  function text(value) {{
-    return value === null || value === undefined ? "" : String(value);
-  }}
-
-  function escapeHtml(value) {{
-    return text(value)
-      .replace(/&/g, "&amp;")
-      .replace(/</g, "&lt;")
-      .replace(/>/g, "&gt;")
-      .replace(/"/g, "&quot;")
-      .replace(/'/g, "&#39;");
-  }}
-
-  function escapeXml(value) {{
-    return text(value)
-      .replace(/&/g, "&amp;")
-      .replace(/</g, "&lt;")
-      .replace(/>/g, "&gt;")
-      .replace(/"/g, "&quot;")
-      .replace(/'/g, "&apos;");
-  }}
-
-  function safeFileNamePart(value) {{
-    const normalized = text(value).trim().replace(/[^A-Za-z0-9._-]+/g, "-").replace(/^-+|-+$/g, "");
-    return normalized || "doxygen";
-  }}
-
-  function cssVar(name) {{
-    return window.getComputedStyle(document.documentElement).getPropertyValue(name).trim();
-  }}
-
-  // #rgb / #rrggbb の前景色を背景色と alpha で混色し、不透明な #rrggbb を返す。
-  // エッジを opacity 1 で描いても、アルファ 0.7 で重ねたのと同じ見た目にするために使う。
-  // Cytoscape は opacity<1 の矢印を destination-out で切り抜くため、塊が不透明に浮く。
-  // see: https://github.com/cytoscape/cytoscape.js/blob/master/src/extensions/renderer/canvas/drawing-edges.js
-  function blendColor(fg, bg, alpha) {{
-    const toRgb = (value) => {{
-      if (typeof value !== "string") return null;
-      let hex = value.trim().replace(/^#/, "");
-      if (/^[0-9a-fA-F]{{3}}$/.test(hex)) hex = hex.replace(/(.)/g, "$1$1");
-      if (!/^[0-9a-fA-F]{{6}}$/.test(hex)) return null;
-      return [parseInt(hex.slice(0, 2), 16), parseInt(hex.slice(2, 4), 16), parseInt(hex.slice(4, 6), 16)];
-    }};
-    const f = toRgb(fg);
-    const b = toRgb(bg);
-    if (!f || !b) return fg;
-    const mix = f.map((c, i) => Math.max(0, Math.min(255, Math.round(alpha * c + (1 - alpha) * b[i]))));
-    return "#" + mix.map((c) => c.toString(16).padStart(2, "0")).join("");
-  }}
-
-  function saveTheme(theme) {{
-    try {{
-      if (window.localStorage) window.localStorage.setItem(themeStorageKey, theme);
-    }} catch (err) {{
-      // 保存できない環境では、このページ内の切り替えだけ反映する。
-    }}
-  }}
-
-  function clearSavedTheme() {{
-    try {{
-      if (window.localStorage) window.localStorage.removeItem(themeStorageKey);
-    }} catch (err) {{
-      // 保存できない環境では何もしない。
-    }}
-  }}
-
-  function applyTheme(theme, persist) {{
-    currentTheme = theme === "dark" ? "dark" : "light";
-    document.documentElement.setAttribute("data-theme", currentTheme);
-    if (persist) saveTheme(currentTheme);
-    updateThemeMenuChecks();
-    refreshOverviewGraphStyle();
-  }}
-
-  // テーマ設定は「システムの設定 (保存なし、prefers-color-scheme に追従)」「ダーク」「ライト」
-  // の 3 択。localStorage に保存があれば明示指定、なければシステムの設定とみなす。
-  function currentThemeChoice() {{
-    let stored = "";
-    try {{
-      stored = window.localStorage ? window.localStorage.getItem(themeStorageKey) || "" : "";
-    }} catch (err) {{
-      stored = "";
-    }}
-    if (stored === "dark" || stored === "light") return stored;
-    return "system";
-  }}
-
-  function systemPreferredTheme() {{
-    return window.matchMedia && window.matchMedia("(prefers-color-scheme: dark)").matches ? "dark" : "light";
-  }}
-
-  function setThemeChoice(choice) {{
-    if (choice === "system") {{
-      clearSavedTheme();
-      applyTheme(systemPreferredTheme(), false);
-      return;
-    }}
-    applyTheme(choice, true);
-  }}
-
-  function updateThemeMenuChecks() {{
-    const options = document.getElementById("themeOptions");
-    if (!options) return;
-    const choice = currentThemeChoice();
-    for (const button of options.querySelectorAll("[data-theme-choice]")) {{
-      button.classList.toggle("checked", button.getAttribute("data-theme-choice") === choice);
-    }}
-  }}
-
-  function graphColors() {{
-    // エッジは opacity 1 で描くため、アルファ 0.7 で重ねた見た目を背景との混色で再現する。
-    const graphBackground = cssVar("--dep-graph-bg") || "#ffffff";
-    const flatEdge = (name, fallback) => blendColor(cssVar(name) || fallback, graphBackground, 0.7);
-    return {{
-      background: graphBackground,
-      labelBackground: cssVar("--dep-graph-label-bg") || "#ffffff",
-      text: cssVar("--dep-graph-text") || "#111827",
-      parentText: cssVar("--dep-graph-parent-text") || "#1f2937",
-      nodeBackground: cssVar("--dep-graph-node-bg") || "#dbeafe",
-      nodeBorder: cssVar("--dep-graph-node-border") || "#2563eb",
-      fileBackground: cssVar("--dep-graph-file-bg") || "#f8fafc",
-      fileBorder: cssVar("--dep-graph-file-border") || "#64748b",
-      mutedFileBackground: cssVar("--dep-graph-muted-file-bg") || "#f8fafc",
-      mutedFileBorder: cssVar("--dep-graph-muted-file-border") || "#dbe4f0",
-      mutedFileText: cssVar("--dep-graph-muted-file-text") || "#a8b4c3",
-      parentBackground: cssVar("--dep-graph-parent-bg") || "#f1f5f9",
-      edge: flatEdge("--dep-graph-edge", "#64748b"),
-      mutedEdge: flatEdge("--dep-graph-muted-edge", "#e2e8f0"),
-      activeEdge: flatEdge("--dep-graph-active-edge", "#334155"),
-      emphasisEdge: flatEdge("--dep-graph-emphasis-edge", "#111827"),
-      leafBackground: cssVar("--dep-graph-leaf-bg") || "#dcfce7",
-      leafBorder: cssVar("--dep-graph-leaf-border") || "#16a34a",
-      localBackground: cssVar("--dep-graph-local-bg") || "#e0f2fe",
-      localBorder: cssVar("--dep-graph-local-border") || "#0284c7",
-      callerBackground: cssVar("--dep-graph-caller-bg") || "#fef3c7",
-      callerBorder: cssVar("--dep-graph-caller-border") || "#d97706",
-      dangerBackground: cssVar("--dep-graph-danger-bg") || "#fee2e2",
-      dangerBorder: cssVar("--dep-graph-danger-border") || "#dc2626",
-      libraryBackground: cssVar("--dep-graph-library-bg") || "#eef2ff",
-      libraryBorder: cssVar("--dep-graph-library-border") || "#4f46e5",
-      mutedLibraryBackground: cssVar("--dep-graph-muted-library-bg") || "#f7f9ff",
-      mutedLibraryBorder: cssVar("--dep-graph-muted-library-border") || "#d5ddff",
-      sourceBackground: cssVar("--dep-graph-source-bg") || "#f3e8ff",
-      sourceBorder: cssVar("--dep-graph-source-border") || "#9333ea",
-      mutedSourceBackground: cssVar("--dep-graph-muted-source-bg") || "#fbf5ff",
-      mutedSourceBorder: cssVar("--dep-graph-muted-source-border") || "#eadcff"
-    }};
-  }}
-
-  function levelText(fn) {{
-    return fn.dependencyLevel === null || fn.dependencyLevel === undefined ? "cycle" : String(fn.dependencyLevel);
-  }}
-
-  function levelSortValue(fn) {{
-    if (fn.dependencyLevel === null || fn.dependencyLevel === undefined) return Number.POSITIVE_INFINITY;
-    return Number(fn.dependencyLevel);
-  }}
-
-  function mapKeys(value) {{
-    if (!value || typeof value !== "object") return [];
-    return Object.keys(value).sort((a, b) => compareText(a, b));
-  }}
-
-  function countMapText(value) {{
-    return mapKeys(value).map((key) => key + ": " + value[key]).join(", ");
-  }}
-
-  function fileLevelText(file) {{
-    const keys = mapKeys(file.levels);
-    return keys.length === 0 ? "" : keys.join(", ");
-  }}
-
-  function fileClassText(file) {{
-    return countMapText(file.classes);
-  }}
-
-  function fileAreasText(file) {{
-    return countMapText(file.areas);
-  }}
-
-  function fileLevelSortValue(file) {{
-    let best = Number.POSITIVE_INFINITY;
-    for (const key of mapKeys(file.levels)) {{
-      const value = key === "cycle" ? Number.POSITIVE_INFINITY : Number(key);
-      if (Number.isFinite(value)) best = Math.min(best, value);
-    }}
-    return best;
-  }}
-
-  function dominantFileClass(file) {{
-    const classes = file.classes || {{}};
-    const keys = mapKeys(classes);
-    if (keys.length === 0) return "";
-    return keys.sort((a, b) => Number(classes[b] || 0) - Number(classes[a] || 0) || compareText(a, b))[0];
-  }}
-
-  function compareText(a, b) {{
-    return text(a).localeCompare(text(b), "ja");
-  }}
-
-  function compareNumbers(a, b) {{
-    return Number(a || 0) - Number(b || 0);
-  }}
-
-  function compareByKey(a, b, key) {{
-    if (key === "level") return levelSortValue(a) - levelSortValue(b);
-    if (key === "class") return compareText(a.dependencyClass, b.dependencyClass);
-    if (key === "export") return Number(a.isExported) - Number(b.isExported);
-    if (key === "static") return Number(a.isStatic) - Number(b.isStatic);
-    if (key === "area") return compareText(a.sourceArea, b.sourceArea);
-    if (key === "name") return compareText(a.name, b.name);
-    if (key === "file") return compareText(a.file, b.file);
-    if (key === "calleeCount") return compareNumbers(a.inScopeCalleeCount, b.inScopeCalleeCount);
-    if (key === "callerCount") return compareNumbers(a.inScopeCallerCount, b.inScopeCallerCount);
-    if (key === "crossFileCount") return compareNumbers(a.crossFileCalleeCount, b.crossFileCalleeCount);
-    return 0;
-  }}
-
-  function compareFileByKey(a, b, key) {{
-    if (key === "area") return compareText(a.dominantArea, b.dominantArea);
-    if (key === "path") return compareText(a.path, b.path);
-    if (key === "functionCount") return compareNumbers(a.functionCount, b.functionCount);
-    if (key === "exportCount") return compareNumbers(a.exportCount, b.exportCount);
-    if (key === "staticCount") return compareNumbers(a.staticCount, b.staticCount);
-    if (key === "edgeCount") return compareNumbers(a.edgeCount, b.edgeCount);
-    if (key === "level") return fileLevelSortValue(a) - fileLevelSortValue(b);
-    if (key === "class") return compareText(dominantFileClass(a), dominantFileClass(b));
-    if (key === "areas") return compareText(fileAreasText(a), fileAreasText(b));
-    return 0;
-  }}
-
-  function compareBaseOrder(a, b) {{
-    return (baseOrder.get(a.id) || 0) - (baseOrder.get(b.id) || 0);
-  }}
-
-  function sortedFunctions(items) {{
-    return items.slice().sort((a, b) => {{
-      let result = compareByKey(a, b, sortState.key);
-      if (sortState.direction === "desc") result = -result;
-      if (result !== 0) return result;
-      return compareBaseOrder(a, b);
-    }});
-  }}
-
-  function sortedFiles(items) {{
-    return items.slice().sort((a, b) => {{
-      let result = compareFileByKey(a, b, fileSortState.key);
-      if (fileSortState.direction === "desc") result = -result;
-      if (result !== 0) return result;
-      return compareText(a.path, b.path);
-    }});
-  }}
-
-  function renderSortMarks() {{
-    for (const button of sortButtons) {{
-      const mark = button.querySelector(".dep-sort-mark");
-      if (!mark) continue;
-      if (button.getAttribute("data-sort-key") === sortState.key) {{
-        mark.textContent = sortState.direction === "asc" ? "▲" : "▼";
-      }} else {{
-        mark.textContent = "";
-      }}
-    }}
-  }}
-
-  function renderFileSortMarks() {{
-    for (const button of fileSortButtons) {{
-      const mark = button.querySelector(".dep-sort-mark");
-      if (!mark) continue;
-      if (button.getAttribute("data-file-sort-key") === fileSortState.key) {{
-        mark.textContent = fileSortState.direction === "asc" ? "▲" : "▼";
-      }} else {{
-        mark.textContent = "";
-      }}
-    }}
-  }}
-
-  function activateTab(tabId) {{
-    const previousTab = activeTab;
-    const immediateOverviewUpdate = tabId === "overviewPanel" && activeTab !== "overviewPanel";
-    activeTab = tabId;
-    for (const item of tabButtons) {{
-      item.classList.toggle("active", item.getAttribute("data-tab-target") === activeTab);
-    }}
-    for (const panel of tabPanels) {{
-      panel.classList.toggle("active", panel.id === activeTab);
-    }}
-    abortOverviewInitializationOnTabLeave(previousTab, activeTab);
-    refreshActiveGraph({{ immediate: immediateOverviewUpdate }});
-    if (activeTab === "functionListPanel" && pendingFunctionListScroll) {{
-      syncSelectedRowScroll(true);
-    }}
-    if (activeTab === "fileListPanel" && pendingFileListScroll) {{
-      syncSelectedFileRowScroll(true);
-    }}
-    updateUrlHashFromState();
-    updateDocumentTitle();
-  }}
-
-  function selectedFunctionTitleText(fn) {{
-    if (!fn) return "";
-    return text(fn.file) + "@" + text(fn.name || fn.id);
-  }}
-
-  function selectedEdgeTitleText(edgeKey) {{
-    const parts = text(edgeKey).split("\\n");
-    const fromFile = parts[0] || "";
-    const toFile = parts[1] || "";
-    if (!fromFile || !toFile) return "";
-    return fromFile + " ~ " + toFile;
-  }}
-
-  function updateDocumentTitle() {{
-    const tabTitleNames = {{
-      functionListPanel: "関数一覧",
-      fileListPanel: "ファイル一覧",
-      overviewPanel: "全体マップ"
-    }};
-    const parts = ["依存関係レポート", tabTitleNames[activeTab] || "関数一覧"];
-    let selectionText = "";
-    if (selectedEdgeKey) {{
-      selectionText = selectedEdgeTitleText(selectedEdgeKey);
-    }} else if (selectedId) {{
-      selectionText = selectedFunctionTitleText(byId.get(selectedId));
-    }} else if (selectedFilePath) {{
-      selectionText = selectedFilePath;
-    }}
-    if (selectionText) parts.push(selectionText);
-    document.title = parts.join(" - ");
-  }}
-
-  // タブと選択状態を URL ハッシュ (#tab=...&fn=... / &file=... / &edge=...) で共有できるようにする。
-  // file:// の固定 URL でも機能するよう、クエリ文字列でなくハッシュ フラグメントを使う。
-  const urlHashTabNames = {{
-    functionListPanel: "functions",
-    fileListPanel: "files",
-    overviewPanel: "overview"
-  }};
-  const urlHashPanelIds = {{
-    functions: "functionListPanel",
-    files: "fileListPanel",
-    overview: "overviewPanel"
-  }};
-  let applyingUrlHash = false;
-
-  function encodeEdgeHashPart(value) {{
-    return encodeURIComponent(value).replace(/~/g, "%7E");
-  }}
-
-  function edgeHashValue(edgeKey) {{
-    const parts = text(edgeKey).split("\\n");
-    if (parts.length < 2 || !parts[0] || !parts[1]) return "";
-    return encodeEdgeHashPart(parts[0]) + "~" + encodeEdgeHashPart(parts[1]);
-  }}
-
-  function currentUrlHashString() {{
-    const params = ["tab=" + (urlHashTabNames[activeTab] || "functions")];
-    const edgeValue = selectedEdgeKey ? edgeHashValue(selectedEdgeKey) : "";
-    if (edgeValue) {{
-      params.push("edge=" + edgeValue);
-    }} else if (selectedId) {{
-      params.push("fn=" + encodeURIComponent(selectedId));
-    }} else if (selectedFilePath) {{
-      params.push("file=" + encodeURIComponent(selectedFilePath));
-    }}
-    return "#" + params.join("&");
-  }}
-
-  function updateUrlHashFromState() {{
-    if (applyingUrlHash) return;
-    const next = currentUrlHashString();
-    if (window.location.hash === next) return;
-    try {{
-      // replaceState なら再読み込みも履歴の増加も起きない (file:// でも動作する)。
-      window.history.replaceState(null, "", next);
-    }} catch (err) {{
-      window.location.hash = next.slice(1);
-    }}
-  }}
-
-  function rawHashParam(rawHash, key) {{
-    const prefix = key + "=";
-    for (const part of rawHash.split("&")) {{
-      if (part.startsWith(prefix)) return part.slice(prefix.length);
-    }}
-    return "";
-  }}
-
-  function edgeKeyFromHash(rawHash) {{
-    const rawEdge = rawHashParam(rawHash, "edge");
-    if (!rawEdge) return "";
-    const separator = rawEdge.indexOf("~");
-    if (separator <= 0 || separator === rawEdge.length - 1) return "";
-    try {{
-      const fromFile = decodeURIComponent(rawEdge.slice(0, separator));
-      const toFile = decodeURIComponent(rawEdge.slice(separator + 1));
-      const edgeKey = overviewEdgeKey(fromFile, toFile);
-      return fileEdgeByKey.has(edgeKey) ? edgeKey : "";
-    }} catch (err) {{
-      return "";
-    }}
-  }}
-
-  function applyStateFromUrlHash() {{
-    const rawHash = window.location.hash.replace(/^#/, "");
-    if (!rawHash) {{
-      updateDocumentTitle();
-      return;
-    }}
-    let params = null;
-    try {{
-      params = new URLSearchParams(rawHash);
-    }} catch (err) {{
-      return;
-    }}
-    applyingUrlHash = true;
-    try {{
-      const edgeKey = edgeKeyFromHash(rawHash);
-      const fnId = params.get("fn") || "";
-      const filePath = params.get("file") || "";
-      if (edgeKey) {{
-        selectOverviewEdge(edgeKey);
-      }} else if (fnId && byId.has(fnId)) {{
-        selectFunction(fnId);
-      }} else if (filePath && fileByPath.has(filePath)) {{
-        selectFile(filePath);
-      }}
-      const panelId = urlHashPanelIds[params.get("tab") || ""] || "";
-      if (panelId && panelId !== activeTab) activateTab(panelId);
-    }} finally {{
-      applyingUrlHash = false;
-    }}
-    // 不正値を取り除いた正規形へ書き戻す。
-    updateUrlHashFromState();
-    updateDocumentTitle();
-  }}
-
-  function addMetric(label, value) {{
-    const item = document.createElement("div");
-    item.className = "dep-metric";
-    item.innerHTML = "<strong>" + escapeHtml(value) + "</strong><span>" + escapeHtml(label) + "</span>";
-    summary.appendChild(item);
-  }}
-
-  function shortPath(path) {{
-    const parts = text(path).split("/");
-    return parts[parts.length - 1] || text(path);
-  }}
-
-  function graphClassFor(klass) {{
-    if (klass === "cycle") return "dep-danger-node";
-    if (
-      klass === "leaf-static" ||
-      klass === "include-static-leaf" ||
-      klass === "include-internal-static-leaf" ||
-      klass === "leaf-global"
-    ) return "dep-leaf-node";
-    if (klass === "file-local") return "dep-local-node";
-    return "dep-caller-node";
-  }}
-
-  function graphFileClassFor(area) {{
-    if (area === "include" || area === "include_internal" || area === "libsrc") return "dep-file-library-node";
-    if (area === "src") return "dep-file-source-node";
-    return "";
-  }}
-
-  function areaBadgeClass(area) {{
-    if (area === "include" || area === "include_internal" || area === "libsrc") return "area-library";
-    if (area === "src") return "area-source";
-    return "";
-  }}
-
-  function areaBadge(area) {{
-    const classes = ["badge"];
-    const areaClass = areaBadgeClass(area);
-    if (areaClass) classes.push(areaClass);
-    return "<span class=\\"" + classes.map(escapeHtml).join(" ") + "\\">" + escapeHtml(area) + "</span>";
-  }}
-
-  function fileSelectionLink(filePath, label) {{
-    return "<a href=\\"#\\" data-file-path=\\"" + escapeHtml(filePath) + "\\">" + escapeHtml(label || filePath) + "</a>";
-  }}
-
-  function overviewEdgeKey(fromFile, toFile) {{
-    return text(fromFile) + "\\n" + text(toFile);
-  }}
-
-  function buildFileEdges(sourceEdges) {{
-    const edgeMap = new Map();
-    for (const edge of sourceEdges) {{
-      if (edge.callerFile === edge.calleeFile) continue;
-      const key = overviewEdgeKey(edge.callerFile, edge.calleeFile);
-      const current = edgeMap.get(key) || {{
-        id: key,
-        source: edge.callerFile,
-        target: edge.calleeFile,
-        fromFile: edge.callerFile,
-        toFile: edge.calleeFile,
-        weight: 0,
-        label: ""
-      }};
-      current.weight += 1;
-      current.label = String(current.weight);
-      edgeMap.set(key, current);
-    }}
-    return Array.from(edgeMap.values()).sort((a, b) => compareText(a.fromFile, b.fromFile) || compareText(a.toFile, b.toFile));
-  }}
-
-  function graphFunctionWeight(fn) {{
-    const rank = Number(fn.dependencyRank);
-    if (!Number.isFinite(rank)) return 10;
-    return Math.max(2, Math.min(10, rank + 1));
-  }}
-
-  function graphStyle(opts) {{
-    const colors = graphColors();
-    // トランジションは「クラス変更後の計算済みスタイル」に定義がある場合のみ補間される。
-    //   - ミュート クラスに定義 -> ミュート化 (非強調側) はフェード、ミュート解除
-    //     (関連関数・親ファイルの強調復帰) は即時反映。
-    //   - dep-overview-fade は選択解除 (選択中 -> 無選択) の Phase C でのみ一時付与され、
-    //     ミュート解除を通常表示へフェードで戻す (フェード完了後にクラスを除去する)。
-    //     スタイルシート差し替え (fromJson) はトランジションを伴わず適用されるため、
-    //     ベース側への一時的な定義追加では補間が発火しない。クラス付与で行うこと。
-    //   - fadeMode: "none" は duration 0 で完全即時。タブ切替 (suppressFade) やテーマ切替で
-    //     色を即時確定するために使う。
-    const fadeMode = (opts && opts.fadeMode) || "muted";
-    const transitionMs = fadeMode === "none" ? "0ms" : OVERVIEW_FADE_MS + "ms";
-    const baseNodeStyle = {{
-      "label": "data(label)",
-      "font-size": 11,
-      "text-wrap": "wrap",
-      "text-max-width": 120,
-      "text-valign": "center",
-      "text-halign": "center",
-      "background-color": colors.nodeBackground,
-      "border-color": colors.nodeBorder,
-      "border-width": 1,
-      "color": colors.text,
-      "width": "mapData(weight, 1, 12, 42, 86)",
-      "height": "mapData(weight, 1, 12, 42, 86)",
-      "z-index": 1,
-      "z-index-compare": "manual",
-      "z-compound-depth": "bottom"
-    }};
-    const baseEdgeStyle = {{
-      "curve-style": "bezier",
-      "target-arrow-shape": "triangle",
-      "target-arrow-color": colors.edge,
-      "line-color": colors.edge,
-      "opacity": 1,
-      "width": "mapData(weight, 1, 8, 1, 5)",
-      "label": "data(label)",
-      "font-size": 10,
-      "color": colors.edge,
-      "text-background-color": colors.labelBackground,
-      "text-background-opacity": 0.85,
-      "text-background-padding": 2,
-      "z-compound-depth": "bottom",
-      "z-index-compare": "manual",
-      "z-index": 0
-    }};
-    return [
-      {{
-        selector: "node",
-        style: baseNodeStyle
-      }},
-      {{
-        selector: "edge",
-        style: baseEdgeStyle
-      }},
-      {{
-        selector: "node.dep-overview-fade",
-        style: {{
-          "transition-property": "background-color, border-color, color",
-          "transition-duration": transitionMs
-        }}
-      }},
-      {{
-        selector: "edge.dep-overview-fade",
-        style: {{
-          "transition-property": "line-color, target-arrow-color, color",
-          "transition-duration": transitionMs
-        }}
-      }},
-      {{
-        selector: ".dep-leaf-node, .dep-local-node, .dep-caller-node, .dep-danger-node",
-        style: {{
-          "z-index": 4,
-          "z-compound-depth": "top"
-        }}
-      }},
-      {{ selector: ".dep-leaf-node", style: {{ "background-color": colors.leafBackground, "border-color": colors.leafBorder }} }},
-      {{ selector: ".dep-local-node", style: {{ "background-color": colors.localBackground, "border-color": colors.localBorder }} }},
-      {{ selector: ".dep-caller-node", style: {{ "background-color": colors.callerBackground, "border-color": colors.callerBorder }} }},
-      {{ selector: ".dep-danger-node", style: {{ "background-color": colors.dangerBackground, "border-color": colors.dangerBorder }} }},
-      {{ selector: ".dep-file-node", style: {{ "background-color": colors.fileBackground, "border-color": colors.fileBorder, "z-index": 1 }} }},
-      {{ selector: ".dep-center-node", style: {{ "border-width": 2 }} }},
-      {{ selector: ".dep-upstream-node", style: {{ "shape": "round-rectangle" }} }},
-      {{ selector: ".dep-downstream-node", style: {{ "shape": "ellipse" }} }},
-      {{ selector: ".dep-both-node", style: {{ "shape": "diamond" }} }},
-      {{
-        selector: "$node > node",
-        style: {{
-          "shape": "round-rectangle",
-          "background-color": colors.parentBackground,
-          "background-opacity": 0.5,
-          "border-color": colors.fileBorder,
-          "border-width": 1,
-          "label": "data(label)",
-          "text-valign": "top",
-          "text-halign": "center",
-          "text-margin-y": -2,
-          "font-size": 12,
-          "padding": 16,
-          "color": colors.parentText,
-          "z-index": 2,
-          "z-compound-depth": "bottom"
-        }}
-      }},
-      {{ selector: ".dep-file-library-node", style: {{ "background-color": colors.libraryBackground, "border-color": colors.libraryBorder }} }},
-      {{ selector: ".dep-file-source-node", style: {{ "background-color": colors.sourceBackground, "border-color": colors.sourceBorder }} }},
-      {{
-        selector: ".dep-file-node-muted",
-        style: {{
-          "background-color": colors.mutedFileBackground,
-          "border-color": colors.mutedFileBorder,
-          "color": colors.mutedFileText,
-          "transition-property": "background-color, border-color, color",
-          "transition-duration": transitionMs,
-          "z-index": -1
-        }}
-      }},
-      {{
-        selector: ".dep-file-node-muted.dep-file-library-node",
-        style: {{
-          "background-color": colors.mutedLibraryBackground,
-          "border-color": colors.mutedLibraryBorder
-        }}
-      }},
-      {{
-        selector: ".dep-file-node-muted.dep-file-source-node",
-        style: {{
-          "background-color": colors.mutedSourceBackground,
-          "border-color": colors.mutedSourceBorder
-        }}
-      }},
-      {{
-        selector: ".dep-base-edge-muted",
-        style: {{
-          "line-color": colors.mutedEdge,
-          "target-arrow-color": colors.mutedEdge,
-          "color": colors.mutedEdge,
-          "transition-property": "line-color, target-arrow-color, color",
-          "transition-duration": transitionMs,
-          "z-index": -2
-        }}
-      }},
-      {{
-        selector: ".dep-emphasis-edge",
-        style: {{
-          "line-color": colors.emphasisEdge,
-          "target-arrow-color": colors.emphasisEdge,
-          "color": colors.emphasisEdge,
-          "z-index": 2
-        }}
-      }},
-      {{
-        selector: ".dep-selected-edge",
-        style: {{
-          "line-color": colors.emphasisEdge,
-          "target-arrow-color": colors.emphasisEdge,
-          "color": colors.emphasisEdge,
-          "z-index": 2
-        }}
-      }},
-      {{
-        selector: ".dep-function-edge",
-        style: {{
-          "line-color": colors.emphasisEdge,
-          "target-arrow-color": colors.emphasisEdge,
-          "color": colors.emphasisEdge,
-          "z-compound-depth": "top",
-          "z-index": 3
-        }}
-      }},
-      {{
-        selector: ".dep-pull-edge",
-        style: {{
-          "opacity": 0,
-          "events": "no",
-          "width": 1,
-          "target-arrow-shape": "none",
-          "curve-style": "straight"
-        }}
-      }},
-      {{
-        selector: ".dep-selected-file",
-        style: {{
-          "border-width": 2
-        }}
-      }},
-      {{ selector: ":selected", style: {{ "border-width": 2 }} }}
-    ];
-  }}
-
-  function graphUnavailable(container, detailElement) {{
-    container.innerHTML = "<p class=\\"dep-empty\\">Cytoscape.js を読み込めませんでした。</p>";
-    detailElement.innerHTML = "<p class=\\"dep-empty\\">グラフ ライブラリを確認してください。</p>";
-  }}
-
-  function refreshOverviewGraphStyle() {{
-    if (!overviewCy) return;
-    // テーマ切替は全色の差し替えであり、トランジションが効くと全要素が OVERVIEW_FADE_MS
-    // フェードしてしまう。duration 0 のスタイルで色を即時確定してから、既定のスタイル
-    // (fadeMode: "muted") を再適用する。2 回目の適用では色が変化しないため補間は走らない。
-    applyOverviewFadeMode("none");
-    applyOverviewFadeMode("muted");
-  }}
-
-  // 現在のスタイルシートを指定の fadeMode で適用し直す。色は変えないため、モード切替
-  // 自体で補間は走らない (トランジション定義の有無だけが変わる)。
-  function applyOverviewFadeMode(mode) {{
-    if (!overviewCy) return;
-    const styleJson = graphStyle({{ fadeMode: mode }});
-    const style = overviewCy.style();
-    if (style && typeof style.fromJson === "function") {{
-      style.fromJson(styleJson).update();
-      return;
-    }}
-    if (typeof overviewCy.style === "function") {{
-      overviewCy.style(styleJson);
-    }}
-  }}
-
-  // 選択解除時に付与した dep-overview-fade をフェード完了後に除去するタイマー (常に 1 本のみ)。
-  // クラスは transition 定義のみで色を持たないため、除去しても見た目は変わらない。
-  let overviewFadeClassCleanupTimer = null;
-
-  function scheduleOverviewFadeClassCleanup() {{
-    if (overviewFadeClassCleanupTimer !== null) window.clearTimeout(overviewFadeClassCleanupTimer);
-    overviewFadeClassCleanupTimer = window.setTimeout(() => {{
-      overviewFadeClassCleanupTimer = null;
-      if (!overviewCy) return;
-      overviewCy.elements(".dep-overview-fade").removeClass("dep-overview-fade");
-    }}, OVERVIEW_FADE_MS + 60);
-  }}
-
-  function hideOverviewGraphMenu() {{
-    if (!overviewGraphMenu) return;
-    overviewGraphMenu.classList.remove("visible");
-  }}
-
-  function overviewDepthAttrValue(depth) {{
-    if (depth === Infinity) return "all";
-    return String(depth);
-  }}
-
-  function updateOverviewDepthMenuChecks() {{
-    if (!overviewGraphMenu) return;
-    const callerValue = overviewDepthAttrValue(overviewCallerDepth);
-    const calleeValue = overviewDepthAttrValue(overviewCalleeDepth);
-    for (const item of overviewGraphMenu.querySelectorAll("[data-caller-depth]")) {{
-      item.classList.toggle("checked", item.getAttribute("data-caller-depth") === callerValue);
-    }}
-    for (const item of overviewGraphMenu.querySelectorAll("[data-callee-depth]")) {{
-      item.classList.toggle("checked", item.getAttribute("data-callee-depth") === calleeValue);
-    }}
-  }}
-
-  function applyOverviewGraphMenuScope(scope) {{
-    if (!overviewGraphMenu) return;
-    // 各項目は data-menu-scope を持つ。背景の右クリックでは background、ファイル ノードの
-    // 右クリックでは node の項目だけ表示する。未指定の項目は常に表示する。
-    for (const item of overviewGraphMenu.querySelectorAll("[data-menu-scope]")) {{
-      const itemScope = item.getAttribute("data-menu-scope");
-      item.style.display = !itemScope || itemScope === scope ? "" : "none";
-    }}
-    updateOverviewDepthMenuChecks();
-  }}
-
-  function showOverviewGraphMenu(clientX, clientY, scope) {{
-    if (!overviewGraphMenu) return;
-    applyOverviewGraphMenuScope(scope || "background");
-    const margin = 8;
-    overviewGraphMenu.classList.add("visible");
-    overviewGraphMenu.style.left = "0px";
-    overviewGraphMenu.style.top = "0px";
-    const rect = overviewGraphMenu.getBoundingClientRect();
-    const left = Math.min(Math.max(margin, clientX), Math.max(margin, window.innerWidth - rect.width - margin));
-    const top = Math.min(Math.max(margin, clientY), Math.max(margin, window.innerHeight - rect.height - margin));
-    overviewGraphMenu.style.left = left + "px";
-    overviewGraphMenu.style.top = top + "px";
-  }}
-
-  function updateOverviewHiddenNotice() {{
-    if (!overviewHiddenNotice) return;
-    overviewHiddenNotice.classList.toggle("visible", hiddenOverviewFiles.size > 0);
-  }}
-
-  function hideOverviewFile(filePath) {{
-    if (!filePath || hiddenOverviewFiles.has(filePath)) return;
-    // レイアウト計算中 (seed の窓内) の非表示は、実行中レイアウトを中止して操作を反映した上で、
-    // 取り残された seed 関数を再レイアウトする。定常状態の通常非表示では再 sync せず、不要な
-    // 再レイアウトとちらつきを避ける。
-    const resyncForInterrupt = Boolean(overviewActiveLayout ||
-      (overviewPositionAnimation && overviewPositionAnimation.active));
-    let savedPosition = null;
-    if (overviewCy) {{
-      const node = overviewCy.getElementById(filePath);
-      if (node && node.length) {{
-        const position = node.position();
-        savedPosition = {{ x: position.x, y: position.y }};
-        // UI 用語は「非表示」だが、描画を軽くするため実体を削除する。compound 子の
-        // 関数ノードと接続エッジは Cytoscape が連動して削除する。割り込み時はここで削除せず、
-        // 再 sync の stale 削除に委ねる (layoutNeeded が立ち、中止された関数が Phase B へ再投入される)。
-        if (!resyncForInterrupt) {{
-          overviewCy.batch(() => {{
-            node.remove();
-          }});
-        }}
-      }}
-    }}
-    hiddenOverviewFiles.set(filePath, savedPosition);
-    updateOverviewHiddenNotice();
-    if (resyncForInterrupt) forceRenderOverviewGraph();
-  }}
-
-  // 非表示ファイルをすべて元の位置に再表示する。選択状態や詳細ペインは変えない。
-  function revealAllOverviewFiles() {{
-    if (hiddenOverviewFiles.size === 0) return;
-    for (const [path, position] of hiddenOverviewFiles) {{
-      if (position) overviewRestorePositions.set(path, position);
-    }}
-    hiddenOverviewFiles.clear();
-    updateOverviewHiddenNotice();
-    forceRenderOverviewGraph();
-  }}
-
-  function suppressOverviewBackgroundTap() {{
-    const now = window.performance && typeof window.performance.now === "function" ? window.performance.now() : Date.now();
-    overviewSuppressBackgroundTapUntil = now + 500;
-  }}
-
-  function isOverviewBackgroundTapSuppressed() {{
-    const now = window.performance && typeof window.performance.now === "function" ? window.performance.now() : Date.now();
-    return now <= overviewSuppressBackgroundTapUntil;
-  }}
-
-  function overviewFitElements() {{
-    if (!overviewCy) return undefined;
-    return overviewCy.elements(":visible").not(".dep-pull-edge");
-  }}
-
-  function fitOverviewGraph() {{
-    if (overviewCy) overviewCy.fit(overviewFitElements(), 30);
-  }}
-
-  function overviewViewport() {{
-    if (!overviewCy) return null;
-    const pan = overviewCy.pan();
-    return {{
-      zoom: overviewCy.zoom(),
-      pan: {{ x: pan.x, y: pan.y }}
-    }};
-  }}
-
-  function restoreOverviewViewport(viewport) {{
-    if (!overviewCy || !viewport) return;
-    overviewCy.zoom(viewport.zoom);
-    overviewCy.pan(viewport.pan);
-  }}
-
-  function requestOverviewFrame(callback) {{
-    const requestFrame = window.requestAnimationFrame || window.webkitRequestAnimationFrame || ((fn) => window.setTimeout(() => fn(Date.now()), 16));
-    requestFrame(callback);
-  }}
-
-  function scheduleOverviewRelayoutReveal(opts) {{
-    const viewport = opts && opts.viewport ? opts.viewport : null;
-    const revealToken = ++overviewRelayoutRevealToken;
-    const waitUntilReady = () => {{
-      if (revealToken !== overviewRelayoutRevealToken) return;
-      if (activeTab === "overviewPanel" && !isOverviewRenderedSelectionCurrent()) {{
-        requestOverviewFrame(waitUntilReady);
-        return;
-      }}
-      restoreOverviewViewport(viewport);
-      requestOverviewFrame(() => {{
-        requestOverviewFrame(() => {{
-          if (revealToken !== overviewRelayoutRevealToken) return;
-          if (activeTab === "overviewPanel" && !isOverviewRenderedSelectionCurrent()) {{
-            waitUntilReady();
-            return;
-          }}
-          if (overviewGraph) overviewGraph.classList.remove("layout-relayouting");
-          setOverviewControlsInert(false);
-        }});
-      }});
-    }};
-    waitUntilReady();
-  }}
-
-  function setOverviewControlsInert(inert) {{
-    if (overviewGraphShell) overviewGraphShell.classList.toggle("controls-inert", inert);
-  }}
-
-  function setOverviewGraphInteractionLocked(locked) {{
-    if (!overviewCy) return;
-    if (locked) {{
-      if (overviewInteractionStateBeforeLayout !== null) return;
-      overviewInteractionStateBeforeLayout = {{
-        panningEnabled: overviewCy.panningEnabled(),
-        zoomingEnabled: overviewCy.zoomingEnabled(),
-        autoungrabify: overviewCy.autoungrabify(),
-        boxSelectionEnabled: overviewCy.boxSelectionEnabled()
-      }};
-      overviewCy.panningEnabled(false);
-      overviewCy.zoomingEnabled(false);
-      overviewCy.autoungrabify(true);
-      overviewCy.boxSelectionEnabled(false);
-      return;
-    }}
-    if (overviewInteractionStateBeforeLayout === null) return;
-    overviewCy.panningEnabled(overviewInteractionStateBeforeLayout.panningEnabled);
-    overviewCy.zoomingEnabled(overviewInteractionStateBeforeLayout.zoomingEnabled);
-    overviewCy.autoungrabify(overviewInteractionStateBeforeLayout.autoungrabify);
-    overviewCy.boxSelectionEnabled(overviewInteractionStateBeforeLayout.boxSelectionEnabled);
-    overviewInteractionStateBeforeLayout = null;
-  }}
-
-  function setOverviewLayoutRunning(running) {{
-    overviewLayoutRunning = running;
-    setOverviewControlsInert(running);
-    setOverviewGraphInteractionLocked(running);
-    if (!running && overviewGraph) overviewGraph.classList.remove("layout-relayouting");
-    if (!running && overviewLayoutWatchdog !== null) {{
-      window.clearTimeout(overviewLayoutWatchdog);
-      overviewLayoutWatchdog = null;
-    }}
-  }}
-
-  function relayoutOverviewGraph() {{
-    if (!overviewCy || overviewLayoutRunning) return;
-    const layoutToken = ++overviewLayoutToken;
-    setOverviewLayoutRunning(true);
-    requestOverviewFrame(() => {{
-      requestOverviewFrame(() => {{
-        if (!overviewCy || layoutToken !== overviewLayoutToken) {{
-          setOverviewLayoutRunning(false);
-          return;
-        }}
-        overviewLayoutWatchdog = window.setTimeout(() => {{
-          if (layoutToken === overviewLayoutToken) setOverviewLayoutRunning(false);
-        }}, 8000);
-        runOverviewLayout({{
-          manual: true,
-          layoutToken: layoutToken,
-          onComplete: () => {{
-            if (layoutToken === overviewLayoutToken) setOverviewLayoutRunning(false);
-          }}
-        }});
-      }});
-    }});
-  }}
-
-  function resetOverviewGraphState() {{
-    overviewCallerDepth = 1;
-    overviewCalleeDepth = 1;
-    clearSelection();
-  }}
-
-  function parseOverviewDepthValue(value) {{
-    if (value === "all") return Infinity;
-    const parsed = Number(value);
-    return Number.isFinite(parsed) ? parsed : 1;
-  }}
-
-  // 呼び出し元/先の表示深さを変更する。関数選択中はマップへ即時反映する。
-  function setOverviewDepth(kind, value) {{
-    const depth = parseOverviewDepthValue(value);
-    const changed = kind === "caller" ? depth !== overviewCallerDepth : depth !== overviewCalleeDepth;
-    if (kind === "caller") overviewCallerDepth = depth; else overviewCalleeDepth = depth;
-    if (!changed) return;
-    if (selectedId && activeTab === "overviewPanel") forceRenderOverviewGraph();
-  }}
-
-  function handleOverviewGraphMenuAction(action) {{
-    if (action === "fit") {{
-      fitOverviewGraph();
-      return true;
-    }}
-    if (action === "relayout") {{
-      relayoutOverviewGraph();
-      return true;
-    }}
-    if (action === "reset") {{
-      resetOverviewGraphState();
-      return true;
-    }}
-    if (action === "hide-file") {{
-      if (overviewMenuTargetFile) hideOverviewFile(overviewMenuTargetFile);
-      return true;
-    }}
-    return false;
-  }}
-
-  function downloadTextFile(fileName, textContent, mimeType) {{
-    const url = URL.createObjectURL(new Blob([textContent], {{ type: mimeType }}));
-    const tmp = document.createElement("a");
-    tmp.href = url;
-    tmp.setAttribute("download", fileName);
-    document.body.appendChild(tmp);
-    tmp.click();
-    document.body.removeChild(tmp);
-    setTimeout(() => URL.revokeObjectURL(url), 1000);
-  }}
-
-  function graphStyleValue(element, name, fallback) {{
-    const value = element.style(name);
-    if (value === null || value === undefined || value === "") return fallback;
-    return value;
-  }}
-
-  function graphStyleNumber(element, name, fallback) {{
-    const value = Number(graphStyleValue(element, name, fallback));
-    if (Number.isFinite(value)) return value;
-    return fallback;
-  }}
-
-  function svgPoint(element, scope) {{
-    if (scope === "viewport") return element.renderedPosition();
-    return element.position();
-  }}
-
-  function svgBox(element, scope) {{
-    const box = scope === "viewport"
-      ? element.renderedBoundingBox({{ includeLabels: true, includeOverlays: false }})
-      : element.boundingBox({{ includeLabels: true, includeOverlays: false }});
-    return {{
-      x1: box.x1,
-      y1: box.y1,
-      x2: box.x2,
-      y2: box.y2,
-      w: Math.max(1, box.w),
-      h: Math.max(1, box.h)
-    }};
-  }}
-
-  function svgElementBounds(scope) {{
-    if (!overviewCy || overviewCy.elements().length === 0) {{
-      return {{ x1: 0, y1: 0, x2: overviewGraph.clientWidth, y2: overviewGraph.clientHeight }};
-    }}
-    if (scope === "viewport") {{
-      return {{ x1: 0, y1: 0, x2: overviewCy.width(), y2: overviewCy.height() }};
-    }}
-    const box = overviewCy.elements(":visible").not(".dep-pull-edge").boundingBox({{ includeLabels: true, includeOverlays: false }});
-    const padding = 40;
-    return {{
-      x1: box.x1 - padding,
-      y1: box.y1 - padding,
-      x2: box.x2 + padding,
-      y2: box.y2 + padding
-    }};
-  }}
-
-  function svgShapeForNode(node, point, width, height, fill, stroke, strokeWidth) {{
-    const shape = graphStyleValue(node, "shape", "ellipse");
-    const attrs = " fill=\\"" + escapeXml(fill) + "\\" stroke=\\"" + escapeXml(stroke) + "\\" stroke-width=\\"" + escapeXml(strokeWidth) + "\\"";
-    if (shape === "diamond") {{
-      const x = point.x;
-      const y = point.y;
-      const hw = width / 2;
-      const hh = height / 2;
-      return "<polygon points=\\"" + [x, y - hh, x + hw, y, x, y + hh, x - hw, y].map((value) => Number(value).toFixed(2)).join(" ") + "\\"" + attrs + "/>";
-    }}
-    if (shape === "round-rectangle" || shape === "roundrectangle" || node.isParent()) {{
-      const x = point.x - width / 2;
-      const y = point.y - height / 2;
-      return "<rect x=\\"" + x.toFixed(2) + "\\" y=\\"" + y.toFixed(2) + "\\" width=\\"" + width.toFixed(2) + "\\" height=\\"" + height.toFixed(2) + "\\" rx=\\"10\\" ry=\\"10\\"" + attrs + "/>";
-    }}
-    return "<ellipse cx=\\"" + point.x.toFixed(2) + "\\" cy=\\"" + point.y.toFixed(2) + "\\" rx=\\"" + (width / 2).toFixed(2) + "\\" ry=\\"" + (height / 2).toFixed(2) + "\\"" + attrs + "/>";
-  }}
-
-  function svgText(label, x, y, fontSize, color, anchor) {{
-    if (!label) return "";
-    return "<text x=\\"" + x.toFixed(2) + "\\" y=\\"" + y.toFixed(2) + "\\" text-anchor=\\"" + escapeXml(anchor || "middle") + "\\" dominant-baseline=\\"middle\\" font-family=\\"system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif\\" font-size=\\"" + escapeXml(fontSize) + "\\" fill=\\"" + escapeXml(color) + "\\">" + escapeXml(label) + "</text>";
-  }}
-
-  function svgArrow(start, end, size, fill, opacity) {{
-    const angle = Math.atan2(end.y - start.y, end.x - start.x);
-    const spread = Math.PI / 7;
-    const p1 = {{
-      x: end.x - Math.cos(angle - spread) * size,
-      y: end.y - Math.sin(angle - spread) * size
-    }};
-    const p2 = {{
-      x: end.x - Math.cos(angle + spread) * size,
-      y: end.y - Math.sin(angle + spread) * size
-    }};
-    const points = [end.x, end.y, p1.x, p1.y, p2.x, p2.y].map((value) => Number(value).toFixed(2)).join(" ");
-    return "<polygon points=\\"" + points + "\\" fill=\\"" + escapeXml(fill) + "\\" opacity=\\"" + escapeXml(opacity) + "\\"/>";
-  }}
-
-  function svgNode(node, scope) {{
-    const point = svgPoint(node, scope);
-    const box = svgBox(node, scope);
-    const width = scope === "viewport" ? Math.max(1, node.renderedWidth()) : Math.max(1, node.width());
-    const height = scope === "viewport" ? Math.max(1, node.renderedHeight()) : Math.max(1, node.height());
-    const shapeWidth = node.isParent() ? box.w : width;
-    const shapeHeight = node.isParent() ? box.h : height;
-    const shapePoint = node.isParent() ? {{ x: (box.x1 + box.x2) / 2, y: (box.y1 + box.y2) / 2 }} : point;
-    const fill = graphStyleValue(node, "background-color", "#ffffff");
-    const stroke = graphStyleValue(node, "border-color", "#64748b");
-    const strokeWidth = graphStyleNumber(node, "border-width", 1);
-    const fontSize = graphStyleNumber(node, "font-size", node.isParent() ? 12 : 11);
-    const color = graphStyleValue(node, "color", "#111827");
-    const labelY = node.isParent() ? box.y1 + Math.max(14, fontSize - 2) : point.y;
-    return svgShapeForNode(node, shapePoint, shapeWidth, shapeHeight, fill, stroke, strokeWidth) +
-      svgText(node.data("label"), point.x, labelY, fontSize, color, "middle");
-  }}
-
-  function svgEdge(edge, scope) {{
-    if (edge.hasClass("dep-pull-edge")) return "";
-    const source = edge.source();
-    const target = edge.target();
-    if (!source.length || !target.length) return "";
-    const start = svgPoint(source, scope);
-    const end = svgPoint(target, scope);
-    const stroke = graphStyleValue(edge, "line-color", "#94a3b8");
-    const strokeWidth = Math.max(1, graphStyleNumber(edge, "width", 1));
-    const opacity = graphStyleValue(edge, "opacity", "1");
-    const midX = (start.x + end.x) / 2;
-    const midY = (start.y + end.y) / 2;
-    const label = edge.data("label");
-    const fontSize = graphStyleNumber(edge, "font-size", 10);
-    const color = graphStyleValue(edge, "color", "#111827");
-    return "<line x1=\\"" + start.x.toFixed(2) + "\\" y1=\\"" + start.y.toFixed(2) + "\\" x2=\\"" + end.x.toFixed(2) + "\\" y2=\\"" + end.y.toFixed(2) + "\\" stroke=\\"" + escapeXml(stroke) + "\\" stroke-width=\\"" + escapeXml(strokeWidth) + "\\" opacity=\\"" + escapeXml(opacity) + "\\"/>" +
-      svgArrow(start, end, Math.max(7, strokeWidth + 6), stroke, opacity) +
-      (label ? "<rect x=\\"" + (midX - 10).toFixed(2) + "\\" y=\\"" + (midY - 8).toFixed(2) + "\\" width=\\"20\\" height=\\"16\\" rx=\\"3\\" fill=\\"" + escapeXml(cssVar("--dep-graph-label-bg") || "#ffffff") + "\\" opacity=\\"0.85\\"/>" + svgText(label, midX, midY, fontSize, color, "middle") : "");
-  }}
-
-  function overviewSvgOrderedElements() {{
-    if (!overviewCy) return [];
-    const visibleEdges = overviewCy.edges(":visible");
-    const visibleNodes = overviewCy.nodes(":visible");
-    const mutedFileEdges = visibleEdges
-      .filter((edge) => !edge.hasClass("dep-function-edge") && edge.hasClass("dep-base-edge-muted"))
-      .toArray();
-    const mutedFileNodes = visibleNodes
-      .filter((node) => !node.isParent() && node.hasClass("dep-file-node") && node.hasClass("dep-file-node-muted"))
-      .toArray();
-    const fileEdges = visibleEdges
-      .filter((edge) => !edge.hasClass("dep-function-edge") && !edge.hasClass("dep-base-edge-muted") && !edge.hasClass("dep-emphasis-edge") && !edge.hasClass("dep-selected-edge"))
-      .toArray();
-    const fileOverviewNodes = visibleNodes
-      .filter((node) => !node.isParent() && node.hasClass("dep-file-node") && !node.hasClass("dep-file-node-muted"))
-      .toArray();
-    const fileDetailNodes = visibleNodes.filter((node) => node.isParent()).toArray();
-    const emphasisEdges = visibleEdges
-      .filter((edge) => edge.hasClass("dep-function-edge") || edge.hasClass("dep-emphasis-edge") || edge.hasClass("dep-selected-edge"))
-      .toArray();
-    const functionNodes = visibleNodes.filter((node) => !node.isParent() && !node.hasClass("dep-file-node")).toArray();
-    return mutedFileEdges.concat(mutedFileNodes, fileEdges, fileOverviewNodes, fileDetailNodes, emphasisEdges, functionNodes);
-  }}
-
-  function buildOverviewSvg(scope) {{
-    if (!overviewCy) return "";
-    stopOverviewPositionAnimation();
-    const bounds = svgElementBounds(scope);
-    const width = Math.max(1, bounds.x2 - bounds.x1);
-    const height = Math.max(1, bounds.y2 - bounds.y1);
-    const elementsSvg = overviewSvgOrderedElements()
-      .map((element) => element.isEdge() ? svgEdge(element, scope) : svgNode(element, scope))
-      .join("");
-    const colors = graphColors();
-    return "<?xml version=\\"1.0\\" encoding=\\"UTF-8\\"?>\\n" +
-      "<svg xmlns=\\"http://www.w3.org/2000/svg\\" width=\\"" + width.toFixed(0) + "\\" height=\\"" + height.toFixed(0) + "\\" viewBox=\\"" + bounds.x1.toFixed(2) + " " + bounds.y1.toFixed(2) + " " + width.toFixed(2) + " " + height.toFixed(2) + "\\" role=\\"img\\">" +
-      "<title>" + escapeXml("依存関係マップ") + "</title>" +
-      "<rect x=\\"" + bounds.x1.toFixed(2) + "\\" y=\\"" + bounds.y1.toFixed(2) + "\\" width=\\"" + width.toFixed(2) + "\\" height=\\"" + height.toFixed(2) + "\\" fill=\\"" + escapeXml(colors.background) + "\\"/>" +
-      elementsSvg +
-      "</svg>\\n";
-  }}
-
-  function downloadOverviewSvg(scope) {{
-    if (!overviewCy) return;
-    const safeCategory = safeFileNamePart(reportCategory);
-    const suffix = scope === "full" ? "full" : "viewport";
-    const svg = buildOverviewSvg(scope);
-    if (!svg) return;
-    downloadTextFile("dependency-map-" + safeCategory + "-" + suffix + ".svg", svg, "image/svg+xml;charset=utf-8");
-  }}
-
-  function downloadOverviewPng(scope) {{
-    if (!overviewCy) return;
-    stopOverviewPositionAnimation();
-    const safeCategory = safeFileNamePart(reportCategory);
-    const suffix = scope === "full" ? "full" : "viewport";
-    const colors = graphColors();
-    const png = overviewCy.png({{
-      full: scope === "full",
-      bg: colors.background,
-      output: "base64uri"
-    }});
-    if (!png) return;
-    const tmp = document.createElement("a");
-    tmp.href = png;
-    tmp.setAttribute("download", "dependency-map-" + safeCategory + "-" + suffix + ".png");
-    document.body.appendChild(tmp);
-    tmp.click();
-    document.body.removeChild(tmp);
-  }}
-
-  function renderOverviewDetail(filePath) {{
-    const file = fileByPath.get(filePath) || {{}};
-    const rows = (functionsByFile.get(filePath) || []).slice().sort((a, b) => compareBaseOrder(a, b));
-    const items = rows
-      .map((fn) => "<li><button type=\\"button\\" class=\\"dep-neighbor-button\\" data-function-id=\\"" + escapeHtml(fn.id) + "\\">" + escapeHtml(fn.name) + "</button> <small>" + escapeHtml(fn.dependencyClass) + "</small></li>")
-      .join("");
-    overviewDetail.innerHTML =
-      "<h2>" + escapeHtml(shortPath(filePath)) + "</h2>" +
-      (file.brief ? "<p class=\\"dep-brief\\">" + escapeHtml(file.brief) + "</p>" : "") +
-      "<dl>" +
-      "<dt>領域</dt><dd>" + areaBadge(file.dominantArea || "") + "</dd>" +
-      "<dt>ファイル</dt><dd>" + escapeHtml(filePath) + "</dd>" +
-      "<dt>export</dt><dd>" + escapeHtml(file.exportCount || 0) + "</dd>" +
-      "<dt>関数</dt><dd>" + escapeHtml(file.functionCount || rows.length) + "</dd>" +
-      "<dt>リンク</dt><dd>" + [pageLinkFor(file, true), linkFor(file, "Doxygen", false), linkFor(file, "Source", true)].filter(Boolean).join(" / ") + "</dd>" +
-      "</dl>" +
-      (items ? "<strong>関数</strong><ul>" + items + "</ul>" : "<p class=\\"dep-empty\\">関数はありません。</p>");
-    bindOverviewActions();
-  }}
-
-  function bindFileDetailActions() {{
-    for (const button of fileDetail.querySelectorAll("[data-function-id]")) {{
-      button.addEventListener("click", () => selectFunction(button.getAttribute("data-function-id"), {{ activateFunctionList: true }}));
-    }}
-    for (const link of fileDetail.querySelectorAll("[data-file-path]")) {{
-      link.addEventListener("click", (event) => {{
-        event.preventDefault();
-        selectFile(link.getAttribute("data-file-path"));
-      }});
-    }}
-  }}
-
-  function renderFileDetail(filePath) {{
-    const file = fileByPath.get(filePath);
-    if (!file) {{
-      fileDetail.innerHTML = "<p class=\\"dep-empty\\">ファイルを選択してください。</p>";
-      return;
-    }}
-    const rows = (functionsByFile.get(filePath) || []).slice().sort((a, b) => compareBaseOrder(a, b));
-    const items = rows
-      .map((fn) => "<li><button type=\\"button\\" class=\\"dep-neighbor-button\\" data-function-id=\\"" + escapeHtml(fn.id) + "\\">" + escapeHtml(fn.name) + "</button> <small>" + escapeHtml(fn.dependencyClass) + "</small></li>")
-      .join("");
-    fileDetail.innerHTML =
-      "<h2>" + escapeHtml(shortPath(filePath)) + "</h2>" +
-      (file.brief ? "<p class=\\"dep-brief\\">" + escapeHtml(file.brief) + "</p>" : "") +
-      "<dl>" +
-      "<dt>領域</dt><dd>" + areaBadge(file.dominantArea || "") + "</dd>" +
-      "<dt>ファイル</dt><dd>" + escapeHtml(filePath) + "</dd>" +
-      "<dt>関数</dt><dd>" + escapeHtml(file.functionCount || rows.length) + "</dd>" +
-      "<dt>export</dt><dd>" + escapeHtml(file.exportCount || 0) + "</dd>" +
-      "<dt>static</dt><dd>" + escapeHtml(file.staticCount || 0) + "</dd>" +
-      "<dt>呼び出し</dt><dd>" + escapeHtml(file.edgeCount || 0) + "</dd>" +
-      "<dt>level</dt><dd>" + escapeHtml(fileLevelText(file)) + "</dd>" +
-      "<dt>分類</dt><dd>" + escapeHtml(fileClassText(file)) + "</dd>" +
-      "<dt>領域内訳</dt><dd>" + escapeHtml(fileAreasText(file)) + "</dd>" +
-      "<dt>リンク</dt><dd>" + [pageLinkFor(file, true), linkFor(file, "Doxygen", false), linkFor(file, "Source", true)].filter(Boolean).join(" / ") + "</dd>" +
-      "</dl>" +
-      (items ? "<strong>関数</strong><ul>" + items + "</ul>" : "<p class=\\"dep-empty\\">関数はありません。</p>");
-    bindFileDetailActions();
-  }}
-
-  function renderOverviewFunctionDetail(fn) {{
-    overviewDetail.innerHTML =
-      "<h2>" + escapeHtml(fn.name) + "</h2>" +
-      (fn.brief ? "<p class=\\"dep-brief\\">" + escapeHtml(fn.brief) + "</p>" : "") +
-      "<dl>" +
-      "<dt>分類</dt><dd><span class=\\"badge " + escapeHtml(fn.dependencyClass) + "\\">" + escapeHtml(fn.dependencyClass) + "</span></dd>" +
-      "<dt>level</dt><dd>" + escapeHtml(levelText(fn)) + "</dd>" +
-      "<dt>領域</dt><dd>" + areaBadge(fn.sourceArea) + "</dd>" +
-      "<dt>呼び出し種別</dt><dd>" + escapeHtml(fn.dominantCallKind) + "</dd>" +
-      "<dt>export</dt><dd>" + (fn.isExported ? "yes" : "no") + "</dd>" +
-      "<dt>static</dt><dd>" + (fn.isStatic ? "yes" : "no") + "</dd>" +
-      "<dt>ファイル</dt><dd>" + fileSelectionLink(fn.file, fn.file) + "</dd>" +
-      "<dt>行</dt><dd>" + escapeHtml(fn.line) + "</dd>" +
-      "<dt>リンク</dt><dd>" + [pageLinkFor(fn, false), linkFor(fn, "Doxygen", false), linkFor(fn, "Source", true)].filter(Boolean).join(" / ") + "</dd>" +
-      "</dl>" +
-      "<div class=\\"dep-neighbors\\">" +
-      "<section><strong>呼び出し先 (ライブラリ内)</strong>" + neighborList(callees.get(fn.id), "対象範囲内の呼び出し先はありません。") + "</section>" +
-      (fn.externalCallees && fn.externalCallees.length > 0 ? "<section><strong>呼び出し先 (外部)</strong>" + externalCalleeList(fn.externalCallees) + "</section>" : "") +
-      "<section><strong>呼び出し元</strong>" + neighborList(callers.get(fn.id), "対象範囲内の呼び出し元はありません。") + "</section>" +
-      cycleGroupSection(fn) +
-      "</div>";
-    bindOverviewActions();
-  }}
-
-  function fileArea(filePath) {{
-    const file = fileByPath.get(filePath);
-    if (file && file.dominantArea) return file.dominantArea;
-    const rows = functionsByFile.get(filePath) || [];
-    return rows.length > 0 ? rows[0].sourceArea : "";
-  }}
-
-  function edgeFunctionPairs(fromFile, toFile) {{
-    return (edgePairsByFileKey.get(overviewEdgeKey(fromFile, toFile)) || [])
-      .map((edge) => {{
-        return {{ caller: byId.get(edge.caller), callee: byId.get(edge.callee) }};
-      }})
-      .filter((pair) => pair.caller && pair.callee)
-      .sort((a, b) => compareBaseOrder(a.caller, b.caller) || compareBaseOrder(a.callee, b.callee));
-  }}
-
-  function edgePairList(fromFile, toFile) {{
-    const pairs = edgeFunctionPairs(fromFile, toFile);
-    if (pairs.length === 0) return "<p class=\\"dep-empty\\">対象範囲内の呼び出しはありません。</p>";
-    const items = pairs.map((pair) => {{
-      return "<li>" +
-        "<button type=\\"button\\" class=\\"dep-neighbor-button\\" data-function-id=\\"" + escapeHtml(pair.caller.id) + "\\">" + escapeHtml(pair.caller.name) + "</button>" +
-        " -> " +
-        "<button type=\\"button\\" class=\\"dep-neighbor-button\\" data-function-id=\\"" + escapeHtml(pair.callee.id) + "\\">" + escapeHtml(pair.callee.name) + "</button>" +
-        "</li>";
-    }});
-    return "<ul>" + items.join("") + "</ul>";
-  }}
-
-  function renderOverviewEdgeDetail(edgeKey) {{
-    const parts = text(edgeKey).split("\\n");
-    const fromFile = parts[0] || "";
-    const toFile = parts[1] || "";
-    overviewDetail.innerHTML =
-      "<h2>ファイル間依存</h2>" +
-      "<dl>" +
-      "<dt>from</dt><dd>" + fileSelectionLink(fromFile, fromFile) + " " + areaBadge(fileArea(fromFile)) + "</dd>" +
-      "<dt>to</dt><dd>" + fileSelectionLink(toFile, toFile) + " " + areaBadge(fileArea(toFile)) + "</dd>" +
-      "</dl>" +
-      "<div class=\\"dep-neighbors\\">" +
-      "<section><strong>関数</strong>" + edgePairList(fromFile, toFile) + "</section>" +
-      "</div>";
-    bindOverviewActions();
-  }}
-
-  function bindOverviewActions() {{
-    for (const button of overviewDetail.querySelectorAll("[data-function-id]")) {{
-      button.addEventListener("click", () => selectFunction(button.getAttribute("data-function-id")));
-    }}
-    for (const link of overviewDetail.querySelectorAll("[data-file-path]")) {{
-      link.addEventListener("click", (event) => {{
-        event.preventDefault();
-        selectFile(link.getAttribute("data-file-path"));
-      }});
-    }}
-  }}
-
-  function overviewSelectionContext(selection) {{
-    return {{
-      selectedId: selection && Object.prototype.hasOwnProperty.call(selection, "selectedId") ? selection.selectedId : selectedId,
-      selectedFilePath: selection && Object.prototype.hasOwnProperty.call(selection, "selectedFilePath") ? selection.selectedFilePath : selectedFilePath,
-      selectedEdgeKey: selection && Object.prototype.hasOwnProperty.call(selection, "selectedEdgeKey") ? selection.selectedEdgeKey : selectedEdgeKey
-    }};
-  }}
-
-  function overviewEmptySelection() {{
-    return {{ selectedId: "", selectedFilePath: "", selectedEdgeKey: "" }};
-  }}
-
-  function overviewSelectionState(edgeMap, selection) {{
-    const context = overviewSelectionContext(selection);
-    const activeFiles = new Set();
-    const activeFileEdges = new Set();
-    const emphasisFileEdges = new Set();
-    if (context.selectedId) {{
-      const visibleFnIds = visibleFunctionIdsForOverview(context);
-      for (const fnId of visibleFnIds) {{
-        const fn = byId.get(fnId);
-        if (fn) activeFiles.add(fn.file);
-      }}
-      return {{ activeFiles: activeFiles, activeFileEdges: activeFileEdges, emphasisFileEdges: emphasisFileEdges, hasSelection: true }};
-    }}
-    if (context.selectedEdgeKey) {{
-      const edge = edgeMap.get(context.selectedEdgeKey);
-      if (edge) {{
-        activeFiles.add(edge.data.fromFile);
-        activeFiles.add(edge.data.toFile);
-        activeFileEdges.add(context.selectedEdgeKey);
-      }}
-      return {{ activeFiles: activeFiles, activeFileEdges: activeFileEdges, emphasisFileEdges: emphasisFileEdges, hasSelection: true }};
-    }}
-    if (context.selectedFilePath) {{
-      activeFiles.add(context.selectedFilePath);
-      for (const edge of edgeMap.values()) {{
-        if (edge.data.fromFile === context.selectedFilePath || edge.data.toFile === context.selectedFilePath) {{
-          activeFiles.add(edge.data.fromFile);
-          activeFiles.add(edge.data.toFile);
-        }}
-        if (edge.data.fromFile === context.selectedFilePath || edge.data.toFile === context.selectedFilePath) {{
-          emphasisFileEdges.add(edge.data.id);
-        }}
-      }}
-      for (const edge of edgeMap.values()) {{
-        if (activeFiles.has(edge.data.fromFile) && activeFiles.has(edge.data.toFile)) {{
-          activeFileEdges.add(edge.data.id);
-        }}
-      }}
-      return {{ activeFiles: activeFiles, activeFileEdges: activeFileEdges, emphasisFileEdges: emphasisFileEdges, hasSelection: true }};
-    }}
-    return {{ activeFiles: activeFiles, activeFileEdges: activeFileEdges, emphasisFileEdges: emphasisFileEdges, hasSelection: false }};
-  }}
-
-  // ファイル ノード/エッジの data は不変 (id/ラベル/weight など) のため、初期化時に 1 回だけ
-  // 構築して毎 sync 再利用する。sync ごとに変わるのは classes と復活位置 (position) のみ。
-  // Phase A の element.data(target.data) は cytoscape が値を要素側へコピーするだけで
-  // 引数オブジェクトを書き換えないため、共有してよい。
-  const overviewFileNodeData = new Map(files.map((file) => [file.path, {{
-    id: file.path,
-    label: shortPath(file.path),
-    weight: Math.max(1, Number(file.functionCount || 1)),
-    path: file.path
-  }}]));
-  const overviewFileEdgeData = new Map(fileEdges.map((edge) => [edge.id, {{
-    id: edge.id,
-    source: edge.source,
-    target: edge.target,
-    kind: "file-edge",
-    fromFile: edge.fromFile,
-    toFile: edge.toFile,
-    label: edge.label,
-    weight: edge.weight
-  }}]));
-
-  function overviewBaseElements(selection) {{
-    const context = overviewSelectionContext(selection);
-    const selectionState = overviewSelectionState(fileEdgeByKey, context);
-    const elements = [];
-    for (const file of files) {{
-      if (hiddenOverviewFiles.has(file.path)) continue;
-      const classes = ["dep-file-node"];
-      const areaClass = graphFileClassFor(file.dominantArea);
-      if (areaClass) classes.push(areaClass);
-      if (!context.selectedId && file.path === context.selectedFilePath) classes.push("dep-selected-file");
-      if (selectionState.hasSelection && !selectionState.activeFiles.has(file.path)) {{
-        classes.push("dep-file-node-muted");
-      }}
-      const fileElement = {{
-        data: overviewFileNodeData.get(file.path),
-        classes: classes.join(" ")
-      }};
-      const restorePosition = overviewRestorePositions.get(file.path);
-      if (restorePosition) fileElement.position = {{ x: restorePosition.x, y: restorePosition.y }};
-      elements.push(fileElement);
-    }}
-    for (const edge of fileEdges) {{
-      if (hiddenOverviewFiles.has(edge.fromFile) || hiddenOverviewFiles.has(edge.toFile)) continue;
-      const classes = [];
-      if (selectedEdgeKey && edge.id === selectedEdgeKey) classes.push("dep-selected-edge");
-      if (selectionState.emphasisFileEdges.has(edge.id)) classes.push("dep-emphasis-edge");
-      if (selectionState.hasSelection && !selectionState.activeFileEdges.has(edge.id)) {{
-        classes.push("dep-base-edge-muted");
-      }}
-      elements.push({{
-        data: overviewFileEdgeData.get(edge.id),
-        classes: classes.join(" ")
-      }});
-    }}
-    return elements;
-  }}
-
-  // 深さ設定 (overviewCallerDepth / overviewCalleeDepth) に基づき、起点から edgeMap
-  // (callers または callees) を辿って到達可能な id 集合を ids へ追加する。
-  // depth 0 は非表示 (追加なし)、1 は起点の 1 段のみ、Infinity は推移閉包 (BFS) で全段。
-  // direction: "caller" は edgeMap (callers) を辿るときのエッジ向き (neighbor -> current)、
-  // "callee" は edgeMap (callees) を辿るときのエッジ向き (current -> neighbor) を表す。
-  // routeEdgeIds には辿った各ステップのエッジ id (関数間エッジ id と同じ "caller->callee" 形式)
-  // を記録する。これにより、選択の展開経路 (ルート) 上のエッジを強調対象として区別できる。
-  function overviewRouteEdgeKey(direction, current, neighbor) {{
-    return direction === "caller" ? (neighbor + "->" + current) : (current + "->" + neighbor);
-  }}
-
-  function collectOverviewRelatedIds(startId, edgeMap, depth, direction, ids, routeEdgeIds) {{
-    if (depth <= 0) return;
-    if (depth === 1) {{
-      for (const c of (edgeMap.get(startId) || [])) {{
-        ids.add(c);
-        routeEdgeIds.add(overviewRouteEdgeKey(direction, startId, c));
-      }}
-      return;
-    }}
-    const visited = new Set([startId]);
-    let frontier = [startId];
-    while (frontier.length > 0) {{
-      const next = [];
-      for (const current of frontier) {{
-        for (const neighbor of (edgeMap.get(current) || [])) {{
-          routeEdgeIds.add(overviewRouteEdgeKey(direction, current, neighbor));
-          if (visited.has(neighbor)) continue;
-          visited.add(neighbor);
-          ids.add(neighbor);
-          next.push(neighbor);
-        }}
-      }}
-      frontier = next;
-    }}
-  }}
-
-  // relatedFunctionIdsForSelection は 1 回の sync 内で複数箇所 (overviewSelectionState と
-  // buildOverviewElements 系) から呼ばれるため、直近結果をメモ化する。呼び出し関係
-  // (edges/callers/callees) は静的データであり、キーは選択 id と深さ設定のみで決まる。
-  // 返す Set は読み取り専用として扱うこと (呼び出し側で変更しない)。
-  let overviewRelatedSelectionCache = {{ key: null, value: null }};
-
-  // 選択関数から表示する関連関数 id 集合と、強調対象のエッジ id 集合 (呼び出し元/先の
-  // 展開で辿った経路) を求める。選択関数の循環グループ全体は呼び出し元/先の深さ設定に
-  // 関わらず常に表示する (routeEdgeIds には含めないが、循環グループ内のエッジは
-  // overviewFunctionEdgeClasses 側の selectedCycleIds 判定で別途強調する)。
-  function relatedFunctionIdsForSelection(selectedId) {{
-    const cacheKey = selectedId + "|" + overviewCallerDepth + "|" + overviewCalleeDepth;
-    if (overviewRelatedSelectionCache.key === cacheKey) return overviewRelatedSelectionCache.value;
-    const ids = new Set([selectedId]);
-    const routeEdgeIds = new Set();
-    const selectedFn = byId.get(selectedId);
-    for (const c of cycleGroupFunctionIds(selectedFn)) ids.add(c);
-    collectOverviewRelatedIds(selectedId, callers, overviewCallerDepth, "caller", ids, routeEdgeIds);
-    collectOverviewRelatedIds(selectedId, callees, overviewCalleeDepth, "callee", ids, routeEdgeIds);
-    const value = {{ ids: ids, routeEdgeIds: routeEdgeIds }};
-    overviewRelatedSelectionCache = {{ key: cacheKey, value: value }};
-    return value;
-  }}
-
-  function visibleFunctionIdsForOverview(selection) {{
-    const context = overviewSelectionContext(selection);
-    if (context.selectedId) {{
-      return relatedFunctionIdsForSelection(context.selectedId).ids;
-    }}
-    if (context.selectedFilePath) {{
-      const ids = new Set();
-      for (const fn of (functionsByFile.get(context.selectedFilePath) || [])) ids.add(fn.id);
-      return ids;
-    }}
-    return new Set();
-  }}
-
-  // 表示関数集合 (includedFnIds) の間を結ぶ関数間エッジを、全エッジの線形走査を避けて
-  // 隣接リスト (edgesByFunctionId) から列挙する。両端に登録されるため id で重複排除する。
-  // 結果集合は「両端が included のエッジすべて」で、全走査と同一。
-  function overviewIncludedFunctionEdges(includedFnIds) {{
-    const seen = new Set();
-    const result = [];
-    for (const fnId of includedFnIds) {{
-      for (const edge of (edgesByFunctionId.get(fnId) || [])) {{
-        if (!includedFnIds.has(edge.caller) || !includedFnIds.has(edge.callee)) continue;
-        const key = edge.caller + "->" + edge.callee;
-        if (seen.has(key)) continue;
-        seen.add(key);
-        result.push(edge);
-      }}
-    }}
-    return result;
-  }}
-
-  // 強調対象は、呼び出し元/先の展開で辿った経路上のエッジ (routeEdgeIds) と、選択関数の
-  // 循環グループ内のエッジ (selectedCycleIds の両端一致)。表示はされていても展開経路に
-  // 含まれないエッジ (例: 呼び出し先ルート上の関数から、別に表示中の関数への呼び出し元
-  // 方向の関連など) は通常表示のままにする。
-  function overviewFunctionEdgeClasses(edge, selectedCycleIds, routeEdgeIds, selection) {{
-    const context = overviewSelectionContext(selection);
-    const classes = [];
-    if (context.selectedId && (routeEdgeIds.has(edge.caller + "->" + edge.callee) ||
-        (selectedCycleIds.has(edge.caller) && selectedCycleIds.has(edge.callee)))) {{
-      classes.push("dep-function-edge");
-    }}
-    return classes.join(" ");
-  }}
-
-  function buildOverviewElements(selection) {{
-    const context = overviewSelectionContext(selection);
-    const elements = overviewBaseElements(context);
-    const relatedSelection = context.selectedId ? relatedFunctionIdsForSelection(context.selectedId) : null;
-    const visibleFnIds = relatedSelection ? relatedSelection.ids : visibleFunctionIdsForOverview(context);
-    const routeEdgeIds = relatedSelection ? relatedSelection.routeEdgeIds : new Set();
-    const visibleFns = Array.from(visibleFnIds)
-      .map((id) => byId.get(id))
-      .filter(Boolean)
-      .filter((fn) => !hiddenOverviewFiles.has(fn.file))
-      .sort((a, b) => {{
-        if (a.id === context.selectedId) return -1;
-        if (b.id === context.selectedId) return 1;
-        return compareBaseOrder(a, b);
-      }});
-    const includedFnIds = new Set(visibleFns.map((fn) => fn.id));
-    const selectedCycleIds = new Set(cycleGroupFunctionIds(byId.get(context.selectedId)));
-    const childrenByFile = new Map();
-    for (let index = 0; index < visibleFns.length; index++) {{
-      const fn = visibleFns[index];
-      const classes = [graphClassFor(fn.dependencyClass)];
-      if (fn.id === context.selectedId) classes.push("dep-center-node");
-      elements.push({{
-        data: {{
-          id: fn.id,
-          label: fn.name,
-          parent: fn.file,
-          weight: graphFunctionWeight(fn)
-        }},
-        position: overviewFunctionPosition(fn, index, visibleFns.length, context),
-        classes: classes.join(" ")
-      }});
-      if (!childrenByFile.has(fn.file)) childrenByFile.set(fn.file, []);
-      childrenByFile.get(fn.file).push(fn.id);
-    }}
-    if (context.selectedId) {{
-      for (const edge of overviewIncludedFunctionEdges(includedFnIds)) {{
-        elements.push({{
-          data: {{
-            id: edge.caller + "->" + edge.callee,
-            source: edge.caller,
-            target: edge.callee,
-            weight: 1
-          }},
-          classes: overviewFunctionEdgeClasses(edge, selectedCycleIds, routeEdgeIds, context)
-        }});
-      }}
-    }} else if (context.selectedFilePath) {{
-      for (const [filePath, ids] of childrenByFile) {{
-        if (ids.length < 2) continue;
-        const hub = ids[0];
-        for (let i = 1; i < ids.length; i++) {{
-          elements.push({{
-            data: {{
-              id: "pull-" + filePath + "-" + ids[i],
-              source: hub,
-              target: ids[i]
-            }},
-            classes: "dep-pull-edge"
-          }});
-        }}
-      }}
-    }}
-    return elements;
-  }}
-
-  async function buildOverviewElementsAsync(token, selection) {{
-    const context = overviewSelectionContext(selection);
-    const selectionState = overviewSelectionState(fileEdgeByKey, context);
-    const elements = [];
-    if (!(await processOverviewChunks(files, token, (chunk) => {{
-      for (const file of chunk) {{
-        if (hiddenOverviewFiles.has(file.path)) continue;
-        const classes = ["dep-file-node"];
-        const areaClass = graphFileClassFor(file.dominantArea);
-        if (areaClass) classes.push(areaClass);
-        if (!context.selectedId && file.path === context.selectedFilePath) classes.push("dep-selected-file");
-        if (selectionState.hasSelection && !selectionState.activeFiles.has(file.path)) {{
-          classes.push("dep-file-node-muted");
-        }}
-        elements.push({{
-          data: overviewFileNodeData.get(file.path),
-          classes: classes.join(" ")
-        }});
-      }}
-    }}))) return null;
-    if (!(await processOverviewChunks(fileEdges, token, (chunk) => {{
-      for (const edge of chunk) {{
-        if (hiddenOverviewFiles.has(edge.fromFile) || hiddenOverviewFiles.has(edge.toFile)) continue;
-        const classes = [];
-        if (selectedEdgeKey && edge.id === selectedEdgeKey) classes.push("dep-selected-edge");
-        if (selectionState.emphasisFileEdges.has(edge.id)) classes.push("dep-emphasis-edge");
-        if (selectionState.hasSelection && !selectionState.activeFileEdges.has(edge.id)) {{
-          classes.push("dep-base-edge-muted");
-        }}
-        elements.push({{
-          data: overviewFileEdgeData.get(edge.id),
-          classes: classes.join(" ")
-        }});
-      }}
-    }}))) return null;
-    const relatedSelection = context.selectedId ? relatedFunctionIdsForSelection(context.selectedId) : null;
-    const visibleFnIds = relatedSelection ? relatedSelection.ids : visibleFunctionIdsForOverview(context);
-    const routeEdgeIds = relatedSelection ? relatedSelection.routeEdgeIds : new Set();
-    const visibleFns = Array.from(visibleFnIds)
-      .map((id) => byId.get(id))
-      .filter(Boolean)
-      .filter((fn) => !hiddenOverviewFiles.has(fn.file))
-      .sort((a, b) => {{
-        if (a.id === context.selectedId) return -1;
-        if (b.id === context.selectedId) return 1;
-        return compareBaseOrder(a, b);
-      }});
-    const includedFnIds = new Set(visibleFns.map((fn) => fn.id));
-    const selectedCycleIds = new Set(cycleGroupFunctionIds(byId.get(context.selectedId)));
-    const childrenByFile = new Map();
-    let fnIndex = 0;
-    if (!(await processOverviewChunks(visibleFns, token, (chunk) => {{
-      for (const fn of chunk) {{
-        const index = fnIndex;
-        fnIndex += 1;
-        const classes = [graphClassFor(fn.dependencyClass)];
-        if (fn.id === context.selectedId) classes.push("dep-center-node");
-        elements.push({{
-          data: {{
-            id: fn.id,
-            label: fn.name,
-            parent: fn.file,
-            weight: graphFunctionWeight(fn)
-          }},
-          position: overviewFunctionPosition(fn, index, visibleFns.length, context),
-          classes: classes.join(" ")
-        }});
-        if (!childrenByFile.has(fn.file)) childrenByFile.set(fn.file, []);
-        childrenByFile.get(fn.file).push(fn.id);
-      }}
-    }}))) return null;
-    if (context.selectedId) {{
-      if (!(await processOverviewChunks(overviewIncludedFunctionEdges(includedFnIds), token, (chunk) => {{
-        for (const edge of chunk) {{
-          elements.push({{
-            data: {{
-              id: edge.caller + "->" + edge.callee,
-              source: edge.caller,
-              target: edge.callee,
-              weight: 1
-            }},
-            classes: overviewFunctionEdgeClasses(edge, selectedCycleIds, routeEdgeIds, context)
-          }});
-        }}
-      }}))) return null;
-    }} else if (context.selectedFilePath) {{
-      const childGroups = Array.from(childrenByFile.entries());
-      if (!(await processOverviewChunks(childGroups, token, (chunk) => {{
-        for (const [filePath, ids] of chunk) {{
-          if (ids.length < 2) continue;
-          const hub = ids[0];
-          for (let i = 1; i < ids.length; i++) {{
-            elements.push({{
-              data: {{
-                id: "pull-" + filePath + "-" + ids[i],
-                source: hub,
-                target: ids[i]
-              }},
-              classes: "dep-pull-edge"
-            }});
-          }}
-        }}
-      }}))) return null;
-    }}
-    return isLatestOverviewSync(token) ? elements : null;
-  }}
-
-  function overviewFunctionPosition(fn, index, count, selection) {{
-    const context = overviewSelectionContext(selection);
-    if (!overviewCy) return {{ x: 0, y: 0 }};
-    const parent = overviewCy.getElementById(fn.file);
-    const center = parent && parent.length > 0 ? parent.position() : {{ x: 0, y: 0 }};
-    if (fn.id === context.selectedId) return {{ x: center.x, y: center.y }};
-    const ringIndex = context.selectedId ? Math.max(0, index - 1) : index;
-    const ringCount = context.selectedId ? Math.max(1, count - 1) : Math.max(1, count);
-    const radius = 56 + Math.min(72, ringCount * 4);
-    const angle = -Math.PI / 2 + (Math.PI * 2 * ringIndex) / ringCount;
-    return {{
-      x: center.x + Math.cos(angle) * radius,
-      y: center.y + Math.sin(angle) * radius
-    }};
-  }}
-
-  function overviewFileEdgeLength(edge, maxLength, minLength) {{
-    if (edge.hasClass("dep-pull-edge")) return 48;
-    const weight = Math.max(1, Number(edge.data("weight") || 1));
-    const normalized = Math.min(1, Math.log2(weight) / 4);
-    return maxLength - (maxLength - minLength) * normalized;
-  }}
-
-  // 進行中のレイアウト (cola / cose) を実際に停止する。layout.stop() は
-  // adaptor.stop() を呼ぶが layoutstop の発火は非同期になり得るため、ロックの解除は
-  // ここで即座に行い、停止由来の遅延 layoutstop は finishLayout 側の isCurrentLayout()
-  // ガードで無害化する。これを呼ばないと、新しい選択で別レイアウトを起動しても旧 cola が
-  // maxSimulationTime まで走り続け、同一 overviewCy 上で位置を奪い合って全体が暴れる。
-  function stopOverviewActiveLayout() {{
-    if (!overviewActiveLayout) return;
-    const active = overviewActiveLayout;
-    overviewActiveLayout = null;
-    // 中止するレイアウトの移動対象は seed のまま取り残されるため、再レイアウト保留として記録する。
-    // 次の sync で現存するものを movingNodeIds へ再投入し Phase B をやり直す。
-    if (active.movingNodeIds) {{
-      for (const id of active.movingNodeIds) overviewPendingRelayoutNodeIds.add(id);
-    }}
-    if (active.lockedNodes) {{
-      try {{ active.lockedNodes.unlock(); }} catch (err) {{ /* 解除済みは無視 */ }}
-    }}
-    // layout.stop() は layoutstop を同期発火させることがある。その場合、割り込み元 (選択変更)
-    // の sync がトークンを更新する前に finishLayout が走るため、isCurrentLayout() だけでは
-    // 中止と自然完了を区別できず、「自然完了」と誤認して上で登録した再レイアウト保留を消し、
-    // 未収束の seed 座標を最終位置として確定してしまう。中止をハンドル自体へ記録し、
-    // finishLayout 側で完了処理を抑止する。
-    active.aborted = true;
-    if (active.layout && typeof active.layout.stop === "function") {{
-      try {{ active.layout.stop(); }} catch (err) {{ /* 停止済みは無視 */ }}
-    }}
-  }}
-
-  function runOverviewLayout(opts) {{
-    if (!overviewCy) return;
-    stopOverviewActiveLayout();
-    const fit = Boolean(opts && opts.fit);
-    const manual = Boolean(opts && opts.manual);
-    const deferPositions = Boolean(opts && opts.deferPositions);
-    const animatePositions = !(opts && opts.animatePositions === false);
-    const instantPositions = Boolean(opts && opts.instantPositions);
-    const fullConvergence = Boolean(opts && opts.fullConvergence);
-    const unlockAllDuringLayout = Boolean(opts && opts.unlockAllDuringLayout);
-    const scopeToVisibleChildren = Boolean(opts && opts.scopeToVisibleChildren);
-    const movingNodeIds = opts && opts.movingNodeIds ? opts.movingNodeIds : null;
-    const anchorCenters = opts && opts.anchorCenters ? opts.anchorCenters : new Map();
-    const immediate = Boolean(opts && opts.immediate) || !overviewLayoutInitialized;
-    const layoutPasses = Math.max(1, Number((opts && opts.layoutPasses) || 1));
-    const onComplete = opts && typeof opts.onComplete === "function" ? opts.onComplete : null;
-    const layoutToken = opts && opts.layoutToken ? opts.layoutToken : ++overviewLayoutToken;
-    const syncToken = opts && opts.syncToken ? opts.syncToken : null;
-    const startPositions = overviewNodePositions();
-    const lockedNodes = (!unlockAllDuringLayout && movingNodeIds) ? overviewCy.nodes().filter((node) => !movingNodeIds.has(node.id())) : overviewCy.collection();
-    // Phase B は「展開中ファイル配下の関数の座標」だけを見た目へ反映し、ファイル位置は
-    // 計算後に anchor で元へ戻す。全グラフを cola にかけると崩壊 (子なし) ファイルまで
-    // 計算してから捨てるため、コストが総ノード数に比例する。scopeToVisibleChildren のときは
-    // レイアウトに効く部分グラフ (子を持つファイル + その子 + 子同士のエッジ) だけを対象にし、
-    // コストを可視関数数に比例させる。cytoscape-cola は渡した eles のノード/エッジだけを
-    // 計算対象にする。
-    let layoutTarget = overviewCy;
-    if (scopeToVisibleChildren) {{
-      const layoutParents = overviewCy.nodes(":parent");
-      const layoutChildren = layoutParents.children();
-      if (layoutChildren.length > 0) {{
-        // 関数配置に効くのは関数間エッジ (dep-function-edge / dep-pull-edge) のみ。
-        // file-edge は端点がファイル ノードで関数配置に影響しないため除外する。
-        const layoutEdges = overviewCy.edges().filter(
-          (edge) => layoutChildren.contains(edge.source()) && layoutChildren.contains(edge.target())
-        );
-        layoutTarget = layoutParents.union(layoutChildren).union(layoutEdges);
-      }}
-    }}
-    overviewLayoutInitialized = true;
-    stopOverviewPositionAnimation();
-    const isCurrentLayout = () => (
-      layoutToken === overviewLayoutToken && (!syncToken || isLatestOverviewSync(syncToken))
-    );
-    let startedLayout = null;
-    let activeHandle = null;
-    let layoutStartMs = 0;
-    const finishLayout = async () => {{
-      // layoutstop が発火した時点でこのレイアウトは終了。cola の純計算時間を記録する。
-      if (layoutStartMs > 0) overviewLastLayoutDurationMs = performance.now() - layoutStartMs;
-      // アクティブ ハンドルが自分自身を指しているなら解放する (別レイアウトに更新済みなら触らない)。
-      if (overviewActiveLayout && overviewActiveLayout.layout === startedLayout) overviewActiveLayout = null;
-      // stopOverviewActiveLayout で中止されたレイアウトは自然完了として扱わない。中止時の
-      // layout.stop() が layoutstop を同期発火させると、割り込み元のトークン更新前に到達する
-      // ため isCurrentLayout() が真のまま通過し、再レイアウト保留の削除と未収束座標の確定が
-      // 誤って行われる (seed 表示中の関数選択で再レイアウトが失火する実測要因)。
-      if (activeHandle && activeHandle.aborted) {{
-        lockedNodes.unlock();
-        return;
-      }}
-      if (!isCurrentLayout()) {{
-        lockedNodes.unlock();
-        return;
-      }}
-      // このレイアウトは中止されず完了した。レイアウト対象を再レイアウト保留から外す
-      // (中止時に stopOverviewActiveLayout が登録するのと対称。これで pending は「最後の
-      // レイアウト試行が中止されたノード」だけを保持する)。
-      if (movingNodeIds) {{
-        for (const id of movingNodeIds) overviewPendingRelayoutNodeIds.delete(id);
-      }}
-      if (immediate && layoutPasses > 1) {{
-        lockedNodes.unlock();
-        const nextOpts = Object.assign({{}}, opts || {{}});
-        nextOpts.layoutPasses = layoutPasses - 1;
-        nextOpts.onComplete = onComplete;
-        setTimeout(() => runOverviewLayout(nextOpts), 50);
-        return;
-      }}
-      if (animatePositions || instantPositions) {{
-        applyOverviewUserMovedPositions(startPositions, anchorCenters);
-        applyOverviewAnchorCentersToCurrentPositions(anchorCenters);
-        const targetPositions = overviewNodePositions();
-        if (!isCurrentLayout()) {{
-          lockedNodes.unlock();
-          return;
-        }}
-        stabilizeOverviewCompoundCenters(targetPositions, anchorCenters);
-        stabilizeOverviewLayoutCenter(startPositions, targetPositions, {{ fit, immediate, anchorCenters }});
-        restoreOverviewNodePositions(startPositions);
-        lockedNodes.unlock();
-        if (immediate || instantPositions) {{
-          restoreOverviewNodePositions(targetPositions);
-          if (fit) fitOverviewGraph();
-          if (onComplete) onComplete();
-          return;
-        }}
-        animateOverviewPositions(startPositions, targetPositions, {{ fit, onComplete }});
-        return;
-      }}
-      applyOverviewUserMovedPositions(startPositions, anchorCenters);
-      if (!(await applyOverviewAnchorCentersToCurrentPositionsAsync(anchorCenters, syncToken))) {{
-        lockedNodes.unlock();
-        return;
-      }}
-      const targetPositions = await overviewNodePositionsAsync(syncToken);
-      if (!targetPositions || !isCurrentLayout()) {{
-        lockedNodes.unlock();
-        return;
-      }}
-      stabilizeOverviewCompoundCenters(targetPositions, anchorCenters);
-      stabilizeOverviewLayoutCenter(startPositions, targetPositions, {{ fit, immediate, anchorCenters }});
-      lockedNodes.unlock();
-      if (fit) fitOverviewGraph();
-      if (onComplete) onComplete();
-    }};
-    // ここから実レイアウト (cola / cose) を起動する。テスト検証用に起動回数と
-    // 投入ノード数を記録する (投入ノード数はスコープ化の効果を測る指標)。
-    overviewLayoutRunCount += 1;
-    overviewLastLayoutNodeCount = layoutTarget.nodes().length;
-    if (typeof cytoscapeCola === "function") {{
-      lockedNodes.lock();
-      const layout = layoutTarget.layout({{
-        name: "cola",
-        animate: false,
-        deferPositions: manual || immediate || deferPositions,
-        // ファイル (compound) の grab をシミュレーションへ伝えない。webcola はグループの
-        // dragstart で全 leaf (関数) を fixed にするため、計算中にファイルを押下保持しただけで
-        // 降下計算が「収束」と誤判定して早期終了し、中途半端な配置が正常完了として採用される
-        // (control 784ms に対し押下ありで 153ms 終了を実測)。ファイル位置の反映は finishLayout
-        // 以降の anchor と live アンカーが担うため、cola 側での固定は不要。
-        // see: https://github.com/tgdwyer/WebCola/blob/master/WebCola/src/layout.ts
-        ignoreCompoundDrags: true,
-        refresh: 1,
-        maxSimulationTime: manual ? 450 : (fullConvergence ? 2000 : 900),
-        fit: false,
-        padding: 30,
-        randomize: false,
-        avoidOverlap: true,
-        handleDisconnected: true,
-        nodeSpacing: function (node) {{ return node.isParent() ? 22 : 14; }},
-        centerGraph: fullConvergence,
-        edgeLength: function (edge) {{ return overviewFileEdgeLength(edge, 140, 128); }},
-        convergenceThreshold: manual ? 0.12 : (fullConvergence ? 0.01 : 0.08),
-        unconstrIter: fullConvergence ? undefined : (manual ? 4 : 8),
-        userConstIter: fullConvergence ? undefined : (manual ? 4 : 8),
-        allConstIter: fullConvergence ? undefined : (manual ? 6 : 12)
-      }});
-      startedLayout = layout;
-      activeHandle = {{ layout, lockedNodes, movingNodeIds, aborted: false }};
-      overviewActiveLayout = activeHandle;
-      layout.one("layoutstop", () => {{
-        finishLayout();
-      }});
-      layoutStartMs = performance.now();
-      layout.run();
-      return;
-    }}
-    lockedNodes.lock();
-    const layout = layoutTarget.layout({{
-      name: "cose",
-      animate: false,
-      fit: false,
-      padding: 30,
-      nodeRepulsion: function (node) {{ return node.isParent() ? 14400 : 3000; }},
-      idealEdgeLength: function (edge) {{ return overviewFileEdgeLength(edge, 128, 116); }},
-      edgeElasticity: function (edge) {{ return edge.hasClass("dep-pull-edge") ? 200 : 100; }},
-      nestingFactor: 0.4,
-      gravity: 120,
-      numIter: manual ? 500 : 1500,
-      randomize: false
-    }});
-    startedLayout = layout;
-    activeHandle = {{ layout, lockedNodes, aborted: false }};
-    overviewActiveLayout = activeHandle;
-    layout.one("layoutstop", () => {{
-      finishLayout();
-    }});
-    layoutStartMs = performance.now();
-    layout.run();
-  }}
-
-  function overviewNodePositions() {{
-    const positions = new Map();
-    if (!overviewCy) return positions;
-    overviewCy.nodes().forEach((node) => {{
-      positions.set(node.id(), {{ x: node.position("x"), y: node.position("y") }});
-    }});
-    return positions;
-  }}
-
-  async function overviewNodePositionsAsync(token) {{
-    const positions = new Map();
-    if (!overviewCy) return positions;
-    const nodes = overviewCy.nodes().toArray();
-    if (!(await processOverviewChunks(nodes, token, (chunk) => {{
-      for (const node of chunk) {{
-        positions.set(node.id(), {{ x: node.position("x"), y: node.position("y") }});
-      }}
-    }}))) return null;
-    return positions;
-  }}
-
-  function overviewNodeCenter(positions, referencePositions) {{
-    let count = 0;
-    let x = 0;
-    let y = 0;
-    for (const [id, position] of positions) {{
-      if (referencePositions && !referencePositions.has(id)) continue;
-      x += position.x;
-      y += position.y;
-      count += 1;
-    }}
-    if (count === 0) return null;
-    return {{ x: x / count, y: y / count }};
-  }}
-
-  function translateOverviewPositions(positions, dx, dy) {{
-    if (Math.abs(dx) < 0.5 && Math.abs(dy) < 0.5) return;
-    for (const position of positions.values()) {{
-      position.x += dx;
-      position.y += dy;
-    }}
-  }}
-
-  function stabilizeOverviewLayoutCenter(startPositions, targetPositions, opts) {{
-    if (!opts || opts.fit || opts.immediate) return;
-    if (opts.anchorCenters && opts.anchorCenters.size > 0) return;
-    const startCenter = overviewNodeCenter(startPositions, targetPositions);
-    const targetCenter = overviewNodeCenter(targetPositions, startPositions);
-    if (!startCenter || !targetCenter) return;
-    translateOverviewPositions(targetPositions, startCenter.x - targetCenter.x, startCenter.y - targetCenter.y);
-  }}
-
-  function stabilizeOverviewCompoundCenters(targetPositions, anchorCenters) {{
-    if (!overviewCy || !anchorCenters || anchorCenters.size === 0) return;
-    for (const [parentId, anchor] of anchorCenters) {{
-      const parent = overviewCy.getElementById(parentId);
-      if (!parent || !parent.length || isOverviewNodeDragging(parent)) continue;
-      const targetParent = targetPositions.get(parentId);
-      if (!targetParent) continue;
-      const dx = anchor.x - targetParent.x;
-      const dy = anchor.y - targetParent.y;
-      if (Math.abs(dx) < 0.5 && Math.abs(dy) < 0.5) continue;
-      targetParent.x += dx;
-      targetParent.y += dy;
-      parent.descendants().nodes().forEach((child) => {{
-        if (isOverviewNodeDragging(child)) return;
-        const position = targetPositions.get(child.id());
-        if (!position) return;
-        position.x += dx;
-        position.y += dy;
-      }});
-    }}
-  }}
-
-  function overviewNodeDragIds(node) {{
-    const ids = new Set();
-    if (!node || !node.length) return ids;
-    ids.add(node.id());
-    node.descendants().nodes().forEach((child) => ids.add(child.id()));
-    return ids;
-  }}
-
-  function isOverviewNodeDragging(nodeOrId) {{
-    const id = typeof nodeOrId === "string" ? nodeOrId : nodeOrId.id();
-    return overviewDraggingNodeIds.has(id);
-  }}
-
-  function hasOverviewDraggingNodes() {{
-    return overviewDraggingNodeIds.size > 0;
-  }}
-
-  function markOverviewFunctionLayoutInterrupted(node) {{
-    if (!overviewCy || !node || !node.length || !node.data("parent")) return;
-    const parent = node.parent();
-    if (!parent || !parent.length) return;
-    parent.children().nodes().forEach((child) => overviewPendingRelayoutNodeIds.add(child.id()));
-  }}
-
-  function rememberOverviewUserMovedPositions(node) {{
-    if (!overviewCy || !node || !node.length) return;
-    for (const id of overviewNodeDragIds(node)) {{
-      const element = overviewCy.getElementById(id);
-      if (!element || !element.length) continue;
-      if (element.data("parent")) continue;
-      const position = element.position();
-      overviewUserMovedNodePositions.set(id, {{ x: position.x, y: position.y }});
-    }}
-  }}
-
-  function forgetOverviewNodeRuntimeState(node) {{
-    if (!node || !node.length || !node.isNode()) return;
-    const ids = overviewNodeDragIds(node);
-    for (const id of ids) {{
-      overviewUserMovedNodePositions.delete(id);
-      overviewDraggingNodeIds.delete(id);
-      overviewPendingRelayoutNodeIds.delete(id);
-    }}
-  }}
-
-  function applyOverviewUserMovedPositions(startPositions, anchorCenters) {{
-    if (!overviewCy || overviewUserMovedNodePositions.size === 0) return;
-    for (const [id, position] of overviewUserMovedNodePositions) {{
-      const element = overviewCy.getElementById(id);
-      if (!element || !element.length) continue;
-      const previous = startPositions.get(id);
-      startPositions.set(id, {{ x: position.x, y: position.y }});
-      if (anchorCenters && anchorCenters.has(id)) {{
-        anchorCenters.set(id, {{ x: position.x, y: position.y }});
-      }}
-      // ファイル (compound) がドラッグされた分、その子 (関数) の start 座標も同じだけずらす。
-      // これをしないと、finishLayout の restoreOverviewNodePositions が子を古い seed 座標
-      // (ドラッグ前のファイル位置基準) へ戻し、seed 配置窓でドラッグした直後のアニメーションが
-      // 一瞬戻るように見える。ファイルのみのドラッグでは子の相対位置は変わらないため、同じ
-      // 並進を子の start にも適用するのが正しい。
-      if (previous && element.isParent()) {{
-        const dx = position.x - previous.x;
-        const dy = position.y - previous.y;
-        if (dx !== 0 || dy !== 0) {{
-          element.descendants().nodes().forEach((child) => {{
-            const childStart = startPositions.get(child.id());
-            if (childStart) startPositions.set(child.id(), {{ x: childStart.x + dx, y: childStart.y + dy }});
-          }});
-        }}
-      }}
-    }}
-    overviewUserMovedNodePositions.clear();
-  }}
-
-  function applyOverviewDeferredDragPositions(deferred) {{
-    if (!overviewCy || !deferred || overviewUserMovedNodePositions.size === 0) return;
-    for (const [id] of overviewUserMovedNodePositions) {{
-      const node = overviewCy.getElementById(id);
-      if (!node || !node.length || node.data("parent")) continue;
-      const current = node.position();
-      deferred.startPositions.set(id, {{ x: current.x, y: current.y }});
-      const targetParent = deferred.targetPositions.get(id);
-      let dx = 0;
-      let dy = 0;
-      if (targetParent) {{
-        dx = current.x - targetParent.x;
-        dy = current.y - targetParent.y;
-        targetParent.x += dx;
-        targetParent.y += dy;
-      }}
-      node.descendants().nodes().forEach((child) => {{
-        const childCurrent = child.position();
-        deferred.startPositions.set(child.id(), {{ x: childCurrent.x, y: childCurrent.y }});
-        const targetChild = deferred.targetPositions.get(child.id());
-        if (targetChild) {{
-          targetChild.x += dx;
-          targetChild.y += dy;
-        }}
-      }});
-    }}
-    overviewUserMovedNodePositions.clear();
-  }}
-
-  function restoreOverviewNodePositions(positions) {{
-    if (!overviewCy) return;
-    overviewCy.nodes().forEach((node) => {{
-      if (isOverviewNodeDragging(node)) return;
-      const position = positions.get(node.id());
-      if (position) node.position(position);
-    }});
-  }}
-
-  function applyOverviewAnchorCentersToCurrentPositions(anchorCenters) {{
-    if (!overviewCy || !anchorCenters || anchorCenters.size === 0) return;
-    for (const [id, anchor] of anchorCenters) {{
-      const node = overviewCy.getElementById(id);
-      if (!node || !node.length) continue;
-      // ドラッグ中のファイルもアンカーへ再センタリングする。anchor は
-      // applyOverviewUserMovedPositions が最新のドラッグ位置 (カーソル) へ更新済み。
-      // ここでスキップすると、保持ドラッグ中に cola が完了したとき、書き込まれた
-      // シミュレーション座標のままクラスタ (と子から導出されるファイル位置) が
-      // カーソルから離れた場所へ飛ぶ。子レベルのドラッグ スキップは直接ドラッグ
-      // された関数を守るためのもので、ファイル ドラッグで伝播登録された子は
-      // 移動対象とする。
-      const nodeDragging = isOverviewNodeDragging(node);
-      const current = node.position();
-      const dx = anchor.x - current.x;
-      const dy = anchor.y - current.y;
-      if (Math.abs(dx) < 0.5 && Math.abs(dy) < 0.5) continue;
-      const movable = node.descendants().nodes(":unlocked");
-      movable.positions((child) => {{
-        if (!nodeDragging && isOverviewNodeDragging(child)) return undefined;
-        const position = child.position();
-        return {{ x: position.x + dx, y: position.y + dy }};
-      }});
-    }}
-  }}
-
-  async function applyOverviewAnchorCentersToCurrentPositionsAsync(anchorCenters, token) {{
-    if (!overviewCy || !anchorCenters || anchorCenters.size === 0) return true;
-    const anchors = Array.from(anchorCenters.entries());
-    return processOverviewChunks(anchors, token, (chunk) => {{
-      overviewCy.batch(() => {{
-        for (const [id, anchor] of chunk) {{
-          const node = overviewCy.getElementById(id);
-          if (!node || !node.length) continue;
-          // 同期版 (applyOverviewAnchorCentersToCurrentPositions) と同じ理由で、
-          // ドラッグ中のファイルも再センタリングし、直接ドラッグされた子のみ守る。
-          const nodeDragging = isOverviewNodeDragging(node);
-          const current = node.position();
-          const dx = anchor.x - current.x;
-          const dy = anchor.y - current.y;
-          if (Math.abs(dx) < 0.5 && Math.abs(dy) < 0.5) continue;
-          const movable = node.descendants().nodes(":unlocked");
-          movable.positions((child) => {{
-            if (!nodeDragging && isOverviewNodeDragging(child)) return undefined;
-            const position = child.position();
-            return {{ x: position.x + dx, y: position.y + dy }};
-          }});
-        }}
-      }});
-    }});
-  }}
-
-  function exponentialEaseOutProgress(t, impact) {{
-    const clamped = Math.max(0, Math.min(1, t));
-    if (clamped >= 1) return 1;
-    const rate = 5.2 + Math.max(0, Math.min(1, impact)) * 2.0;
-    const endValue = 1 - Math.exp(-rate);
-    if (endValue <= 0) return 1;
-    const value = 1 - Math.exp(-rate * clamped);
-    return Math.max(0, Math.min(1, value / endValue));
-  }}
-
-  function stopOverviewPositionAnimation() {{
-    if (!overviewPositionAnimation) return;
-    overviewPositionAnimation.active = false;
-    if (overviewPositionAnimation.frameId !== null) {{
-      const caf = window.cancelAnimationFrame || window.webkitCancelAnimationFrame || window.clearTimeout;
-      caf(overviewPositionAnimation.frameId);
-    }}
-    overviewPositionAnimation = null;
-  }}
-
-  function animateOverviewPositions(startPositions, targetPositions, opts) {{
-    if (!overviewCy) return;
-    stopOverviewPositionAnimation();
-    if (overviewFunctionGrabInterruptedLayout) {{
-      const onComplete = opts && typeof opts.onComplete === "function" ? opts.onComplete : null;
-      if (onComplete) onComplete();
-      return;
-    }}
-    if (hasOverviewDraggingNodes()) {{
-      overviewDeferredPositionAnimation = {{
-        startPositions,
-        targetPositions,
-        opts: Object.assign({{}}, opts || {{}})
-      }};
-      overviewSyncAfterDrag = true;
-      return;
-    }}
-    overviewDeferredPositionAnimation = null;
-    const duration = OVERVIEW_ANIMATION_MS;
-    const distances = new Map();
-    let maxDistance = 1;
-    for (const [id, target] of targetPositions) {{
-      const start = startPositions.get(id) || target;
-      const distance = Math.hypot(target.x - start.x, target.y - start.y);
-      distances.set(id, distance);
-      maxDistance = Math.max(maxDistance, distance);
-    }}
-    const raf = window.requestAnimationFrame || window.webkitRequestAnimationFrame || ((callback) => window.setTimeout(() => callback(Date.now()), 16));
-    const startedAt = (window.performance && window.performance.now) ? window.performance.now() : Date.now();
-    overviewPositionAnimation = {{ active: true, frameId: null, targetPositions, opts: Object.assign({{}}, opts || {{}}) }};
-    // 与えた座標マップ上の「親ファイルからの相対オフセット」を親ファイルの最新位置へ加えて求める。
-    // start (補間の起点) と target (移動目標) の双方に使う。親ファイルが実際にドラッグされているか
-    // ユーザー移動済みのときだけ live アンカーし、関数はファイルへ追従しつつレイアウト結果へ収束する。
-    // start も live アンカーするのが要点で、これによりドラッグ後の補間がドラッグ前 (seed) の座標から
-    // 始まって「一瞬戻る」動きになるのを防ぎ、常に現在のファイル位置を基準に補間する。通常 (非ドラッグ)
-    // は従来どおり絶対座標を使い挙動を変えない。ドラッグ済みのルート ファイルは現在位置に留める。
-    // 判定は grabbed() ではなくドラッグ集合 (実際の drag イベント) で行う。純タップの静止 grab を
-    // アンカーにすると、compound の位置が子から導出されるために錨が子の移動で毎フレーム流れ、
-    // クラスタ全体が漂流して重心がファイルから離れる。
-    const frameParentPositions = new Map();
-    const snapshotParentPositions = () => {{
-      frameParentPositions.clear();
-      overviewCy.nodes(":parent").forEach((parent) => {{
-        frameParentPositions.set(parent.id(), {{ x: parent.position("x"), y: parent.position("y") }});
-      }});
-    }};
-    const liveAnchored = (node, posMap) => {{
-      const id = node.id();
-      const c = posMap.get(id);
-      const parent = node.parent();
-      const parentAnchored = parent && parent.length
-        && (isOverviewNodeDragging(parent.id()) || overviewUserMovedNodePositions.has(parent.id()))
-        && posMap.has(parent.id()) && c;
-      if (parentAnchored) {{
-        const pc = posMap.get(parent.id());
-        // 錨となる親位置はフレーム冒頭のスナップショットを使う。子を再配置しながら
-        // parent.position() を読むと、同一フレーム内で導出位置が変わり相対配置が歪む。
-        const pp = frameParentPositions.get(parent.id()) || parent.position();
-        return {{ x: pp.x + (c.x - pc.x), y: pp.y + (c.y - pc.y) }};
-      }}
-      if ((!parent || !parent.length) && overviewUserMovedNodePositions.has(id)) {{
-        const cur = node.position();
-        return {{ x: cur.x, y: cur.y }};
-      }}
-      return c;
-    }};
-    const liveTarget = (node) => liveAnchored(node, targetPositions);
-    const liveStart = (node) => liveAnchored(node, startPositions);
-    const frame = (now) => {{
-      if (!overviewPositionAnimation || !overviewPositionAnimation.active) return;
-      const elapsed = Math.max(0, now - startedAt);
-      const t = Math.min(1, elapsed / duration);
-      snapshotParentPositions();
-      overviewCy.nodes().positions((node) => {{
-        // ドラッグ中のルート ファイルだけはカーソル追従に任せて触らない。compound の子 (関数) は
-        // grabbed() が伝播するが、ここでは live アンカーで動かしたいのでスキップ対象から外す。
-        // 純タップ (grab のみでドラッグなし) のルート ファイルはスキップせず通常どおり動かす。
-        if (node.grabbed() && !node.data("parent") && isOverviewNodeDragging(node.id())) return undefined;
-        const target = liveTarget(node);
-        if (!target) return undefined;
-        const start = liveStart(node) || target;
-        const impact = (distances.get(node.id()) || 0) / maxDistance;
-        const p = exponentialEaseOutProgress(t, impact);
-        return {{
-          x: start.x + (target.x - start.x) * p,
-          y: start.y + (target.y - start.y) * p
-        }};
-      }});
-      if (t < 1) {{
-        overviewPositionAnimation.frameId = raf(frame);
-        return;
-      }}
-      snapshotParentPositions();
-      overviewCy.nodes().positions((node) => {{
-        if (node.grabbed() && !node.data("parent") && isOverviewNodeDragging(node.id())) return undefined;
-        return liveTarget(node) || undefined;
-      }});
-      const shouldFit = Boolean(opts && opts.fit);
-      const onComplete = opts && typeof opts.onComplete === "function" ? opts.onComplete : null;
-      stopOverviewPositionAnimation();
-      if (shouldFit) fitOverviewGraph();
-      if (onComplete) onComplete();
-    }};
-    overviewPositionAnimation.frameId = raf(frame);
-  }}
-
-  function isEdgeElement(element) {{
-    return element.data && element.data.source && element.data.target;
-  }}
-
-  function currentDataDiffers(element, targetData) {{
-    for (const key of Object.keys(targetData || {{}})) {{
-      if (element.data(key) !== targetData[key]) return true;
-    }}
-    return false;
-  }}
-
-  function classText(classes) {{
-    return text(classes)
-      .split(/\\s+/)
-      .filter(Boolean)
-      .sort()
-      .join(" ");
-  }}
-
-  function currentClassesDiffer(element, targetClasses) {{
-    return classText(element.classes().join(" ")) !== classText(targetClasses || "");
-  }}
-
-  const OVERVIEW_STATE_CLASSES = new Set([
-    "dep-center-node",
-    "dep-selected-file",
-    "dep-selected-edge",
-    "dep-emphasis-edge",
-    "dep-file-node-muted",
-    "dep-base-edge-muted",
-    // 選択解除時のフェード用 (transition 定義のみ、色を持たない)。構造クラス比較から除外する。
-    "dep-overview-fade"
-  ]);
-  const OVERVIEW_DEFERRED_STATE_CLASSES = new Set([
-    "dep-file-node-muted",
-    "dep-base-edge-muted"
-  ]);
-
-  function overviewStructuralClasses(classes) {{
-    return classText(classes || "")
-      .split(/\\s+/)
-      .filter((name) => name && !OVERVIEW_STATE_CLASSES.has(name))
-      .join(" ");
-  }}
-
-  function overviewStateClasses(classes) {{
-    return classText(classes || "")
-      .split(/\\s+/)
-      .filter((name) => name && OVERVIEW_STATE_CLASSES.has(name))
-      .join(" ");
-  }}
-
-  function overviewImmediateStateClasses(classes) {{
-    return classText(classes || "")
-      .split(/\\s+/)
-      .filter((name) => name && OVERVIEW_STATE_CLASSES.has(name) && !OVERVIEW_DEFERRED_STATE_CLASSES.has(name))
-      .join(" ");
-  }}
-
-  function overviewDeferredStateClasses(classes) {{
-    return classText(classes || "")
-      .split(/\\s+/)
-      .filter((name) => name && OVERVIEW_DEFERRED_STATE_CLASSES.has(name))
-      .join(" ");
-  }}
-
-  function overviewPhaseAClasses(targetClasses, currentClasses) {{
-    return classText([
-      overviewStructuralClasses(targetClasses),
-      overviewImmediateStateClasses(targetClasses),
-      overviewDeferredStateClasses(currentClasses)
-    ].filter(Boolean).join(" "));
-  }}
-
-  function overviewStructureElement(element) {{
-    const result = {{ data: Object.assign({{}}, element.data || {{}}) }};
-    const classes = overviewStructuralClasses(element.classes || "");
-    if (classes) result.classes = classes;
-    if (element.position) result.position = {{ x: element.position.x, y: element.position.y }};
-    return result;
-  }}
-
-  function seedOverviewInitialPositions(elements) {{
-    const rootNodes = elements.filter((element) => (
-      !isEdgeElement(element) && element.data && !element.data.parent
-    ));
-    if (rootNodes.length === 0) return;
-    const columns = Math.ceil(Math.sqrt(rootNodes.length));
-    const rows = Math.ceil(rootNodes.length / columns);
-    const gap = 220;
-    const rootPositions = new Map();
-    for (let index = 0; index < rootNodes.length; index++) {{
-      const node = rootNodes[index];
-      const column = index % columns;
-      const row = Math.floor(index / columns);
-      const position = {{
-        x: (column - (columns - 1) / 2) * gap,
-        y: (row - (rows - 1) / 2) * gap
-      }};
-      node.position = position;
-      rootPositions.set(node.data.id, position);
-    }}
-    const childCounts = new Map();
-    for (const element of elements) {{
-      if (isEdgeElement(element) || !element.data || !element.data.parent) continue;
-      childCounts.set(element.data.parent, (childCounts.get(element.data.parent) || 0) + 1);
-    }}
-    const childIndexes = new Map();
-    for (const element of elements) {{
-      if (isEdgeElement(element) || !element.data || !element.data.parent) continue;
-      const center = rootPositions.get(element.data.parent);
-      if (!center) continue;
-      const index = childIndexes.get(element.data.parent) || 0;
-      const count = childCounts.get(element.data.parent) || 1;
-      childIndexes.set(element.data.parent, index + 1);
-      const radius = 72 + Math.min(88, count * 5);
-      const angle = -Math.PI / 2 + (Math.PI * 2 * index) / count;
-      element.position = {{
-        x: center.x + Math.cos(angle) * radius,
-        y: center.y + Math.sin(angle) * radius
-      }};
-    }}
-  }}
-
-  async function seedOverviewInitialPositionsAsync(elements, token) {{
-    const rootNodes = elements.filter((element) => (
-      !isEdgeElement(element) && element.data && !element.data.parent
-    ));
-    if (rootNodes.length === 0) return isLatestOverviewSync(token);
-    const columns = Math.ceil(Math.sqrt(rootNodes.length));
-    const rows = Math.ceil(rootNodes.length / columns);
-    const gap = 220;
-    const rootPositions = new Map();
-    let rootIndex = 0;
-    if (!(await processOverviewChunks(rootNodes, token, (chunk) => {{
-      for (const node of chunk) {{
-        const index = rootIndex;
-        rootIndex += 1;
-        const column = index % columns;
-        const row = Math.floor(index / columns);
-        const position = {{
-          x: (column - (columns - 1) / 2) * gap,
-          y: (row - (rows - 1) / 2) * gap
-        }};
-        node.position = position;
-        rootPositions.set(node.data.id, position);
-      }}
-    }}))) return false;
-    const childCounts = new Map();
-    const childElements = [];
-    if (!(await processOverviewChunks(elements, token, (chunk) => {{
-      for (const element of chunk) {{
-        if (isEdgeElement(element) || !element.data || !element.data.parent) continue;
-        childElements.push(element);
-        childCounts.set(element.data.parent, (childCounts.get(element.data.parent) || 0) + 1);
-      }}
-    }}))) return false;
-    const childIndexes = new Map();
-    if (!(await processOverviewChunks(childElements, token, (chunk) => {{
-      for (const element of chunk) {{
-        const center = rootPositions.get(element.data.parent);
-        if (!center) continue;
-        const index = childIndexes.get(element.data.parent) || 0;
-        const count = childCounts.get(element.data.parent) || 1;
-        childIndexes.set(element.data.parent, index + 1);
-        const radius = 72 + Math.min(88, count * 5);
-        const angle = -Math.PI / 2 + (Math.PI * 2 * index) / count;
-        element.position = {{
-          x: center.x + Math.cos(angle) * radius,
-          y: center.y + Math.sin(angle) * radius
-        }};
-      }}
-    }}))) return false;
-    return isLatestOverviewSync(token);
-  }}
-
-  function anchorOverviewChildPositions(targetElements, anchorCenters) {{
-    if (!anchorCenters || anchorCenters.size === 0) return;
-    const childrenByParent = new Map();
-    for (const element of targetElements) {{
-      if (isEdgeElement(element) || !element.data || !element.data.parent) continue;
-      if (!anchorCenters.has(element.data.parent)) continue;
-      if (!childrenByParent.has(element.data.parent)) childrenByParent.set(element.data.parent, []);
-      childrenByParent.get(element.data.parent).push(element);
-    }}
-    for (const [parentId, children] of childrenByParent) {{
-      const anchor = anchorCenters.get(parentId);
-      if (!anchor || children.length === 0) continue;
-      let minX = Infinity;
-      let maxX = -Infinity;
-      let minY = Infinity;
-      let maxY = -Infinity;
-      for (const child of children) {{
-        const position = child.position || anchor;
-        minX = Math.min(minX, position.x);
-        maxX = Math.max(maxX, position.x);
-        minY = Math.min(minY, position.y);
-        maxY = Math.max(maxY, position.y);
-      }}
-      const center = {{ x: (minX + maxX) / 2, y: (minY + maxY) / 2 }};
-      const dx = anchor.x - center.x;
-      const dy = anchor.y - center.y;
-      for (const child of children) {{
-        const position = child.position || anchor;
-        child.position = {{ x: position.x + dx, y: position.y + dy }};
-      }}
-    }}
-  }}
-
-  function collectOverviewAnchorCenters(previousPositions, targetElements) {{
-    const anchorCenters = new Map();
-    for (const element of targetElements) {{
-      if (isEdgeElement(element) || !element.data || element.data.parent) continue;
-      if (previousPositions.has(element.data.id)) {{
-        anchorCenters.set(element.data.id, previousPositions.get(element.data.id));
-      }}
-    }}
-    if (selectedFilePath && previousPositions.has(selectedFilePath)) {{
-      anchorCenters.set(selectedFilePath, previousPositions.get(selectedFilePath));
-    }}
-    for (const element of targetElements) {{
-      if (isEdgeElement(element) || !element.data || !element.data.parent) continue;
-      const parentId = element.data.parent;
-      if (previousPositions.has(parentId)) {{
-        anchorCenters.set(parentId, previousPositions.get(parentId));
-      }}
-    }}
-    // 非表示から復活したファイルは previousPositions に存在しない。保存した元位置を
-    // アンカーに加え、再表示後もレイアウトで流されず元の場所へ戻るようにする。
-    for (const [path, position] of overviewRestorePositions) {{
-      if (position) anchorCenters.set(path, position);
-    }}
-    return anchorCenters;
-  }}
-
-  function nextOverviewFrame() {{
-    return new Promise((resolve) => requestOverviewFrame(resolve));
-  }}
-
-  function isLatestOverviewSync(token) {{
-    return token === overviewSyncToken;
-  }}
-
-  function isOverviewSyncTokenActive(token) {{
-    return token === null || token === undefined || isLatestOverviewSync(token);
-  }}
-
-  function selectionSignatureHasSelection(signature) {{
-    if (!signature) return false;
-    try {{
-      const values = JSON.parse(signature);
-      return Array.isArray(values) && values.some((value) => Boolean(value));
-    }} catch (err) {{
-      return false;
-    }}
-  }}
-
-  function targetElementIdSet(targetElements) {{
-    return new Set(targetElements.map((element) => element.data.id));
-  }}
-
-  function overviewSyncDiffPlan(targetElements) {{
-    const targetIds = targetElementIdSet(targetElements);
-    const targetById = new Map(targetElements.map((element) => [element.data.id, element]));
-    const stale = overviewCy.elements().toArray().filter((element) => !targetIds.has(element.id()));
-    const missing = targetElements.filter((element) => !overviewCy.getElementById(element.data.id).length);
-    const parentNodes = missing.filter((element) => !isEdgeElement(element) && !element.data.parent);
-    const childNodes = missing.filter((element) => !isEdgeElement(element) && element.data.parent);
-    const edgeElements = missing.filter(isEdgeElement);
-    return {{
-      targetById: targetById,
-      stale: stale,
-      missingOrdered: parentNodes.concat(childNodes, edgeElements)
-    }};
-  }}
-
-  // Phase B (cola) が実際に必要かを判定する。ファイル位置は anchor で固定されるため、
-  // 移動対象がすべて「兄弟を持たない子」であればファイル内配置は自明 (親中心) で、
-  // cola を走らせても視覚結果は変わらない。次のいずれかを満たす移動対象があるときのみ
-  // レイアウトが要る:
-  //   - 親を持たない (ファイル ノード自体の追加/移動 -> 全体配置が要る)
-  //   - 親の子数が 2 以上 (兄弟あり -> ファイル内配置に cola が要る)
-  function overviewMovingNodesNeedLayout(movingNodeIds, targetElements) {{
-    if (!movingNodeIds || movingNodeIds.size === 0) return false;
-    const childCountByParent = new Map();
-    for (const element of targetElements) {{
-      if (isEdgeElement(element) || !element.data || !element.data.parent) continue;
-      childCountByParent.set(
-        element.data.parent,
-        (childCountByParent.get(element.data.parent) || 0) + 1
-      );
-    }}
-    for (const id of movingNodeIds) {{
-      const node = overviewCy.getElementById(id);
-      const parent = node && node.length ? node.data("parent") : null;
-      if (!parent) return true;
-      if ((childCountByParent.get(parent) || 0) >= 2) return true;
-    }}
-    return false;
-  }}
-
-  // 100 件単位のチャンクを、1 フレームあたり OVERVIEW_CHUNK_FRAME_BUDGET_MS の時間予算内で
-  // 連続処理する。予算を使い切ったら次フレームへ譲る (応答性の担保)。フレームごとに最低
-  // 1 チャンクは処理するため、コールバックが予算より重くても必ず前進する。
-  // token 失効チェックはチャンクごとに従来どおり行う。
-  async function processOverviewChunks(items, token, callback) {{
-    let index = 0;
-    while (index < items.length) {{
-      const frameStart = performance.now();
-      while (index < items.length) {{
-        if (!isOverviewSyncTokenActive(token)) return false;
-        callback(items.slice(index, index + OVERVIEW_SYNC_CHUNK_SIZE));
-        index += OVERVIEW_SYNC_CHUNK_SIZE;
-        if (performance.now() - frameStart >= OVERVIEW_CHUNK_FRAME_BUDGET_MS) break;
-      }}
-      // 従来実装は最終チャンク後にもフレーム待機していたため、末尾の待機も維持する
-      // (追加直後の描画・スタイル確定タイミングに依存する呼び出し元への互換)。
-      await nextOverviewFrame();
-    }}
-    return isOverviewSyncTokenActive(token);
-  }}
-
-  // クリックによるマップ更新を 3 フェーズで反映する。
-  //   Phase A: 構造変化 (グループ化・関数ノード・関数間エッジの追加/削除/親移動)、
-  //            data 更新、興味対象の強調/非強調、ファイル グループ ノードの座標補正を
-  //            フレーム待機なしの単一 overviewCy.batch() で同期反映する。batch が中間状態の
-  //            再描画を合体させるため、グラフを隠さずちらつかせず 1 回の連続描画になる。
-  //   Phase B: グループ内関数のレイアウトを非同期計算し、アニメーションで反映する。
-  //   Phase C: 興味対象外の非強調 (ミュート) を、レイアウト計算開始前までの描画完了後に
-  //            全量を単一 batch で同時反映し、クリック応答を阻害しない。
-  function syncOverviewElementsCore(targetElements, opts, token) {{
-    if (!overviewCy || !isLatestOverviewSync(token)) return false;
-    const immediate = Boolean(opts && opts.immediate);
-    const onComplete = opts && typeof opts.onComplete === "function" ? opts.onComplete : null;
-    const selectionSignature = opts && opts.selectionSignature ? opts.selectionSignature : overviewSelectionSignature();
-    // この sync が目指す選択署名を進行中 (pending) として記録する。完了前 (Phase B/C 進行中)
-    // でも「マップが現在の選択へ向かっているか」を判定できるようにし、選択が変わったら
-    // 確実に再 sync させる。完了時に finishPhaseCIfReady が rendered と一致させる。
-    overviewPendingSelectionSignature = selectionSignature;
-    const previousPositions = overviewNodePositions();
-    const movingNodeIds = new Set();
-    const anchorCenters = collectOverviewAnchorCenters(previousPositions, targetElements);
-    anchorOverviewChildPositions(targetElements, anchorCenters);
-    // 復活させるファイル ノードは元位置に固定したい。movingNodeIds から除外することで
-    // ロック対象 (非移動) となり、レイアウトで element.position (復活位置) から流されない。
-    const restoredFilePaths = new Set(overviewRestorePositions.keys());
-    // 復活位置はこの sync が消費した (要素 position とアンカーへ反映済み)。次回以降に
-    // 残さないようクリアする。
-    if (overviewRestorePositions.size > 0) overviewRestorePositions.clear();
-    const plan = overviewSyncDiffPlan(targetElements);
-    // 直前状態は「状態クラスが画面に適用済みの署名」(overviewVisualStateSignature) を使う。
-    // rendered は Phase B/C の完了まで更新されないため、seed 窓 (Phase B 進行中) の割り込みでは
-    // ミュート適用済みなのに「無選択」を指し、選択解除のフェードが失われる。pending は適用前
-    // から目標を指すため、same-tick の連続選択で「未適用なのに適用済み」と誤る。
-    const previousSelectionSignature = overviewVisualStateSignature || overviewRenderedSelectionSignature || JSON.stringify(["", "", ""]);
-    const previousHasSelection = selectionSignatureHasSelection(previousSelectionSignature);
-    const nextHasSelection = selectionSignatureHasSelection(selectionSignature);
-    const deferStateClassChanges = previousHasSelection !== nextHasSelection;
-
-    // --- Phase A (同期・単一 batch) ---
-    let layoutNeeded = false;
-    const dragRevision = overviewDragRevision;
-    const deferredClassTargets = [];
-    overviewLastClassUpdatePlan = {{
-      previousHasSelection,
-      nextHasSelection,
-      deferStateClassChanges,
-      phaseA: 0,
-      phaseC: 0
-    }};
-    const parentsWithRemovedChildren = new Set();
-    overviewCy.batch(() => {{
-      if (plan.stale.length > 0) {{
-        const staleCollection = overviewCy.collection(plan.stale);
-        if (staleCollection.nodes().length > 0) layoutNeeded = true;
-        staleCollection.nodes().forEach((node) => {{
-          const parentId = node.data("parent");
-          if (parentId) parentsWithRemovedChildren.add(parentId);
-          forgetOverviewNodeRuntimeState(node);
-        }});
-        overviewCy.remove(staleCollection);
-      }}
-      if (plan.missingOrdered.length > 0) {{
-        const missingElements = plan.missingOrdered
-          .map((element) => plan.targetById.get(element.data.id))
-          .filter(Boolean)
-          .map((target) => {{
-            const structureElement = overviewStructureElement(target);
-            // 新規追加ノードは初回描画から最終状態 (ミュート等の遅延状態クラス含む) で生成する。
-            // 構造クラスのみで生成すると、状態クラス適用までの 1 フレーム、非ミュートの素の見た目が
-            // 露出する (再表示時のちらつき)。画面に存在しなかったノードは Phase C 遅延の対象外。
-            const fullClasses = classText(target.classes || "");
-            if (fullClasses) structureElement.classes = fullClasses;
-            return structureElement;
-          }});
-        for (const element of missingElements) {{
-          if (isEdgeElement(element)) continue;
-          // 復活ファイル ノードはロックして元位置に固定する。
-          if (restoredFilePaths.has(element.data.id)) continue;
-          movingNodeIds.add(element.data.id);
-        }}
-        if (missingElements.length > 0) {{
-          overviewCy.add(missingElements);
-          layoutNeeded = true;
-        }}
-      }}
-      for (const target of targetElements) {{
-        const element = overviewCy.getElementById(target.data.id);
-        if (!element.length) continue;
-        if (target.data && target.data.parent && element.data("parent") !== target.data.parent) {{
-          element.move({{ parent: target.data.parent }});
-          movingNodeIds.add(target.data.id);
-          layoutNeeded = true;
-        }}
-        if (currentDataDiffers(element, target.data)) {{
-          element.data(target.data);
-        }}
-        const targetClasses = classText(target.classes || "");
-        let phaseAClasses = targetClasses;
-        if (deferStateClassChanges) {{
-          phaseAClasses = overviewPhaseAClasses(targetClasses, element.classes().join(" "));
-          if (classText(phaseAClasses) !== targetClasses) {{
-            deferredClassTargets.push({{ id: target.data.id, classes: targetClasses }});
-            overviewLastClassUpdatePlan.phaseC += 1;
-          }}
-        }}
-        if (currentClassesDiffer(element, phaseAClasses)) {{
-          overviewLastClassUpdatePlan.phaseA += 1;
-          element.classes(phaseAClasses);
-        }}
-      }}
-      applyOverviewAnchorCentersToCurrentPositions(anchorCenters);
-    }});
-    // 遅延なし (選択→選択など) の sync では、状態クラスは上の batch で全量適用済み。
-    // 遅延ありの場合は Phase C (startPhaseC) の適用後に更新する。
-    if (!deferStateClassChanges) overviewVisualStateSignature = selectionSignature;
-
-    // 中止されたレイアウトで seed のまま取り残された関数を今回の移動対象へ再投入する。直前の
-    // レイアウトが操作割り込み (reveal/hide、または seed 表示中の選択変更) で中止されたケースで、
-    // 取り残された関数を Phase B で再レイアウトするための再開ロジック。
-    // pending は「直前に中止されたレイアウトの移動対象」だけを保持する。割り込み種別 (force 経路か
-    // 通常の選択 sync か) に依らず、Phase A 完了後も生存 (可視) している pending ノードは再レイアウト
-    // 対象へ戻す。生存しない (stale で削除された) id は pending から取り除く。pending が空の通常 sync
-    // では no-op となるため、選択操作の挙動・ノード位置には影響しない。
-    // pending の登録は中止時 (stopOverviewActiveLayout)、削除は自然完了時 (finishLayout) と本ループの
-    // stale 除去で行う (再投入した関数は新レイアウト完了時に finishLayout が pending から削除する)。
-    if (overviewPendingRelayoutNodeIds.size > 0) {{
-      for (const id of Array.from(overviewPendingRelayoutNodeIds)) {{
-        const node = overviewCy.getElementById(id);
-        if (node && node.length) {{
-          movingNodeIds.add(id);
-        }} else {{
-          overviewPendingRelayoutNodeIds.delete(id);
-        }}
-      }}
-      if (movingNodeIds.size > 0) layoutNeeded = true;
-    }}
-
-    // stale 除去で子を失った親 (ファイル) の生存子は、除去前の兄弟集合を前提とした配置のまま
-    // 取り残される。ファイル選択 (全関数表示) から関数選択へ縮小する遷移で、新規追加が各ファイル
-    // 単一子のみだと overviewMovingNodesNeedLayout の単一子スキップにより Phase B 全体が失火し、
-    // 残存兄弟が旧座標のまま放置される。兄弟集合が縮小した親の生存子を移動対象へ加えることで、
-    // 単一子スキップの前提 (レイアウト結果が自明) が崩れるケースを Phase B の対象に戻す。
-    if (parentsWithRemovedChildren.size > 0) {{
-      for (const parentId of parentsWithRemovedChildren) {{
-        const parent = overviewCy.getElementById(parentId);
-        if (!parent || !parent.length) continue;
-        parent.children().forEach((child) => movingNodeIds.add(child.id()));
-      }}
-      if (movingNodeIds.size > 0) layoutNeeded = true;
-    }}
-
-    if (!isLatestOverviewSync(token)) return false;
-
-    // --- Phase C 本体 ---
-    // レイアウト入力へ影響しないミュート クラスを、レイアウト計算開始前までの描画
-    // (Phase A の強調 + seed 配置) が確実に画面へ描画された後に、全量を単一 batch で
-    // 同時反映する。完了通知は Phase B と Phase C の双方が終わってから行う。
-    let phaseCStarted = false;
-    let phaseCClassesDone = false;
-    let phaseCLayoutDone = true;
-    let phaseCFinalized = false;
-    const finishPhaseCIfReady = () => {{
-      if (phaseCFinalized || !phaseCClassesDone || !phaseCLayoutDone) return;
-      phaseCFinalized = true;
-      if (!overviewCy || !isLatestOverviewSync(token)) return;
-      if (selectionSignature === overviewSelectionSignature()) {{
-        overviewRenderedSelectionSignature = selectionSignature;
-        overviewPendingSelectionSignature = selectionSignature;
-      }}
-      if (onComplete) onComplete();
-    }};
-    const markPhaseCLayoutDone = () => {{
-      phaseCLayoutDone = true;
-      finishPhaseCIfReady();
-    }};
-    const startPhaseC = () => {{
-      if (phaseCStarted) return;
-      phaseCStarted = true;
-      if (!overviewCy || !isLatestOverviewSync(token)) return;
-      if (deferredClassTargets.length === 0) {{
-        overviewVisualStateSignature = selectionSignature;
-        phaseCClassesDone = true;
-        finishPhaseCIfReady();
-        return;
-      }}
-      // 操作種別に応じてフェードの扱いを切り替える。
-      //   suppressFade (タブ切替・初期化): fadeMode "none" のスタイルで適用して完全即時。
-      //     適用後すぐ既定スタイルへ戻す (色が変化しないため補間は走らない)。
-      //   選択解除 (選択中 -> 無選択): dep-overview-fade を併せて付与し、ミュート解除も
-      //     通常表示へフェードで戻す。フェード完了後にクラスを除去する (タイマー)。
-      //   それ以外 (選択変更・選択開始): 既定 "muted" のまま (ミュート化のみフェード)。
-      const suppressFade = Boolean(opts && opts.suppressFade);
-      const clearingSelection = !suppressFade && previousHasSelection && !nextHasSelection;
-      if (suppressFade) {{
-        applyOverviewFadeMode("none");
-      }}
-      overviewCy.batch(() => {{
-        for (const target of deferredClassTargets) {{
-          const element = overviewCy.getElementById(target.id);
-          if (!element.length) continue;
-          const nextClasses = clearingSelection
-            ? classText((target.classes || "") + " dep-overview-fade")
-            : (target.classes || "");
-          if (currentClassesDiffer(element, nextClasses)) {{
-            // 進行中のスタイル トランジション (ミュート化フェード等) は停止してから
-            // クラスを変更する。cytoscape はトランジションをキューイングするため、
-            // 停止しないと進行中のフェードが完走してから次の変化が始まり、
-            // seed 窓中の選択解除で「ミュート化が続いた後に急に戻る」見た目になる。
-            // stop(true, false) は現在色で凍結するため、そこから目標色へ補間される。
-            if (clearingSelection) element.stop(true, false);
-            element.classes(nextClasses);
-          }}
-        }}
-      }});
-      if (suppressFade) {{
-        applyOverviewFadeMode("muted");
-      }} else if (clearingSelection) {{
-        scheduleOverviewFadeClassCleanup();
-      }}
-      overviewVisualStateSignature = selectionSignature;
-      phaseCClassesDone = true;
-      finishPhaseCIfReady();
-    }};
-    // rAF コールバックは「次の描画の直前」に走るため、rAF 1 回では直前フレームの内容が
-    // 画面へ描画されたことを保証できない。rAF を 2 回連ねることで間に 1 回の paint が
-    // 確実に挟まり、レイアウト計算開始前までの状態の描画完了後に全量適用できる。
-    const schedulePhaseCAfterPaint = () => {{
-      requestOverviewFrame(() => requestOverviewFrame(startPhaseC));
-    }};
-
-    // ドラッグ中はレイアウトを後回しにし、ドラッグ終了後 (handleOverviewNodeFree) に再同期する。
-    if (layoutNeeded && (hasOverviewDraggingNodes() || dragRevision !== overviewDragRevision)) {{
-      overviewSyncAfterDrag = true;
-      startPhaseC();
-      return true;
-    }}
-
-    // --- Phase B (非同期レイアウト + アニメーション) ---
-    // 移動対象がすべて単一子 (兄弟なし) のときはファイル内配置が自明で cola は不要。
-    // その場合は Phase B をスキップし、下の「構造変化なし」経路で Phase C を確定する。
-    // 単一子は Phase A で親中心へ配置済みのため追加の座標処理は要らないが、pending な
-    // ユーザー ドラッグの消費と anchorCenters 反映のため applyOverviewUserMovedPositions は
-    // スキップ経路でも 1 回呼ぶ (レイアウトは起動しない)。
-    const needsLayout = overviewMovingNodesNeedLayout(movingNodeIds, targetElements);
-    if (layoutNeeded && movingNodeIds.size > 0 && needsLayout) {{
-      applyOverviewUserMovedPositions(previousPositions, anchorCenters);
-      restoreOverviewNodePositions(previousPositions);
-      applyOverviewAnchorCentersToCurrentPositions(anchorCenters);
-      if (opts) opts.layoutStarted = true;
-      phaseCLayoutDone = false;
-      runOverviewLayout({{
-        movingNodeIds,
-        anchorCenters,
-        immediate,
-        animatePositions: !(opts && opts.hideDuringUpdate),
-        instantPositions: Boolean(opts && opts.hideDuringUpdate),
-        onComplete: markPhaseCLayoutDone,
-        deferPositions: true,
-        fullConvergence: true,
-        unlockAllDuringLayout: true,
-        scopeToVisibleChildren: true,
-        syncToken: token
-      }});
-      schedulePhaseCAfterPaint();
-      return true;
-    }}
-
-    // 構造変化なし、または移動対象が単一子のみで Phase B スキップ: 興味対象の強調は
-    // 反映済み。単一子スキップ時は pending ドラッグの消費と anchorCenters 反映を保つ。
-    // ミュートがあれば強調の描画完了後に全量反映し、なければ即座に確定する。
-    if (movingNodeIds.size > 0) {{
-      applyOverviewUserMovedPositions(previousPositions, anchorCenters);
-    }}
-    if (deferredClassTargets.length > 0) {{
-      schedulePhaseCAfterPaint();
-    }} else {{
-      startPhaseC();
-    }}
-    return true;
-  }}
-
-  function syncOverviewElements(targetElements, opts) {{
-    if (opts) opts.layoutStarted = true;
-    runLatestOverviewSync(opts, targetElements);
-  }}
-
-  function runLatestOverviewSync(opts, targetElements) {{
-    if (!overviewCy) return;
-    const token = ++overviewSyncToken;
-    ++overviewLayoutToken;
-    // 手動レイアウト (relayoutOverviewGraph) の実行中にこの sync が割り込むと、進めた
-    // overviewLayoutToken により手動レイアウトの完了/watchdog の解除条件が二度と成立せず、
-    // overviewLayoutRunning と操作ロック/controls-inert が孤児化して固着する。差し替える側で
-    // 明示的に解放する。
-    if (overviewLayoutRunning) setOverviewLayoutRunning(false);
-    overviewDeferredPositionAnimation = null;
-    stopOverviewPositionAnimation();
-    stopOverviewActiveLayout();
-    const completed = syncOverviewElementsCore(targetElements || buildOverviewElements(), opts || {{}}, token);
-    if (completed && isLatestOverviewSync(token) && opts && opts.onSyncComplete) opts.onSyncComplete();
-  }}
-
-  // ファイル (compound) を掴むと、その子 (関数) ノードにも grab/drag が伝播する。親ファイルが
-  // 掴まれている子のイベントは、ファイル ドラッグの副作用であって関数の直接操作ではない。これを
-  // 関数の割り込みとして扱うと、ファイルを少し動かしただけで進行中の関数レイアウト (cola) が中止され、
-  // 関数が seed 位置のまま取り残される。子のイベントは親ファイル側の grab/drag で処理されるため、
-  // ここでは無視してよい。
-  function isOverviewChildOfGrabbedFile(node) {{
-    if (!node || !node.length || !node.data("parent")) return false;
-    const parent = node.parent();
-    return Boolean(parent && parent.length && parent.grabbed());
-  }}
-
-  function handleOverviewNodeGrab(node) {{
-    if (isOverviewChildOfGrabbedFile(node)) return;
-    // grab (mousedown) はタップでも発火する。ここでドラッグ集合へ登録すると、
-    // タップ直後の選択 sync がドラッグ後回し分岐に入り Phase B (関数レイアウト) を
-    // 取りこぼす。実際の移動 (drag) があって初めてドラッグ扱いとする。
-    if (node && node.length && node.data("parent") && (overviewActiveLayout || overviewPositionAnimation)) {{
-      if (overviewActiveLayout) stopOverviewActiveLayout();
-      overviewDeferredPositionAnimation = null;
-      markOverviewFunctionLayoutInterrupted(node);
-      overviewFunctionGrabInterruptedLayout = true;
-      stopOverviewPositionAnimation();
-      return;
-    }}
-    // ファイル (ルート) ノードを cola 後の位置アニメーション中に掴んでも止めない。アニメーションは
-    // 親ファイルの最新位置に追従して関数を動かすため、ドラッグ中もそのまま継続させる。止めると
-    // 完了通知 (onComplete) が失われ、レイアウト結果が採用されないまま固着する。
-    if (node && node.length && !node.data("parent")
-        && overviewPositionAnimation && overviewPositionAnimation.active) {{
-      return;
-    }}
-    stopOverviewPositionAnimation();
-  }}
-
-  function handleOverviewNodeDrag(node) {{
-    if (isOverviewChildOfGrabbedFile(node)) return;
-    if (node && node.length && node.data("parent") && (overviewActiveLayout || overviewFunctionGrabInterruptedLayout)) {{
-      stopOverviewActiveLayout();
-      markOverviewFunctionLayoutInterrupted(node);
-      overviewSyncAfterDrag = true;
-    }}
-    rememberOverviewUserMovedPositions(node);
-    let added = false;
-    for (const id of overviewNodeDragIds(node)) {{
-      if (!overviewDraggingNodeIds.has(id)) {{
-        overviewDraggingNodeIds.add(id);
-        added = true;
-      }}
-    }}
-    if (added) overviewDragRevision += 1;
-  }}
-
-  function handleOverviewNodeFree(node) {{
-    // 実ドラッグを伴わない free (純タップ) では userMoved を記録しない。タップで記録すると
-    // ファイルが「ユーザー移動済み」と誤認され、以後の位置アニメーションが live アンカー経路に
-    // 入り、静止した grab を錨とした帰還ループで配置が漂流する。
-    if (isOverviewNodeDragging(node)) rememberOverviewUserMovedPositions(node);
-    let removed = false;
-    for (const id of overviewNodeDragIds(node)) {{
-      if (overviewDraggingNodeIds.delete(id)) removed = true;
-    }}
-    if (removed) overviewDragRevision += 1;
-    if (hasOverviewDraggingNodes()) return;
-    if (overviewDeferredPositionAnimation && !overviewFunctionGrabInterruptedLayout) {{
-      const deferred = overviewDeferredPositionAnimation;
-      overviewDeferredPositionAnimation = null;
-      overviewSyncAfterDrag = false;
-      applyOverviewDeferredDragPositions(deferred);
-      animateOverviewPositions(deferred.startPositions, deferred.targetPositions, deferred.opts);
-      return;
-    }}
-    overviewFunctionGrabInterruptedLayout = false;
-    overviewDeferredPositionAnimation = null;
-    if (!overviewSyncAfterDrag) return;
-    overviewSyncAfterDrag = false;
-    runLatestOverviewSync({{ relayoutPending: true }}, buildOverviewElements());
-  }}
-
-  function overviewSelectionSignature() {{
-    return JSON.stringify([selectedId, selectedFilePath, selectedEdgeKey]);
-  }}
-
-  function isOverviewRenderedSelectionCurrent() {{
-    return (
-      overviewCy &&
-      overviewCy.elements().length > 0 &&
-      overviewRenderedSelectionSignature === overviewSelectionSignature()
-    );
-  }}
-
-  // 「マップが現在の選択を反映済み、または進行中の sync が現在の選択を対象にしているか」。
-  // rendered だけを見る isOverviewRenderedSelectionCurrent と異なり、未完了 (Phase B/C 進行中) の
-  // pending も考慮する。これにより、進行中 sync が現在選択と異なる対象を目指している間は、
-  // 現在選択が偶然 rendered と一致しても再 sync をスキップせず、状態の食い違いを防ぐ。
-  function isOverviewSelectionPendingOrRendered() {{
-    return (
-      overviewCy &&
-      overviewCy.elements().length > 0 &&
-      overviewPendingSelectionSignature === overviewSelectionSignature()
-    );
-  }}
-
-  // 選択操作に応じて、非表示ファイルのうち復活条件を満たすものを再表示する。
-  // 復活条件: 選択中ファイル自身、選択中関数の所属ファイル、循環参照の関数選択時に限り
-  // 循環グループ各関数の所属ファイル。「関連ファイル」や「関連関数の所属ファイル」だけでは
-  // 復活しない。戻り値は復活が発生したか。
-  function reconcileHiddenOverviewFiles() {{
-    if (hiddenOverviewFiles.size === 0) return false;
-    const reveal = new Set();
-    if (selectedFilePath && hiddenOverviewFiles.has(selectedFilePath)) {{
-      reveal.add(selectedFilePath);
-    }}
-    if (selectedId) {{
-      const fn = byId.get(selectedId);
-      if (fn) {{
-        if (hiddenOverviewFiles.has(fn.file)) reveal.add(fn.file);
-        if (fn.dependencyClass === "cycle") {{
-          for (const cycleId of cycleGroupFunctionIds(fn)) {{
-            const cycleFn = byId.get(cycleId);
-            if (cycleFn && hiddenOverviewFiles.has(cycleFn.file)) reveal.add(cycleFn.file);
-          }}
-        }}
-      }}
-    }}
-    if (reveal.size === 0) return false;
-    for (const path of reveal) {{
-      const position = hiddenOverviewFiles.get(path);
-      hiddenOverviewFiles.delete(path);
-      if (position) overviewRestorePositions.set(path, position);
-    }}
-    updateOverviewHiddenNotice();
-    return true;
-  }}
-
-  function forceRenderOverviewGraph() {{
-    if (activeTab === "overviewPanel") renderOverviewGraph({{ force: true }});
-  }}
-
-  function renderOverviewGraph(opts) {{
-    if (!overviewCy) return;
-    if (overviewCy.elements().length === 0) {{
-      resetOverviewGraph({{ initializeUnselectedFirst: Boolean(opts && opts.initializeUnselectedFirst) }});
-      return true;
-    }}
-    if (!(opts && opts.force) && isOverviewSelectionPendingOrRendered()) {{
-      return false;
-    }}
-    const selectionSignature = overviewSelectionSignature();
-    const originalOnComplete = opts && typeof opts.onComplete === "function" ? opts.onComplete : null;
-    const renderOpts = Object.assign({{}}, opts || {{}});
-    const hideDuringUpdate = Boolean(renderOpts.hideDuringUpdate);
-    const viewportBeforeUpdate = hideDuringUpdate ? overviewViewport() : null;
-    renderOpts.selectionSignature = selectionSignature;
-    renderOpts.hideDuringUpdate = hideDuringUpdate;
-    renderOpts.onComplete = () => {{
-      if (hideDuringUpdate) {{
-        scheduleOverviewRelayoutReveal({{ viewport: viewportBeforeUpdate }});
-      }}
-      if (originalOnComplete) originalOnComplete();
-    }};
-    if (hideDuringUpdate) {{
-      ++overviewRelayoutRevealToken;
-      overviewGraph.classList.add("layout-relayouting");
-      setOverviewControlsInert(true);
-    }}
-    syncOverviewElements(buildOverviewElements(), renderOpts);
-    return false;
-  }}
-
-  async function resetOverviewGraphAsync(token, opts) {{
-    await nextOverviewFrame();
-    await nextOverviewFrame();
-    if (!overviewCy || !isLatestOverviewSync(token)) return false;
-    overviewCy.resize();
-    overviewCy.elements().remove();
-    await nextOverviewFrame();
-    if (!overviewCy || !isLatestOverviewSync(token)) return false;
-    const initializeUnselectedFirst = Boolean(opts && opts.initializeUnselectedFirst && selectionSignatureHasSelection(overviewSelectionSignature()));
-    const initialSelection = initializeUnselectedFirst ? overviewEmptySelection() : null;
-    const elements = await buildOverviewElementsAsync(token, initialSelection);
-    if (!elements || !isLatestOverviewSync(token)) return false;
-    if (!(await seedOverviewInitialPositionsAsync(elements, token))) return false;
-    if (!(await processOverviewChunks(elements, token, (chunk) => {{
-      overviewCy.add(chunk);
-    }}))) return false;
-    if (!overviewCy || !isLatestOverviewSync(token)) return false;
-    runOverviewLayout({{
-      immediate: true,
-      fit: true,
-      layoutPasses: 2,
-      layoutToken: overviewLayoutToken,
-      onComplete: () => {{
-        finishOverviewInitialLayout(token, initializeUnselectedFirst);
-      }}
-    }});
-    return true;
-  }}
-
-  async function revealOverviewGraphAfterFit(token) {{
-    if (!overviewCy || !isLatestOverviewSync(token)) return;
-    setOverviewGraphInteractionLocked(false);
-    overviewCy.resize();
-    fitOverviewGraph();
-    await nextOverviewFrame();
-    if (!overviewCy || !isLatestOverviewSync(token)) return;
-    setOverviewGraphInteractionLocked(false);
-    overviewCy.resize();
-    fitOverviewGraph();
-    overviewRenderedSelectionSignature = overviewSelectionSignature();
-    overviewPendingSelectionSignature = overviewRenderedSelectionSignature;
-    overviewGraph.classList.remove("layout-initializing");
-    overviewGraph.classList.remove("layout-relayouting");
-    setOverviewControlsInert(false);
-  }}
-
-  function finishOverviewInitialLayout(token, initializeUnselectedFirst) {{
-    if (!overviewCy || !isLatestOverviewSync(token)) return;
-    if (!initializeUnselectedFirst) {{
-      revealOverviewGraphAfterFit(token);
-      return;
-    }}
-    overviewGraph.classList.add("layout-relayouting");
-    const renderOpts = {{
-      immediate: false,
-      hideDuringUpdate: false,
-      selectionSignature: overviewSelectionSignature(),
-      // 初期化はユーザーのクリック操作ではないため、状態クラスのフェードを行わない。
-      suppressFade: true,
-      onComplete: () => {{
-        revealOverviewGraphAfterFit(token);
-      }}
-    }};
-    syncOverviewElementsCore(buildOverviewElements(), renderOpts, token);
-  }}
-
-  function resetOverviewGraph(opts) {{
-    if (!overviewCy) return;
-    // 初期化では非表示を解除し、全ファイルを元の状態へ戻す。
-    hiddenOverviewFiles.clear();
-    overviewRestorePositions.clear();
-    overviewPendingRelayoutNodeIds.clear();
-    updateOverviewHiddenNotice();
-    const token = ++overviewSyncToken;
-    ++overviewLayoutToken;
-    // 手動レイアウト実行中の初期化でも実行状態が孤児化しないよう、自前の再ロック前に解放する。
-    if (overviewLayoutRunning) setOverviewLayoutRunning(false);
-    stopOverviewActiveLayout();
-    overviewRenderedSelectionSignature = null;
-    overviewPendingSelectionSignature = null;
-    overviewVisualStateSignature = null;
-    overviewGraph.classList.add("layout-initializing");
-    setOverviewControlsInert(true);
-    setOverviewGraphInteractionLocked(true);
-    ++overviewRelayoutRevealToken;
-    overviewLayoutInitialized = false;
-    stopOverviewPositionAnimation();
-    resetOverviewGraphAsync(token, opts || {{}});
-  }}
-
-  function abortOverviewInitializationOnTabLeave(previousTab, nextTab) {{
-    if (previousTab !== "overviewPanel" || nextTab === "overviewPanel") return;
-    if (!overviewCy || !overviewGraph || !overviewGraph.classList.contains("layout-initializing")) return;
-    ++overviewSyncToken;
-    ++overviewLayoutToken;
-    ++overviewRelayoutRevealToken;
-    stopOverviewActiveLayout();
-    stopOverviewPositionAnimation();
-    setOverviewLayoutRunning(false);
-    overviewCy.elements().remove();
-    overviewRenderedSelectionSignature = null;
-    overviewPendingSelectionSignature = null;
-    overviewVisualStateSignature = null;
-    overviewLayoutInitialized = false;
-    overviewPendingRelayoutNodeIds.clear();
-    setOverviewControlsInert(true);
-    setOverviewGraphInteractionLocked(true);
-  }}
-
-  function initOverviewGraph() {{
-    if (overviewCy || !overviewGraph) return;
-    if (typeof cytoscape !== "function") {{
-      graphUnavailable(overviewGraph, overviewDetail);
-      return;
-    }}
-    overviewCy = cytoscape({{
-      container: overviewGraph,
-      elements: [],
-      style: graphStyle(),
-      wheelSensitivity: 0.18
-    }});
-    overviewCy.on("tap", "node", (event) => {{
-      const id = event.target.id();
-      if (functionsByFile.has(id)) {{
-        selectFile(id);
-      }} else {{
-        selectFunction(id);
-      }}
-    }});
-    overviewCy.on("tap", "edge", (event) => {{
-      const edge = event.target;
-      if (edge.data("kind") !== "file-edge") return;
-      selectOverviewEdge(edge.id());
-    }});
-    overviewCy.on("tap", (event) => {{
-      if (event.target !== overviewCy) return;
-      if (isOverviewBackgroundTapSuppressed()) return;
-      clearOverviewSelection();
-    }});
-    overviewCy.on("grab", "node", (event) => {{
-      handleOverviewNodeGrab(event.target);
-    }});
-    overviewCy.on("drag", "node", (event) => {{
-      handleOverviewNodeDrag(event.target);
-    }});
-    overviewCy.on("free", "node", (event) => {{
-      handleOverviewNodeFree(event.target);
-    }});
-    function overviewCxtMenuCoords(event) {{
-      const originalEvent = event.originalEvent || {{}};
-      if (originalEvent.preventDefault) originalEvent.preventDefault();
-      let clientX = Number(originalEvent.clientX);
-      let clientY = Number(originalEvent.clientY);
-      if ((!Number.isFinite(clientX) || !Number.isFinite(clientY)) && event.renderedPosition) {{
-        const rect = overviewGraph.getBoundingClientRect();
-        clientX = rect.left + event.renderedPosition.x;
-        clientY = rect.top + event.renderedPosition.y;
-      }}
-      return {{ clientX, clientY }};
-    }}
-    overviewCy.on("cxttap", (event) => {{
-      if (event.target !== overviewCy) return;
-      const coords = overviewCxtMenuCoords(event);
-      if (Number.isFinite(coords.clientX) && Number.isFinite(coords.clientY)) {{
-        overviewMenuTargetFile = "";
-        showOverviewGraphMenu(coords.clientX, coords.clientY, "background");
-      }}
-    }});
-    overviewCy.on("cxttap", "node.dep-file-node", (event) => {{
-      const coords = overviewCxtMenuCoords(event);
-      if (Number.isFinite(coords.clientX) && Number.isFinite(coords.clientY)) {{
-        overviewMenuTargetFile = event.target.id();
-        showOverviewGraphMenu(coords.clientX, coords.clientY, "node");
-      }}
-    }});
-    overviewGraph.addEventListener("contextmenu", (event) => {{
-      event.preventDefault();
-    }});
-    overviewGraph.addEventListener("mousedown", (event) => {{
-      if (event.button !== 1) return;
-      event.preventDefault();
-    }});
-    overviewGraph.addEventListener("auxclick", (event) => {{
-      if (event.button !== 1) return;
-      event.preventDefault();
-      fitOverviewGraph();
-    }});
-  }}
-
-  function refreshActiveGraph(opts) {{
-    if (activeTab === "overviewPanel") {{
-      initOverviewGraph();
-      // 他タブで選択変更後に全体マップへ遷移した場合も復活条件を評価する。
-      const revealed = reconcileHiddenOverviewFiles();
-      // 既にレイアウト済みの全体マップへ別タブから戻る場合は初期化用 immediate を落とすが、
-      // マップは最終断面まで隠したまま非アニメーションで選択を反映する。
-      // 未初期化 (要素が空) のときだけ immediate のまま resetOverviewGraph へ渡す。
-      const alreadyLaidOut = Boolean(overviewLayoutInitialized && overviewCy && overviewCy.elements().length > 0);
-      const requestedImmediate = Boolean(opts && opts.immediate);
-      const immediate = requestedImmediate && !alreadyLaidOut;
-      const hideDuringUpdate = requestedImmediate;
-      if (!revealed && immediate && isOverviewSelectionPendingOrRendered()) {{
-        return;
-      }}
-      if (immediate && overviewCy && overviewCy.elements().length > 0) {{
-        ++overviewRelayoutRevealToken;
-        overviewGraph.classList.add("layout-relayouting");
-        setOverviewControlsInert(true);
-      }}
-      const requestFrame = window.requestAnimationFrame || window.webkitRequestAnimationFrame || ((callback) => window.setTimeout(() => callback(Date.now()), 16));
-      const finishImmediateRefresh = () => {{
-        if (!immediate) return;
-        if (activeTab === "overviewPanel" && !isOverviewRenderedSelectionCurrent()) {{
-          requestFrame(finishImmediateRefresh);
-          return;
-        }}
-        scheduleOverviewRelayoutReveal();
-      }};
-      const refresh = () => {{
-        if (activeTab !== "overviewPanel") {{
-          finishImmediateRefresh();
-          return;
-        }}
-        const renderOpts = {{ immediate, hideDuringUpdate, initializeUnselectedFirst: immediate && selectionSignatureHasSelection(overviewSelectionSignature()), onComplete: finishImmediateRefresh, selectionSignature: overviewSelectionSignature(), force: revealed, suppressFade: true }};
-        const resetStarted = renderOverviewGraph(renderOpts);
-        if (overviewCy && !resetStarted && !renderOpts.layoutStarted) {{
-          finishImmediateRefresh();
-        }}
-      }};
-      if (immediate) {{
-        requestFrame(() => requestFrame(refresh));
-      }} else {{
-        requestFrame(refresh);
-      }}
-    }}
-  }}
-
-  function fillOptions() {{
-    const levels = Array.from(new Set(functions.map(levelText))).sort((a, b) => {{
-      if (a === "cycle") return 1;
-      if (b === "cycle") return -1;
-      return Number(a) - Number(b);
-    }});
-    for (const level of levels) {{
-      const option = document.createElement("option");
-      option.value = level;
-      option.textContent = "level " + level;
-      levelFilter.appendChild(option);
-      fileLevelFilter.appendChild(option.cloneNode(true));
-    }}
-    for (const klass of Array.from(new Set(functions.map((fn) => fn.dependencyClass))).sort()) {{
-      const option = document.createElement("option");
-      option.value = klass;
-      option.textContent = klass;
-      classFilter.appendChild(option);
-      fileClassFilter.appendChild(option.cloneNode(true));
-    }}
-    for (const area of Array.from(new Set(functions.map((fn) => fn.sourceArea))).sort()) {{
-      const option = document.createElement("option");
-      option.value = area;
-      option.textContent = area;
-      areaFilter.appendChild(option);
-      fileAreaFilter.appendChild(option.cloneNode(true));
-    }}
-    for (const file of Array.from(new Set(functions.map((fn) => fn.file))).sort()) {{
-      const option = document.createElement("option");
-      option.value = file;
-      option.textContent = file;
-      fileFilter.appendChild(option);
-    }}
-  }}
-
-  function matches(fn) {{
-    const query = search.value.trim().toLowerCase();
-    if (query && !(fn.name.toLowerCase().includes(query) || fn.file.toLowerCase().includes(query))) return false;
-    if (levelFilter.value && levelText(fn) !== levelFilter.value) return false;
-    if (classFilter.value && fn.dependencyClass !== classFilter.value) return false;
-    if (exportFilter.value && (fn.isExported ? "yes" : "no") !== exportFilter.value) return false;
-    if (staticFilter.value && (fn.isStatic ? "yes" : "no") !== staticFilter.value) return false;
-    if (areaFilter.value && fn.sourceArea !== areaFilter.value) return false;
-    if (fileFilter.value && fn.file !== fileFilter.value) return false;
-    return true;
-  }}
-
-  function matchesFile(file) {{
-    const query = fileSearch.value.trim().toLowerCase();
-    const searchable = [
-      file.path,
-      file.brief,
-      file.dominantArea,
-      fileLevelText(file),
-      fileClassText(file),
-      fileAreasText(file)
-    ].join(" ").toLowerCase();
-    if (query && !searchable.includes(query)) return false;
-    if (fileLevelFilter.value && !mapKeys(file.levels).includes(fileLevelFilter.value)) return false;
-    if (fileClassFilter.value && !mapKeys(file.classes).includes(fileClassFilter.value)) return false;
-    if (fileExportFilter.value && (Number(file.exportCount || 0) > 0 ? "yes" : "no") !== fileExportFilter.value) return false;
-    if (fileStaticFilter.value && (Number(file.staticCount || 0) > 0 ? "yes" : "no") !== fileStaticFilter.value) return false;
-    if (fileAreaFilter.value && !mapKeys(file.areas).includes(fileAreaFilter.value)) return false;
-    return true;
-  }}
-
-  function selectedVisible() {{
-    if (!selectedId) return true;
-    const fn = byId.get(selectedId);
-    return !fn || matches(fn);
-  }}
-
-  function selectedFileVisible() {{
-    if (!selectedFilePath) return true;
-    const file = fileByPath.get(selectedFilePath);
-    return !file || matchesFile(file);
-  }}
-
-  function renderNotice() {{
-    filterNotice.classList.toggle("visible", !selectedVisible());
-  }}
-
-  function renderFileNotice() {{
-    fileFilterNotice.classList.toggle("visible", !selectedFileVisible());
-  }}
-
-  function centerSelectedRow(selectedRow) {{
-    const wrap = selectedRow.closest(".dep-table-wrap");
-    if (!wrap || wrap.clientHeight === 0) return false;
-    const wrapRect = wrap.getBoundingClientRect();
-    const rowRect = selectedRow.getBoundingClientRect();
-    const currentRowCenter = rowRect.top + rowRect.height / 2;
-    const targetCenter = wrapRect.top + wrap.clientHeight / 2;
-    wrap.scrollTop += currentRowCenter - targetCenter;
-    return true;
-  }}
-
-  function syncSelectedRowScroll(forceScroll) {{
-    const selectedRow = rows.querySelector("tr.selected");
-    if (!selectedRow) {{
-      previousSelectedRowVisible = false;
-      return;
-    }}
-    if (forceScroll || !previousSelectedRowVisible) {{
-      if (!centerSelectedRow(selectedRow)) {{
-        pendingFunctionListScroll = true;
-        return;
-      }}
-      pendingFunctionListScroll = false;
-    }}
-    previousSelectedRowVisible = true;
-  }}
-
-  function syncSelectedFileRowScroll(forceScroll) {{
-    const selectedRow = fileRows.querySelector("tr.selected");
-    if (!selectedRow) {{
-      previousSelectedFileRowVisible = false;
-      return;
-    }}
-    if (forceScroll || !previousSelectedFileRowVisible) {{
-      if (!centerSelectedRow(selectedRow)) {{
-        pendingFileListScroll = true;
-        return;
-      }}
-      pendingFileListScroll = false;
-    }}
-    previousSelectedFileRowVisible = true;
-  }}
-
-  function renderRows(opts) {{
-    const fragment = document.createDocumentFragment();
-    for (const fn of sortedFunctions(functions.filter(matches))) {{
-      const tr = document.createElement("tr");
-      tr.setAttribute("data-function-row-id", fn.id);
-      if (fn.id === selectedId) tr.className = "selected";
-      tr.innerHTML =
-        "<td class=\\"dep-num\\">" + escapeHtml(levelText(fn)) + "</td>" +
-        "<td><span class=\\"badge " + escapeHtml(fn.dependencyClass) + "\\">" + escapeHtml(fn.dependencyClass) + "</span></td>" +
-        "<td>" + (fn.isExported ? "yes" : "") + "</td>" +
-        "<td>" + (fn.isStatic ? "yes" : "") + "</td>" +
-        "<td>" + areaBadge(fn.sourceArea) + "</td>" +
-        "<td>" + escapeHtml(fn.name) + "</td>" +
-        "<td class=\\"dep-file\\" title=\\"" + escapeHtml(fn.file) + "\\">" + escapeHtml(fn.file) + "</td>" +
-        "<td class=\\"dep-num\\">" + escapeHtml(fn.inScopeCalleeCount) + "</td>" +
-        "<td class=\\"dep-num\\">" + escapeHtml(fn.inScopeCallerCount) + "</td>" +
-        "<td class=\\"dep-num\\">" + escapeHtml(fn.crossFileCalleeCount) + "</td>";
-      fragment.appendChild(tr);
-    }}
-    rows.replaceChildren(fragment);
-    ensureFunctionRowSelectionRendered();
-    renderNotice();
-    renderSortMarks();
-    syncSelectedRowScroll(Boolean(opts && opts.forceScroll));
-  }}
-
-  function renderFileRows(opts) {{
-    const fragment = document.createDocumentFragment();
-    for (const file of sortedFiles(files.filter(matchesFile))) {{
-      const tr = document.createElement("tr");
-      tr.setAttribute("data-file-row-path", file.path);
-      if (file.path === selectedFilePath) tr.className = "selected";
-      tr.innerHTML =
-        "<td>" + areaBadge(file.dominantArea || "") + "</td>" +
-        "<td class=\\"dep-file\\" title=\\"" + escapeHtml(file.path) + "\\">" + escapeHtml(file.path) + "</td>" +
-        "<td class=\\"dep-num\\">" + escapeHtml(file.functionCount || 0) + "</td>" +
-        "<td class=\\"dep-num\\">" + escapeHtml(file.exportCount || 0) + "</td>" +
-        "<td class=\\"dep-num\\">" + escapeHtml(file.staticCount || 0) + "</td>" +
-        "<td class=\\"dep-num\\">" + escapeHtml(file.edgeCount || 0) + "</td>" +
-        "<td>" + escapeHtml(fileLevelText(file)) + "</td>" +
-        "<td>" + escapeHtml(fileClassText(file)) + "</td>" +
-        "<td>" + escapeHtml(fileAreasText(file)) + "</td>";
-      fragment.appendChild(tr);
-    }}
-    fileRows.replaceChildren(fragment);
-    ensureFileRowSelectionRendered();
-    renderFileNotice();
-    renderFileSortMarks();
-    syncSelectedFileRowScroll(Boolean(opts && opts.forceScroll));
-  }}
-
-  function ensureFunctionRowSelectionRendered() {{
-    for (const row of rows.querySelectorAll("[data-function-row-id]")) {{
-      row.classList.toggle("selected", row.getAttribute("data-function-row-id") === selectedId);
-    }}
-  }}
-
-  function ensureFileRowSelectionRendered() {{
-    for (const row of fileRows.querySelectorAll("[data-file-row-path]")) {{
-      row.classList.toggle("selected", row.getAttribute("data-file-row-path") === selectedFilePath);
-    }}
-  }}
-
-  function linkFor(fn, label, source) {{
-    const url = source ? (fn.gitUrl || fn.sourceUrl) : fn.htmlUrl;
-    if (!url) return "";
-    const target = source ? "source-file" : "doxygen-page";
-    return "<a href=\\"" + escapeHtml(url) + "\\" target=\\"" + target + "\\">" + escapeHtml(label) + "</a>";
-  }}
-
-  // --- make docs 発行ページ (シングルページ md HTML) への page リンク ---
-  // ページ種別 (variant) は ja / ja-details / en / en-details など。localStorage に永続化し、
-  // 未保存時の既定は「通常 (非 details)」で、言語は自言語が pageLanguages にあれば自言語、
-  // なければ en があれば en、それもなければリスト先頭。
-  const PAGE_VARIANT_STORAGE_KEY = "doxyfw-dependency-page-variant";
-
-  function defaultPageVariant() {{
-    const primary = String(navigator.language || "").split("-")[0].toLowerCase();
-    if (pageLanguages.indexOf(primary) !== -1) return primary;
-    if (pageLanguages.indexOf("en") !== -1) return "en";
-    return pageLanguages[0];
-  }}
-
-  function loadPageVariant() {{
-    let stored = "";
-    try {{
-      stored = window.localStorage ? window.localStorage.getItem(PAGE_VARIANT_STORAGE_KEY) || "" : "";
-    }} catch (err) {{
-      stored = "";
-    }}
-    if (stored && pageLanguages.indexOf(stored.replace(/-details$/, "")) !== -1) return stored;
-    return defaultPageVariant();
-  }}
-
-  let pageVariant = loadPageVariant();
-
-  function setPageVariant(variant) {{
-    if (variant === pageVariant) return;
-    pageVariant = variant;
-    try {{
-      if (window.localStorage) window.localStorage.setItem(PAGE_VARIANT_STORAGE_KEY, variant);
-    }} catch (err) {{
-      // localStorage が使えない環境ではページ内のみの設定として扱う。
-    }}
-    updatePageVariantMenuChecks();
-    refreshDetailPanes();
-  }}
-
-  function pageUrlForFile(filePath) {{
-    if (!pageUrlTemplate || !filePath) return "";
-    return pageUrlTemplate.replace("{{variant}}", pageVariant) + "/Files/" + filePath + ".html";
-  }}
-
-  // 関数見出しのアンカーは Pandoc の auto identifier (見出しテキストの小文字化)。
-  // md の関数見出しは "#### 関数名" のため、アンカー = 関数名の小文字化で構成できる。
-  // 同一ページ内の同名見出し衝突時の -N サフィックスは扱わない (C 関数はページ内で一意)。
-  function pageUrlForFunction(fn) {{
-    const fileUrl = pageUrlForFile(fn.file);
-    if (!fileUrl) return "";
-    return fileUrl + "#" + String(fn.name || "").toLowerCase();
-  }}
-
-  function pageLinkFor(target, isFile) {{
-    if (!pageUrlTemplate) return "";
-    const url = isFile ? pageUrlForFile(target.path) : pageUrlForFunction(target);
-    if (!url) return "";
-    return "<a href=\\"" + escapeHtml(url) + "\\" target=\\"doxyfw-dependency-page\\">Page</a>";
-  }}
-
-  // ページ種別変更時に、表示中の詳細ペインを再描画してリンクを更新する。
-  function refreshDetailPanes() {{
-    if (selectedId) {{
-      const fn = byId.get(selectedId);
-      if (fn) {{
-        renderDetail(fn);
-        renderFileDetail(fn.file);
-        renderOverviewFunctionDetail(fn);
-      }}
-      return;
-    }}
-    if (selectedFilePath) {{
-      renderFileDetail(selectedFilePath);
-      renderOverviewDetail(selectedFilePath);
-    }}
-  }}
-
-  function neighborList(ids, emptyText) {{
-    if (!ids || ids.length === 0) return "<p class=\\"dep-empty\\">" + emptyText + "</p>";
-    const items = ids
-      .map((id) => byId.get(id))
-      .filter(Boolean)
-      .sort((a, b) => a.file.localeCompare(b.file) || a.name.localeCompare(b.name))
-      .map((fn) => "<li><button type=\\"button\\" class=\\"dep-neighbor-button\\" data-function-id=\\"" + escapeHtml(fn.id) + "\\">" + escapeHtml(fn.name) + "</button> <small>" + escapeHtml(fn.file) + "</small></li>");
-    return "<ul>" + items.join("") + "</ul>";
-  }}
-
-  function cycleGroupFunctionIds(fn) {{
-    if (!fn || fn.dependencyClass !== "cycle" || !fn.sccId) return [];
-    const scc = sccById.get(fn.sccId);
-    if (!scc || !Array.isArray(scc.functions)) return [];
-    return scc.functions;
-  }}
-
-  function cycleGroupSection(fn) {{
-    const ids = cycleGroupFunctionIds(fn);
-    if (ids.length === 0) return "";
-    return "<section><strong>循環グループ</strong>" + neighborList(ids, "同じ循環グループの関数はありません。") + "</section>";
-  }}
-
-  function externalCalleeList(externalCallees) {{
-    if (!externalCallees || externalCallees.length === 0) return "";
-    const items = externalCallees.map((ec) =>
-      "<li><span class=\\"dep-external-callee\\">" + escapeHtml(ec.name) + "</span></li>"
-    );
-    return "<ul>" + items.join("") + "</ul>";
-  }}
-
-  function bindDetailActions() {{
-    for (const button of detail.querySelectorAll("[data-function-id]")) {{
-      button.addEventListener("click", () => selectFunction(button.getAttribute("data-function-id")));
-    }}
-    for (const link of detail.querySelectorAll("[data-file-path]")) {{
-      link.addEventListener("click", (event) => {{
-        event.preventDefault();
-        selectFile(link.getAttribute("data-file-path"), {{ activateFileList: true }});
-      }});
-    }}
-  }}
-
-  function renderDetail(fn) {{
-    if (!fn) {{
-      detail.innerHTML = "<p class=\\"dep-empty\\">関数を選択してください。</p>";
-      return;
-    }}
-    detail.innerHTML =
-      "<h2>" + escapeHtml(fn.name) + "</h2>" +
-      (fn.brief ? "<p class=\\"dep-brief\\">" + escapeHtml(fn.brief) + "</p>" : "") +
-      "<dl>" +
-      "<dt>分類</dt><dd><span class=\\"badge " + escapeHtml(fn.dependencyClass) + "\\">" + escapeHtml(fn.dependencyClass) + "</span></dd>" +
-      "<dt>level</dt><dd>" + escapeHtml(levelText(fn)) + "</dd>" +
-      "<dt>rank</dt><dd>" + escapeHtml(fn.dependencyRank) + "</dd>" +
-      "<dt>depth</dt><dd>" + escapeHtml(fn.dependencyDepth === null || fn.dependencyDepth === undefined ? "cycle" : fn.dependencyDepth) + "</dd>" +
-      "<dt>領域</dt><dd>" + areaBadge(fn.sourceArea) + "</dd>" +
-      "<dt>呼び出し種別</dt><dd>" + escapeHtml(fn.dominantCallKind) + "</dd>" +
-      "<dt>export</dt><dd>" + (fn.isExported ? "yes" : "no") + "</dd>" +
-      "<dt>static</dt><dd>" + (fn.isStatic ? "yes" : "no") + "</dd>" +
-      "<dt>ファイル</dt><dd>" + fileSelectionLink(fn.file, fn.file) + "</dd>" +
-      "<dt>行</dt><dd>" + escapeHtml(fn.line) + "</dd>" +
-      "<dt>リンク</dt><dd>" + [pageLinkFor(fn, false), linkFor(fn, "Doxygen", false), linkFor(fn, "Source", true)].filter(Boolean).join(" / ") + "</dd>" +
-      "</dl>" +
-      "<div class=\\"dep-neighbors\\">" +
-      "<section><strong>呼び出し先 (ライブラリ内)</strong>" + neighborList(callees.get(fn.id), "対象範囲内の呼び出し先はありません。") + "</section>" +
-      (fn.externalCallees && fn.externalCallees.length > 0 ? "<section><strong>呼び出し先 (外部)</strong>" + externalCalleeList(fn.externalCallees) + "</section>" : "") +
-      "<section><strong>呼び出し元</strong>" + neighborList(callers.get(fn.id), "対象範囲内の呼び出し元はありません。") + "</section>" +
-      cycleGroupSection(fn) +
-      "</div>";
-    bindDetailActions();
-  }}
-
-  function selectFunction(id, opts) {{
-    const fn = byId.get(id);
-    if (!fn) return;
-    if (scheduleRenderRows) scheduleRenderRows.cancel();
-    if (id === selectedId && !selectedEdgeKey) {{
-      ensureFunctionRowSelectionRendered();
-      renderNotice();
-      if (reconcileHiddenOverviewFiles()) forceRenderOverviewGraph();
-      if (opts && opts.activateFunctionList) {{
-        pendingFunctionListScroll = true;
-        activateTab("functionListPanel");
-      }}
-      return;
-    }}
-    const fromTableRow = Boolean(opts && opts.fromTableRow);
-    if (fromTableRow) previousSelectedRowVisible = true;
-    selectedId = id;
-    selectedFilePath = fn.file;
-    selectedEdgeKey = "";
-    reconcileHiddenOverviewFiles();
-    renderDetail(fn);
-    renderFileDetail(fn.file);
-    renderOverviewFunctionDetail(fn);
-    renderRows({{ forceScroll: !fromTableRow }});
-    renderFileRows({{ forceScroll: true }});
-    if (opts && opts.activateFunctionList) {{
-      activateTab("functionListPanel");
-    }}
-    if (activeTab === "overviewPanel") {{
-      renderOverviewGraph();
-    }}
-    updateUrlHashFromState();
-    updateDocumentTitle();
-    updateDetailCopyButtons();
-  }}
-
-  function selectFile(path, opts) {{
-    if (scheduleRenderFileRows) scheduleRenderFileRows.cancel();
-    if (path === selectedFilePath && selectedId === "" && selectedEdgeKey === "") {{
-      ensureFileRowSelectionRendered();
-      renderFileNotice();
-      if (reconcileHiddenOverviewFiles()) forceRenderOverviewGraph();
-      if (opts && opts.activateFileList) {{
-        pendingFileListScroll = true;
-        activateTab("fileListPanel");
-      }}
-      return;
-    }}
-    const fromFileRow = Boolean(opts && opts.fromFileRow);
-    if (fromFileRow) previousSelectedFileRowVisible = true;
-    selectedFilePath = path;
-    selectedId = "";
-    selectedEdgeKey = "";
-    reconcileHiddenOverviewFiles();
-    renderDetail(null);
-    renderFileDetail(path);
-    renderOverviewDetail(path);
-    renderRows({{ forceScroll: false }});
-    renderFileRows({{ forceScroll: !fromFileRow }});
-    if (opts && opts.activateFileList) {{
-      activateTab("fileListPanel");
-    }}
-    if (activeTab === "overviewPanel") {{
-      renderOverviewGraph();
-    }}
-    updateUrlHashFromState();
-    updateDocumentTitle();
-    updateDetailCopyButtons();
-  }}
-
-  function selectOverviewEdge(edgeKey) {{
-    if (!edgeKey) return;
-    if (!fileEdgeByKey.has(edgeKey)) return;
-    selectedId = "";
-    selectedFilePath = "";
-    selectedEdgeKey = edgeKey;
-    renderDetail(null);
-    renderFileDetail("");
-    renderOverviewEdgeDetail(edgeKey);
-    renderRows({{ forceScroll: false }});
-    renderFileRows({{ forceScroll: false }});
-    if (activeTab === "overviewPanel") {{
-      renderOverviewGraph();
-    }}
-    updateUrlHashFromState();
-    updateDocumentTitle();
-    updateDetailCopyButtons();
-  }}
-
-  function clearOverviewSelection() {{
-    selectedId = "";
-    selectedFilePath = "";
-    selectedEdgeKey = "";
-    renderDetail(null);
-    renderFileDetail("");
-    overviewDetail.innerHTML = "<p class=\\"dep-empty\\">ファイルまたは関数を選択してください。</p>";
-    renderRows({{ forceScroll: false }});
-    renderFileRows({{ forceScroll: false }});
-    if (activeTab === "overviewPanel") {{
-      renderOverviewGraph();
-    }}
-    updateUrlHashFromState();
-    updateDocumentTitle();
-    updateDetailCopyButtons();
-  }}
-
-  function clearSelection() {{
-    selectedId = "";
-    selectedFilePath = "";
-    selectedEdgeKey = "";
-    renderDetail(null);
-    renderFileDetail("");
-    overviewDetail.innerHTML = "<p class=\\"dep-empty\\">ファイルまたは関数を選択してください。</p>";
-    renderRows({{ forceScroll: false }});
-    renderFileRows({{ forceScroll: false }});
-    if (activeTab === "overviewPanel") {{
-      resetOverviewGraph();
-    }}
-    updateUrlHashFromState();
-    updateDocumentTitle();
-    updateDetailCopyButtons();
-  }}
-
-  function debounce(callback, delayMs) {{
-    let timer = null;
-    const debounced = () => {{
-      if (timer !== null) window.clearTimeout(timer);
-      timer = window.setTimeout(() => {{
-        timer = null;
-        callback();
-      }}, delayMs);
-    }};
-    debounced.cancel = () => {{
-      if (timer === null) return;
-      window.clearTimeout(timer);
-      timer = null;
-    }};
-    return debounced;
-  }}
-
-  addMetric("関数", data.summary.functionCount || 0);
-  addMetric("呼び出し関係", data.summary.edgeCount || 0);
-  addMetric("ファイル", data.summary.fileCount || 0);
-  addMetric("export", data.summary.exportCount || 0);
-  addMetric("static", data.summary.staticCount || 0);
-  addMetric("leaf", data.summary.leafCount || 0);
-  addMetric("循環グループ", data.summary.cycleGroupCount || 0);
-  fillOptions();
-  renderRows();
-  renderFileRows();
-  const scheduleRenderRows = debounce(() => renderRows(), 80);
-  const scheduleRenderFileRows = debounce(() => renderFileRows(), 80);
-  applyStateFromUrlHash();
-  window.addEventListener("hashchange", () => {{
-    if (applyingUrlHash) return;
-    if (window.location.hash === currentUrlHashString()) return;
-    applyStateFromUrlHash();
-  }});
-  const rowSelectEventName = window.PointerEvent ? "pointerdown" : "mousedown";
-  rows.addEventListener(rowSelectEventName, (event) => {{
-    const row = event.target.closest("[data-function-row-id]");
-    if (!row || !rows.contains(row)) return;
-    selectFunction(row.getAttribute("data-function-row-id"), {{ fromTableRow: true }});
-  }});
-  fileRows.addEventListener(rowSelectEventName, (event) => {{
-    const row = event.target.closest("[data-file-row-path]");
-    if (!row || !fileRows.contains(row)) return;
-    selectFile(row.getAttribute("data-file-row-path"), {{ fromFileRow: true }});
-  }});
-  for (const control of [search, levelFilter, classFilter, exportFilter, staticFilter, areaFilter, fileFilter]) {{
-    control.addEventListener("input", scheduleRenderRows);
-    control.addEventListener("change", scheduleRenderRows);
-  }}
-  for (const control of [fileSearch, fileLevelFilter, fileClassFilter, fileExportFilter, fileStaticFilter, fileAreaFilter]) {{
-    control.addEventListener("input", scheduleRenderFileRows);
-    control.addEventListener("change", scheduleRenderFileRows);
-  }}
-  for (const button of sortButtons) {{
-    button.addEventListener("click", () => {{
-      const key = button.getAttribute("data-sort-key");
-      if (sortState.key === key) {{
-        sortState = {{ key, direction: sortState.direction === "asc" ? "desc" : "asc" }};
-      }} else {{
-        sortState = {{ key, direction: "asc" }};
-      }}
-      renderRows();
-    }});
-  }}
-  for (const button of fileSortButtons) {{
-    button.addEventListener("click", () => {{
-      const key = button.getAttribute("data-file-sort-key");
-      if (fileSortState.key === key) {{
-        fileSortState = {{ key, direction: fileSortState.direction === "asc" ? "desc" : "asc" }};
-      }} else {{
-        fileSortState = {{ key, direction: "asc" }};
-      }}
-      renderFileRows();
-    }});
-  }}
-  for (const button of tabButtons) {{
-    button.addEventListener("click", () => {{
-      activateTab(button.getAttribute("data-tab-target"));
-    }});
-  }}
-  overviewFit.addEventListener("click", () => {{
-    fitOverviewGraph();
-  }});
-  overviewRelayout.addEventListener("click", () => {{
-    relayoutOverviewGraph();
-  }});
-  overviewReset.addEventListener("click", () => {{
-    resetOverviewGraphState();
-  }});
-  if (overviewHiddenNotice) {{
-    for (const eventName of ["pointerdown", "mousedown", "touchstart", "pointerup", "mouseup"]) {{
-      overviewHiddenNotice.addEventListener(eventName, (event) => {{
-        event.stopPropagation();
-      }});
-    }}
-    overviewHiddenNotice.addEventListener("click", (event) => {{
-      event.preventDefault();
-      event.stopPropagation();
-      suppressOverviewBackgroundTap();
-      revealAllOverviewFiles();
-    }});
-  }}
-  {{
-    const themeOptions = document.getElementById("themeOptions");
-    if (themeOptions) {{
-      for (const button of themeOptions.querySelectorAll("[data-theme-choice]")) {{
-        button.addEventListener("click", () => {{
-          setThemeChoice(button.getAttribute("data-theme-choice"));
-          closeDownloadMenus(null);
-        }});
-      }}
-      updateThemeMenuChecks();
-    }}
-    // システムの設定 (保存なし) の間は、OS のテーマ変更へ追従する。
-    if (window.matchMedia) {{
-      const media = window.matchMedia("(prefers-color-scheme: dark)");
-      const followSystem = () => {{
-        if (currentThemeChoice() === "system") applyTheme(systemPreferredTheme(), false);
-      }};
-      if (typeof media.addEventListener === "function") media.addEventListener("change", followSystem);
-    }}
-  }}
-  // 詳細ペインの「コピー」ボタン: 表示内容 (プレーン テキスト) と、現在のタブ・選択状態を
-  // 表す URL (正規ハッシュ付き) をクリップボードへコピーする。
-  function writeTextToClipboard(text) {{
-    if (navigator.clipboard && typeof navigator.clipboard.writeText === "function") {{
-      return navigator.clipboard.writeText(text);
-    }}
-    // 非対応環境向けフォールバック: 一時 textarea を選択して execCommand でコピーする。
-    return new Promise((resolve, reject) => {{
-      const textarea = document.createElement("textarea");
-      textarea.value = text;
-      textarea.setAttribute("readonly", "");
-      textarea.style.position = "fixed";
-      textarea.style.left = "-9999px";
-      document.body.appendChild(textarea);
-      textarea.select();
-      let succeeded = false;
-      try {{
-        succeeded = document.execCommand("copy");
-      }} catch (err) {{
-        succeeded = false;
-      }}
-      document.body.removeChild(textarea);
-      if (succeeded) {{
-        resolve();
-      }} else {{
-        reject(new Error("execCommand copy failed"));
-      }}
-    }});
-  }}
-
-  // 詳細ペインの表示内容を Markdown へ変換する。構造は 3 ペイン共通:
-  //   h2 (タイトル) -> "# "、section 見出しの strong / h3 -> "## "、
-  //   dl の dt/dd ペア -> "- dt: dd"、ul/ol の li -> "- "、p -> 素の段落。
-  // 見出しの前後には空行を入れ、Markdown として妥当な体裁にする。
-  function detailPaneToMarkdown(root, linkTabs) {{
-    const lines = [];
-    const baseUrl = window.location.href.split("#")[0];
-    // 関数/ファイル リンクの遷移先タブ。既定は関数タブ/ファイル タブだが、全体マップの
-    // 詳細ペインからのコピーでは双方とも全体マップ タブを指す。
-    const tabs = linkTabs || {{ fn: "functions", file: "files" }};
-    const labelOf = (el) => (el.textContent || "").replace(/\\s+/g, " ").trim();
-    // インライン変換: リンク類は Markdown リンク表現 [text](url) にする。
-    //   - data-function-id (関数リンク) -> #tab=<tabs.fn>&fn=...
-    //   - data-file-path (ファイル リンク) -> #tab=<tabs.file>&file=...
-    //   - 実 URL を持つアンカー (Doxygen / source) -> a.href で絶対 URL 化
-    const inlineTextOf = (el) => {{
-      let text = "";
-      for (const node of el.childNodes) {{
-        if (node.nodeType === Node.TEXT_NODE) {{
-          text += node.textContent;
-        }} else if (node.nodeType === Node.ELEMENT_NODE) {{
-          const functionId = node.getAttribute ? node.getAttribute("data-function-id") : null;
-          const filePath = node.getAttribute ? node.getAttribute("data-file-path") : null;
-          if (functionId) {{
-            text += "[" + labelOf(node) + "](" + baseUrl + "#tab=" + tabs.fn + "&fn=" + encodeURIComponent(functionId) + ")";
-          }} else if (filePath) {{
-            text += "[" + labelOf(node) + "](" + baseUrl + "#tab=" + tabs.file + "&file=" + encodeURIComponent(filePath) + ")";
-          }} else if (node.tagName === "A" && (node.getAttribute("href") || "") !== "" && node.getAttribute("href") !== "#") {{
-            text += "[" + labelOf(node) + "](" + node.href + ")";
-          }} else {{
-            text += inlineTextOf(node);
-          }}
-        }}
-      }}
-      return text;
-    }};
-    const textOf = (el) => inlineTextOf(el).replace(/\\s+/g, " ").trim();
-    const pushBlank = () => {{
-      if (lines.length > 0 && lines[lines.length - 1] !== "") lines.push("");
-    }};
-    const pushHeading = (prefix, el) => {{
-      const text = textOf(el);
-      if (!text) return;
-      pushBlank();
-      lines.push(prefix + " " + text);
-      lines.push("");
-    }};
-    const walk = (node) => {{
-      for (const child of node.children) {{
-        const tag = child.tagName;
-        if (tag === "H2") {{
-          pushHeading("#", child);
-        }} else if (tag === "H3" || tag === "STRONG") {{
-          pushHeading("##", child);
-        }} else if (tag === "P") {{
-          const text = textOf(child);
-          if (text) {{
-            pushBlank();
-            lines.push(text);
-          }}
-        }} else if (tag === "DL") {{
-          pushBlank();
-          let term = "";
-          for (const item of child.children) {{
-            if (item.tagName === "DT") {{
-              term = textOf(item);
-            }} else if (item.tagName === "DD") {{
-              lines.push("- " + term + ": " + textOf(item));
-            }}
-          }}
-        }} else if (tag === "UL" || tag === "OL") {{
-          pushBlank();
-          for (const li of child.children) {{
-            lines.push("- " + textOf(li));
-          }}
-        }} else {{
-          walk(child);
-        }}
-      }}
-    }};
-    walk(root);
-    while (lines.length > 0 && lines[lines.length - 1] === "") lines.pop();
-    return lines.join("\\n");
-  }}
-
-  function showCopyFeedback(button, label) {{
-    const original = button.textContent;
-    button.textContent = label;
-    button.disabled = true;
-    button.dataset.copyFeedback = "1";
-    window.setTimeout(() => {{
-      button.textContent = original;
-      delete button.dataset.copyFeedback;
-      // 表示復帰時の活性状態は現在の選択状態に従う。
-      updateDetailCopyButtons();
-    }}, 1500);
-  }}
-
-  // 非選択状態ではコピー ボタンを非活性にする。ペインごとの活性条件:
-  //   detail (関数一覧) = 関数選択中、fileDetail (ファイル一覧) = ファイル表示中、
-  //   overviewDetail (全体マップ) = 関数・ファイル・エッジのいずれか選択中。
-  function updateDetailCopyButtons() {{
-    const enabledBySource = {{
-      detail: Boolean(selectedId),
-      fileDetail: Boolean(selectedFilePath),
-      overviewDetail: Boolean(selectedId || selectedFilePath || selectedEdgeKey)
-    }};
-    for (const button of document.querySelectorAll(".dep-detail-copy")) {{
-      if (button.dataset.copyFeedback === "1") continue;
-      const source = button.getAttribute("data-copy-source") || "";
-      button.disabled = !enabledBySource[source];
-    }}
-  }}
-
-  for (const button of document.querySelectorAll(".dep-detail-copy")) {{
-    button.addEventListener("click", () => {{
-      const source = document.getElementById(button.getAttribute("data-copy-source") || "");
-      if (!source) return;
-      // 全体マップの詳細ペインからのコピーでは、関数・ファイル リンクとも全体マップ タブを指す。
-      const linkTabs = button.getAttribute("data-copy-source") === "overviewDetail"
-        ? {{ fn: "overview", file: "overview" }}
-        : null;
-      const url = window.location.href.split("#")[0] + currentUrlHashString();
-      const text = detailPaneToMarkdown(source, linkTabs) + "\\n\\n## 依存関係レポートへのリンク\\n\\n<" + url + ">\\n";
-      writeTextToClipboard(text)
-        .then(() => showCopyFeedback(button, "コピーしました"))
-        .catch(() => showCopyFeedback(button, "コピーできません"));
-    }});
-  }}
-  updateDetailCopyButtons();
-  if (overviewGraphMenu) {{
-    overviewGraphMenu.addEventListener("contextmenu", (event) => {{
-      event.preventDefault();
-    }});
-    overviewGraphMenu.addEventListener("click", (event) => {{
-      const button = event.target.closest("button");
-      if (!button) return;
-      const scope = button.getAttribute("data-svg-scope");
-      const pngScope = button.getAttribute("data-png-scope");
-      const callerDepth = button.getAttribute("data-caller-depth");
-      const calleeDepth = button.getAttribute("data-callee-depth");
-      if (scope) {{
-        downloadOverviewSvg(scope);
-      }} else if (pngScope) {{
-        downloadOverviewPng(pngScope);
-      }} else if (callerDepth !== null) {{
-        setOverviewDepth("caller", callerDepth);
-      }} else if (calleeDepth !== null) {{
-        setOverviewDepth("callee", calleeDepth);
-      }} else {{
-        if (!handleOverviewGraphMenuAction(button.getAttribute("data-action"))) return;
-      }}
-      hideOverviewGraphMenu();
-    }});
-    document.addEventListener("click", (event) => {{
-      if (!overviewGraphMenu.contains(event.target)) hideOverviewGraphMenu();
-    }});
-    document.addEventListener("keydown", (event) => {{
-      if (event.key === "Escape") hideOverviewGraphMenu();
-    }});
-    window.addEventListener("resize", hideOverviewGraphMenu);
-    window.addEventListener("scroll", hideOverviewGraphMenu, true);
-  }}
-  function clearFunctionFilters() {{
-    search.value = "";
-    levelFilter.value = "";
-    classFilter.value = "";
-    exportFilter.value = "";
-    staticFilter.value = "";
-    areaFilter.value = "";
-    fileFilter.value = "";
-    renderRows();
-  }}
-
-  function clearFileListFilters() {{
-    fileSearch.value = "";
-    fileLevelFilter.value = "";
-    fileClassFilter.value = "";
-    fileExportFilter.value = "";
-    fileStaticFilter.value = "";
-    fileAreaFilter.value = "";
-    renderFileRows();
-  }}
-
-  clearFilters.addEventListener("click", clearFunctionFilters);
-  clearHiddenFunctionFilters.addEventListener("click", clearFunctionFilters);
-  clearFileFilters.addEventListener("click", clearFileListFilters);
-  clearHiddenFileFilters.addEventListener("click", clearFileListFilters);
-
-  function closeDownloadMenus(exceptMenu) {{
-    for (const menu of document.querySelectorAll(".dep-download-menu.open")) {{
-      if (menu === exceptMenu) continue;
-      menu.classList.remove("open");
-      const button = menu.querySelector(".dep-download-menu-button");
-      const items = menu.querySelector(".dep-download-menu-items");
-      if (button) button.setAttribute("aria-expanded", "false");
-      if (items) items.hidden = true;
-    }}
-  }}
-
-  for (const menu of document.querySelectorAll(".dep-download-menu")) {{
-    const button = menu.querySelector(".dep-download-menu-button");
-    const items = menu.querySelector(".dep-download-menu-items");
-    if (!button || !items) continue;
-    button.addEventListener("click", () => {{
-      const willOpen = !menu.classList.contains("open");
-      closeDownloadMenus(menu);
-      menu.classList.toggle("open", willOpen);
-      button.setAttribute("aria-expanded", willOpen ? "true" : "false");
-      items.hidden = !willOpen;
-    }});
-  }}
-
-  document.addEventListener("click", (event) => {{
-    if (event.target.closest(".dep-download-menu")) return;
-    closeDownloadMenus(null);
-  }});
-
-  // 設定メニュー (ページ種別)。pageUrlTemplate が無いレポートでは非表示のまま。
-  const pageVariantOptions = document.getElementById("pageVariantOptions");
-
-  function pageVariantList() {{
-    const variants = [];
-    for (const lang of pageLanguages) {{
-      variants.push(lang);
-      variants.push(lang + "-details");
-    }}
-    return variants;
-  }}
-
-  function updatePageVariantMenuChecks() {{
-    if (!pageVariantOptions) return;
-    for (const button of pageVariantOptions.querySelectorAll("[data-page-variant]")) {{
-      button.classList.toggle("checked", button.getAttribute("data-page-variant") === pageVariant);
-    }}
-  }}
-
-  // 設定メニュー自体は常時表示 (テーマ設定があるため)。ページ種別セクションのみ
-  // pageUrlTemplate があるレポートで表示する。
-  const pageVariantSection = document.getElementById("pageVariantSection");
-  if (pageVariantSection && pageVariantOptions && pageUrlTemplate) {{
-    pageVariantSection.hidden = false;
-    for (const variant of pageVariantList()) {{
-      const button = document.createElement("button");
-      button.type = "button";
-      button.className = "dep-menu-option";
-      button.setAttribute("data-page-variant", variant);
-      button.textContent = variant;
-      button.addEventListener("click", () => {{
-        setPageVariant(variant);
-        closeDownloadMenus(null);
-      }});
-      pageVariantOptions.appendChild(button);
-    }}
-    updatePageVariantMenuChecks();
-  }}
-
-  const FUNCTION_CSV_FIELDS = [
-    "dependencyLevel",
-    "dependencyRank",
-    "dependencyDepth",
-    "dependencyClass",
-    "sourceArea",
-    "maxCalleeArea",
-    "dominantCallKind",
-    "isExported",
-    "isStatic",
-    "name",
-    "file",
-    "line",
-    "inScopeCalleeCount",
-    "inScopeCallerCount",
-    "sameFileCalleeCount",
-    "crossFileCalleeCount",
-    "sccId",
-    "cycleGroupSize",
-    "id",
-    "htmlUrl",
-    "sourceUrl",
-    "gitUrl",
-    "brief"
-  ];
-
-  const FILE_CSV_FIELDS = [
-    "path",
-    "functionCount",
-    "exportCount",
-    "staticCount",
-    "edgeCount",
-    "dominantArea",
-    "levels",
-    "classes",
-    "areas",
-    "brief",
-    "htmlUrl",
-    "sourceUrl",
-    "gitUrl"
-  ];
-
-  function stableJsonText(value) {{
-    const source = value && typeof value === "object" && !Array.isArray(value) ? value : {{}};
-    const sorted = {{}};
-    for (const key of Object.keys(source).sort()) {{
-      sorted[key] = source[key];
-    }}
-    return JSON.stringify(sorted);
-  }}
-
-  function csvCell(value) {{
-    if (value === null || value === undefined) return "";
-    const textValue = String(value);
-    if (/[",\\r\\n]/.test(textValue)) {{
-      return "\\"" + textValue.replace(/"/g, "\\"\\"") + "\\"";
-    }}
-    return textValue;
-  }}
-
-  function csvText(fieldNames, rows) {{
-    const lines = [fieldNames.map(csvCell).join(",")];
-    for (const row of rows || []) {{
-      lines.push(fieldNames.map((field) => csvCell(row[field])).join(","));
-    }}
-    return lines.join("\\r\\n") + "\\r\\n";
-  }}
-
-  function generatedFileCsvRows() {{
-    return files.map((file) => ({{
-      path: file.path,
-      functionCount: file.functionCount,
-      exportCount: file.exportCount,
-      staticCount: file.staticCount,
-      edgeCount: file.edgeCount,
-      dominantArea: file.dominantArea,
-      levels: stableJsonText(file.levels),
-      classes: stableJsonText(file.classes),
-      areas: stableJsonText(file.areas),
-      brief: file.brief || "",
-      htmlUrl: file.htmlUrl || "",
-      sourceUrl: file.sourceUrl || "",
-      gitUrl: file.gitUrl || ""
-    }}));
-  }}
-
-  function generatedDownloadText(kind) {{
-    if (kind === "json") {{
-      return JSON.stringify(data, null, 2) + "\\n";
-    }}
-    if (kind === "functions-csv") {{
-      return csvText(FUNCTION_CSV_FIELDS, functions);
-    }}
-    if (kind === "files-csv") {{
-      return csvText(FILE_CSV_FIELDS, generatedFileCsvRows());
-    }}
-    return null;
-  }}
-
-  function generatedDownloadBlob(link) {{
-    const kind = link.getAttribute("data-download-kind") || "";
-    let text = generatedDownloadText(kind);
-    if (text === null) return null;
-    if (link.getAttribute("data-download-bom") === "true") {{
-      text = "\\ufeff" + text;
-    }}
-    return new Blob([text], {{ type: "application/octet-stream" }});
-  }}
-
-  function triggerBlobDownload(blob, name) {{
-    const url = URL.createObjectURL(new Blob([blob], {{ type: "application/octet-stream" }}));
-    const tmp = document.createElement("a");
-    tmp.href = url;
-    tmp.setAttribute("download", name);
-    document.body.appendChild(tmp);
-    tmp.click();
-    document.body.removeChild(tmp);
-    setTimeout(() => URL.revokeObjectURL(url), 1000);
-  }}
-
-  for (const link of document.querySelectorAll(".dep-download")) {{
-    link.addEventListener("click", (ev) => {{
-      const menu = link.closest(".dep-download-menu");
-      if (menu) closeDownloadMenus(null);
-      const href = link.getAttribute("href");
-      if (!href) return;
-      const name = link.getAttribute("data-download-name") || href.split("/").pop();
-      const fallbackDownload = () => {{
-        const generatedBlob = generatedDownloadBlob(link);
-        if (generatedBlob) {{
-          triggerBlobDownload(generatedBlob, name);
-          return;
-        }}
-        window.location.href = href;
-      }};
-      ev.preventDefault();
-      if (window.location.protocol !== "http:" && window.location.protocol !== "https:") {{
-        fallbackDownload();
-        return;
-      }}
-      fetch(href, {{ cache: "no-store" }})
-        .then((res) => {{
-          if (!res.ok) throw new Error("HTTP " + res.status);
-          return res.blob();
-        }})
-        .then((blob) => {{
-          triggerBlobDownload(blob, name);
-        }})
-        .catch(() => {{
-          fallbackDownload();
-        }});
-    }});
-  }}
-
-  // テスト専用フック。読み込み前に window.__DEP_REPORT_TEST__ を true に設定した場合のみ
-  // 公開する。通常の閲覧時はグローバルを汚さない。Puppeteer による全体マップの
-  // インタラクション検証 (Phase A 同期反映 / Phase C 遅延) に用いる。
-  if (window.__DEP_REPORT_TEST__) {{
-    window.depReportOverviewTestApi = {{
-      activateOverview: () => activateTab("overviewPanel"),
-      isReady: () => Boolean(overviewCy) && overviewCy.elements().length > 0 && isOverviewRenderedSelectionCurrent(),
-      isInitializing: () => Boolean(overviewGraph && overviewGraph.classList.contains("layout-initializing")),
-      isLayoutRunning: () => Boolean(overviewLayoutRunning) || Boolean(overviewActiveLayout) || Boolean(overviewPositionAnimation && overviewPositionAnimation.active),
-      layoutRunCount: () => overviewLayoutRunCount,
-      lastLayoutNodeCount: () => overviewLastLayoutNodeCount,
-      lastLayoutDurationMs: () => overviewLastLayoutDurationMs,
-      totalNodeCount: () => (overviewCy ? overviewCy.nodes().length : 0),
-      // 現在の可視状態で、全子ノードを対象に 1 回レイアウトを実行し、投入ノード数と
-      // 純計算時間を返す。scope=true で部分コレクション経路、false で全グラフ経路。
-      // 部分コレクション化の改善効果 (投入ノード数・時間の削減) を同一条件で比較するための
-      // テスト専用フック。視覚結果は問わない (anchorCenters なしで走らせる)。
-      measureLayoutForTest: (scope) => new Promise((resolve) => {{
-        if (!overviewCy) {{ resolve(null); return; }}
-        const movingNodeIds = new Set(overviewCy.nodes(":child").map((node) => node.id()));
-        runOverviewLayout({{
-          movingNodeIds,
-          immediate: true,
-          fullConvergence: true,
-          unlockAllDuringLayout: true,
-          scopeToVisibleChildren: Boolean(scope),
-          onComplete: () => resolve({{
-            nodeCount: overviewLastLayoutNodeCount,
-            durationMs: overviewLastLayoutDurationMs
-          }})
-        }});
-      }}),
-      selectFile: (path) => selectFile(path),
-      selectFunction: (id) => selectFunction(id),
-      selectEdge: (id) => selectOverviewEdge(id),
-      fileEdgeIds: () => fileEdges.map((edge) => edge.id),
-      clearSelection: () => clearOverviewSelection(),
-      hideFile: (path) => hideOverviewFile(path),
-      revealAll: () => revealAllOverviewFiles(),
-      hiddenFiles: () => Array.from(hiddenOverviewFiles.keys()),
-      hiddenNoticeVisible: () => Boolean(overviewHiddenNotice && overviewHiddenNotice.classList.contains("visible")),
-      hiddenNoticeRect: () => {{
-        if (!overviewHiddenNotice) return null;
-        const rect = overviewHiddenNotice.getBoundingClientRect();
-        return {{ left: rect.left, top: rect.top, width: rect.width, height: rect.height }};
-      }},
-      resetGraph: () => resetOverviewGraphState(),
-      setOverviewDepth: (kind, value) => setOverviewDepth(kind, value),
-      overviewDepthSettings: () => ({{ caller: overviewDepthAttrValue(overviewCallerDepth), callee: overviewDepthAttrValue(overviewCalleeDepth) }}),
-      overviewDepthMenuChecked: () => {{
-        if (!overviewGraphMenu) return null;
-        applyOverviewGraphMenuScope("background");
-        const checkedOf = (selector) => {{
-          const el = overviewGraphMenu.querySelector(selector + ".checked");
-          return el ? el.getAttribute(selector.startsWith("[data-caller") ? "data-caller-depth" : "data-callee-depth") : null;
-        }};
-        return {{ caller: checkedOf("[data-caller-depth]"), callee: checkedOf("[data-callee-depth]") }};
-      }},
-      renderedSignature: () => overviewRenderedSelectionSignature,
-      pendingSignature: () => overviewPendingSelectionSignature,
-      currentSignature: () => overviewSelectionSignature(),
-      viewport: () => overviewViewport(),
-      lastClassUpdatePlan: () => overviewLastClassUpdatePlan,
-      activateFunctionList: () => activateTab("functionListPanel"),
-      activateFileList: () => activateTab("fileListPanel"),
-      isRelayoutHidden: () => Boolean(overviewGraph && overviewGraph.classList.contains("layout-relayouting")),
-      isPositionAnimationActive: () => Boolean(overviewPositionAnimation && overviewPositionAnimation.active),
-      classesOf: (id) => {{
-        if (!overviewCy) return null;
-        const element = overviewCy.getElementById(id);
-        return element && element.length ? element.classes() : null;
-      }},
-      styleOf: (id, names) => {{
-        if (!overviewCy) return null;
-        const element = overviewCy.getElementById(id);
-        if (!element || !element.length) return null;
-        const result = {{}};
-        for (const name of (names || [])) {{
-          result[name] = graphStyleValue(element, name, "");
-        }}
-        return result;
-      }},
-      edgeIds: () => (overviewCy ? overviewCy.edges().map((edge) => edge.id()) : []),
-      elementCount: () => (overviewCy ? overviewCy.elements().length : 0),
-      buildSvg: (scope) => buildOverviewSvg(scope || "full"),
-      svgDrawOrder: () => overviewSvgOrderedElements().map((element) => element.id()),
-      applyThemeForTest: (theme) => applyTheme(theme, false),
-      nodeIds: () => (overviewCy ? overviewCy.nodes().map((node) => node.id()) : []),
-      childPositions: (parentId) => {{
-        if (!overviewCy) return null;
-        const parent = overviewCy.getElementById(parentId);
-        if (!parent || !parent.length) return null;
-        return parent.children().map((child) => {{
-          const position = child.position();
-          return {{ id: child.id(), x: Math.round(position.x), y: Math.round(position.y) }};
-        }});
-      }},
-      renderedPositionOf: (id) => {{
-        if (!overviewCy) return null;
-        const element = overviewCy.getElementById(id);
-        if (!element || !element.length) return null;
-        const rendered = element.renderedPosition();
-        const rect = overviewGraph.getBoundingClientRect();
-        return {{ x: rect.left + rendered.x, y: rect.top + rendered.y }};
-      }},
-      renderedBoundingBoxOf: (id) => {{
-        if (!overviewCy) return null;
-        const element = overviewCy.getElementById(id);
-        if (!element || !element.length) return null;
-        const box = element.renderedBoundingBox({{ includeLabels: true, includeOverlays: false }});
-        return {{ x1: box.x1, y1: box.y1, x2: box.x2, y2: box.y2, w: box.w, h: box.h }};
-      }},
-      graphSize: () => overviewCy ? {{ width: overviewCy.width(), height: overviewCy.height() }} : null,
-      positionOf: (id) => {{
-        if (!overviewCy) return null;
-        const element = overviewCy.getElementById(id);
-        if (!element || !element.length) return null;
-        const position = element.position();
-        return {{ x: position.x, y: position.y }};
-      }}
-    }};
-  }}
-}}());
-</script>
+<script src="{script_url}"></script>
 </body>
 </html>
 """
     (output_dir / "index.html").write_text(html_text, encoding="utf-8")
 
 
-def copy_graph_assets(output_dir: Path) -> None:
-    for asset_name in GRAPH_ASSETS:
+def hashed_asset_name(asset_name: str, digest: str) -> str:
+    """内容ハッシュを拡張子の直前に挿入したファイル名を返す。"""
+    base, dot, suffix = asset_name.rpartition(".")
+    if not dot:
+        return f"{asset_name}.{digest}"
+    return f"{base}.{digest}.{suffix}"
+
+
+def link_or_copy_asset(source: Path, target: Path) -> None:
+    """source を target へハード リンクし、できない場合はコピーする。
+
+    同名のファイル (同じ内容ハッシュ) が既にあれば何もしない。
+    他のカテゴリーの生成と同時に書き込んでも壊れないよう、一時ファイルを
+    経由して rename で配置する。
+    """
+    if target.is_file():
+        return
+    temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copyfile(source, temp_path)
+    os.replace(temp_path, target)
+
+
+def write_report_assets(asset_dir: Path, asset_url: str) -> Dict[str, str]:
+    """ビューアーの静的ファイルを内容ハッシュ付きの名前で asset_dir へ配置する。
+
+    run_doxyfw_make.sh は asset_dir にステージング用のディレクトリを渡し、
+    共有の配置先へはレポートと同じく publish-staged-dir.py で公開する。
+
+    Returns:
+        論理名 (VIEWER_ASSETS、GRAPH_ASSETS) から index.html で参照する URL への辞書。
+        ファイル名に内容ハッシュを含むため、ブラウザーは複数のレポート間でも
+        同じファイルをキャッシュから再利用できる。
+    """
+    asset_dir.mkdir(parents=True, exist_ok=True)
+    prefix = asset_url.rstrip("/") + "/" if asset_url else ""
+    urls: Dict[str, str] = {}
+    for asset_name in VIEWER_ASSETS + GRAPH_ASSETS:
         source = SCRIPT_DIR / asset_name
         if not source.is_file():
             raise FileNotFoundError(f"graph asset not found: {source}")
-        shutil.copyfile(source, output_dir / asset_name)
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()[:ASSET_HASH_LENGTH]
+        hashed_name = hashed_asset_name(asset_name, digest)
+        link_or_copy_asset(source, asset_dir / hashed_name)
+        urls[asset_name] = prefix + hashed_name
+    return urls
 
 
 def generate_report(
@@ -7270,23 +2634,207 @@ def generate_report(
     source_dir: Optional[Path] = None,
     page_template: str = "",
     page_langs: Optional[List[str]] = None,
+    asset_dir: Optional[Path] = None,
+    asset_url: str = "",
+    reachability_limit: int = REACHABILITY_MAX_ENTRIES,
+    sqlite_export: bool = False,
+    skip_variants: Iterable[str] = (),
 ) -> Dict[str, object]:
     output_dir.mkdir(parents=True, exist_ok=True)
-    data = build_report_data(xml_dir, output_dir, category_id, source_dir)
+    # 静的ファイルの共有先が指定されない場合は、レポート内の assets/ に置く
+    if asset_dir is None:
+        asset_dir = output_dir / DEFAULT_ASSET_DIR_NAME
+        asset_url = DEFAULT_ASSET_DIR_NAME
+    data = build_report_data(xml_dir, output_dir, category_id, source_dir, reachability_limit)
     # make docs (docsfw) が発行するシングルページ md HTML への URL テンプレート。
     # "{variant}" プレースホルダーを ja / ja-details 等のページ種別で置換して使う。
     # 空のときはページ リンク機能を無効にする (従来表示)。
     data["pageUrlTemplate"] = page_template or ""
     data["pageLanguages"] = list(page_langs) if page_langs else []
-    write_data_js(output_dir, data)
-    write_data_json(output_dir, data)
-    write_csv(output_dir, data)
-    write_html(output_dir, category_id, collect_git_info(source_dir))
-    copy_graph_assets(output_dir)
+    write_report_outputs(
+        output_dir,
+        data,
+        category_id,
+        collect_git_info(source_dir),
+        asset_dir,
+        asset_url,
+        sqlite_export,
+        skip_variants,
+    )
+    return data
+
+
+def write_report_outputs(
+    output_dir: Path,
+    data: Dict[str, object],
+    category_id: str,
+    git_info: str,
+    asset_dir: Path,
+    asset_url: str,
+    sqlite_export: bool = False,
+    skip_variants: Iterable[str] = (),
+) -> None:
+    write_data_files(output_dir, data, include_json="json" not in skip_variants)
+    write_csv(output_dir, data, include_bom="bom" not in skip_variants)
+    if sqlite_export:
+        write_sqlite(output_dir, data)
+    elif (output_dir / SQLITE_FILE_NAME).exists():
+        (output_dir / SQLITE_FILE_NAME).unlink()
+    asset_urls = write_report_assets(asset_dir, asset_url)
+    write_html(output_dir, category_id, git_info, asset_urls)
+
+
+def merge_reports(
+    report_dirs: List[Path],
+    output_dir: Path,
+    asset_dir: Optional[Path] = None,
+    asset_url: str = "",
+    reachability_limit: int = REACHABILITY_MAX_ENTRIES,
+    sqlite_export: bool = False,
+    skip_variants: Iterable[str] = (),
+    publish_dir: Optional[Path] = None,
+) -> Dict[str, object]:
+    """複数カテゴリーのレポートを統合し、同じ形式のビューアーと CSV を出力する。
+
+    publish_dir を指定すると、output_dir はステージング先として扱い、各レポートへの
+    相対 URL は公開先の publish_dir から計算する。
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if asset_dir is None:
+        asset_dir = output_dir / DEFAULT_ASSET_DIR_NAME
+        asset_url = DEFAULT_ASSET_DIR_NAME
+    data = merge_report_data(report_dirs, publish_dir or output_dir, reachability_limit)
+    data["pageUrlTemplate"] = ""
+    data["pageLanguages"] = []
+    categories = ", ".join(str(category) for category in data["meta"]["categories"])
+    write_report_outputs(
+        output_dir,
+        data,
+        MERGED_CATEGORY_ID,
+        f"({categories})",
+        asset_dir,
+        asset_url,
+        sqlite_export,
+        skip_variants,
+    )
     return data
 
 
+@dataclass
+class OutputOptions:
+    asset_dir: Optional[Path]
+    asset_url: str
+    reachability_limit: int
+    sqlite_export: bool
+    skip_variants: List[str]
+
+
+def read_output_options() -> Optional[OutputOptions]:
+    """出力に関する環境変数を読み込む。不正な値のときはエラーを表示して None を返す。"""
+    # 複数カテゴリーのレポートで共有する静的ファイルの配置先と、公開後の
+    # レポートからの相対 URL (makefile の DEPENDENCY_ASSET_DIR / DEPENDENCY_ASSET_URL)
+    asset_dir_text = os.environ.get("DEPENDENCY_ASSET_DIR", "")
+    asset_dir = Path(asset_dir_text) if asset_dir_text else None
+    asset_url = os.environ.get("DEPENDENCY_ASSET_URL", "") if asset_dir else ""
+    limit_text = os.environ.get("DEPENDENCY_REACHABILITY_LIMIT", "")
+    try:
+        reachability_limit = int(limit_text) if limit_text else REACHABILITY_MAX_ENTRIES
+    except ValueError:
+        print(f"ERROR: invalid DEPENDENCY_REACHABILITY_LIMIT: {limit_text}", file=sys.stderr)
+        return None
+    # makefile の DEPENDENCY_SQLITE に空以外 (0 を除く) を指定すると dependency.sqlite も出力する
+    sqlite_export = os.environ.get("DEPENDENCY_SQLITE", "") not in ("", "0")
+    # makefile の DEPENDENCY_SKIP_VARIANTS に bom / json を空白区切りで指定すると、その派生出力を省略する
+    skip_variants = os.environ.get("DEPENDENCY_SKIP_VARIANTS", "").split()
+    unknown_variants = [name for name in skip_variants if name not in SKIPPABLE_VARIANTS]
+    if unknown_variants:
+        print(f"ERROR: invalid DEPENDENCY_SKIP_VARIANTS: {' '.join(unknown_variants)}", file=sys.stderr)
+        return None
+    return OutputOptions(asset_dir, asset_url, reachability_limit, sqlite_export, skip_variants)
+
+
+def merge_main(argv: List[str]) -> int:
+    if len(argv) < 4:
+        print(
+            "使用方法: generate-dependency-report.py merge <output_directory> <report_directory>...",
+            file=sys.stderr,
+        )
+        return 2
+
+    output_dir = Path(argv[2])
+    report_dirs = [Path(arg) for arg in argv[3:]]
+    for report_dir in report_dirs:
+        if not (report_dir / "dependency-data.json").is_file() and not (report_dir / "dependency-data.js").is_file():
+            print(f"ERROR: dependency report not found: {report_dir}", file=sys.stderr)
+            return 1
+
+    options = read_output_options()
+    if options is None:
+        return 2
+
+    # makefile の dependency-merge はステージング先 (DEPENDENCY_MERGE_STAGE_DIR) へ出力し、
+    # 静的ファイルとともに publish-staged-dir.py で output_dir へ公開する
+    stage_dir_text = os.environ.get("DEPENDENCY_MERGE_STAGE_DIR", "")
+    data = merge_reports(
+        report_dirs,
+        Path(stage_dir_text) if stage_dir_text else output_dir,
+        options.asset_dir,
+        options.asset_url,
+        options.reachability_limit,
+        options.sqlite_export,
+        options.skip_variants,
+        output_dir if stage_dir_text else None,
+    )
+    print(
+        "Merged dependency report: {} (reports={}, functions={}, edges={}, resolved external calls={})".format(
+            output_dir,
+            len(report_dirs),
+            data["summary"]["functionCount"],
+            data["summary"]["edgeCount"],
+            data["meta"]["resolvedExternalCallCount"],
+        )
+    )
+    return 0
+
+
+def diff_main(argv: List[str]) -> int:
+    if len(argv) != 5:
+        print(
+            "使用方法: generate-dependency-report.py diff <old_report_directory> <new_report_directory> <output_directory>",
+            file=sys.stderr,
+        )
+        return 2
+
+    old_report_dir = Path(argv[2])
+    new_report_dir = Path(argv[3])
+    output_dir = Path(argv[4])
+    for report_dir in (old_report_dir, new_report_dir):
+        if not (report_dir / "dependency-data.json").is_file() and not (report_dir / "dependency-data.js").is_file():
+            print(f"ERROR: dependency report not found: {report_dir}", file=sys.stderr)
+            return 1
+
+    diff = diff_reports(old_report_dir, new_report_dir, output_dir)
+    summary = diff["summary"]
+    print(
+        "Dependency diff: {} (functions +{} -{}, edges +{} -{}, new cycles={}, level changes={})".format(
+            output_dir,
+            summary["addedFunctionsCount"],
+            summary["removedFunctionsCount"],
+            summary["addedEdgesCount"],
+            summary["removedEdgesCount"],
+            summary["newSccsCount"],
+            summary["levelChangesCount"],
+        )
+    )
+    return 0
+
+
 def main(argv: List[str]) -> int:
+    if len(argv) >= 2 and argv[1] == "merge":
+        return merge_main(argv)
+    if len(argv) >= 2 and argv[1] == "diff":
+        return diff_main(argv)
+
     if len(argv) not in (3, 4, 5, 6, 7):
         print(
             "使用方法: generate-dependency-report.py <xml_directory> <output_directory>"
@@ -7306,7 +2854,23 @@ def main(argv: List[str]) -> int:
         print(f"ERROR: XML directory not found: {xml_dir}", file=sys.stderr)
         return 1
 
-    data = generate_report(xml_dir, output_dir, category_id, source_dir, page_template, page_langs)
+    options = read_output_options()
+    if options is None:
+        return 2
+
+    data = generate_report(
+        xml_dir,
+        output_dir,
+        category_id,
+        source_dir,
+        page_template,
+        page_langs,
+        options.asset_dir,
+        options.asset_url,
+        options.reachability_limit,
+        options.sqlite_export,
+        options.skip_variants,
+    )
     print(
         "Generated dependency report: {} (functions={}, edges={})".format(
             output_dir,
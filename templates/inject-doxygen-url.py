@@ -7,9 +7,16 @@ inject-doxygen-url.py - Doxybook2 出力 md に対応 Doxygen HTML の URL を
 Doxygen tag file の compound 情報から、Doxybook2 が生成した Files/、Modules/、
 Classes/、Namespaces/ 配下 Markdown と Doxygen HTML の単一ページを対応づける。
 解決した URL は workspace ルート相対パスとして front matter キー doxygen-page-url に書き込む。
+--batch を指定した場合は md を書き換えず、更新を batch ファイルへ登録する
+(commit-frontmatter.py がほかの段の更新とまとめて書き込む)。
+
+tag file は大規模カテゴリーで数百 MB になるため、iterparse で compound 単位に読み進め、
+処理した要素は直ちに破棄する。ファイル パスの suffix は、パス要素を末尾から辿るトライに
+保持する (suffix ごとに連結した文字列をキーとして持たない)。
+md を直接書き換える場合は、スレッド プールで並行して書き込む。
 
 使用方法:
-    python3 inject-doxygen-url.py <markdown_dir> <tagfile_path> <doxygen_html_root> <workspace_dir>
+    python3 inject-doxygen-url.py [--batch <batch_file>] <markdown_dir> <tagfile_path> <doxygen_html_root> <workspace_dir>
 """
 
 import os
@@ -17,6 +24,8 @@ import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from frontmatter_updates import write_frontmatter_updates
+
 sys.stdout.reconfigure(encoding="utf-8")
 sys.stderr.reconfigure(encoding="utf-8")
 
@@ -37,79 +46,85 @@ def add_unique(mapping, key, value):
         mapping[key] = value
 
 
-def add_path_suffixes(mapping, path, value):
-    """絶対パスと相対パスの差を吸収するため、全 suffix を候補にする。"""
-    key = normalize_key(path)
-    if not key:
-        return
+# Modules/Classes/Namespaces などの md に対応する compound の種類
+COMPOUND_KINDS = {"group", "class", "struct", "namespace", "union", "interface"}
+
+_UNSET = object()
 
-    parts = [part for part in key.split("/") if part]
-    for i in range(len(parts)):
-        add_unique(mapping, "/".join(parts[i:]), value)
+
+class PathSuffixTrie:
+    """
+    パスの全 suffix から値を引くトライ。パス要素を末尾から順に辿る。
+
+    絶対パスと相対パスの差を吸収するため、登録したパスのどの suffix でも検索できる。
+    同一 suffix が異なる値を指す場合は衝突として None を返す (add_unique と同じ規則)。
+    """
+
+    __slots__ = ("value", "children")
+
+    def __init__(self):
+        self.value = _UNSET
+        self.children = {}
+
+    def add(self, path, value):
+        key = normalize_key(path)
+        if not key:
+            return
+
+        node = self
+        for part in reversed([part for part in key.split("/") if part]):
+            child = node.children.get(part)
+            if child is None:
+                child = PathSuffixTrie()
+                node.children[part] = child
+            node = child
+            if node.value is _UNSET:
+                node.value = value
+            elif node.value != value:
+                node.value = None
+
+    def get(self, path):
+        node = self
+        for part in reversed(normalize_key(path).split("/")):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return None if node.value is _UNSET else node.value
 
 
 def parse_tagfile(tagfile_path):
     """Doxygen tag file から file/page/compound の対応マップを構築する。"""
-    tree = ET.parse(tagfile_path)
-    root = tree.getroot()
-    file_map = {}
+    file_map = PathSuffixTrie()
     page_map = {}
     # Modules/Classes/Namespaces などは md ファイル名 = HTML ファイル名なので
     # basename 集合だけ持てば解決できる。
     compound_html_set = set()
 
-    compound_kinds = {"group", "class", "struct", "namespace", "union", "interface"}
-
-    for compound in root.findall("compound"):
-        kind = compound.get("kind")
-        name = compound.findtext("name") or ""
-        filename = compound.findtext("filename") or ""
-        if not name or not filename:
+    # tag file 全体を木として保持しないよう、compound を読み終えるたびに処理して中身を破棄する。
+    # compound はトップレベルにのみ現れ、配下の member などは compound とともに破棄される。
+    for _, element in ET.iterparse(tagfile_path):
+        if element.tag != "compound":
             continue
 
-        if kind == "file":
-            path = compound.findtext("path") or ""
-            add_path_suffixes(file_map, os.path.join(path, name), filename)
-            add_unique(file_map, name, filename)
-        elif kind == "page":
-            add_unique(page_map, name, filename)
-        elif kind in compound_kinds:
-            compound_html_set.add(os.path.basename(filename))
+        kind = element.get("kind")
+        if kind == "file" or kind == "page" or kind in COMPOUND_KINDS:
+            name = element.findtext("name") or ""
+            filename = element.findtext("filename") or ""
+            if name and filename:
+                if kind == "file":
+                    path = element.findtext("path") or ""
+                    file_map.add(os.path.join(path, name), filename)
+                    file_map.add(name, filename)
+                elif kind == "page":
+                    add_unique(page_map, name, filename)
+                else:
+                    compound_html_set.add(os.path.basename(filename))
+
+        element.clear()
 
     return file_map, page_map, compound_html_set
 
 
-def inject_frontmatter(md_path, key, value):
-    """
-    md の先頭 front matter ブロックへ `key: "value"` を挿入する。
-
-    既存の同名キーがあれば置換する。front matter が無ければ新規生成する。
-    """
-    with open(md_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    new_line = '{0}: "{1}"\n'.format(key, value)
-
-    if lines and lines[0].rstrip("\r\n") == "---":
-        close_index = None
-        for i in range(1, len(lines)):
-            if lines[i].rstrip("\r\n") == "---":
-                close_index = i
-                break
-        if close_index is not None:
-            body = lines[1:close_index]
-            body = [ln for ln in body if not ln.lstrip().startswith(key + ":")]
-            body.append(new_line)
-            lines = [lines[0]] + body + lines[close_index:]
-        else:
-            lines = ["---\n", new_line, "---\n"] + lines
-    else:
-        lines = ["---\n", new_line, "---\n"] + lines
-
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
-
-
 def resolve_doxygen_filename(rel_under_files, file_map, page_map):
     """Files/ 配下相対パスから Doxygen HTML ファイル名を解決する。"""
     candidates = []
@@ -135,8 +150,12 @@ def resolve_doxygen_filename(rel_under_files, file_map, page_map):
     return None
 
 
-def inject_doxygen_urls(markdown_dir, tagfile_path, doxygen_html_root, workspace_dir):
-    """Doxybook2 出力 md に doxygen-page-url front matter を埋め込む。"""
+def inject_doxygen_urls(markdown_dir, tagfile_path, doxygen_html_root, workspace_dir, batch_path=None):
+    """
+    Doxybook2 出力 md に doxygen-page-url front matter を埋め込む。
+
+    batch_path が指定された場合は md を書き換えず、更新を batch ファイルへ登録する。
+    """
     markdown_dir_path = Path(markdown_dir)
     files_dir = markdown_dir_path / "Files"
     has_files = files_dir.is_dir()
@@ -160,6 +179,7 @@ def inject_doxygen_urls(markdown_dir, tagfile_path, doxygen_html_root, workspace
     doxygen_html_root = os.path.abspath(doxygen_html_root)
 
     count = 0
+    updates = []
 
     if has_files:
         for md_path in sorted(files_dir.rglob("*.md")):
@@ -175,7 +195,7 @@ def inject_doxygen_urls(markdown_dir, tagfile_path, doxygen_html_root, workspace
 
             html_path = os.path.join(doxygen_html_root, filename)
             ws_rel = os.path.relpath(html_path, workspace_dir).replace("\\", "/")
-            inject_frontmatter(str(md_path), "doxygen-page-url", ws_rel)
+            updates.append((str(md_path), "doxygen-page-url", ws_rel))
             count += 1
             print("  doxygen-page-url: Files/{0} -> {1}".format(rel_under_files, ws_rel))
 
@@ -194,32 +214,39 @@ def inject_doxygen_urls(markdown_dir, tagfile_path, doxygen_html_root, workspace
 
             html_path = os.path.join(doxygen_html_root, html_basename)
             ws_rel = os.path.relpath(html_path, workspace_dir).replace("\\", "/")
-            inject_frontmatter(str(md_path), "doxygen-page-url", ws_rel)
+            updates.append((str(md_path), "doxygen-page-url", ws_rel))
             count += 1
             print("  doxygen-page-url: {0}/{1} -> {2}".format(dir_name, rel_under_dir, ws_rel))
 
+    write_frontmatter_updates(updates, batch_path)
     print("doxygen-page-url を {0} 件の md に注入しました。".format(count))
 
 
 def main():
     """エントリ ポイント。"""
-    if len(sys.argv) != 5:
+    args = sys.argv[1:]
+    batch_path = None
+    if len(args) >= 2 and args[0] == "--batch":
+        batch_path = args[1]
+        args = args[2:]
+
+    if len(args) != 4:
         print(
-            "使用方法: inject-doxygen-url.py <markdown_dir> <tagfile_path> <doxygen_html_root> <workspace_dir>",
+            "使用方法: inject-doxygen-url.py [--batch <batch_file>] <markdown_dir> <tagfile_path> <doxygen_html_root> <workspace_dir>",
             file=sys.stderr,
         )
         sys.exit(1)
 
-    markdown_dir = sys.argv[1]
-    tagfile_path = sys.argv[2]
-    doxygen_html_root = sys.argv[3]
-    workspace_dir = sys.argv[4]
+    markdown_dir = args[0]
+    tagfile_path = args[1]
+    doxygen_html_root = args[2]
+    workspace_dir = args[3]
 
     if not os.path.isdir(markdown_dir):
         print("エラー: ディレクトリが存在しません: {0}".format(markdown_dir), file=sys.stderr)
         sys.exit(1)
 
-    inject_doxygen_urls(markdown_dir, tagfile_path, doxygen_html_root, workspace_dir)
+    inject_doxygen_urls(markdown_dir, tagfile_path, doxygen_html_root, workspace_dir, batch_path)
 
 
 if __name__ == "__main__":
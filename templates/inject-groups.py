@@ -46,6 +46,123 @@ EXT_LANGUAGE_MAP = {
 }
 
 
+class DocsTree:
+    """
+    docs_dir 以下の Files / Modules / Classes ディレクトリと md ファイルの索引。
+
+    起動時に docs_dir を 1 回だけ走査し、各注入処理はこの索引でディレクトリと
+    md ファイルの有無を引く (注入処理ごとに rglob で木全体を走査し直さない)。
+    md の内容も読み込み時にキャッシュし、書き換えと追記はキャッシュに反映して
+    flush() でまとめて書き出す。これにより各 md は 1 回の実行で高々 1 回ずつ読み書きされる。
+
+    md を解析した結果も parsed() でキャッシュする。書き出しを flush() まで遅らせるため
+    ファイルの mtime は内容の変更を表さない。キャッシュは md ごとの版数 (write() のたびに
+    増える) をキーに持ち、内容が変わった md だけを解析し直す。
+    """
+
+    INDEXED_DIR_NAMES = ("Files", "Modules", "Classes")
+
+    def __init__(self, docs_dir):
+        self.docs_dir = docs_dir
+        self._dirs = {name: [] for name in self.INDEXED_DIR_NAMES}
+        self._md_names = {}
+        self._contents = {}
+        self._dirty = set()
+        self._revisions = {}
+        self._parsed = {}
+
+        for root, dirnames, _ in os.walk(str(docs_dir)):
+            for dirname in dirnames:
+                if dirname in self._dirs:
+                    self._dirs[dirname].append(Path(root) / dirname)
+        for dirs in self._dirs.values():
+            dirs.sort()
+        self._dir_set = {path for dirs in self._dirs.values() for path in dirs}
+
+    def directories(self, name):
+        """name (Files / Modules / Classes) という名前のディレクトリをパス順に返す。"""
+        return self._dirs[name]
+
+    def is_indexed_dir(self, path):
+        return path in self._dir_set
+
+    def md_names(self, directory):
+        """directory 直下の md ファイル名の集合を返す (初回のみディレクトリを読む)。"""
+        names = self._md_names.get(directory)
+        if names is None:
+            try:
+                names = {
+                    entry.name for entry in os.scandir(str(directory))
+                    if entry.name.endswith(".md") and entry.is_file()
+                }
+            except OSError:
+                names = set()
+            self._md_names[directory] = names
+        return names
+
+    def md_path(self, directory, stem):
+        """directory 直下の <stem>.md のパスを返す。存在しない場合は None。"""
+        name = stem + ".md"
+        if name not in self.md_names(directory):
+            return None
+        return directory / name
+
+    def read(self, md_path):
+        content = self._contents.get(md_path)
+        if content is None:
+            with open(str(md_path), "r", encoding="utf-8") as f:
+                content = f.read()
+            self._contents[md_path] = content
+        return content
+
+    def write(self, md_path, content):
+        """md の内容を置き換える。ファイルへの書き出しは flush() で行う。"""
+        self._contents[md_path] = content
+        self._dirty.add(md_path)
+        self._revisions[md_path] = self._revisions.get(md_path, 0) + 1
+
+    def parsed(self, md_path, parser):
+        """
+        md の内容を parser で解析した結果を返す。
+
+        同じ md と parser の組は、内容が変わるまで前回の結果を再利用する。
+        結果は呼び出し元の間で共有されるため、変更してはならない。
+        """
+        key = (md_path, parser)
+        revision = self._revisions.get(md_path, 0)
+        cached = self._parsed.get(key)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        result = parser(self.read(md_path))
+        self._parsed[key] = (revision, result)
+        return result
+
+    def append(self, md_path, text):
+        self.write(md_path, self.read(md_path) + text)
+
+    def create(self, md_path, content):
+        """中間 md を新規に書き出し、索引に加える。"""
+        with open(str(md_path), "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        self._contents[md_path] = content
+        self._dirty.discard(md_path)
+        self._revisions[md_path] = self._revisions.get(md_path, 0) + 1
+        self.md_names(md_path.parent).add(md_path.name)
+
+    def unlink(self, md_path):
+        md_path.unlink()
+        self._contents.pop(md_path, None)
+        self._dirty.discard(md_path)
+        self._revisions[md_path] = self._revisions.get(md_path, 0) + 1
+        self.md_names(md_path.parent).discard(md_path.name)
+
+    def flush(self):
+        for md_path in sorted(self._dirty):
+            with open(str(md_path), "w", encoding="utf-8", newline="\n") as f:
+                f.write(self._contents[md_path])
+        self._dirty.clear()
+
+
 def source_basename_to_md_name(basename):
     """
     ソースファイルのベースネームを Doxybook2 の Files ページ名に変換する。
@@ -156,7 +273,7 @@ def collect_groups(xml_dir):
     return group_data, hierarchy, member_langs
 
 
-def fix_member_fence_language(docs_dir, member_langs):
+def fix_member_fence_language(tree, member_langs):
     """
     Modules/group__*.md のメンバー シグネチャ フェンスに言語指定を付与する。
 
@@ -174,24 +291,20 @@ def fix_member_fence_language(docs_dir, member_langs):
     perfile / perchild 注入より前に実行することで、グループ md から
     抽出されるすべての埋め込みセクションに言語指定が波及する。
 
-    @param[in] docs_dir     doxybook2 出力ディレクトリ
+    @param[in] tree         docs_dir の索引 (DocsTree)
     @param[in] member_langs {group_id: {member_name: language}}
     """
     structure_marker = "!doxyfw-structure-title!"
     processed = 0
 
-    for modules_dir in sorted(docs_dir.rglob("Modules")):
-        if not modules_dir.is_dir():
-            continue
-
+    for modules_dir in tree.directories("Modules"):
         for group_id in sorted(member_langs.keys()):
             name_langs = member_langs[group_id]
-            group_md = modules_dir / "{}.md".format(group_id)
-            if not group_md.exists():
+            group_md = tree.md_path(modules_dir, group_id)
+            if group_md is None:
                 continue
 
-            with open(str(group_md), "r", encoding="utf-8") as f:
-                lines = f.read().split("\n")
+            lines = tree.read(group_md).split("\n")
 
             changed = False
             in_code_block = False
@@ -234,16 +347,15 @@ def fix_member_fence_language(docs_dir, member_langs):
                     pending_lang = None
 
             if changed:
-                with open(str(group_md), "w", encoding="utf-8", newline="\n") as f:
-                    f.write("\n".join(lines))
+                tree.write(group_md, "\n".join(lines))
                 processed += 1
 
     print("[inject-groups] fence language fixed: {} file(s)".format(processed))
 
 
-def parse_group_md_sections(md_path):
+def parse_group_md_sections(content):
     """
-    Doxybook2 が生成した Modules/*.md をパースし、メンバーセクションを分解する。
+    Doxybook2 が生成した Modules/*.md の内容をパースし、メンバーセクションを分解する。
 
     YAML フロントマター・HTML コメント・H1 を読み飛ばした後、
     残りを H2 (セクション見出し) と H3 (個別メンバー) で分割する。
@@ -255,8 +367,7 @@ def parse_group_md_sections(md_path):
             member_name: "### COMM_SUCCESS" の "COMM_SUCCESS" 部分
             content_lines: H3 見出し行を含むそのメンバーのすべての行
     """
-    with open(str(md_path), "r", encoding="utf-8") as f:
-        raw_lines = f.read().split("\n")
+    raw_lines = content.split("\n")
 
     i = 0
     n = len(raw_lines)
@@ -330,14 +441,58 @@ def parse_group_md_sections(md_path):
     return sections
 
 
+class GroupSections:
+    """
+    Modules/group__*.md の解析結果と、メンバー名から位置を引く索引。
+
+    1 つのグループのメンバーが多数のソース ファイルにまたがる場合でも、
+    グループ md の解析は DocsTree.parsed() により 1 回で済み、
+    ファイルごとのフィルター済みビューは select() で索引から組み立てる。
+    """
+
+    def __init__(self, content):
+        self.sections = parse_group_md_sections(content)
+        # {member_name: [(section_index, member_index), ...]}
+        self.positions = {}
+        for section_index, (_, members) in enumerate(self.sections):
+            for member_index, (name, _) in enumerate(members):
+                self.positions.setdefault(name, []).append((section_index, member_index))
+
+    def member_names(self):
+        return self.positions.keys()
+
+    def select(self, member_names):
+        """
+        member_names に含まれるメンバーだけを、元の順序のままセクションごとに返す。
+
+        Returns:
+            list: [(h2_heading_line, [content_lines, ...]), ...]
+                対象メンバーを含まないセクションは含めない。
+        """
+        selected = sorted(
+            position
+            for name in member_names
+            for position in self.positions.get(name, ())
+        )
+        result = []
+        current_index = None
+        for section_index, member_index in selected:
+            h2_line, members = self.sections[section_index]
+            if section_index != current_index:
+                result.append((h2_line, []))
+                current_index = section_index
+            result[-1][1].append(members[member_index][1])
+        return result
+
+
 # メンバー本文中の Classes include 行を検出する正規表現
 # (例: !include Classes/structcom__util__realtime__timestamp.md)
 _CLASSES_INCLUDE_RE = re.compile(r"^[ \t]*!include[ \t]+(Classes/.+\.md)[ \t]*$")
 
 
-def _strip_classes_md_header(md_path):
+def _strip_classes_md_header(content):
     """
-    raw Classes/*.md からフロントマター・先頭 HTML コメント・H1 を除いた本文行を返す。
+    raw Classes/*.md の内容からフロントマター・先頭 HTML コメント・H1 を除いた本文行を返す。
 
     inject-groups.py は postprocess.sh より前に実行されるため、ここで読む内容は
     !doxyfw-structure-title! マーカー・!dunder!・!linebreak! が未変換の raw である。
@@ -346,8 +501,7 @@ def _strip_classes_md_header(md_path):
     空行が入る。空行が混在しても本文先頭 (最初の H2 以降の実コンテンツ) まで
     確実にスキップするため、空行 / HTML コメント / H1 を区別せず読み飛ばす。
     """
-    with open(str(md_path), "r", encoding="utf-8") as f:
-        raw_lines = f.read().split("\n")
+    raw_lines = content.split("\n")
 
     i = 0
     n = len(raw_lines)
@@ -377,7 +531,35 @@ def _strip_classes_md_header(md_path):
     return raw_lines[i:]
 
 
-def resolve_classes_includes(member_lines, classes_dir, offset):
+class ClassesBody:
+    """raw Classes/*.md の本文行と、見出しシフト段数ごとの展開結果のキャッシュ。"""
+
+    def __init__(self, content):
+        self.lines = _strip_classes_md_header(content)
+        self._shifted = {}
+
+    def shifted(self, offset):
+        """本文の見出しを offset 段シフトした行リストを返す (コードブロック内は保持)。"""
+        lines = self._shifted.get(offset)
+        if lines is not None:
+            return lines
+
+        lines = []
+        in_code_block = False
+        for body_line in self.lines:
+            if body_line.startswith("```"):
+                in_code_block = not in_code_block
+                lines.append(body_line)
+                continue
+            if in_code_block:
+                lines.append(body_line)
+                continue
+            lines.append(shift_heading_line(body_line, offset))
+        self._shifted[offset] = lines
+        return lines
+
+
+def resolve_classes_includes(tree, member_lines, classes_dir, offset):
     """
     メンバー本文中の !include Classes/<name>.md を raw Classes 本文でインライン解決する。
 
@@ -392,6 +574,7 @@ def resolve_classes_includes(member_lines, classes_dir, offset):
     perfile 経由 (postprocess.sh が後段で offset 1 を加える) では offset=1 を与え、
     最終的にスタンドアロン Modules ページと同じ offset 2 に揃える。
 
+    @param[in] tree         docs_dir の索引 (DocsTree)
     @param[in] member_lines 1 メンバー分の行リスト
     @param[in] classes_dir  Classes ディレクトリ (None の場合は解決しない)
     @param[in] offset       展開した Classes 本文に与える見出しシフト段数
@@ -409,28 +592,18 @@ def resolve_classes_includes(member_lines, classes_dir, offset):
 
         # Classes/<name>.md の <name> 部分を取り出してファイルを特定する
         rel = match.group(1)
-        classes_md = classes_dir / Path(rel).name
-        if not classes_md.exists():
+        classes_md = tree.md_path(classes_dir, Path(rel).stem)
+        if classes_md is None:
             # 解決できない場合は元の行を保持 (後方互換)
             resolved.append(line)
             continue
 
-        body_lines = _strip_classes_md_header(classes_md)
-        in_code_block = False
-        for body_line in body_lines:
-            if body_line.startswith("```"):
-                in_code_block = not in_code_block
-                resolved.append(body_line)
-                continue
-            if in_code_block:
-                resolved.append(body_line)
-                continue
-            resolved.append(shift_heading_line(body_line, offset))
+        resolved.extend(tree.parsed(classes_md, ClassesBody).shifted(offset))
 
     return resolved
 
 
-def generate_filtered_md(title, sections, member_names, classes_dir=None):
+def generate_filtered_md(tree, title, group_sections, member_names, classes_dir=None):
     """
     対象ファイルのメンバー名集合でフィルタした中間 MD コンテンツを生成する。
 
@@ -456,15 +629,12 @@ def generate_filtered_md(title, sections, member_names, classes_dir=None):
     out.append("# {}".format(title))
     out.append("")
 
-    for (h2_line, members) in sections:
-        # このセクションで対象ファイルに属するメンバーだけを抽出
-        filtered = [(name, lines) for (name, lines) in members if name in member_names]
-        if not filtered:
-            continue
+    # 対象ファイルに属するメンバーだけをセクションごとに抽出
+    for (h2_line, filtered) in group_sections.select(member_names):
         out.append(h2_line)
         out.append("")
-        for (_, member_lines) in filtered:
-            out.extend(resolve_classes_includes(member_lines, classes_dir, 1))
+        for member_lines in filtered:
+            out.extend(resolve_classes_includes(tree, member_lines, classes_dir, 1))
             out.append("")
 
     return "\n".join(out)
@@ -492,7 +662,7 @@ def shift_heading_line(line, offset):
     return prefix + "#" * level + match.group(3)
 
 
-def build_embedded_group_section(title, sections, member_names, classes_dir=None):
+def build_embedded_group_section(tree, title, group_sections, member_names, classes_dir=None):
     """
     対象メンバーのみを含むグループ セクションを、直接埋め込み用に組み立てる。
 
@@ -524,21 +694,18 @@ def build_embedded_group_section(title, sections, member_names, classes_dir=None
             return
         out.append(shift_heading_line(line, 1))
 
-    for (h2_line, members) in sections:
-        filtered = [(name, lines) for (name, lines) in members if name in member_names]
-        if not filtered:
-            continue
+    for (h2_line, filtered) in group_sections.select(member_names):
         emit(h2_line)
         out.append("")
-        for (_, member_lines) in filtered:
-            for member_line in resolve_classes_includes(member_lines, classes_dir, 0):
+        for member_lines in filtered:
+            for member_line in resolve_classes_includes(tree, member_lines, classes_dir, 0):
                 emit(member_line)
             out.append("")
 
     return "\n".join(out)
 
 
-def append_missing_group_sections(md_path, modules_dir, modules_rel,
+def append_missing_group_sections(tree, md_path, modules_dir, modules_rel,
                                   ordered_members, group_titles, log_prefix,
                                   embed=False, classes_dir=None):
     """
@@ -554,6 +721,7 @@ def append_missing_group_sections(md_path, modules_dir, modules_rel,
     embed=True の場合は見出しを 1 段シフトした内容を直接追記する。
     対象 md 自身が !include される側 (Classes/*.md) の場合に使う。
 
+    @param[in] tree            docs_dir の索引 (DocsTree)
     @param[in] md_path         追記対象の md
     @param[in] modules_dir     Modules ディレクトリ
     @param[in] modules_rel     docs_dir からの Modules 相対パス (!include 用)
@@ -565,7 +733,7 @@ def append_missing_group_sections(md_path, modules_dir, modules_rel,
                                !include Classes/...md をインライン解決する。None で無効)
     @return    True: 追記した / False: 追記不要または追記済み
     """
-    content = md_path.read_text(encoding="utf-8")
+    content = tree.read(md_path)
 
     if not embed and "!include {}/perfile__".format(modules_rel) in content:
         print("  [skip] {}: perfile include already exists".format(md_path.name))
@@ -598,20 +766,16 @@ def append_missing_group_sections(md_path, modules_dir, modules_rel,
 
     append_lines = []
     for group_id in group_order:
-        group_md = modules_dir / "{}.md".format(group_id)
-        if not group_md.exists():
-            print("  -> 警告: {} が見つかりません".format(group_md))
+        group_md = tree.md_path(modules_dir, group_id)
+        if group_md is None:
+            print("  -> 警告: {} が見つかりません".format(modules_dir / "{}.md".format(group_id)))
             continue
 
-        sections = parse_group_md_sections(group_md)
+        group_sections = tree.parsed(group_md, GroupSections)
 
         # グループ md に実在するメンバーだけを対象にする
         # (空セクションの追記を防ぐ)
-        available = set()
-        for (_, members) in sections:
-            for (name, _) in members:
-                available.add(name)
-        effective = missing_names[group_id] & available
+        effective = missing_names[group_id] & group_sections.member_names()
         if not effective:
             print("  -> 警告: {} に対象メンバーが見つかりません: {}".format(
                 group_md.name, ", ".join(sorted(missing_names[group_id]))))
@@ -621,15 +785,13 @@ def append_missing_group_sections(md_path, modules_dir, modules_rel,
 
         if embed:
             append_lines.append(
-                build_embedded_group_section(title, sections, effective, classes_dir))
+                build_embedded_group_section(tree, title, group_sections, effective, classes_dir))
             append_lines.append("\n")
         else:
-            filtered_content = generate_filtered_md(title, sections, effective, classes_dir)
+            filtered_content = generate_filtered_md(tree, title, group_sections, effective, classes_dir)
 
             filtered_name = "perfile__{}__{}.md".format(group_id, md_path.stem)
-            filtered_path = modules_dir / filtered_name
-            with open(str(filtered_path), "w", encoding="utf-8", newline="\n") as f:
-                f.write(filtered_content)
+            tree.create(modules_dir / filtered_name, filtered_content)
 
             append_lines.append("\n!doxyfw-structure-title!## {}\n".format(title))
             append_lines.append("\n!include {}/{}\n".format(modules_rel, filtered_name))
@@ -640,8 +802,7 @@ def append_missing_group_sections(md_path, modules_dir, modules_rel,
     if not append_lines:
         return False
 
-    with open(str(md_path), "a", encoding="utf-8", newline="\n") as f:
-        f.write("".join(append_lines))
+    tree.append(md_path, "".join(append_lines))
 
     return True
 
@@ -701,7 +862,7 @@ def collect_class_group_members(xml_dir):
     return result
 
 
-def inject_into_class_files_md(docs_dir, class_group_members, group_titles):
+def inject_into_class_files_md(tree, class_group_members, group_titles):
     """
     グループへ移動したクラス メンバーをクラス ページへ補完する。
 
@@ -712,29 +873,26 @@ def inject_into_class_files_md(docs_dir, class_group_members, group_titles):
     postprocess.sh はソート順 (Classes が Files / Namespaces より先) で
     処理することでネストした !include を解決する。
 
-    @param[in] docs_dir            doxybook2 出力ディレクトリ
+    @param[in] tree                docs_dir の索引 (DocsTree)
     @param[in] class_group_members {class_compound_id: [(group_id, member_name)]}
     @param[in] group_titles        {group_id: title}
     """
     processed = 0
 
-    for classes_dir in sorted(docs_dir.rglob("Classes")):
-        if not classes_dir.is_dir():
-            continue
-
+    for classes_dir in tree.directories("Classes"):
         modules_dir = classes_dir.parent / "Modules"
-        if not modules_dir.is_dir():
+        if not tree.is_indexed_dir(modules_dir):
             continue
 
-        modules_rel = str(modules_dir.relative_to(docs_dir))
+        modules_rel = str(modules_dir.relative_to(tree.docs_dir))
 
         for compound_id, ordered_members in class_group_members.items():
-            class_md_path = classes_dir / (compound_id + ".md")
-            if not class_md_path.exists():
+            class_md_path = tree.md_path(classes_dir, compound_id)
+            if class_md_path is None:
                 continue
 
             if append_missing_group_sections(
-                    class_md_path, modules_dir, modules_rel,
+                    tree, class_md_path, modules_dir, modules_rel,
                     ordered_members, group_titles, "class",
                     embed=True, classes_dir=classes_dir):
                 processed += 1
@@ -742,7 +900,7 @@ def inject_into_class_files_md(docs_dir, class_group_members, group_titles):
     print("[inject-groups] class files processed: {}".format(processed))
 
 
-def inject_into_files_md(files_md_path, groups, modules_dir, modules_rel, group_data,
+def inject_into_files_md(tree, files_md_path, groups, modules_dir, modules_rel, group_data,
                          class_member_names, classes_dir=None):
     """
     Files/*.md の末尾に ## グループ タイトル セクションと !include ディレクティブを追記する。
@@ -760,12 +918,12 @@ def inject_into_files_md(files_md_path, groups, modules_dir, modules_rel, group_
     !include のパスは docs_dir からの相対パスで記述する
     (postprocess.sh が MARKDOWN_DIR 基準で解決するため)。
 
+    @param[in] tree               docs_dir の索引 (DocsTree)
     @param[in] class_member_names {group_id: set(member_name)} クラス所属メンバー
     @param[in] classes_dir        Classes ディレクトリ (struct メンバー本文の
                                   !include Classes/...md をインライン解決する。None で無効)
     """
-    with open(str(files_md_path), "r", encoding="utf-8") as f:
-        content = f.read()
+    content = tree.read(files_md_path)
 
     if "!include {}/perfile__".format(modules_rel) in content:
         print("  [skip] {}: perfile include already exists".format(files_md_path.name))
@@ -797,19 +955,17 @@ def inject_into_files_md(files_md_path, groups, modules_dir, modules_rel, group_
             continue
 
         # Modules/group_id.md をパース
-        group_md_path = modules_dir / "{}.md".format(group_id)
-        if not group_md_path.exists():
-            print("  -> 警告: {} が見つかりません".format(group_md_path))
+        group_md_path = tree.md_path(modules_dir, group_id)
+        if group_md_path is None:
+            print("  -> 警告: {} が見つかりません".format(modules_dir / "{}.md".format(group_id)))
             continue
 
-        sections = parse_group_md_sections(group_md_path)
-        filtered_content = generate_filtered_md(title, sections, member_names, classes_dir)
+        group_sections = tree.parsed(group_md_path, GroupSections)
+        filtered_content = generate_filtered_md(tree, title, group_sections, member_names, classes_dir)
 
         # フィルター済み中間 MD を Modules/ に書き出す
         filtered_name = "perfile__{}__{}.md".format(group_id, files_stem)
-        filtered_path = modules_dir / filtered_name
-        with open(str(filtered_path), "w", encoding="utf-8", newline="\n") as f:
-            f.write(filtered_content)
+        tree.create(modules_dir / filtered_name, filtered_content)
 
         include_path = "{}/{}".format(modules_rel, filtered_name)
         append_lines.append("\n!doxyfw-structure-title!## {}\n".format(title))
@@ -819,13 +975,12 @@ def inject_into_files_md(files_md_path, groups, modules_dir, modules_rel, group_
     if not generated:
         return
 
-    with open(str(files_md_path), "a", encoding="utf-8", newline="\n") as f:
-        f.write("".join(append_lines))
+    tree.append(files_md_path, "".join(append_lines))
 
     print("  [ok] {}: {} inserted (filtered)".format(files_md_path.name, ", ".join(generated)))
 
 
-def generate_perchild_md(group_md_path, classes_dir=None):
+def generate_perchild_md(tree, group_md_path, classes_dir=None):
     """
     子グループの group__*.md を読み込み、**Module:** breadcrumb 行を除去した
     perchild 用コンテンツを生成する。
@@ -841,8 +996,7 @@ def generate_perchild_md(group_md_path, classes_dir=None):
     Returns:
         str: perchild ファイルに書き出すコンテンツ
     """
-    with open(str(group_md_path), "r", encoding="utf-8") as f:
-        lines = f.read().split("\n")
+    lines = tree.read(group_md_path).split("\n")
 
     result = []
     i = 0
@@ -855,7 +1009,7 @@ def generate_perchild_md(group_md_path, classes_dir=None):
             while i < n and lines[i] == "":
                 i += 1
             continue
-        result.extend(resolve_classes_includes([line], classes_dir, 1))
+        result.extend(resolve_classes_includes(tree, [line], classes_dir, 1))
         i += 1
 
     return "\n".join(result)
@@ -906,7 +1060,7 @@ def collect_child_group_ids(hierarchy):
     return child_ids
 
 
-def remove_merged_child_group_outputs(docs_dir, merged_child_ids):
+def remove_merged_child_group_outputs(tree, merged_child_ids):
     """
     root group に統合済みの子孫 group ページと目次リンクを削除する。
 
@@ -919,21 +1073,18 @@ def remove_merged_child_group_outputs(docs_dir, merged_child_ids):
     removed_pages = 0
     removed_index_lines = 0
 
-    for modules_dir in sorted(docs_dir.rglob("Modules")):
-        if not modules_dir.is_dir():
-            continue
-
+    for modules_dir in tree.directories("Modules"):
         for group_id in sorted(merged_child_ids):
-            child_md = modules_dir / "{}.md".format(group_id)
-            if child_md.exists():
-                child_md.unlink()
+            child_md = tree.md_path(modules_dir, group_id)
+            if child_md is not None:
+                tree.unlink(child_md)
                 removed_pages += 1
 
-        index_path = modules_dir.parent / "index_groups.md"
-        if not index_path.exists():
+        index_path = tree.md_path(modules_dir.parent, "index_groups")
+        if index_path is None:
             continue
 
-        lines = index_path.read_text(encoding="utf-8").split("\n")
+        lines = tree.read(index_path).split("\n")
         filtered_lines = []
         for line in lines:
             remove_line = False
@@ -950,7 +1101,7 @@ def remove_merged_child_group_outputs(docs_dir, merged_child_ids):
                 filtered_lines.append(line)
 
         if len(filtered_lines) != len(lines):
-            index_path.write_text("\n".join(filtered_lines), encoding="utf-8", newline="\n")
+            tree.write(index_path, "\n".join(filtered_lines))
 
     print(
         "[inject-groups] merged child group outputs removed: pages={}, index_lines={}".format(
@@ -959,7 +1110,7 @@ def remove_merged_child_group_outputs(docs_dir, merged_child_ids):
     )
 
 
-def inject_children_into_parent_groups(docs_dir, hierarchy):
+def inject_children_into_parent_groups(tree, hierarchy):
     """
     root group の Modules ページに子孫グループの内容を挿入する。
 
@@ -984,20 +1135,17 @@ def inject_children_into_parent_groups(docs_dir, hierarchy):
         if not descendants:
             continue
 
-        for modules_dir in sorted(docs_dir.rglob("Modules")):
-            if not modules_dir.is_dir():
+        for modules_dir in tree.directories("Modules"):
+            parent_md = tree.md_path(modules_dir, parent_id)
+            if parent_md is None:
                 continue
 
-            parent_md = modules_dir / "{}.md".format(parent_id)
-            if not parent_md.exists():
-                continue
-
-            modules_rel = str(modules_dir.relative_to(docs_dir))
+            modules_rel = str(modules_dir.relative_to(tree.docs_dir))
             classes_dir = modules_dir.parent / "Classes"
-            if not classes_dir.is_dir():
+            if not tree.is_indexed_dir(classes_dir):
                 classes_dir = None
 
-            content = parent_md.read_text(encoding="utf-8")
+            content = tree.read(parent_md)
             if "!include {}/perchild__".format(modules_rel) in content:
                 print("  [skip] {}: perchild include already exists".format(parent_md.name))
                 continue
@@ -1006,16 +1154,14 @@ def inject_children_into_parent_groups(docs_dir, hierarchy):
             generated = []
 
             for descendant_id, path_title in descendants:
-                child_md = modules_dir / "{}.md".format(descendant_id)
-                if not child_md.exists():
-                    print("  -> 警告: {} が見つかりません".format(child_md))
+                child_md = tree.md_path(modules_dir, descendant_id)
+                if child_md is None:
+                    print("  -> 警告: {} が見つかりません".format(modules_dir / "{}.md".format(descendant_id)))
                     continue
 
-                perchild_content = generate_perchild_md(child_md, classes_dir)
+                perchild_content = generate_perchild_md(tree, child_md, classes_dir)
                 perchild_name = "perchild__{}__{}.md".format(parent_id, descendant_id)
-                perchild_path = modules_dir / perchild_name
-                with open(str(perchild_path), "w", encoding="utf-8", newline="\n") as f:
-                    f.write(perchild_content)
+                tree.create(modules_dir / perchild_name, perchild_content)
 
                 include_path = "{}/{}".format(modules_rel, perchild_name)
                 append_lines.append("\n!doxyfw-structure-title!## {}\n".format(path_title))
@@ -1026,13 +1172,12 @@ def inject_children_into_parent_groups(docs_dir, hierarchy):
             if not generated:
                 continue
 
-            with open(str(parent_md), "a", encoding="utf-8", newline="\n") as f:
-                f.write("".join(append_lines))
+            tree.append(parent_md, "".join(append_lines))
 
             print("  [ok] {}: {} inserted".format(parent_md.name, ", ".join(generated)))
             processed += 1
 
-    remove_merged_child_group_outputs(docs_dir, merged_child_ids)
+    remove_merged_child_group_outputs(tree, merged_child_ids)
     print("[inject-groups] parent groups processed: {}".format(processed))
 
 
@@ -1063,10 +1208,13 @@ def main():
         print("[inject-groups] Done: 0 file(s) processed")
         return 0
 
+    # docs_dir の索引 (以降の注入処理はすべてこの索引と md キャッシュを経由する)
+    tree = DocsTree(docs_dir)
+
     # メンバー シグネチャ フェンスへの言語付与
     # (perfile / perchild のすべての抽出より前に行い、埋め込みへ波及させる)
     if member_langs:
-        fix_member_fence_language(docs_dir, member_langs)
+        fix_member_fence_language(tree, member_langs)
 
     # グループ タイトルのマップ (class 注入とログで使用)
     group_titles = {}
@@ -1096,15 +1244,12 @@ def main():
     for basename in file_groups:
         file_groups[basename].sort(key=lambda x: x[2])
 
-    # docs_dir 以下の Files/ ディレクトリを再帰的に探索
+    # docs_dir 以下の Files/ ディレクトリを探索
     processed = 0
-    for files_dir in sorted(docs_dir.rglob("Files")):
-        if not files_dir.is_dir():
-            continue
-
+    for files_dir in tree.directories("Files"):
         # Modules/ は Files/ と同じ階層 (category ディレクトリ直下) に配置
         modules_dir = files_dir.parent / "Modules"
-        if not modules_dir.is_dir():
+        if not tree.is_indexed_dir(modules_dir):
             continue
 
         # !include で使う相対パス (docs_dir からの相対)
@@ -1112,17 +1257,17 @@ def main():
 
         # struct メンバー本文の !include Classes/...md 解決用 (同階層の Classes)
         classes_dir = files_dir.parent / "Classes"
-        if not classes_dir.is_dir():
+        if not tree.is_indexed_dir(classes_dir):
             classes_dir = None
 
+        md_names = tree.md_names(files_dir)
         for source_basename, groups in file_groups.items():
             md_name = source_basename_to_md_name(source_basename)
-            files_md_path = files_dir / md_name
-            if not files_md_path.exists():
+            if md_name not in md_names:
                 continue
 
             inject_into_files_md(
-                files_md_path, groups, modules_dir, modules_rel, group_data,
+                tree, files_dir / md_name, groups, modules_dir, modules_rel, group_data,
                 class_member_names, classes_dir
             )
             processed += 1
@@ -1131,12 +1276,13 @@ def main():
 
     # クラス ページへのグループ メンバー補完注入
     if class_group_members:
-        inject_into_class_files_md(docs_dir, class_group_members, group_titles)
+        inject_into_class_files_md(tree, class_group_members, group_titles)
 
     # 親グループへの子グループ注入
     if hierarchy:
-        inject_children_into_parent_groups(docs_dir, hierarchy)
+        inject_children_into_parent_groups(tree, hierarchy)
 
+    tree.flush()
     return 0
 
 
@@ -15,18 +15,22 @@ Doxygen の INPUT 相対ソース パスと一致する。Doxygen 実行ディ
 
 解決した origin を WORKSPACE_DIR 相対パスに正規化し、フロントマター キー git-origin として
 埋め込む。docsfw 側はこのヒントを使って origin への Git リンクを表示する。
+--batch を指定した場合は md を書き換えず、更新を batch ファイルへ登録する
+(commit-frontmatter.py がほかの段の更新とまとめて書き込む)。
 
 トップレベル Files/README.md は Doxybook2 が生成する `ファイルの一覧` 索引であり実ソースでは
 ないため除外する。サブフォルダーの README.md (例 Files/src/image/README.md) は実ソースなので対象。
 
 使用方法:
-    python3 inject-source-origin.py <markdown_dir> <doxygen_rundir> <workspace_dir>
+    python3 inject-source-origin.py [--batch <batch_file>] <markdown_dir> <doxygen_rundir> <workspace_dir>
 """
 
 import sys
 import os
 from pathlib import Path
 
+from frontmatter_updates import write_frontmatter_updates
+
 sys.stdout.reconfigure(encoding="utf-8")
 sys.stderr.reconfigure(encoding="utf-8")
 
@@ -52,48 +56,14 @@ def resolve_origin(rundir, rel_under_files):
     return None
 
 
-def inject_frontmatter(md_path, key, value):
-    """
-    md の先頭フロントマター ブロックへ `key: "value"` を挿入する。
-
-    既存の同名キーがあれば置換する。フロントマターが無ければ新規生成する。
-
-    @param[in] md_path  対象 md ファイルのパス
-    @param[in] key      挿入するキー名
-    @param[in] value    挿入する値 (文字列)
-    """
-    with open(md_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    new_line = '{0}: "{1}"\n'.format(key, value)
-
-    if lines and lines[0].rstrip("\r\n") == "---":
-        close_index = None
-        for i in range(1, len(lines)):
-            if lines[i].rstrip("\r\n") == "---":
-                close_index = i
-                break
-        if close_index is not None:
-            body = lines[1:close_index]
-            body = [ln for ln in body if not ln.lstrip().startswith(key + ":")]
-            body.append(new_line)
-            lines = [lines[0]] + body + lines[close_index:]
-        else:
-            lines = ["---\n", new_line, "---\n"] + lines
-    else:
-        lines = ["---\n", new_line, "---\n"] + lines
-
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
-
-
-def inject_source_origin(markdown_dir, rundir, workspace_dir):
+def inject_source_origin(markdown_dir, rundir, workspace_dir, batch_path=None):
     """
     Files/ 配下の各 md に git-origin フロントマターを埋め込む。
 
     @param[in] markdown_dir   doxybook2 出力ディレクトリ
     @param[in] rundir         Doxygen 実行ディレクトリ
     @param[in] workspace_dir  ワークスペース ルート
+    @param[in] batch_path     front matter 更新の登録先 (None の場合は md を直接書き換える)
     """
     files_dir = Path(markdown_dir) / "Files"
     if not files_dir.is_dir():
@@ -108,6 +78,7 @@ def inject_source_origin(markdown_dir, rundir, workspace_dir):
     workspace_dir = os.path.abspath(workspace_dir)
 
     count = 0
+    updates = []
     for md_path in sorted(files_dir.rglob("*.md")):
         rel_under_files = md_path.relative_to(files_dir).as_posix()
 
@@ -120,29 +91,36 @@ def inject_source_origin(markdown_dir, rundir, workspace_dir):
             continue
 
         ws_rel = os.path.relpath(abs_origin, workspace_dir).replace("\\", "/")
-        inject_frontmatter(str(md_path), "git-origin", ws_rel)
+        updates.append((str(md_path), "git-origin", ws_rel))
         count += 1
         print("  git-origin: Files/{0} -> {1}".format(rel_under_files, ws_rel))
 
+    write_frontmatter_updates(updates, batch_path)
     print("git-origin を {0} 件の Files md に注入しました。".format(count))
 
 
 def main():
     """エントリ ポイント。"""
-    if len(sys.argv) != 4:
-        print("使用方法: inject-source-origin.py <markdown_dir> <doxygen_rundir> <workspace_dir>",
+    args = sys.argv[1:]
+    batch_path = None
+    if len(args) >= 2 and args[0] == "--batch":
+        batch_path = args[1]
+        args = args[2:]
+
+    if len(args) != 3:
+        print("使用方法: inject-source-origin.py [--batch <batch_file>] <markdown_dir> <doxygen_rundir> <workspace_dir>",
               file=sys.stderr)
         sys.exit(1)
 
-    markdown_dir = sys.argv[1]
-    rundir = sys.argv[2]
-    workspace_dir = sys.argv[3]
+    markdown_dir = args[0]
+    rundir = args[1]
+    workspace_dir = args[2]
 
     if not os.path.isdir(markdown_dir):
         print("エラー: ディレクトリが存在しません: {0}".format(markdown_dir), file=sys.stderr)
         sys.exit(1)
 
-    inject_source_origin(markdown_dir, rundir, workspace_dir)
+    inject_source_origin(markdown_dir, rundir, workspace_dir, batch_path)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,40 @@
 #!/usr/bin/env python3
-# merge-index-files.py - index_files.md と index_pages.md の階層構造をマージ
+"""merge-index-files.py - index_files.md と index_pages.md の階層構造をマージ
 
+index_files.md は読み込みと同時に次のパッチを行を単位に適用し、そのままツリーへ積む
+(別パスでファイルを書き換えない)。
+
+Doxybook2 が生成する index_files.md では、ディレクトリ名やファイル名に
+Doxygen INPUT ルートからの相対パス (例: calc/include, calc/src/add/add.c) が付与される。
+index_pages.md のローカル名と対応付けるため、各表示名を末尾コンポーネントのみに変換する。
+
+また、Doxybook2 が生成するファイルリンクは Files/xxx.md#file-xxx.h 形式だが、
+対象の Files/*.md にはそのアンカーが存在しないため、#fragment 部分も合わせて除去する。
+
+変換例:
+    📁 calc/include                             → 📁 include
+    📁 calc/src/add                             → 📁 add
+    [calc/src/add/add.c](Files/add_8c.md#file-add.c)  → [add.c](Files/add_8c.md)
+
+各 Node は子を名前で引ける辞書を持ち、マージは兄弟数に対して線形に進む。
+index_pages.md が無い場合はパッチのみを適用して index_files.md へ書き戻す。
+"""
+
+import os
 import sys
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Match, Optional, Tuple
+
+# ディレクトリ表示名: 📁 path/to/dir (スラッシュを含まない名前はそのまま)
+DIR_NAME_RE = re.compile(r'📁 ([^\s\[<\r\n]+)')
+# ファイルリンク表示名: [path/to/file](Files/...) (index_files.md 内のファイル リンクは必ず Files/ で始まる)
+FILE_LINK_RE = re.compile(r'\[([^\]]+)\]\((Files/[^)]+)\)')
+
+ENTRY_RE = re.compile(r'[*+\-] (📁|📄) (.+)')
+LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)(.*)')
+NAME_RE = re.compile(r'([^<]+)(.*)')
+DESCRIPTION_RE = re.compile(r'<br/>(&nbsp;)*(.+)')
+
 
 class Node:
     """ツリー構造のノードを表すクラス"""
@@ -14,11 +45,35 @@ class Node:
         self.link = link
         self.description = description
         self.children: List[Node] = []
+        # 同名の子は後に追加したものを引く
+        self.children_by_name: Dict[str, Node] = {}
         self.is_file = icon == "📄"
 
+    def add_child(self, node: "Node") -> None:
+        self.children.append(node)
+        self.children_by_name[node.name] = node
+
     def __repr__(self):
         return f"Node({self.name}, indent={self.indent}, icon={self.icon}, link={self.link})"
 
+
+def _strip_dir(m: Match[str]) -> str:
+    """📁 path/to/dir → 📁 dir"""
+    return '📁 ' + m.group(1).rsplit('/', 1)[-1]
+
+
+def _strip_file(m: Match[str]) -> str:
+    """[path/to/file](Files/xxx.md#fragment) → [file](Files/xxx.md)"""
+    href = m.group(2).split('#', 1)[0]
+    return '[' + m.group(1).rsplit('/', 1)[-1] + '](' + href + ')'
+
+
+def patch_index_text(text: str) -> str:
+    """index_files.md の表示名をローカル名に変換し、ファイルリンクのフラグメントを除去する"""
+    text = DIR_NAME_RE.sub(_strip_dir, text)
+    return FILE_LINK_RE.sub(_strip_file, text)
+
+
 def parse_line(line: str) -> Optional[Tuple[int, str, str, str, str]]:
     """Markdown行を解析して (インデント, アイコン, 名前, リンク, 説明) を返す"""
     # インデントを計算 (4 スペース = 1 レベル)
@@ -30,7 +85,7 @@ def parse_line(line: str) -> Optional[Tuple[int, str, str, str, str]]:
     indent_count = (len(line) - len(stripped)) // 4
 
     # アイコンと残りの部分を抽出
-    match = re.match(r'[*+\-] (📁|📄) (.+)', stripped)
+    match = ENTRY_RE.match(stripped)
     if not match:
         return None
 
@@ -42,14 +97,14 @@ def parse_line(line: str) -> Optional[Tuple[int, str, str, str, str]]:
     # または: [name](link)
     # または: name <br/>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;description
     # または: name
-    link_match = re.match(r'\[([^\]]+)\]\(([^)]+)\)(.*)', rest)
+    link_match = LINK_RE.match(rest)
     if link_match:
         name = link_match.group(1)
         link = link_match.group(2)
         desc_part = link_match.group(3)
     else:
         # リンクなし
-        name_match = re.match(r'([^<]+)(.*)', rest)
+        name_match = NAME_RE.match(rest)
         if name_match:
             name = name_match.group(1).strip()
             link = ""
@@ -58,13 +113,14 @@ def parse_line(line: str) -> Optional[Tuple[int, str, str, str, str]]:
             return None
 
     # 説明部分を抽出
-    desc_match = re.search(r'<br/>(&nbsp;)*(.+)', desc_part)
+    desc_match = DESCRIPTION_RE.search(desc_part)
     description = desc_match.group(2) if desc_match else ""
 
     return (indent_count, icon, name, link, description)
 
-def build_tree(lines: List[str]) -> List[Node]:
-    """Markdown行のリストからツリー構造を構築"""
+
+def build_tree(lines: Iterable[str]) -> List[Node]:
+    """Markdown行の列からツリー構造を構築"""
     root_nodes: List[Node] = []
     stack: List[Node] = []
 
@@ -82,7 +138,7 @@ def build_tree(lines: List[str]) -> List[Node]:
 
         # 親ノードに追加
         if stack:
-            stack[-1].children.append(node)
+            stack[-1].add_child(node)
         else:
             root_nodes.append(node)
 
@@ -92,22 +148,20 @@ def build_tree(lines: List[str]) -> List[Node]:
 
     return root_nodes
 
+
 def merge_trees(pages_tree: List[Node], files_tree: List[Node]) -> List[Node]:
     """2つのツリーをマージ（ページ版を優先）"""
-    def merge_nodes(pages_nodes: List[Node], files_nodes: List[Node]) -> List[Node]:
+    def index(nodes: List[Node]) -> Dict[str, Node]:
+        return {node.name: node for node in nodes}
+
+    def merge_nodes(pages_dict: Dict[str, Node], files_dict: Dict[str, Node]) -> List[Node]:
         # ページ ノードをベースにする
         result: List[Node] = []
-        pages_dict: Dict[str, Node] = {node.name: node for node in pages_nodes}
-        files_dict: Dict[str, Node] = {node.name: node for node in files_nodes}
 
-        # 両辞書のキーの和集合を取得 (末尾でソートするため挿入順は不問)
-        all_names = list(pages_dict.keys() | files_dict.keys())
-
-        for name in all_names:
-            pages_node = pages_dict.get(name)
+        for name, pages_node in pages_dict.items():
             files_node = files_dict.get(name)
 
-            if pages_node and files_node:
+            if files_node:
                 # 両方にある場合: ページ版を優先し、子をマージ
                 merged_node = Node(
                     pages_node.name,
@@ -117,40 +171,34 @@ def merge_trees(pages_tree: List[Node], files_tree: List[Node]) -> List[Node]:
                     pages_node.description or files_node.description
                 )
                 # 子ノードを再帰的にマージ
-                merged_node.children = merge_nodes(pages_node.children, files_node.children)
+                for child in merge_nodes(pages_node.children_by_name, files_node.children_by_name):
+                    merged_node.add_child(child)
                 result.append(merged_node)
-            elif pages_node:
-                # ページ版のみ: そのまま使用 (ファイル ツリーから子を追加)
-                merged_node = Node(
-                    pages_node.name,
-                    pages_node.indent,
-                    pages_node.icon,
-                    pages_node.link,
-                    pages_node.description
-                )
-                # ファイル ツリーから対応するディレクトリを探す
-                files_match = files_dict.get(name)
-                if files_match and not pages_node.is_file:
-                    # 子ノードをマージ
-                    merged_node.children = merge_nodes(pages_node.children, files_match.children)
-                else:
-                    merged_node.children = pages_node.children
-                result.append(merged_node)
-            elif files_node:
-                # ファイル版のみ: 追加 (特にファイル エントリ)
+            else:
+                # ページ版のみ: そのまま使用
+                result.append(pages_node)
+
+        # ファイル版のみ: 追加 (特にファイル エントリ)
+        for name, files_node in files_dict.items():
+            if name not in pages_dict:
                 result.append(files_node)
 
         # フォルダー優先・名前順でソート
         result.sort(key=lambda n: (n.is_file, n.name))
         return result
 
-    return merge_nodes(pages_tree, files_tree)
+    return merge_nodes(index(pages_tree), index(files_tree))
+
 
-def tree_to_markdown(nodes: List[Node], base_indent: int = 0) -> List[str]:
+def tree_to_markdown(nodes: List[Node]) -> List[str]:
     """ツリーをMarkdown行のリストに変換"""
     lines: List[str] = []
+    # 再帰せず、子を逆順に積んだスタックで前順に辿る
+    stack = list(reversed(nodes))
+
+    while stack:
+        node = stack.pop()
 
-    for node in nodes:
         # インデント文字列を生成
         indent_str = "    " * node.indent
 
@@ -166,44 +214,61 @@ def tree_to_markdown(nodes: List[Node], base_indent: int = 0) -> List[str]:
 
         lines.append(node_str)
 
-        # 子ノードを再帰的に追加
-        lines.extend(tree_to_markdown(node.children, node.indent + 1))
+        # 子ノードを続けて出力
+        stack.extend(reversed(node.children))
 
     return lines
 
+
+def read_index_lines(path: str, patch: bool = False) -> Tuple[List[str], List[str]]:
+    """index ファイルを 1 行ずつ読み、(ヘッダー行, コンテンツ行) を返す。
+
+    ヘッダーは YAML フロント マターと見出し (# ) の手前まで。見出し行は含めない。
+    patch=True の場合は各行に patch_index_text を適用する。
+    """
+    header_lines: List[str] = []
+    content_lines: List[str] = []
+    in_content = False
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if patch:
+                line = patch_index_text(line)
+            if in_content:
+                content_lines.append(line.rstrip())
+            elif line.startswith('# '):
+                in_content = True
+            else:
+                header_lines.append(line.rstrip())
+
+    if not in_content:
+        # 見出しがない場合はファイル全体をコンテンツとして扱う
+        content_lines = header_lines
+    return header_lines, content_lines
+
+
+def patch_index_file(path: str) -> None:
+    """index_files.md にパッチのみを適用する。
+
+    バイナリモードで読み書きすることで、元の改行コード (CRLF/LF) を保持する。
+    """
+    with open(path, 'rb') as f:
+        text = f.read().decode('utf-8')
+
+    with open(path, 'wb') as f:
+        f.write(patch_index_text(text).encode('utf-8'))
+
+
 def merge_index_files(files_path: str, pages_path: str, output_path: str):
-    """index_files.md と index_pages.md をマージし、index_files.md へ上書きする。
+    """index_files.md にパッチを適用しつつ index_pages.md とマージし、index_files.md へ上書きする。
 
     Pages/ のリンクは Files/ へ書き換える。
     ヘッダー (YAML フロントマター) は index_files.md 側を採用し、
     page-break-before-heading: true 等を保持する。
     """
     # ファイルを先に全読込し、open したまま書き込む競合を避ける
-    with open(files_path, 'r', encoding='utf-8') as f:
-        files_lines = f.readlines()
-
-    with open(pages_path, 'r', encoding='utf-8') as f:
-        pages_lines = f.readlines()
-
-    # ヘッダー部分 (YAML フロント マターと見出しまで) を index_files.md 側から抽出
-    header_lines = []
-    files_content_start_idx = 0
-    for i, line in enumerate(files_lines):
-        if line.startswith('# '):
-            files_content_start_idx = i + 1
-            break
-        header_lines.append(line.rstrip())
-
-    # pages_lines のコンテンツ開始位置を特定 (ヘッダーの行数は files と同じ構造)
-    pages_content_start_idx = 0
-    for i, line in enumerate(pages_lines):
-        if line.startswith('# '):
-            pages_content_start_idx = i + 1
-            break
-
-    # ファイルとページのコンテンツ部分を抽出
-    files_content = [line.rstrip() for line in files_lines[files_content_start_idx:]]
-    pages_content = [line.rstrip() for line in pages_lines[pages_content_start_idx:]]
+    header_lines, files_content = read_index_lines(files_path, patch=True)
+    _, pages_content = read_index_lines(pages_path)
 
     # ツリーを構築
     files_tree = build_tree(files_content)
@@ -212,13 +277,6 @@ def merge_index_files(files_path: str, pages_path: str, output_path: str):
     # ツリーをマージ
     merged_tree = merge_trees(pages_tree, files_tree)
 
-    # Markdown に変換
-    merged_lines = tree_to_markdown(merged_tree)
-
-    # Pages/ リンクを Files/ へ書き換え
-    # index_files.md の新しい内容として index_files.md へ上書きする
-    rewritten_lines = [line.replace('](Pages/', '](Files/') for line in merged_lines]
-
     # 出力ファイルを作成 (output_path == files_path で上書き)
     with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
         # ヘッダーを書き込む (index_files.md 側を採用)
@@ -230,11 +288,13 @@ def merge_index_files(files_path: str, pages_path: str, output_path: str):
         f.write('\n')
 
         # 展開可能リストとしてマージされたコンテンツを書き込む
+        # Pages/ リンクを Files/ へ書き換え
         f.write('::: {.collapsible-list open-level=-1}\n')
-        for line in rewritten_lines:
-            f.write(line + '\n')
+        for line in tree_to_markdown(merged_tree):
+            f.write(line.replace('](Pages/', '](Files/') + '\n')
         f.write(':::\n')
 
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: merge-index-files.py <markdown_directory>", file=sys.stderr)
@@ -246,12 +306,13 @@ def main():
     # マージ結果は index_files.md へ上書きする (index_files_and_pages.md は廃止)
     output_path = files_path
 
-    import os
     if not os.path.exists(files_path):
         print(f"Warning: {files_path} not found. Skipping merge.", file=sys.stderr)
         sys.exit(0)
 
     if not os.path.exists(pages_path):
+        patch_index_file(files_path)
+        print(f"Patched: {files_path}")
         print(f"Warning: {pages_path} not found. Skipping merge.", file=sys.stderr)
         sys.exit(0)
 
@@ -259,5 +320,6 @@ def main():
     merge_index_files(files_path, pages_path, output_path)
     print(f"Successfully updated {output_path}")
 
+
 if __name__ == "__main__":
     main()
@@ -1069,18 +1069,12 @@ fi
 # (Pages/ ステージングと index_pages.md 生成を行う)
 "$SCRIPT_DIR/copy-markdown-from-input.sh" "$MARKDOWN_DIR" || exit 1
 
-# ファイル インデックスのパッチ
+# ファイル インデックスのパッチと index_files.md / index_pages.md のマージ処理
 # Doxybook2 が出力するディレクトリ名・ファイル名は Doxygen INPUT ルートからの相対パス形式。
 # 例: calc/include, calc/src/add/add.c
-# merge-index-files.py でのマージ時に index_pages.md のローカル名と対応付けるため、
-# patch-index-files.py によって末尾コンポーネントのみに変換する。
-if [ -f "$MARKDOWN_DIR/index_files.md" ]; then
-    python3 "$SCRIPT_DIR/patch-index-files.py" "$MARKDOWN_DIR/index_files.md" || exit 1
-fi
-
-# index_files.md と index_pages.md のマージ処理
-# merge-index-files.py を呼び出してマージ結果を index_files.md へ上書きする
-# (index_files_and_pages.md は生成しない)
+# index_pages.md のローカル名と対応付けるため、merge-index-files.py が index_files.md の
+# 読み込みと同じパスで末尾コンポーネントのみに変換し、マージ結果を index_files.md へ上書きする
+# (index_files_and_pages.md は生成しない。index_pages.md が無ければ変換のみ行う)
 python3 "$SCRIPT_DIR/merge-index-files.py" "$MARKDOWN_DIR" || exit 1
 
 # Pages/ の内容を Files/ へ物理統合
@@ -1112,11 +1106,16 @@ fi
 # 画像分散配置ループが Pages 由来 md を含む Files/ 全体を対象にするため再収集する。
 mapfile -t md_files < <(find "$MARKDOWN_DIR/Files" -name "*.md" -type f 2>/dev/null)
 
+# 以下の front matter 注入段は md を直接書き換えず、更新を batch ファイルへ登録する。
+# 登録した更新は commit-frontmatter.py が md ごとに 1 回の読み書きでまとめて書き込む
+# (段ごとに全 md を読み込み・書き換えし直さない)。
+FRONTMATTER_BATCH="$TEMP_DIR/frontmatter-updates.jsonl"
+
 # Files/ 配下の各 md に元ソースの origin パス (git-origin) を埋め込む
 # (Pages→Files 統合後に実施: プログラム由来と Markdown 由来の両方が最終構造で揃った状態が前提。
 #  Files/ 配下相対パスが Doxygen の INPUT 相対ソース パスと一致することを利用して元ソースを特定する)
 # docsfw 側はこのヒントを使い、gitignore 対象の生成 md でも元ソースへの Git リンクを表示する。
-python3 "$SCRIPT_DIR/inject-source-origin.py" "$MARKDOWN_DIR" "$DOXYGEN_RUNDIR" "$WORKSPACE_ROOT" || exit 1
+python3 "$SCRIPT_DIR/inject-source-origin.py" --batch "$FRONTMATTER_BATCH" "$MARKDOWN_DIR" "$DOXYGEN_RUNDIR" "$WORKSPACE_ROOT" || exit 1
 
 # Files/ 配下の各 md に対応 Doxygen HTML の URL (doxygen-page-url) を埋め込む
 DOXYFW_TAGFILE="${DOXYFW_TAGFILE:-}"
@@ -1125,7 +1124,10 @@ if [ -n "$CATEGORY_ID" ]; then
 else
     DOXYFW_HTML_ROOT="$WORKSPACE_ROOT/pages/doxygen"
 fi
-python3 "$SCRIPT_DIR/inject-doxygen-url.py" "$MARKDOWN_DIR" "$DOXYFW_TAGFILE" "$DOXYFW_HTML_ROOT" "$WORKSPACE_ROOT" || exit 1
+python3 "$SCRIPT_DIR/inject-doxygen-url.py" --batch "$FRONTMATTER_BATCH" "$MARKDOWN_DIR" "$DOXYFW_TAGFILE" "$DOXYFW_HTML_ROOT" "$WORKSPACE_ROOT" || exit 1
+
+# 登録した front matter の更新を md ごとにまとめて書き込む
+python3 "$SCRIPT_DIR/commit-frontmatter.py" "$FRONTMATTER_BATCH" || exit 1
 
 # サブディレクトリ内 Markdown の画像を分散配置
 # Doxybook2 がルート images/ に出力した画像を各 md と同階層の images/ へ移動する。
@@ -1137,49 +1139,83 @@ python3 "$SCRIPT_DIR/inject-doxygen-url.py" "$MARKDOWN_DIR" "$DOXYFW_TAGFILE" "$
 #
 # Pages 由来 md の画像は copy_referenced_images + Pages 統合ですでに隣接 images/ に
 # 配置済みの場合がある。移動先に既存なら root 側を削除して root を確実に空にする。
+#
+# root images/ のファイル名集合は copy-doxygen-images.py が書き出した一覧
+# (DOXYFW_IMAGE_MANIFEST) から読み込み、未指定時のみ images/ を列挙する。
+# 画像参照の抽出は md ごとに grep/sed を起動せず、全 md を 1 回の grep で走査する。
 
 DOXYBOOK2_IMAGES_DIR="$MARKDOWN_DIR/images"
+DOXYFW_IMAGE_MANIFEST="${DOXYFW_IMAGE_MANIFEST:-}"
 
 if [ -d "$DOXYBOOK2_IMAGES_DIR" ]; then
+    declare -A root_images=()
+    if [ -n "$DOXYFW_IMAGE_MANIFEST" ] && [ -f "$DOXYFW_IMAGE_MANIFEST" ]; then
+        while IFS= read -r img_name; do
+            [ -n "$img_name" ] && root_images["$img_name"]=1
+        done < "$DOXYFW_IMAGE_MANIFEST"
+    else
+        for img_path in "$DOXYBOOK2_IMAGES_DIR"/*; do
+            [ -f "$img_path" ] && root_images["${img_path##*/}"]=1
+        done
+    fi
+
+    # スラッシュが含まれる = サブディレクトリ内のファイル
+    subdir_md_files=()
     for file in "${md_files[@]}"; do
         rel_path="${file#$MARKDOWN_DIR/}"
-        # スラッシュが含まれる = サブディレクトリ内のファイル
-        if [[ "$rel_path" == */* ]] && grep -qE '!\[[^]]*\]\([^)]+\)' "$file" 2>/dev/null; then
-            file_dir="$(dirname "$file")"
-            local_images_dir="$file_dir/images"
-
-            # 参照画像の basename を収集し、Doxybook2 ルート images/ から各 md の隣接へ移動
-            # すでに隣接 images/ に配置済みなら root 側を削除して root を確実に空にする
-            while IFS= read -r img_name; do
-                [ -z "$img_name" ] && continue
-                if [ -f "$DOXYBOOK2_IMAGES_DIR/$img_name" ]; then
-                    mkdir -p "$local_images_dir"
-                    if [ ! -f "$local_images_dir/$img_name" ]; then
-                        mv "$DOXYBOOK2_IMAGES_DIR/$img_name" "$local_images_dir/$img_name"
-                        echo "  Moved image: $img_name -> ${rel_path%/*}/images/"
-                    else
-                        # 配置済み (Pages 統合ですでに存在) → root 側を削除して root を空にする
-                        rm "$DOXYBOOK2_IMAGES_DIR/$img_name"
-                        echo "  Removed from root (already placed): $img_name"
-                    fi
-                fi
-            done < <(
-                grep -oE '!\[[^]]*\]\([^)]+\)' "$file" | \
-                    grep -Ev '\(https?://' | \
-                    sed -E 's/!\[[^]]*\]\(([^/)]*\/)*([^/)?# ]+)\).*/\2/'
-            )
-
-            # 画像パスを images/<name> に正規化 (ディレクトリ部分を除去) し、
-            # キャプション補正 (![filename](url)caption → ![caption](url)) も適用。
-            # - ディレクトリ部分を strip して images/{basename} に統一
-            # - Doxybook2 は @image html のキャプションを) 直後にスペースなしで連結する
-            sed -i -E \
-                -e 's/!\[([^]]*)\]\(([^/)]*\/)*([^/)?# ]+)\)/![\1](images\/\3)/g' \
-                -e 's/!\[[^]]*\]\(([^)]+)\)([^ ].*)/![\2](\1)/g' \
-                "$file"
-        fi
+        [[ "$rel_path" == */* ]] && subdir_md_files+=("$file")
     done
 
+    # 画像参照 ![text](url) を md の処理順で 1 回の grep により抽出する
+    # (grep -Z で「ファイル名 NUL 参照」の形式にする)
+    image_ref_re='!\[[^]]*\]\([^)]+\)'
+    image_name_re='^!\[[^]]*\]\(([^/)]*/)*([^/)?# ]+)\)$'
+    image_md_files=()
+    prev_file=""
+    while IFS= read -r -d '' file && IFS= read -r img_ref; do
+        if [ "$file" != "$prev_file" ]; then
+            image_md_files+=("$file")
+            prev_file="$file"
+        fi
+        case "$img_ref" in
+            *'(http://'*|*'(https://'*) continue ;;
+        esac
+        [[ "$img_ref" =~ $image_name_re ]] || continue
+        img_name="${BASH_REMATCH[2]}"
+
+        # 参照画像の basename を Doxybook2 ルート images/ から各 md の隣接へ移動
+        # すでに隣接 images/ に配置済みなら root 側を削除して root を確実に空にする
+        if [ -n "${root_images[$img_name]+set}" ]; then
+            rel_path="${file#$MARKDOWN_DIR/}"
+            local_images_dir="${file%/*}/images"
+            mkdir -p "$local_images_dir"
+            if [ ! -f "$local_images_dir/$img_name" ]; then
+                mv "$DOXYBOOK2_IMAGES_DIR/$img_name" "$local_images_dir/$img_name"
+                echo "  Moved image: $img_name -> ${rel_path%/*}/images/"
+            else
+                # 配置済み (Pages 統合ですでに存在) → root 側を削除して root を空にする
+                rm "$DOXYBOOK2_IMAGES_DIR/$img_name"
+                echo "  Removed from root (already placed): $img_name"
+            fi
+            unset 'root_images[$img_name]'
+        fi
+    done < <(
+        if [ ${#subdir_md_files[@]} -gt 0 ]; then
+            printf '%s\0' "${subdir_md_files[@]}" | \
+                xargs -0 grep -oHZE "$image_ref_re" 2>/dev/null
+        fi
+    )
+
+    # 画像パスを images/<name> に正規化 (ディレクトリ部分を除去) し、
+    # キャプション補正 (![filename](url)caption → ![caption](url)) も適用。
+    # - ディレクトリ部分を strip して images/{basename} に統一
+    # - Doxybook2 は @image html のキャプションを) 直後にスペースなしで連結する
+    if [ ${#image_md_files[@]} -gt 0 ]; then
+        printf '%s\0' "${image_md_files[@]}" | xargs -0 sed -i -E \
+            -e 's/!\[([^]]*)\]\(([^/)]*\/)*([^/)?# ]+)\)/![\1](images\/\3)/g' \
+            -e 's/!\[[^]]*\]\(([^)]+)\)([^ ].*)/![\2](\1)/g'
+    fi
+
     # 分散配置後に root images/ が空になっていれば削除
     if [ -z "$(find "$DOXYBOOK2_IMAGES_DIR" -maxdepth 1 -type f -print -quit)" ]; then
         rm -rf "$DOXYBOOK2_IMAGES_DIR"
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+preprocess-xml.py - Doxybook2 に渡す前の XML 書き換えをまとめて行う
+
+preprocess.sh が個別のスクリプトと XML ファイルごとの sed の連結で行っていた次の書き換えを、
+ファイルごとに 1 回の読み込みで順に適用する。
+
+1. 無名名前空間の compound と、その compound への参照の除去
+2. 注釈 simplesect の marker 付き par への変換
+3. 無名 enum の空 <name /> の placeholder 化
+4. parblock ラッパーの除去
+5. PlantUML (<plantuml>) のコード フェンス化
+6. パラメーターの direction 属性の [in] / [out] / [in,out] テキスト化
+7. 改行直前の <linebreak/> の !linebreak! 化
+8. <bold>C 識別子</bold> の !dunder! 保護
+9. <name> / <title> 内の __ の !dunder! 保護
+10. セクション見出しレベルの変換 (sect1 → sect5、sect2 → sect6)
+
+4 以降の出力は従来の sed の連結とバイト単位で一致する。
+各書き換えはメモリー上のテキストに対する線形の置換で、sed の全体読み込み (:a;N;$!ba) や
+置換ループ (t loop) のように入力の大きさに対して二乗の時間はかからない。
+無名名前空間の refid は 1 つのトライ正規表現にまとめ、refid の数によらず 1 回の走査で照合する。
+ファイル間は独立しているため、CPU 数 (DOXYFW_JOBS 指定時はその値まで) のプロセスで並行処理する。
+
+使用方法:
+    python3 preprocess-xml.py <xml_directory>
+例:
+    python3 preprocess-xml.py /tmp/doxyfw-tmp/com_internal/run.XXXXXX/xml
+"""
+
+import functools
+import io
+import locale
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from doxyfw_jobs import worker_count
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+
+# sed の \s に一致する改行以外の空白。sed は行単位で処理するため改行は含めない。
+# UTF-8 ロケールでは glibc の iswspace が真になる Unicode の空白も一致する。
+SED_ASCII_SPACES = " \t\v\f\r"
+SED_UNICODE_SPACES = SED_ASCII_SPACES + (
+    "\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2008\u2009\u200a\u2028\u2029\u205f\u3000"
+)
+
+ANONYMOUS_NAMESPACE_INDEX_RE = re.compile(
+    r'<compound\s+refid="([^"]+)"\s+kind="namespace"\s*>\s*<name>([^<]*)</name>'
+)
+
+ADMONITION_TYPES = {
+    "note": "NOTE",
+    "remark": "TIP",
+    "important": "IMPORTANT",
+    "warning": "WARNING",
+    "attention": "CAUTION",
+    "deprecated": "DEPRECATED",
+}
+
+MARKER_PREFIX = "!doxyfw-admonition"
+
+# ElementTree での解析は、注釈の simplesect を含むファイルに限る。
+ADMONITION_SIMPLESECT_RE = re.compile(
+    r'<simplesect\s[^>]*kind="(?:{0})"'.format("|".join(ADMONITION_TYPES))
+)
+
+ENUM_MEMBERDEF_RE = re.compile(r'<memberdef\s+kind="enum"[^>]*>.*?</memberdef>', flags=re.DOTALL)
+SELF_CLOSING_NAME_RE = re.compile(r"<name\s*/>")
+
+PARAMETER_DIRECTIONS = {
+    "in": "in",
+    "out": "out",
+    "in,out": "in,out",
+    "in, out": "in,out",
+    "inout": "in,out",
+}
+
+PARAMETER_DIRECTION_RE = re.compile(
+    r'<parametername direction="(in|out|in,out|in, out|inout)">([^<\n]*)</parametername>'
+)
+BOLD_IDENTIFIER_RE = re.compile(r"<bold>([a-zA-Z_][a-zA-Z0-9_]*)</bold>")
+NAME_TEXT_RE = re.compile(r"<name>([^<\n]*)</name>")
+TITLE_TEXT_RE = re.compile(r"<title>([^<\n]*)</title>")
+
+
+@dataclass
+class AnonymousNamespaceRefs:
+    """無名名前空間の compound への参照を除去する正規表現。"""
+
+    index_compound_re: "re.Pattern[str]"
+    innernamespace_re: "re.Pattern[str]"
+    ref_re: "re.Pattern[str]"
+
+
+@dataclass
+class FileResult:
+    removed_references: int = 0
+    anonymous_enums: int = 0
+
+
+def collect_anonymous_namespace_refids(index_text: str) -> List[str]:
+    """
+    index.xml から無名名前空間 compound の refid を収集する。
+
+    Doxygen は EXTRACT_ANON_NSPACES = NO の設定でも C++ の無名名前空間に対して
+    kind="namespace" の compounddef を出力し、ファイル スコープの無名名前空間では
+    <compoundname></compoundname> が空要素になる。Doxybook2 はこれを null 文字列として解釈し、
+    compound の読み込みを中断する。入れ子の無名名前空間は親と同名の別 compound となり、
+    名前空間一覧に重複エントリとリンク切れが生成される。
+    無名名前空間の名前は @<8 進数字列> 形式で出力されるため、index.xml の <name> で判定する。
+
+    @param[in] index_text  index.xml の内容
+
+    @return 無名名前空間 compound の refid のリスト。該当なしなら空リスト
+    """
+    return [
+        match.group(1)
+        for match in ANONYMOUS_NAMESPACE_INDEX_RE.finditer(index_text)
+        if "@" in match.group(2)
+    ]
+
+
+def build_trie_pattern(words: List[str]) -> str:
+    """
+    文字列の集合に一致する正規表現を、共通接頭辞をまとめたトライの形で組み立てる。
+
+    refid は namespace_... のように長い接頭辞を共有するため、単純な選択 (a|b|...) と異なり
+    照合位置ごとに refid の数だけ比較し直すことがない。
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return render(trie)
+
+
+def compile_anonymous_namespace_refs(refids: List[str]) -> AnonymousNamespaceRefs:
+    pattern = build_trie_pattern(refids)
+    return AnonymousNamespaceRefs(
+        # index.xml の compound はネストしないため、最短一致で対応する </compound> が取れる。
+        index_compound_re=re.compile(
+            r'[ \t]*<compound\s+refid="(?:{0})"[^>]*>.*?</compound>\n?'.format(pattern),
+            flags=re.DOTALL,
+        ),
+        innernamespace_re=re.compile(
+            r'[ \t]*<innernamespace\s+refid="(?:{0})"[^>]*>.*?</innernamespace>\n?'.format(pattern),
+            flags=re.DOTALL,
+        ),
+        # refid は compound 自身とその配下メンバーの双方を前方一致で対象にする。
+        ref_re=re.compile(
+            r'<ref\s+refid="(?:{0})[^"]*"[^>]*>(.*?)</ref>'.format(pattern),
+            flags=re.DOTALL,
+        ),
+    )
+
+
+def strip_anonymous_namespace_references(text: str, refs: AnonymousNamespaceRefs) -> Tuple[str, int]:
+    """
+    無名名前空間への参照を除去する。
+
+    <innernamespace> は要素ごと削除し、<ref> はリンク先を失うためタグのみを外してテキストを残す。
+
+    @return 書き換え後のテキストと、除去した参照の数
+    """
+    text, inner_count = refs.innernamespace_re.subn("", text)
+    text, ref_count = refs.ref_re.subn(r"\1", text)
+    return text, inner_count + ref_count
+
+
+def mark_admonitions(text: str) -> str:
+    """
+    Doxygen の注釈 simplesect を Doxybook2 が保持できる marker 付き par へ変換する。
+
+    特に @important は Doxybook2 v1.6.1 の JSON に出ないため、XML 段階で退避する。
+    """
+    if not ADMONITION_SIMPLESECT_RE.search(text):
+        return text
+
+    root = ET.fromstring(text.encode("utf-8", errors="surrogateescape"))
+    changed = False
+    for simplesect in root.iter("simplesect"):
+        admonition_type = ADMONITION_TYPES.get(simplesect.attrib.get("kind", ""))
+        if admonition_type is None:
+            continue
+
+        simplesect.set("kind", "par")
+        title = simplesect.find("title")
+        if title is None:
+            title = ET.Element("title")
+            simplesect.insert(0, title)
+        title.text = f"{MARKER_PREFIX} {admonition_type}"
+        changed = True
+
+    if not changed:
+        return text
+
+    output = io.BytesIO()
+    ET.ElementTree(root).write(output, encoding="utf-8", xml_declaration=True)
+    return output.getvalue().decode("utf-8", errors="surrogateescape")
+
+
+def fix_anonymous_enums(text: str) -> Tuple[str, int]:
+    """
+    <memberdef kind="enum"> 直下の空 <name /> または <name></name> を
+    <name>__anonymous_enum_N__</name> に置換する。
+
+    Doxygen は C の無名 enum の <memberdef kind="enum"> 直下に空の name 要素を生成する。
+    Doxybook2 はこれを null 文字列として解釈してクラッシュし、同一ディレクトリの後続ファイルが
+    ディレクトリ パス情報を失い Files/ 直下にフラットに出力される。
+    置換後の名前は kind_file.tmpl が見出しに使わないため、出力 Markdown には表示されない。
+
+    @return 書き換え後のテキストと、置換した箇所数
+    """
+    counter = [0]
+
+    def placeholder(_match: "re.Match[str]") -> str:
+        counter[0] += 1
+        return "<name>__anonymous_enum_{0}__</name>".format(counter[0])
+
+    def replace_in_enum_block(match: "re.Match[str]") -> str:
+        block = SELF_CLOSING_NAME_RE.sub(placeholder, match.group(0))
+        return re.sub(r"<name></name>", placeholder, block)
+
+    if 'kind="enum"' not in text:
+        return text, 0
+    text = ENUM_MEMBERDEF_RE.sub(replace_in_enum_block, text)
+    return text, counter[0]
+
+
+def sed_locale_is_utf8() -> bool:
+    """呼び出し元のロケールが UTF-8 かどうかを返す。sed の \\s が一致する空白の範囲を合わせるために使う。"""
+    # C / POSIX ロケールで起動した Python は UTF-8 モードに切り替わる (PEP 540)。
+    # このとき LC_CTYPE も C.UTF-8 に置き換わるため、起動時のロケールはこのフラグで判定する。
+    if sys.flags.utf8_mode and os.environ.get("PYTHONUTF8", "") == "":
+        return False
+    locale.setlocale(locale.LC_CTYPE, "")
+    return locale.nl_langinfo(locale.CODESET).upper().replace("-", "") == "UTF8"
+
+
+def compile_plantuml_open_re(unicode_spaces: bool) -> "re.Pattern[str]":
+    spaces = SED_UNICODE_SPACES if unicode_spaces else SED_ASCII_SPACES
+    return re.compile("[" + re.escape(spaces) + r"]*<plantuml[^>\n]*>")
+
+
+def protect_dunder(match: "re.Match[str]", tag: str) -> str:
+    """タグ内の __ を !dunder! に置き換える。
+
+    sed の置換ループは貪欲な一致で最後の __ から置き換えるため、右から分割して同じ結果にする
+    (例: a___b は a_!dunder!b)。
+    """
+    return "<{0}>{1}</{0}>".format(tag, "!dunder!".join(match.group(1).rsplit("__")))
+
+
+def transform_xml_text(text: str, plantuml_open_re: "re.Pattern[str]") -> str:
+    """XML テキストに前処理の書き換えを順に適用する。"""
+    # Doxybook2 v1.6.1 は Doxygen の parblock 要素を認識しない。
+    # parblock は複数の para 要素をまとめるだけなので、内容を維持してラッパーだけを除去する。
+    # see: https://github.com/matusnovak/doxybook2/blob/master/src/Doxybook/XmlTextParser.cpp
+    text = text.replace("<parblock>", "").replace("</parblock>", "")
+
+    # <plantuml ...> と </plantuml> をコード フェンス + @startuml / @enduml に変換する。
+    text = plantuml_open_re.sub("\n\n```plantuml\n@startuml\n", text)
+    text = text.replace("</plantuml>", "\n@enduml\n```")
+
+    # doxybook2 は direction 属性を独自に処理しないため、「名前 [方向]」形式のテキストとして埋め込む。
+    text = PARAMETER_DIRECTION_RE.sub(
+        lambda match: "<parametername>{} [{}]</parametername>".format(
+            match.group(2),
+            PARAMETER_DIRECTIONS[match.group(1)],
+        ),
+        text,
+    )
+
+    # <linebreak/> を !linebreak! に変換する (postprocess で最終的に改行に置換)。
+    # 末尾の改行は sed のパターン スペースに含まれないため置換の対象外とする。
+    if text.endswith("\n"):
+        text = text[:-1].replace("<linebreak/>\n", "!linebreak!") + "\n"
+    else:
+        text = text.replace("<linebreak/>\n", "!linebreak!")
+
+    # Doxygen は __identifier__ を Markdown 強調として解釈し <bold>identifier</bold> に変換する。
+    # doxybook2 はこれをさらに **identifier** に変換するため、__attribute__ が **attribute** に化ける。
+    # XML 段階で !dunder!識別子!dunder! に変換して保護し、postprocess で __ に戻す。
+    text = BOLD_IDENTIFIER_RE.sub(r"!dunder!\1!dunder!", text)
+
+    # doxybook2 は <name> タグの内容を見出しやテンプレートの変数として直接展開するため、
+    # <name> タグ内の __ も保護する。<title> タグは extract-graphs.py が挿入するグラフ見出しで使用される。
+    text = NAME_TEXT_RE.sub(lambda match: protect_dunder(match, "name"), text)
+    text = TITLE_TEXT_RE.sub(lambda match: protect_dunder(match, "title"), text)
+
+    # doxybook2 は <sect1> を Markdown の # (レベル 1) に変換するが、
+    # ファイル ドキュメントの構造上 ##### (レベル 5) が正しい。
+    # doxybook2 はセクション レベルのオフセット機能を持たないため、sect1→sect5, sect2→sect6 に変換する。
+    return (
+        text.replace("<sect1", "<sect5")
+        .replace("</sect1>", "</sect5>")
+        .replace("<sect2", "<sect6")
+        .replace("</sect2>", "</sect6>")
+    )
+
+
+def preprocess_file(
+    xml_path: str,
+    unicode_spaces: bool,
+    anonymous_refs: Optional[AnonymousNamespaceRefs] = None,
+    index_path: str = "",
+) -> FileResult:
+    """1 つの XML ファイルを読み込み、すべての書き換えを適用して書き戻す。"""
+    path = Path(xml_path)
+    original = path.read_bytes().decode("utf-8", errors="surrogateescape")
+    result = FileResult()
+
+    text = original
+    if anonymous_refs is not None:
+        if xml_path == index_path:
+            # 無名名前空間の <compound> ブロックを配下の <member> ごと削除する。
+            text = anonymous_refs.index_compound_re.sub("", text)
+        text, result.removed_references = strip_anonymous_namespace_references(text, anonymous_refs)
+    text = mark_admonitions(text)
+    text, result.anonymous_enums = fix_anonymous_enums(text)
+    text = transform_xml_text(text, compile_plantuml_open_re(unicode_spaces))
+
+    if text != original:
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_bytes(text.encode("utf-8", errors="surrogateescape"))
+        os.replace(temp_path, path)
+    return result
+
+
+def prepare_anonymous_namespaces(xml_dir: Path) -> Optional[AnonymousNamespaceRefs]:
+    """
+    無名名前空間の compound XML を削除し、残る参照を除去する正規表現を返す。
+
+    compound XML を削除するため、XML ファイルの一覧を作る前に呼び出す。
+    """
+    index_path = xml_dir / "index.xml"
+    if not index_path.is_file():
+        print("preprocess-xml: index.xml がないため処理をスキップします。")
+        return None
+
+    refids = collect_anonymous_namespace_refids(index_path.read_text(encoding="utf-8"))
+    if not refids:
+        print("preprocess-xml: 無名名前空間は見つかりませんでした。")
+        return None
+
+    removed_files = 0
+    for refid in refids:
+        compound_path = xml_dir / "{0}.xml".format(refid)
+        if compound_path.is_file():
+            compound_path.unlink()
+            removed_files += 1
+    print("preprocess-xml: compound {0} 件を除去 (XML ファイル {1} 件削除)".format(
+        len(refids), removed_files))
+    return compile_anonymous_namespace_refs(refids)
+
+
+def find_xml_files(xml_dir: Path) -> List[str]:
+    return sorted(
+        str(path)
+        for path in xml_dir.rglob("*")
+        if path.is_file() and not path.is_symlink() and path.suffix in (".xml", ".XML")
+    )
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 2:
+        print("使用方法: preprocess-xml.py <xml_directory>", file=sys.stderr)
+        return 2
+
+    xml_dir = Path(argv[1])
+    if not xml_dir.is_dir():
+        print(f"ERROR: XML directory not found: {xml_dir}", file=sys.stderr)
+        return 1
+
+    anonymous_refs = prepare_anonymous_namespaces(xml_dir)
+
+    xml_files = find_xml_files(xml_dir)
+    if not xml_files:
+        print("警告: 指定されたフォルダにXMLファイルが見つかりません: {0}".format(xml_dir))
+        return 0
+
+    process = functools.partial(
+        preprocess_file,
+        unicode_spaces=sed_locale_is_utf8(),
+        anonymous_refs=anonymous_refs,
+        index_path=str(xml_dir / "index.xml"),
+    )
+    workers = worker_count(len(xml_files))
+    if workers <= 1:
+        results = [process(xml_file) for xml_file in xml_files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_size = max(1, len(xml_files) // (workers * 4))
+            results = list(executor.map(process, xml_files, chunksize=chunk_size))
+
+    if anonymous_refs is not None:
+        removed_references = sum(result.removed_references for result in results)
+        if removed_references > 0:
+            print("preprocess-xml: 残存参照 {0} 件を除去".format(removed_references))
+
+    total_enums = 0
+    for xml_file, result in zip(xml_files, results):
+        if result.anonymous_enums > 0:
+            print("  preprocess-xml: {0} 箇所置換 in {1}".format(
+                result.anonymous_enums, Path(xml_file).name))
+            total_enums += result.anonymous_enums
+    if total_enums > 0:
+        print("preprocess-xml: 合計 {0} 箇所の無名 enum 名を修正しました。".format(total_enums))
+    else:
+        print("preprocess-xml: 無名 enum 名は見つかりませんでした。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -22,87 +22,22 @@ fi
 
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 
-# 無名名前空間の compound を XML から除去する。
-# Doxygen は EXTRACT_ANON_NSPACES = NO でも C++ の無名名前空間に対して
-# kind="namespace" の compounddef を出力し、ファイル スコープの無名名前空間では
-# <compoundname></compoundname> が空要素になる。Doxybook2 はこれを null 文字列として
-# 解釈し、std::string のコンストラクターが失敗して compound の読み込みを中断する。
-# 入れ子の無名名前空間はクラッシュしないが、親と同名の別 compound となるため
-# 名前空間一覧に重複エントリとリンク切れが生成される。
-# XML ファイルを削除するため、後続の XML ファイル検索より前に実行する必要がある。
-python3 "$SCRIPT_DIR/strip-anonymous-namespaces.py" "$XML_FOLDER"
-
-# XML ファイル検索
-XML_FILES=$(find "$XML_FOLDER" -type f \( -name "*.xml" -o -name "*.XML" \) 2>/dev/null)
-
-if [ -z "$XML_FILES" ]; then
-    echo "警告: 指定されたフォルダにXMLファイルが見つかりません: $XML_FOLDER"
-    exit 0
-fi
-
-# XML ファイル数をカウント
-XML_COUNT=$(echo "$XML_FILES" | wc -l)
-PROCESSED_COUNT=0
-
-# Doxygen の注釈 simplesect を Doxybook2 が保持できる marker 付き par へ変換する。
-# 特に @important は Doxybook2 v1.6.1 の JSON に出ないため、XML 段階で退避する。
-python3 "$SCRIPT_DIR/mark-admonitions.py" "$XML_FOLDER"
-
-# 無名 enum の空 <name /> を placeholder に置換する。
-# Doxygen は C の無名 enum を XML に出力する際 <memberdef kind="enum"> 直下に
-# <name /> を生成する。Doxybook2 はこれを null 文字列として解釈し、
-# std::string のコンストラクターが失敗してクラッシュする。
-# このクラッシュが発生すると、同一ディレクトリの後続ファイルすべてが
-# ディレクトリ パス情報を失い Files/ 直下にフラットに出力される。
-python3 "$SCRIPT_DIR/fix-anonymous-enums.py" "$XML_FOLDER"
-
-# 各 XML ファイルを処理
-while IFS= read -r xml_file; do
-    PROCESSED_COUNT=$((PROCESSED_COUNT + 1))
-
-    # Doxybook2 v1.6.1 は Doxygen の parblock 要素を認識しない。
-    # parblock は複数の para 要素をまとめるだけなので、内容を維持してラッパーだけを除去する。
-    # see: https://github.com/matusnovak/doxybook2/blob/master/src/Doxybook/XmlTextParser.cpp
-    sed -e 's|<parblock>||g' \
-        -e 's|</parblock>||g' \
-        "$xml_file" | \
-    # PlantUML 変換
-    # <plantuml ...> と </plantuml> をコード フェンス + @startuml / @enduml に変換する。
-    sed -e 's|\s*<plantuml\([^>]*\)>|\n\n```plantuml\n@startuml\n|g' \
-        -e 's|</plantuml>|\n@enduml\n```|g' | \
-    # パラメーター direction 変換
-    # doxybook2 は direction 属性を独自に処理しないため、テキストとして埋め込む。
-    # direction 属性を [in]/[out]/[in,out] テキストに変換し「名前 [方向]」形式で埋め込む。
-    sed -e 's|<parametername direction="in">\([^<]*\)</parametername>|<parametername>\1 [in]</parametername>|g' \
-        -e 's|<parametername direction="out">\([^<]*\)</parametername>|<parametername>\1 [out]</parametername>|g' \
-        -e 's|<parametername direction="in,out">\([^<]*\)</parametername>|<parametername>\1 [in,out]</parametername>|g' \
-        -e 's|<parametername direction="in, out">\([^<]*\)</parametername>|<parametername>\1 [in,out]</parametername>|g' \
-        -e 's|<parametername direction="inout">\([^<]*\)</parametername>|<parametername>\1 [in,out]</parametername>|g' | \
-    # linebreak 変換 (<linebreak/> を !linebreak! に変換、postprocess で最終的に改行に置換)
-    sed ':a;N;$!ba;s|<linebreak/>\n|!linebreak!|g' | \
-    # ダブル アンダースコア保護
-    # Doxygen は __identifier__ を Markdown 強調として解釈し <bold>identifier</bold> に変換する。
-    # doxybook2 はこれをさらに **identifier** (Markdown bold) に変換するため、
-    # __attribute__ が **attribute** に化けてしまう。
-    # XML 段階で <bold>C 識別子</bold> を !dunder!識別子!dunder! に変換して保護し、
-    # postprocess で __ に戻す。
-    sed 's|<bold>\([a-zA-Z_][a-zA-Z0-9_]*\)</bold>|!dunder!\1!dunder!|g' | \
-    # <name>/<title> タグ内の __ を !dunder! に変換
-    # doxybook2 は <name> タグの内容を見出しやテンプレートの変数として直接展開するため、
-    # <bold> 変換とは別に <name> タグ内の __ も保護が必要。
-    # <title> タグは extract-graphs.py が挿入するグラフ見出しで使用される。
-    # ループ展開で複数の __ を含む識別子 (__foo__bar__ など) にも対応する。
-    sed ':loop; s|<name>\([^<]*\)__\([^<]*\)</name>|<name>\1!dunder!\2</name>|; t loop' | \
-    sed ':loop; s|<title>\([^<]*\)__\([^<]*\)</title>|<title>\1!dunder!\2</title>|; t loop' | \
-    # セクション見出しレベル変換
-    # doxybook2 は <sect1> を Markdown の # (レベル 1) に変換するが、
-    # ファイル ドキュメントの構造上 ##### (レベル 5) が正しい。
-    # doxybook2 はセクション レベルのオフセット機能を持たないため、
-    # XML 段階で sect1→sect5, sect2→sect6 に変換して対応する。
-    sed -e 's|<sect1|<sect5|g' \
-        -e 's|</sect1>|</sect5>|g' \
-        -e 's|<sect2|<sect6|g' \
-        -e 's|</sect2>|</sect6>|g' \
-        > "${xml_file}.tmp" && mv "${xml_file}.tmp" "$xml_file"
-    
-done <<< "$XML_FILES"
+# 次の書き換えを、XML ファイルごとに 1 回の読み込みでまとめて行う。
+# ファイル間は独立しているため並行処理する。各書き換えの詳細は preprocess-xml.py を参照。
+#
+# - 無名名前空間の compound と参照の除去
+#   Doxygen は EXTRACT_ANON_NSPACES = NO でも C++ の無名名前空間に対して
+#   kind="namespace" の compounddef を出力し、ファイル スコープの無名名前空間では
+#   <compoundname></compoundname> が空要素になる。Doxybook2 はこれを null 文字列として
+#   解釈し、std::string のコンストラクターが失敗して compound の読み込みを中断する。
+#   入れ子の無名名前空間はクラッシュしないが、親と同名の別 compound となるため
+#   名前空間一覧に重複エントリとリンク切れが生成される。
+# - 注釈 simplesect の marker 付き par への変換
+#   特に @important は Doxybook2 v1.6.1 の JSON に出ないため、XML 段階で退避する。
+# - 無名 enum の空 <name /> の placeholder 化
+#   Doxybook2 は空の name を null 文字列として解釈してクラッシュし、
+#   同一ディレクトリの後続ファイルすべてがディレクトリ パス情報を失い
+#   Files/ 直下にフラットに出力される。
+# - parblock 除去、PlantUML、パラメーター direction、linebreak、ダブル アンダースコア保護、
+#   セクション見出しレベル変換
+python3 "$SCRIPT_DIR/preprocess-xml.py" "$XML_FOLDER"
@@ -8,7 +8,13 @@ Doxybook2 が生成する Files/*.md はエンコード名でフラットに並
 各 md の先頭 H1 から元のソースファイルパス (INPUT 相対パス) を取得し、
 Files/<path>.md へ移動する。
 
-index_files.md 内の変換前ファイル名リンクを新パスへ書き換える。
+index_files.md などトップレベル ページ内の変換前ファイル名リンクを新パスへ書き換える。
+
+数万ファイル規模でも処理量が総バイト数に比例するよう、次の順で 1 パスずつ処理する。
+  1. 各 md の先頭 H1_SCAN_BYTES バイトだけを読んで H1 を取得する
+  2. 移動 (リネーム) 計画をまとめて決めてから移動する
+  3. 変換前ファイル名 -> 変換後パスの対応表を引く 1 本のコンパイル済み正規表現で、
+     参照ページの全リンクを 1 回の走査で書き換える
 
 エンコード名ではなく H1 を情報源とする理由:
   - basename 衝突がない場合、エンコード名にパス情報が含まれない
@@ -31,6 +37,15 @@ from pathlib import Path
 sys.stdout.reconfigure(encoding="utf-8")
 sys.stderr.reconfigure(encoding="utf-8")
 
+# H1 探索で読み込む先頭バイト数。
+# Doxybook2 の Files/*.md は短いフロントマターと自動生成コメントの直後に H1 が来る。
+H1_SCAN_BYTES = 16 * 1024
+
+# ](Files/<名前>) / ](Files/<名前>#fragment) 形式のリンク。
+# フラグメントは merge-index-files.py が除去するが、restructure が先に実行されるため
+# ここでフラグメント付き形式も処理して変換前エンコード名が残らないようにする。
+FILES_LINK_RE = re.compile(r'\]\(Files/([^)]*)\)')
+
 
 def extract_h1_path(md_path):
     """
@@ -39,67 +54,60 @@ def extract_h1_path(md_path):
     YAML フロントマターと HTML コメントをスキップし、
     最初の '# ' で始まる行からパスを抽出する。
     HTML エンティティ (&#95; -> _) を復元する。
+    読み込むのは先頭 H1_SCAN_BYTES バイトまでとする。
 
     @param[in] md_path  対象 md ファイルの Path オブジェクト
 
     @return INPUT 相対パス文字列。取得できなければ None
     """
+    with open(str(md_path), 'rb') as f:
+        head = f.read(H1_SCAN_BYTES + 1)
+
+    lines = head.split(b'\n')
+    if len(head) > H1_SCAN_BYTES:
+        # 読み込み範囲の末尾で途切れた行は判定に使わない
+        lines.pop()
+
     in_frontmatter = False
-    first_line = True
-    with open(str(md_path), 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.rstrip('\r\n')
-            if first_line:
-                first_line = False
-                if line.strip() == '---':
-                    in_frontmatter = True
-                    continue
-            if in_frontmatter:
-                if line.strip() == '---':
-                    in_frontmatter = False
-                continue
-            # HTML コメント行をスキップ
-            if line.startswith('<!--'):
-                continue
-            if line.startswith('# '):
-                path_str = line[2:].strip()
-                # HTML エンティティ復元
-                path_str = path_str.replace('&#95;', '_')
-                # 空パスや単独スラッシュは不正
-                if path_str and path_str != '/':
-                    return path_str
-                return None
+    for index, raw in enumerate(lines):
+        line = raw.decode('utf-8').rstrip('\r\n')
+        if index == 0 and line.strip() == '---':
+            in_frontmatter = True
+            continue
+        if in_frontmatter:
+            if line.strip() == '---':
+                in_frontmatter = False
+            continue
+        # HTML コメント行をスキップ
+        if line.startswith('<!--'):
+            continue
+        if line.startswith('# '):
+            path_str = line[2:].strip()
+            # HTML エンティティ復元
+            path_str = path_str.replace('&#95;', '_')
+            # 空パスや単独スラッシュは不正
+            if path_str and path_str != '/':
+                return path_str
+            return None
     return None
 
 
-def restructure_files(docs_dir):
+def plan_renames(files_dir, flat_mds):
     """
-    Files/ をフラット構造から実フォルダ構造へ再編し、index_files.md を更新する。
+    フラットな md の移動計画を作る。
 
-    トップレベルの Files/*.md のみを対象とし、既にサブディレクトリ内に
-    ある md はスキップする。
+    移動先が既に存在するもの、または計画内の先行エントリと移動先が重なるものは
+    スキップする (先に移動したものを優先する)。先行エントリの移動で空く場所は
+    移動先として使用できる。
 
-    @param[in] docs_dir  doxybook2 出力ディレクトリ (index_files.md のある場所)
-    """
-    docs_path = Path(docs_dir)
-    files_dir = docs_path / 'Files'
-    index_path = docs_path / 'index_files.md'
+    @param[in] files_dir  Files/ ディレクトリの Path オブジェクト
+    @param[in] flat_mds   対象 md の Path オブジェクトのリスト (処理順)
 
-    if not files_dir.is_dir():
-        print('警告: Files/ ディレクトリが見つかりません: {0}'.format(files_dir))
-        return
-
-    # トップレベルのフラットな .md のみ対象 (サブディレクトリ内は除外)
-    flat_mds = sorted(
-        p for p in files_dir.iterdir() if p.is_file() and p.suffix == '.md'
-    )
-
-    if not flat_mds:
-        print('Files/: 再編対象なし。')
-        return
-
-    # 変換前ファイル名 -> 変換後相対パス (Files/ 配下) の対応表
-    rename_map = {}
+    @return [(移動元 Path, 移動先 Path), ...]
+    """
+    plan = []
+    claimed = set()
+    vacated = set()
 
     for md_path in flat_mds:
         src_path = extract_h1_path(md_path)
@@ -118,14 +126,34 @@ def restructure_files(docs_dir):
             continue
 
         # 衝突チェック
-        if new_path.exists():
+        if new_path in claimed or (new_path not in vacated and new_path.exists()):
             print('警告: 移動先が既に存在します。スキップします: {0} -> {1}'.format(
                 md_path.name,
                 str(new_path.relative_to(files_dir)).replace('\\', '/')))
             continue
 
+        claimed.add(new_path)
+        vacated.add(md_path)
+        plan.append((md_path, new_path))
+
+    return plan
+
+
+def apply_renames(files_dir, plan):
+    """
+    移動計画どおりに md を移動する。
+
+    @return 変換前ファイル名 -> 変換後相対パス (Files/ 配下) の対応表
+    """
+    rename_map = {}
+    created_dirs = set()
+
+    for md_path, new_path in plan:
         # 中間ディレクトリを作成して移動
-        new_path.parent.mkdir(parents=True, exist_ok=True)
+        parent = new_path.parent
+        if parent not in created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(parent)
         md_path.rename(new_path)
 
         old_name = md_path.name
@@ -133,36 +161,102 @@ def restructure_files(docs_dir):
         rename_map[old_name] = new_rel_str
         print('  Restructured: Files/{0} -> Files/{1}'.format(old_name, new_rel_str))
 
+    return rename_map
+
+
+def rewrite_links(text, rename_map):
+    """
+    ](Files/<変換前名>) と ](Files/<変換前名>#fragment) を ](Files/<変換後パス>) へ 1 パスで書き換える。
+
+    @return (書き換え後テキスト, 書き換えたリンク数)
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        target = match.group(1)
+        new_rel_str = rename_map.get(target)
+        # フラグメント付き: 変換前名は最初の '#' までとは限らない (&#95; 等) ため、
+        # '#' の各位置で区切った前半を順に引く
+        hash_pos = target.find('#')
+        while new_rel_str is None and hash_pos >= 0:
+            new_rel_str = rename_map.get(target[:hash_pos])
+            hash_pos = target.find('#', hash_pos + 1)
+        if new_rel_str is None:
+            return match.group(0)
+        count += 1
+        return '](Files/' + new_rel_str + ')'
+
+    return FILES_LINK_RE.sub(replace, text), count
+
+
+def rewrite_page(page_path, rename_map):
+    """
+    ページ内のリンクを書き換え、変化があれば書き戻す。
+
+    @return 書き換えたリンク数
+    """
+    with open(str(page_path), 'rb') as f:
+        text = f.read().decode('utf-8')
+    if '](Files/' not in text:
+        return 0
+
+    text, count = rewrite_links(text, rename_map)
+    if count:
+        with open(str(page_path), 'wb') as f:
+            f.write(text.encode('utf-8'))
+    return count
+
+
+def restructure_files(docs_dir):
+    """
+    Files/ をフラット構造から実フォルダ構造へ再編し、参照ページのリンクを更新する。
+
+    トップレベルの Files/*.md のみを対象とし、既にサブディレクトリ内に
+    ある md はスキップする。リンクの書き換え対象は docs_dir 直下の md
+    (index_files.md など) とする。サブディレクトリ内の md のファイル間リンクは
+    postprocess.sh が後段で除去する。
+
+    @param[in] docs_dir  doxybook2 出力ディレクトリ (index_files.md のある場所)
+    """
+    docs_path = Path(docs_dir)
+    files_dir = docs_path / 'Files'
+    index_path = docs_path / 'index_files.md'
+
+    if not files_dir.is_dir():
+        print('警告: Files/ ディレクトリが見つかりません: {0}'.format(files_dir))
+        return
+
+    # トップレベルのフラットな .md のみ対象 (サブディレクトリ内は除外)
+    with os.scandir(str(files_dir)) as entries:
+        flat_mds = sorted(
+            files_dir / entry.name for entry in entries
+            if entry.name.endswith('.md') and entry.is_file()
+        )
+
+    if not flat_mds:
+        print('Files/: 再編対象なし。')
+        return
+
+    rename_map = apply_renames(files_dir, plan_renames(files_dir, flat_mds))
+
     if not rename_map:
         print('Files/: 移動対象なし (すべてスキップ)。')
         return
 
-    # index_files.md のリンクを更新
-    if index_path.is_file():
-        with open(str(index_path), 'rb') as f:
-            data = f.read()
-        text = data.decode('utf-8')
-
-        for old_name, new_rel_str in rename_map.items():
-            new_link = '](Files/' + new_rel_str + ')'
-            # ](Files/<変換前名>) -> ](Files/<変換後パス>)  (フラグメントなし形式)
-            old_link_plain = '](Files/' + old_name + ')'
-            text = text.replace(old_link_plain, new_link)
-            # ](Files/<変換前名>#fragment) -> ](Files/<変換後パス>)  (Doxybook2 が付与するフラグメント付き形式)
-            # フラグメントは patch-index-files.py が除去するが、restructure が先に実行されるため
-            # ここでフラグメント付き形式も処理して変換前エンコード名が残らないようにする。
-            text = re.sub(
-                r'\]\(Files/' + re.escape(old_name) + r'#[^)]*\)',
-                new_link,
-                text
-            )
-
-        with open(str(index_path), 'wb') as f:
-            f.write(text.encode('utf-8'))
-        print('Updated: {0}'.format(index_path.name))
-    else:
+    if not index_path.is_file():
         print('警告: index_files.md が見つかりません: {0}'.format(index_path))
 
+    # index_files.md ほか docs_dir 直下の参照ページのリンクを更新
+    with os.scandir(str(docs_path)) as entries:
+        pages = sorted(
+            docs_path / entry.name for entry in entries
+            if entry.name.endswith('.md') and entry.is_file()
+        )
+    for page_path in pages:
+        if rewrite_page(page_path, rename_map) or page_path == index_path:
+            print('Updated: {0}'.format(page_path.name))
+
 
 def main():
     """エントリ ポイント。"""
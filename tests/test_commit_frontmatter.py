@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
+SOURCE_ORIGIN_SCRIPT = TEMPLATES_DIR / "inject-source-origin.py"
+DOXYGEN_URL_SCRIPT = TEMPLATES_DIR / "inject-doxygen-url.py"
+COMMIT_SCRIPT = TEMPLATES_DIR / "commit-frontmatter.py"
+
+TAGFILE = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<tagfile>
+  <compound kind="file">
+    <name>calc.c</name>
+    <path>/work/src/</path>
+    <filename>calc_8c.html</filename>
+  </compound>
+  <compound kind="group">
+    <name>CALC</name>
+    <filename>group__CALC.html</filename>
+  </compound>
+</tagfile>
+"""
+
+MARKDOWN_FILES = {
+    "Files/src/calc.c.md": "---\ntitle: calc.c\ngit-origin: \"stale\"\n---\n\n# calc.c\n",
+    "Files/src/notes.md": "# notes\n",
+    "Files/README.md": "# Files\n",
+    "Modules/group__CALC.md": "---\r\ntitle: CALC\r\n---\r\n\r\n# CALC\r\n",
+}
+
+
+class CommitFrontmatterTest(unittest.TestCase):
+    def _build(self, root):
+        markdown_dir = root / "markdown"
+        rundir = root / "run"
+        (rundir / "src").mkdir(parents=True)
+        (rundir / "src" / "calc.c").write_text("int calc(void);\n", encoding="utf-8")
+        (rundir / "src" / "notes.md").write_text("# notes\n", encoding="utf-8")
+        for rel, content in MARKDOWN_FILES.items():
+            path = markdown_dir / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content.encode("utf-8"))
+        tagfile = root / "doxyfw.tag"
+        tagfile.write_text(TAGFILE, encoding="utf-8")
+        return markdown_dir, rundir, tagfile
+
+    def _inject(self, root, batch_args):
+        markdown_dir, rundir, tagfile = self._build(root)
+        html_root = root / "pages" / "doxygen"
+        for command in (
+            [str(SOURCE_ORIGIN_SCRIPT)] + batch_args + [str(markdown_dir), str(rundir), str(root)],
+            [str(DOXYGEN_URL_SCRIPT)] + batch_args + [str(markdown_dir), str(tagfile), str(html_root), str(root)],
+        ):
+            subprocess.run([sys.executable] + command, check=True, capture_output=True)
+        return markdown_dir
+
+    def _snapshot(self, markdown_dir):
+        return {rel: (markdown_dir / rel).read_bytes() for rel in MARKDOWN_FILES}
+
+    def test_batched_updates_match_direct_injection(self):
+        with tempfile.TemporaryDirectory() as direct_text, tempfile.TemporaryDirectory() as batch_text:
+            expected = self._snapshot(self._inject(Path(direct_text), []))
+
+            batch_path = Path(batch_text) / "frontmatter.jsonl"
+            markdown_dir = self._inject(Path(batch_text), ["--batch", str(batch_path)])
+            # commit 前は md を書き換えない
+            self.assertEqual(
+                (markdown_dir / "Files/src/calc.c.md").read_text(encoding="utf-8"),
+                MARKDOWN_FILES["Files/src/calc.c.md"],
+            )
+
+            subprocess.run(
+                [sys.executable, str(COMMIT_SCRIPT), str(batch_path)],
+                check=True,
+                capture_output=True,
+            )
+
+            self.assertEqual(self._snapshot(markdown_dir), expected)
+            self.assertFalse(batch_path.exists())
+
+        calc_md = expected["Files/src/calc.c.md"].decode("utf-8")
+        self.assertEqual(
+            calc_md,
+            "---\ntitle: calc.c\ngit-origin: \"run/src/calc.c\"\n"
+            "doxygen-page-url: \"pages/doxygen/calc_8c.html\"\n---\n\n# calc.c\n",
+        )
+        self.assertEqual(expected["Files/README.md"], b"# Files\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "templates" / "copy-doxygen-images.py"
+sys.path.insert(0, str(SCRIPT_PATH.parent))
+SPEC = importlib.util.spec_from_file_location("copy_doxygen_images", SCRIPT_PATH)
+copy_doxygen_images = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = copy_doxygen_images
+SPEC.loader.exec_module(copy_doxygen_images)
+
+COMPOUND_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="sample_8c" kind="file">
+    <detaileddescription>
+      <para><image type="html" name="flow&amp;chart.png" inline="yes"></image></para>
+      <para><image name='diagram.svg' type='html'/></para>
+      <para><image type="latex" name="diagram.eps"></image></para>
+      <para><image type="html" name="missing.png"></image></para>
+    </detaileddescription>
+  </compounddef>
+</doxygen>
+"""
+
+
+class CopyDoxygenImagesTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.xml_dir = root / "xml"
+        self.docs_dir = root / "docs"
+        self.xml_dir.mkdir()
+        self.docs_dir.mkdir()
+        (self.xml_dir / "sample_8c.xml").write_text(COMPOUND_XML, encoding="utf-8")
+        (self.xml_dir / "empty.xml").write_bytes(b"")
+        (self.xml_dir / "flow&chart.png").write_bytes(b"\x89PNG flow")
+        (self.xml_dir / "diagram.svg").write_bytes(b"<svg/>")
+        (self.xml_dir / "diagram.eps").write_bytes(b"%!PS")
+        self.manifest = root / "images.txt"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return copy_doxygen_images.copy_missing_images(
+                self.xml_dir, self.docs_dir, self.manifest
+            )
+
+    def test_html_image_names_are_scanned_from_raw_xml(self):
+        self.assertEqual(
+            list(copy_doxygen_images.iter_html_image_names(self.xml_dir)),
+            ["diagram.svg", "flow&chart.png", "missing.png"],
+        )
+
+    def test_images_are_published_and_listed_in_the_manifest(self):
+        images_dir = self.docs_dir / "images"
+        images_dir.mkdir()
+        (images_dir / "diagram.svg").write_bytes(b"<svg/>")
+        (images_dir / "other.png").write_bytes(b"other")
+        kept_inode = (images_dir / "diagram.svg").stat().st_ino
+
+        self.assertEqual(self._run(), 0)
+
+        self.assertEqual((images_dir / "flow&chart.png").read_bytes(), b"\x89PNG flow")
+        # サイズとハッシュが一致する既存ファイルは置き換えない
+        self.assertEqual((images_dir / "diagram.svg").stat().st_ino, kept_inode)
+        self.assertFalse((images_dir / "diagram.eps").exists())
+        self.assertEqual(
+            self.manifest.read_text(encoding="utf-8"),
+            "diagram.svg\nflow&chart.png\nother.png\n",
+        )
+
+    def test_mismatched_images_are_replaced(self):
+        images_dir = self.docs_dir / "images"
+        images_dir.mkdir()
+        (images_dir / "diagram.svg").write_bytes(b"<svg")
+
+        self._run()
+
+        self.assertEqual((images_dir / "diagram.svg").read_bytes(), b"<svg/>")
+
+    def test_copy_falls_back_when_hardlinks_are_unavailable(self):
+        with mock.patch.object(os, "link", side_effect=OSError("cross-device link")):
+            self._run()
+
+        dest = self.docs_dir / "images" / "flow&chart.png"
+        self.assertEqual(dest.read_bytes(), b"\x89PNG flow")
+        self.assertNotEqual(dest.stat().st_ino, (self.xml_dir / "flow&chart.png").stat().st_ino)
+
+
+if __name__ == "__main__":
+    unittest.main()
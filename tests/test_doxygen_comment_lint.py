@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+BIN_DIR = Path(__file__).resolve().parents[1] / "bin"
+sys.path.insert(0, str(BIN_DIR))
+
+import doxygen_comment_lint  # noqa: E402
+
+HEADER = """/**
+ * @file sample.h
+ * ****************************
+ */
+extern "C" {
+    /**
+ * @brief Open.
+ *
+ * ****************************
+ */
+    int open_device(void);
+    int state; /**< State
+                    of device */
+    /** One line. */
+}
+"""
+
+SOURCE = """/**
+ * ****************************
+ * @brief Close.
+ */
+int close_device(void);
+"""
+
+FIXED_HEADER = """/**
+ * @file sample.h
+ * ****************************
+ */
+extern "C" {
+    /**
+     * @brief Open.
+     *
+     */
+    int open_device(void);
+    int state; /**< State
+                    of device */
+    /** One line. */
+}
+"""
+
+FIXED_SOURCE = """/**
+ * @brief Close.
+ */
+int close_device(void);
+"""
+
+
+class DoxygenCommentLintTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "src").mkdir()
+        (self.root / "obj").mkdir()
+        (self.root / "src" / "sample.h").write_text(HEADER, encoding="utf-8")
+        (self.root / "src" / "sample.c").write_text(SOURCE, encoding="utf-8")
+        (self.root / "obj" / "generated.h").write_text(HEADER, encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self, script, *args):
+        return subprocess.run(
+            [sys.executable, str(BIN_DIR / script)] + list(args),
+            cwd=self.root,
+            capture_output=True,
+            encoding="utf-8",
+        )
+
+    def test_both_rule_sets_share_one_tokenization(self):
+        tokens = doxygen_comment_lint.tokenize(HEADER.splitlines(keepends=True))
+        self.assertEqual(tokens.starts, [0, 5, 11, 13])
+        self.assertEqual(tokens.closes, [3, 9, 12, 13])
+
+        indent_issues, modifications = doxygen_comment_lint.check_indent(tokens)
+        self.assertEqual([issue["doc_start_line"] for issue in indent_issues], [6])
+        self.assertEqual([item["line_num"] for item in modifications], [7, 8, 9, 10])
+        separator_issues = doxygen_comment_lint.check_separators(tokens)
+        self.assertEqual([issue.separator_lines for issue in separator_issues], [(9,)])
+
+    def test_combined_check_reports_both_rules(self):
+        completed = self._run("check-doxygen-comments.py", "--check", ".")
+
+        self.assertEqual(completed.returncode, 1)
+        self.assertIn("src/sample.h:7: 検出: Doxygen コメントの字下げレベルが一致しません", completed.stdout)
+        self.assertIn("src/sample.h:9: 検出: @file 以外の", completed.stdout)
+        self.assertIn("src/sample.c:2: 検出: @file 以外の", completed.stdout)
+        self.assertNotIn("obj/", completed.stdout)
+
+    def test_combined_fix_matches_running_both_tools(self):
+        completed = self._run("check-doxygen-comments.py", "--fix", "src")
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        # 9 行目は字下げ不一致かつセパレータ行。削除する行の字下げ修正は数えない
+        self.assertIn("修正: src/sample.h (字下げ 3 行修正, セパレータ 1 行削除)", completed.stdout)
+        self.assertIn("完了: 5 行を修正しました。", completed.stdout)
+        self.assertEqual((self.root / "src" / "sample.h").read_text(encoding="utf-8"), FIXED_HEADER)
+        self.assertEqual((self.root / "src" / "sample.c").read_text(encoding="utf-8"), FIXED_SOURCE)
+
+        self.assertEqual(self._run("check-doxygen-comments.py", "--check", "src").returncode, 0)
+        self.assertEqual(self._run("check-doxygen-indent.py", "--check", "src").returncode, 0)
+        self.assertEqual(self._run("check-doxygen-separators.py", "--check", "src").returncode, 0)
+
+    def test_per_tool_clis_keep_their_modes(self):
+        dry_run = self._run("check-doxygen-indent.py", "--dry-run", "src")
+        self.assertEqual(dry_run.returncode, 0)
+        self.assertIn("📊 修正予定: 1 ファイル, 4 行", dry_run.stdout)
+        self.assertEqual((self.root / "src" / "sample.h").read_text(encoding="utf-8"), HEADER)
+
+        separators = self._run("check-doxygen-separators.py", "--fix", "src")
+        self.assertEqual(separators.returncode, 0)
+        self.assertIn("完了: 2 行のセパレータを削除しました。", separators.stdout)
+
+        indent = self._run("check-doxygen-indent.py", "--fix", "src")
+        self.assertIn("✅ 1 ファイルを修正しました (3 行)", indent.stdout)
+        self.assertEqual((self.root / "src" / "sample.h").read_text(encoding="utf-8"), FIXED_HEADER)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ import json
 import os
 import re
 import shutil
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -33,6 +34,27 @@ def write_xml(directory, name, content):
     (directory / name).write_text(content, encoding="utf-8")
 
 
+REPORT_ASSET_RE = re.compile(r'(?:href|src)="(assets/[^"]+)"')
+
+
+def read_report_html(output_dir):
+    """index.html と、そこから参照する assets/ 配下の静的ファイルを連結して返す。"""
+    index_html = (output_dir / "index.html").read_text(encoding="utf-8")
+    parts = [index_html]
+    for asset_url in REPORT_ASSET_RE.findall(index_html):
+        if asset_url.endswith((".css", ".js")):
+            parts.append((output_dir / asset_url).read_text(encoding="utf-8"))
+    return "\n".join(parts)
+
+
+def report_asset_path(output_dir, asset_name):
+    """論理名の静的ファイルが内容ハッシュ付きで配置された assets/ 配下のパスを返す。"""
+    base, _, suffix = asset_name.rpartition(".")
+    matches = sorted((output_dir / "assets").glob("{}.*.{}".format(base, suffix)))
+    assert len(matches) == 1, (asset_name, matches)
+    return matches[0]
+
+
 class GenerateDependencyReportTest(unittest.TestCase):
     def test_dependency_levels_and_classes(self):
         with tempfile.TemporaryDirectory() as temp_dir_text:
@@ -299,17 +321,22 @@ class GenerateDependencyReportTest(unittest.TestCase):
             self.assertTrue((output_dir / "dependency-functions-utf8-bom.csv").is_file())
             self.assertTrue((output_dir / "dependency-files.csv").is_file())
             self.assertTrue((output_dir / "dependency-files-utf8-bom.csv").is_file())
-            self.assertTrue((output_dir / "cytoscape.min.js").is_file())
-            self.assertTrue((output_dir / "cytoscape.LICENSE.txt").is_file())
-            self.assertTrue((output_dir / "webcola.min.js").is_file())
-            self.assertTrue((output_dir / "webcola.LICENSE.txt").is_file())
-            self.assertTrue((output_dir / "cytoscape-cola.js").is_file())
-            self.assertTrue((output_dir / "cytoscape-cola.LICENSE.txt").is_file())
+            for asset_name in (
+                "cytoscape.min.js",
+                "cytoscape.LICENSE.txt",
+                "webcola.min.js",
+                "webcola.LICENSE.txt",
+                "cytoscape-cola.js",
+                "cytoscape-cola.LICENSE.txt",
+                "dependency-report.css",
+                "dependency-report.js",
+            ):
+                self.assertTrue(report_asset_path(output_dir, asset_name).is_file())
             self.assertFalse((output_dir / "dependency-functions.csv").read_bytes().startswith(b"\xef\xbb\xbf"))
             self.assertFalse((output_dir / "dependency-files.csv").read_bytes().startswith(b"\xef\xbb\xbf"))
             self.assertTrue((output_dir / "dependency-functions-utf8-bom.csv").read_bytes().startswith(b"\xef\xbb\xbf"))
             self.assertTrue((output_dir / "dependency-files-utf8-bom.csv").read_bytes().startswith(b"\xef\xbb\xbf"))
-            cola_js = (output_dir / "cytoscape-cola.js").read_text(encoding="utf-8")
+            cola_js = report_asset_path(output_dir, "cytoscape-cola.js").read_text(encoding="utf-8")
             self.assertIn("options.animate || options.deferPositions", cola_js)
             self.assertIn("deferPositions: false", cola_js)
             # compound (ファイル) の grab をシミュレーションへ伝えないローカル パッチ。
@@ -337,8 +364,21 @@ class GenerateDependencyReportTest(unittest.TestCase):
             payload_data = json.loads(payload)
             self.assertEqual(payload_data["summary"]["functionCount"], 18)
             self.assertIn("fileEdges", payload_data)
+            expected_json = json.dumps(data, ensure_ascii=False, indent=2)
+            self.assertEqual(data_js, "window.DoxyfwDependencyData = " + expected_json + ";\n")
+            self.assertEqual((output_dir / "dependency-data.json").read_text(encoding="utf-8"), expected_json + "\n")
+            self.assertEqual(
+                (output_dir / "dependency-functions-utf8-bom.csv").read_bytes(),
+                b"\xef\xbb\xbf" + (output_dir / "dependency-functions.csv").read_bytes(),
+            )
+            generate_dependency_report.generate_report(xml_dir, output_dir, "sample", skip_variants=("bom", "json"))
+            self.assertTrue((output_dir / "dependency-data.js").is_file())
+            self.assertTrue((output_dir / "dependency-functions.csv").is_file())
+            self.assertFalse((output_dir / "dependency-data.json").exists())
+            self.assertFalse((output_dir / "dependency-functions-utf8-bom.csv").exists())
+            self.assertFalse((output_dir / "dependency-files-utf8-bom.csv").exists())
 
-            index_html = (output_dir / "index.html").read_text(encoding="utf-8")
+            index_html = read_report_html(output_dir)
             self.assertIn('<span class="dep-meta">対象: sample</span></h1>', index_html)
             self.assertNotIn('<p class="dep-meta">', index_html)
             self.assertIn("関数一覧", index_html)
@@ -393,6 +433,20 @@ class GenerateDependencyReportTest(unittest.TestCase):
             self.assertIn('data-file-sort-key="path"', index_html)
             self.assertIn("function renderFileRows(opts)", index_html)
             self.assertIn("function syncSelectedFileRowScroll(forceScroll)", index_html)
+            self.assertIn("function renderTableWindow(tableWindow, force)", index_html)
+            self.assertIn("functionTableWindow.order = sortedFunctionOrder(order);", index_html)
+            self.assertIn("fileTableWindow.order = sortedFileOrder(order);", index_html)
+            self.assertIn("if (!scrollTableWindowTo(functionTableWindow, position)) {", index_html)
+            self.assertIn("if (!scrollTableWindowTo(fileTableWindow, position)) {", index_html)
+            self.assertIn('tableWindow.wrap.addEventListener("scroll", scheduleWindowRender, { passive: true });', index_html)
+            self.assertIn("tr.dep-row-spacer td {", index_html)
+            self.assertNotIn("sortedFunctions(functions.filter(matches))", index_html)
+            self.assertIn("function createSearchIndex(items, searchTextOf, columns)", index_html)
+            self.assertIn("const order = searchIndexFilter(functionSearchIndex, functionFilterState());", index_html)
+            self.assertIn("const order = searchIndexFilter(fileSearchIndex, fileFilterState());", index_html)
+            self.assertIn("result = intersectSortedIndices(result, lists[k]);", index_html)
+            self.assertIn("bits[index >>> 5] |= 1 << (index & 31);", index_html)
+            self.assertNotIn("fn.name.toLowerCase().includes(query)", index_html)
             self.assertIn("function renderFileDetail(filePath)", index_html)
             self.assertIn("function activateTab(tabId)", index_html)
             self.assertIn('content: "初期化しています...";', index_html)
@@ -838,6 +892,15 @@ class GenerateDependencyReportTest(unittest.TestCase):
             self.assertIn('overviewGraph.addEventListener("auxclick"', index_html)
             self.assertIn("function applyTheme(theme, persist)", index_html)
             self.assertIn("const sccById = new Map(sccs.map((scc) => [scc.id, scc]));", index_html)
+            self.assertIn("const reachable = reachableFunctionIds(startId, direction);", index_html)
+            self.assertIn("const OVERVIEW_DIRECTORY_COLLAPSE_THRESHOLD = 300;", index_html)
+            self.assertIn("if (overviewNodeIdForFile(file.path) !== file.path) continue;", index_html)
+            self.assertIn("for (const element of overviewDirectoryElements(selectionState)) elements.push(element);", index_html)
+            self.assertIn("expandOverviewDirectory(directoryPath);", index_html)
+            self.assertIn("const expanded = reconcileCollapsedOverviewDirectories();", index_html)
+            self.assertIn('const OVERVIEW_LAYOUT_STORAGE_KEY = "doxyfw-dependency-layout:" + text(data.meta && data.meta.categoryId);', index_html)
+            self.assertIn("if (!stored || stored.fingerprint !== overviewLayoutFingerprint || !stored.positions) return null;", index_html)
+            self.assertIn("if (cachedLayout && applyOverviewCachedPositions(elements, cachedLayout.positions)) {", index_html)
             self.assertIn("function cycleGroupFunctionIds(fn)", index_html)
             self.assertIn("function cycleGroupSection(fn)", index_html)
             self.assertIn("for (const c of cycleGroupFunctionIds(selectedFn)) ids.add(c);", index_html)
@@ -924,6 +987,94 @@ class GenerateDependencyReportTest(unittest.TestCase):
             self.assertLess(by_id["cycle_a"]["dependencyLevel"], by_id["cycle_c"]["dependencyLevel"])
             scc_sizes = sorted(scc["size"] for scc in data["sccs"])
             self.assertEqual(scc_sizes, [2, 3])
+            again = generate_dependency_report.build_report_data(xml_dir, output_dir, "sample")
+            self.assertEqual(len(data["meta"]["fingerprint"]), generate_dependency_report.FINGERPRINT_LENGTH)
+            self.assertEqual(again["meta"]["fingerprint"], data["meta"]["fingerprint"])
+            function_ids = [row["id"] for row in data["functions"]]
+            reachability = data["reachability"]
+            component = reachability["component"][function_ids.index("cycle_c")]
+            members = reachability["members"]
+            member_indices = members["values"][members["offsets"][component]:members["offsets"][component + 1]]
+            self.assertEqual(sorted(function_ids[index] for index in member_indices), ["cycle_c", "cycle_d", "cycle_e"])
+
+    def test_sqlite_export_writes_queryable_tables(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            temp_dir = Path(temp_dir_text)
+            xml_dir = temp_dir / "xml"
+            output_dir = temp_dir / "out"
+            xml_dir.mkdir()
+            write_xml(
+                xml_dir,
+                "sqlite.xml",
+                """<?xml version="1.0" encoding="UTF-8"?>
+<doxygen>
+  <compounddef id="sqlite_8c" kind="file">
+    <compoundname>sqlite.c</compoundname>
+    <sectiondef>
+      <memberdef kind="function" id="loop_a" static="yes">
+        <name>loop_a</name>
+        <references refid="loop_b" compoundref="sqlite_8c">loop_b</references>
+        <references refid="ext_memcpy">memcpy</references>
+        <location file="src/sqlite.c" line="10" bodyfile="src/sqlite.c" bodystart="10"/>
+      </memberdef>
+      <memberdef kind="function" id="loop_b" static="yes">
+        <name>loop_b</name>
+        <references refid="loop_a" compoundref="sqlite_8c">loop_a</references>
+        <location file="src/sqlite.c" line="20" bodyfile="src/sqlite.c" bodystart="20"/>
+      </memberdef>
+      <memberdef kind="function" id="ext_memcpy" static="no">
+        <name>memcpy</name>
+        <location file="include/string.h" line="5"/>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+""",
+            )
+            with contextlib.redirect_stderr(io.StringIO()):
+                data = generate_dependency_report.generate_report(xml_dir, output_dir, "sample")
+
+            self.assertFalse((output_dir / "dependency.sqlite").exists())
+            generate_dependency_report.write_sqlite(output_dir, data)
+            connection = sqlite3.connect(str(output_dir / "dependency.sqlite"))
+            try:
+                callers = connection.execute("SELECT caller FROM edges WHERE callee = ?", ("loop_a",)).fetchall()
+                self.assertEqual(callers, [("loop_b",)])
+                scc_rows = connection.execute(
+                    "SELECT s.size, COUNT(*) FROM scc_functions f JOIN sccs s ON s.id = f.scc_id GROUP BY s.id"
+                ).fetchall()
+                self.assertEqual(scc_rows, [(2, 2)])
+                function_count = connection.execute("SELECT COUNT(*) FROM functions WHERE file = ?", ("src/sqlite.c",)).fetchone()
+                self.assertEqual(function_count, (2,))
+                external_rows = connection.execute("SELECT function_id, name, file FROM external_callees").fetchall()
+                self.assertEqual(external_rows, [("loop_a", "memcpy", "include/string.h")])
+                fingerprint = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+                self.assertEqual(fingerprint, (data["meta"]["fingerprint"],))
+            finally:
+                connection.close()
+
+    def test_sqlite_export_failure_keeps_previous_database(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            temp_dir = Path(temp_dir_text)
+            xml_dir = temp_dir / "xml"
+            output_dir = temp_dir / "out"
+            xml_dir.mkdir()
+            write_xml(xml_dir, "compound.xml", MERGE_LIB_XML)
+            with contextlib.redirect_stderr(io.StringIO()):
+                data = generate_dependency_report.generate_report(xml_dir, output_dir, "sample")
+            generate_dependency_report.write_sqlite(output_dir, data)
+
+            broken = dict(data, edges=[{"caller": "helper"}])
+            with self.assertRaises(KeyError):
+                generate_dependency_report.write_sqlite(output_dir, broken)
+
+            self.assertFalse((output_dir / "dependency.sqlite.tmp").exists())
+            # 失敗しても前回のデータベースは置き換えない
+            connection = sqlite3.connect(str(output_dir / "dependency.sqlite"))
+            try:
+                self.assertEqual(connection.execute("SELECT COUNT(*) FROM edges").fetchone(), (len(data["edges"]),))
+            finally:
+                connection.close()
 
     def test_include_definition_prefers_libsrc_and_ignores_src_call(self):
         with tempfile.TemporaryDirectory() as temp_dir_text:
@@ -1358,6 +1509,24 @@ class GenerateDependencyReportTest(unittest.TestCase):
             self.assertIn("Warning: macro-reference-cycle detected", stderr.getvalue())
             self.assertEqual(by_id["caller"]["inScopeCalleeCount"], 0)
 
+    def test_macro_reference_cycle_members_share_targets(self):
+        macros = {
+            "macro_a": generate_dependency_report.MacroInfo("macro_a", "MACRO_A", {"macro_b", "func_a"}),
+            "macro_b": generate_dependency_report.MacroInfo("macro_b", "MACRO_B", {"macro_a", "func_b"}),
+            "macro_log": generate_dependency_report.MacroInfo("macro_log", "LOG", {"macro_b"}),
+        }
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            expansion = generate_dependency_report.build_macro_target_map(macros, {"func_a", "func_b"})
+
+        self.assertEqual(expansion.targets["macro_a"], {"func_a", "func_b"})
+        self.assertEqual(expansion.targets["macro_b"], {"func_a", "func_b"})
+        self.assertEqual(expansion.targets["macro_log"], {"func_a", "func_b"})
+        self.assertEqual(expansion.max_depth, 2)
+        self.assertEqual(expansion.cycle_count, 1)
+        self.assertIn("macro-reference-cycle detected: MACRO_A -> MACRO_B -> MACRO_A", stderr.getvalue())
+
     def test_cross_file_reference_is_remapped_for_static_target(self):
         with tempfile.TemporaryDirectory() as temp_dir_text:
             temp_dir = Path(temp_dir_text)
@@ -1866,7 +2035,7 @@ class GenerateDependencyReportTest(unittest.TestCase):
             # 1. クリーンな Git 管理下: ブランチ名と短縮ハッシュが付く (+ なし)。
             out_clean = temp_dir / "clean"
             generate_dependency_report.generate_report(xml_dir, out_clean, "cat", repo)
-            index_html = (out_clean / "index.html").read_text(encoding="utf-8")
+            index_html = read_report_html(out_clean)
             self.assertIn(
                 "対象: cat main ({})</span>".format(short_hash), index_html
             )
@@ -1875,7 +2044,7 @@ class GenerateDependencyReportTest(unittest.TestCase):
             (repo / "new.txt").write_text("x", encoding="utf-8")
             out_dirty = temp_dir / "dirty"
             generate_dependency_report.generate_report(xml_dir, out_dirty, "cat", repo)
-            index_html = (out_dirty / "index.html").read_text(encoding="utf-8")
+            index_html = read_report_html(out_dirty)
             self.assertIn(
                 "対象: cat main ({}+)</span>".format(short_hash), index_html
             )
@@ -1885,13 +2054,13 @@ class GenerateDependencyReportTest(unittest.TestCase):
             plain.mkdir()
             out_plain = temp_dir / "plain_out"
             generate_dependency_report.generate_report(xml_dir, out_plain, "cat", plain)
-            index_html = (out_plain / "index.html").read_text(encoding="utf-8")
+            index_html = read_report_html(out_plain)
             self.assertIn("対象: cat</span>", index_html)
 
             # 4. source_dir 省略時も Git 情報は付かない (従来互換)。
             out_none = temp_dir / "none"
             generate_dependency_report.generate_report(xml_dir, out_none, "cat")
-            index_html = (out_none / "index.html").read_text(encoding="utf-8")
+            index_html = read_report_html(out_none)
             self.assertIn("対象: cat</span>", index_html)
 
     def test_source_git_url(self):
@@ -1951,7 +2120,7 @@ class GenerateDependencyReportTest(unittest.TestCase):
 
             data_js = (output_dir / "dependency-data.js").read_text(encoding="utf-8")
             self.assertIn('"gitUrl": "{}#L10"'.format(expected_file_url), data_js)
-            index_html = (output_dir / "index.html").read_text(encoding="utf-8")
+            index_html = read_report_html(output_dir)
             self.assertIn("const url = source ? (fn.gitUrl || fn.sourceUrl) : fn.htmlUrl;", index_html)
 
             plain_out = temp_dir / "plain"
@@ -1987,6 +2156,366 @@ class GenerateDependencyReportTest(unittest.TestCase):
             expected_mapped_url = "https://web.internal/example/project/-/blob/{}/prod/src/a.c".format(mapped_hash)
             self.assertEqual(mapped_by_file["src/a.c"]["gitUrl"], expected_mapped_url)
 
+    def test_shared_assets_are_content_hashed_and_reused(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            temp_dir = Path(temp_dir_text)
+            xml_dir = temp_dir / "xml"
+            xml_dir.mkdir()
+            write_xml(
+                xml_dir,
+                "a.xml",
+                """<?xml version="1.0" encoding="UTF-8"?>
+<doxygen>
+  <compounddef id="src_2a_8c" kind="file">
+    <compoundname>src/a.c</compoundname>
+    <sectiondef>
+      <memberdef kind="function" id="fn_a" static="yes">
+        <name>fn_a</name>
+        <location file="src/a.c" line="10" bodyfile="src/a.c" bodystart="10"/>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+""",
+            )
+            asset_dir = temp_dir / "pages" / "doxygen" / "_dependency-assets"
+            first_out = temp_dir / "pages" / "doxygen" / "first" / "dependency"
+            second_out = temp_dir / "pages" / "doxygen" / "second" / "dependency"
+
+            for output_dir in (first_out, second_out):
+                generate_dependency_report.generate_report(
+                    xml_dir,
+                    output_dir,
+                    output_dir.parent.name,
+                    asset_dir=asset_dir,
+                    asset_url="../../_dependency-assets",
+                )
+
+            asset_names = sorted(path.name for path in asset_dir.iterdir())
+            self.assertEqual(len(asset_names), 8)
+            script_name = next(name for name in asset_names if name.startswith("dependency-report.") and name.endswith(".js"))
+            digest = script_name.split(".")[1]
+            self.assertEqual(len(digest), generate_dependency_report.ASSET_HASH_LENGTH)
+            source_script = generate_dependency_report.SCRIPT_DIR / "dependency-report.js"
+            self.assertEqual((asset_dir / script_name).read_bytes(), source_script.read_bytes())
+
+            for output_dir in (first_out, second_out):
+                index_html = (output_dir / "index.html").read_text(encoding="utf-8")
+                self.assertIn('<script src="../../_dependency-assets/{}"></script>'.format(script_name), index_html)
+                # 共有の配置先は参照の有無で不要判定するため、すべての静的ファイルを参照する
+                for asset_name in asset_names:
+                    self.assertIn("../../_dependency-assets/" + asset_name, index_html)
+                self.assertNotIn("function renderRows", index_html)
+                self.assertFalse((output_dir / "assets").exists())
+                self.assertFalse((output_dir / "cytoscape.min.js").exists())
+            self.assertIn('window.DoxyfwDependencyCategory = "second";', index_html)
+
+
+class BuildReachabilityTest(unittest.TestCase):
+    """強連結成分で縮約した推移閉包が、呼び出し関係の全段探索と一致することを検証する。"""
+
+    CALLEES = {
+        "main": {"init", "loop"},
+        "init": {"log"},
+        "loop": {"step"},
+        "step": {"loop", "log"},
+        "log": set(),
+        "self": {"self"},
+    }
+
+    def _reachable(self, reachability, function_ids, start, direction):
+        table = reachability[direction]
+        members = reachability["members"]
+        start_index = function_ids.index(start)
+        component = reachability["component"][start_index]
+        components = [component] + table["values"][table["offsets"][component]:table["offsets"][component + 1]]
+        result = set()
+        for value in components:
+            for index in members["values"][members["offsets"][value]:members["offsets"][value + 1]]:
+                if index != start_index:
+                    result.add(function_ids[index])
+        return result
+
+    def _bfs(self, edges, start):
+        visited = {start}
+        frontier = [start]
+        found = set()
+        while frontier:
+            current = frontier.pop()
+            for neighbor in edges.get(current, set()):
+                if neighbor in visited:
+                    continue
+                visited.add(neighbor)
+                found.add(neighbor)
+                frontier.append(neighbor)
+        return found
+
+    def test_closure_matches_breadth_first_search(self):
+        function_ids = sorted(self.CALLEES)
+        callers = {func_id: set() for func_id in function_ids}
+        for caller, targets in self.CALLEES.items():
+            for callee in targets:
+                callers[callee].add(caller)
+
+        reachability = generate_dependency_report.build_reachability(function_ids, self.CALLEES)
+
+        for func_id in function_ids:
+            with self.subTest(func_id=func_id):
+                self.assertEqual(
+                    self._reachable(reachability, function_ids, func_id, "callees"),
+                    self._bfs(self.CALLEES, func_id),
+                )
+                self.assertEqual(
+                    self._reachable(reachability, function_ids, func_id, "callers"),
+                    self._bfs(callers, func_id),
+                )
+
+    def test_closure_is_omitted_above_limit(self):
+        function_ids = sorted(self.CALLEES)
+        self.assertIsNone(generate_dependency_report.build_reachability(function_ids, self.CALLEES, limit=3))
+
+
+class BuildDirectoryHierarchyTest(unittest.TestCase):
+    """全体マップの折りたたみに使うディレクトリ階層と集計値を検証する。"""
+
+    def test_directories_aggregate_all_descendant_files(self):
+        file_rows = [
+            {"path": "src/lib/a.c", "functionCount": 2, "edgeCount": 3},
+            {"path": "src/lib/b.c", "functionCount": 1, "edgeCount": 0},
+            {"path": "src/main.c", "functionCount": 4, "edgeCount": 5},
+            {"path": "top.c", "functionCount": 1, "edgeCount": 1},
+        ]
+
+        directories = generate_dependency_report.build_directory_hierarchy(file_rows)
+
+        self.assertEqual(
+            directories,
+            [
+                {"path": "src", "parent": "", "depth": 1, "fileCount": 3, "functionCount": 7, "edgeCount": 8},
+                {"path": "src/lib", "parent": "src", "depth": 2, "fileCount": 2, "functionCount": 3, "edgeCount": 3},
+            ],
+        )
+
+
+MERGE_LIB_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<doxygen>
+  <compounddef id="lib_8c" kind="file">
+    <compoundname>lib.c</compoundname>
+    <sectiondef>
+      <memberdef kind="function" id="lib_8c_1lib_open" static="no">
+        <name>lib_open</name>
+        <references refid="helper" compoundref="lib_8c">helper</references>
+        <location file="libsrc/lib.c" line="10" bodyfile="libsrc/lib.c" bodystart="10"/>
+      </memberdef>
+      <memberdef kind="function" id="helper" static="yes">
+        <name>helper</name>
+        <location file="libsrc/lib.c" line="20" bodyfile="libsrc/lib.c" bodystart="20"/>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+"""
+
+MERGE_APP_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<doxygen>
+  <compounddef id="app_8c" kind="file">
+    <compoundname>app.c</compoundname>
+    <sectiondef>
+      <memberdef kind="function" id="app_8c_1app_main" static="no">
+        <name>app_main</name>
+        <references refid="ext_lib_open">lib_open</references>
+        <references refid="ext_memcpy">memcpy</references>
+        <references refid="helper" compoundref="app_8c">helper</references>
+        <location file="src/app.c" line="10" bodyfile="src/app.c" bodystart="10"/>
+      </memberdef>
+      <memberdef kind="function" id="helper" static="yes">
+        <name>helper</name>
+        <location file="src/app.c" line="30" bodyfile="src/app.c" bodystart="30"/>
+      </memberdef>
+      <memberdef kind="function" id="ext_lib_open" static="no">
+        <name>lib_open</name>
+        <location file="include/lib.h" line="5"/>
+      </memberdef>
+      <memberdef kind="function" id="ext_memcpy" static="no">
+        <name>memcpy</name>
+        <location file="src/app.c" line="12"/>
+      </memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+"""
+
+
+class MergeReportsTest(unittest.TestCase):
+    def _generate(self, root, category, xml_text, source_dir=None, name=None):
+        name = name or category
+        xml_dir = root / "xml" / name
+        xml_dir.mkdir(parents=True)
+        write_xml(xml_dir, "compound.xml", xml_text)
+        output_dir = root / "pages" / name / "dependency"
+        with contextlib.redirect_stderr(io.StringIO()):
+            generate_dependency_report.generate_report(xml_dir, output_dir, category, source_dir)
+        return output_dir
+
+    def test_external_callees_are_resolved_across_categories(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            root = Path(temp_dir_text)
+            (root / "lib").mkdir()
+            (root / "app").mkdir()
+            lib_dir = self._generate(root, "lib", MERGE_LIB_XML, root / "lib")
+            app_dir = self._generate(root, "app", MERGE_APP_XML, root / "app")
+            # 同じソースを含む小分類は、同じ関数として 1 つにまとめる
+            app_public_dir = self._generate(root, "app_public", MERGE_APP_XML, root / "app")
+            output_dir = root / "pages" / "merged" / "dependency"
+
+            data = generate_dependency_report.merge_reports([lib_dir, app_dir, app_public_dir], output_dir)
+
+            by_key = {(row["file"], row["name"]): row for row in data["functions"]}
+            self.assertEqual(
+                sorted(by_key),
+                [
+                    ("app/src/app.c", "app_main"),
+                    ("app/src/app.c", "helper"),
+                    ("lib/libsrc/lib.c", "helper"),
+                    ("lib/libsrc/lib.c", "lib_open"),
+                ],
+            )
+            app_main = by_key[("app/src/app.c", "app_main")]
+            lib_open = by_key[("lib/libsrc/lib.c", "lib_open")]
+            app_helper = by_key[("app/src/app.c", "helper")]
+            self.assertEqual(app_helper["id"], "app:helper")
+            edge_pairs = {(edge["caller"], edge["callee"]) for edge in data["edges"]}
+            self.assertIn((app_main["id"], lib_open["id"]), edge_pairs)
+            self.assertIn((app_main["id"], "app:helper"), edge_pairs)
+            self.assertEqual(app_main["externalCallees"], [{"name": "memcpy", "file": "src/app.c"}])
+            generate_dependency_report.write_sqlite(output_dir, data)
+            connection = sqlite3.connect(str(output_dir / "dependency.sqlite"))
+            try:
+                external_rows = connection.execute("SELECT function_id, name, file FROM external_callees").fetchall()
+            finally:
+                connection.close()
+            self.assertEqual(external_rows, [(app_main["id"], "memcpy", "src/app.c")])
+            self.assertEqual(lib_open["inScopeCallerCount"], 1)
+            self.assertEqual(data["meta"]["categories"], ["lib", "app", "app_public"])
+            self.assertEqual(data["meta"]["resolvedExternalCallCount"], 1)
+            self.assertEqual(lib_open["htmlUrl"], "../../lib/lib_8c.html#lib_open")
+            self.assertEqual(
+                [(edge["fromFile"], edge["toFile"]) for edge in data["fileEdges"]],
+                [("app/src/app.c", "lib/libsrc/lib.c")],
+            )
+            self.assertTrue((output_dir / "index.html").is_file())
+            with (output_dir / "dependency-functions.csv").open(encoding="utf-8", newline="") as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 4)
+
+    def test_same_relative_paths_from_different_sources_are_kept_apart(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            root = Path(temp_dir_text)
+            for name in ("lib", "app_a", "app_b"):
+                (root / name).mkdir()
+            lib_dir = self._generate(root, "lib", MERGE_LIB_XML, root / "lib")
+            # カテゴリー ID と相対パスが同じでも、ソースの所在が異なれば別の関数とする
+            app_a_dir = self._generate(root, "app", MERGE_APP_XML, root / "app_a", "app_a")
+            app_b_dir = self._generate(root, "app", MERGE_APP_XML, root / "app_b", "app_b")
+            # ソースの所在が分からないレポートはまとめない
+            unknown_dir = self._generate(root, "unknown", MERGE_APP_XML)
+            output_dir = root / "pages" / "merged" / "dependency"
+
+            data = generate_dependency_report.merge_reports([lib_dir, app_a_dir, app_b_dir, unknown_dir], output_dir)
+
+            helper_ids = sorted(row["id"] for row in data["functions"] if row["name"] == "helper")
+            self.assertEqual(helper_ids, ["app:helper", "app:helper:2", "helper", "unknown:helper"])
+            self.assertEqual(len({row["id"] for row in data["functions"]}), len(data["functions"]))
+            self.assertEqual(
+                sorted(row["file"] for row in data["functions"] if row["name"] == "app_main"),
+                ["app/src/app.c", "app:2/src/app.c", "unknown/src/app.c"],
+            )
+
+    def test_merge_requires_output_and_reports(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(generate_dependency_report.main(["generate-dependency-report.py", "merge", "out"]), 2)
+
+
+def diff_sample_xml(members):
+    """memberdef の (ID, 呼び出し先 ID の一覧, 行) から diff 用の XML を作る。"""
+    memberdefs = []
+    for func_id, callees, line in members:
+        references = "".join(
+            f'<references refid="{callee}" compoundref="diff_8c">{callee}</references>' for callee in callees
+        )
+        memberdefs.append(
+            f"""      <memberdef kind="function" id="{func_id}" static="no">
+        <name>{func_id}</name>
+        {references}
+        <location file="src/diff.c" line="{line}" bodyfile="src/diff.c" bodystart="{line}"/>
+      </memberdef>
+"""
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<doxygen>\n  <compounddef id="diff_8c" kind="file">\n'
+        "    <compoundname>diff.c</compoundname>\n    <sectiondef>\n"
+        + "".join(memberdefs)
+        + "    </sectiondef>\n  </compounddef>\n</doxygen>\n"
+    )
+
+
+class DiffReportsTest(unittest.TestCase):
+    def _generate(self, root, name, members):
+        xml_dir = root / "xml" / name
+        xml_dir.mkdir(parents=True)
+        write_xml(xml_dir, "diff.xml", diff_sample_xml(members))
+        output_dir = root / name
+        generate_dependency_report.generate_report(xml_dir, output_dir, "sample")
+        return output_dir
+
+    def test_diff_reports_edges_cycles_and_levels(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            root = Path(temp_dir_text)
+            old_dir = self._generate(root, "old", [("alpha", ["beta"], 10), ("beta", [], 20), ("gamma", [], 30)])
+            # 行番号が変わっても同じ関数として対応付ける
+            new_dir = self._generate(
+                root,
+                "new",
+                [("alpha", ["beta"], 12), ("beta", ["alpha"], 22), ("delta", ["beta"], 40)],
+            )
+            output_dir = root / "diff"
+
+            diff = generate_dependency_report.diff_reports(old_dir, new_dir, output_dir)
+
+            self.assertEqual([row["key"] for row in diff["addedFunctions"]], ["src/diff.c::delta"])
+            self.assertEqual([row["key"] for row in diff["removedFunctions"]], ["src/diff.c::gamma"])
+            self.assertEqual(
+                diff["addedEdges"],
+                [
+                    {"caller": "src/diff.c::beta", "callee": "src/diff.c::alpha"},
+                    {"caller": "src/diff.c::delta", "callee": "src/diff.c::beta"},
+                ],
+            )
+            self.assertEqual(diff["removedEdges"], [])
+            self.assertEqual(diff["newSccs"], [["src/diff.c::alpha", "src/diff.c::beta"]])
+            callers = {row["function"]: row["addedCallers"] for row in diff["callerChanges"]}
+            self.assertEqual(callers["src/diff.c::beta"], ["src/diff.c::delta"])
+            level_keys = {row["key"] for row in diff["levelChanges"]}
+            self.assertEqual(level_keys, {"src/diff.c::alpha", "src/diff.c::beta"})
+            self.assertEqual(diff["summary"]["newSccsCount"], 1)
+            saved = json.loads((output_dir / "dependency-diff.json").read_text(encoding="utf-8"))
+            self.assertEqual(saved["summary"], diff["summary"])
+            diff_html = (output_dir / "dependency-diff.html").read_text(encoding="utf-8")
+            self.assertIn("新しい循環グループ (1)", diff_html)
+            self.assertIn("src/diff.c::alpha, src/diff.c::beta", diff_html)
+
+    def test_same_name_functions_in_one_file_are_numbered_by_line(self):
+        report = {
+            "functions": [
+                {"id": "late", "file": "a.c", "name": "f", "line": 30},
+                {"id": "early", "file": "a.c", "name": "f", "line": 10},
+            ]
+        }
+        self.assertEqual(
+            generate_dependency_report.report_function_keys(report),
+            {"early": "a.c::f", "late": "a.c::f#2"},
+        )
+
 
 class IsDefinitionReferenceLineTest(unittest.TestCase):
     """programlisting の 1 行が関数定義の開始行かどうかの判定を検証する。"""
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "templates" / "inject-doxygen-url.py"
+sys.path.insert(0, str(SCRIPT_PATH.parent))
+SPEC = importlib.util.spec_from_file_location("inject_doxygen_url", SCRIPT_PATH)
+inject_doxygen_url = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = inject_doxygen_url
+SPEC.loader.exec_module(inject_doxygen_url)
+
+TAGFILE = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<tagfile doxygen_version="1.15.0">
+  <compound kind="file">
+    <name>util.c</name>
+    <path>/work/app/src/</path>
+    <filename>app_2src_2util_8c.html</filename>
+    <member kind="function">
+      <name>helper</name>
+      <anchorfile>app_2src_2util_8c.html</anchorfile>
+    </member>
+  </compound>
+  <compound kind="file">
+    <name>util.c</name>
+    <path>/work/lib/src/</path>
+    <filename>lib_2src_2util_8c.html</filename>
+  </compound>
+  <compound kind="page">
+    <name>md_README</name>
+    <filename>md_README.html</filename>
+  </compound>
+  <compound kind="struct">
+    <name>point</name>
+    <filename>structpoint.html</filename>
+  </compound>
+  <compound kind="dir">
+    <name>src</name>
+    <filename>dir_src.html</filename>
+  </compound>
+</tagfile>
+"""
+
+
+class ParseTagfileTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        tagfile = Path(self.temp_dir.name) / "doxyfw.tag"
+        tagfile.write_text(TAGFILE, encoding="utf-8")
+        self.file_map, self.page_map, self.compound_html_set = inject_doxygen_url.parse_tagfile(
+            str(tagfile)
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unique_path_suffixes_resolve_to_their_file(self):
+        self.assertEqual(self.file_map.get("app/src/util.c"), "app_2src_2util_8c.html")
+        self.assertEqual(self.file_map.get("/work/lib/src/util.c"), "lib_2src_2util_8c.html")
+
+    def test_ambiguous_or_unknown_suffixes_do_not_resolve(self):
+        # src/util.c と util.c は 2 つのファイルに共通するため衝突として扱う
+        self.assertIsNone(self.file_map.get("src/util.c"))
+        self.assertIsNone(self.file_map.get("util.c"))
+        self.assertIsNone(self.file_map.get("other/src/util.c"))
+        self.assertIsNone(self.file_map.get(""))
+
+    def test_pages_and_compounds_are_collected(self):
+        self.assertEqual(self.page_map, {"md_README": "md_README.html"})
+        self.assertEqual(self.compound_html_set, {"structpoint.html"})
+        self.assertEqual(
+            inject_doxygen_url.resolve_doxygen_filename("README.md", self.file_map, self.page_map),
+            "md_README.html",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import builtins
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "templates" / "inject-groups.py"
+SPEC = importlib.util.spec_from_file_location("inject_groups", SCRIPT_PATH)
+inject_groups = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = inject_groups
+SPEC.loader.exec_module(inject_groups)
+
+GROUP_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="group__{group}" kind="group">
+    <title>{title}</title>{inner}
+    <sectiondef kind="func">
+      <memberdef kind="function"><name>{group}_open</name><location file="src/sample.h" line="10"/></memberdef>
+      <memberdef kind="function"><name>{group}_close</name><location file="src/other.h" line="20"/></memberdef>
+    </sectiondef>
+  </compounddef>
+</doxygen>
+"""
+
+GROUP_MD = """---
+title: {title}
+---
+
+# {title}
+
+**Module:** {title}
+
+## Functions
+
+### {group}_open
+
+```
+int {group}_open(void)
+```
+
+### {group}_close
+
+```
+int {group}_close(void)
+```
+"""
+
+
+class InjectGroupsTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.xml_dir = root / "xml"
+        self.docs_dir = root / "docs"
+        self.xml_dir.mkdir()
+        self.category_dir = self.docs_dir / "sample"
+        for name in ("Files", "Modules", "Classes"):
+            (self.category_dir / name).mkdir(parents=True)
+
+        groups = {
+            "PARENT": ("Parent", '\n    <innergroup refid="group__CHILD">Child</innergroup>'),
+            "CHILD": ("Child", ""),
+        }
+        for group, (title, inner) in groups.items():
+            (self.xml_dir / "group__{}.xml".format(group)).write_text(
+                GROUP_XML.format(group=group, title=title, inner=inner), encoding="utf-8"
+            )
+            (self.category_dir / "Modules" / "group__{}.md".format(group)).write_text(
+                GROUP_MD.format(group=group, title=title), encoding="utf-8"
+            )
+        (self.category_dir / "index_groups.md").write_text(
+            "* [Parent](Modules/group__PARENT.md)\n* [Child](Modules/group__CHILD.md)\n",
+            encoding="utf-8",
+        )
+        for name in ("sample_8h.md", "other_8h.md"):
+            (self.category_dir / "Files" / name).write_text("# {}\n".format(name), encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self):
+        argv = ["inject-groups.py", str(self.xml_dir), str(self.docs_dir)]
+        with mock.patch.object(sys, "argv", argv):
+            self.assertEqual(inject_groups.main(), 0)
+
+    def test_groups_are_injected_into_files_and_parent_group(self):
+        self._run()
+
+        modules_dir = self.category_dir / "Modules"
+        sample_md = (self.category_dir / "Files" / "sample_8h.md").read_text(encoding="utf-8")
+        self.assertIn("!include sample/Modules/perfile__group__PARENT__sample_8h.md", sample_md)
+        self.assertIn("!include sample/Modules/perfile__group__CHILD__sample_8h.md", sample_md)
+        perfile = (modules_dir / "perfile__group__PARENT__sample_8h.md").read_text(encoding="utf-8")
+        self.assertIn("### PARENT_open", perfile)
+        self.assertNotIn("### PARENT_close", perfile)
+        # シグネチャ フェンスの言語指定は perfile 抽出より前に付与される
+        self.assertIn("```cpp\nint PARENT_open(void)", perfile)
+
+        parent_md = (modules_dir / "group__PARENT.md").read_text(encoding="utf-8")
+        self.assertIn("```cpp\nint PARENT_open(void)", parent_md)
+        self.assertIn("!include sample/Modules/perchild__group__PARENT__group__CHILD.md", parent_md)
+        perchild = (modules_dir / "perchild__group__PARENT__group__CHILD.md").read_text(encoding="utf-8")
+        self.assertNotIn("**Module:**", perchild)
+        self.assertIn("```cpp\nint CHILD_open(void)", perchild)
+
+        self.assertFalse((modules_dir / "group__CHILD.md").exists())
+        index_groups = (self.category_dir / "index_groups.md").read_text(encoding="utf-8")
+        self.assertNotIn("group__CHILD.md", index_groups)
+
+    def test_each_markdown_file_is_read_and_written_at_most_once(self):
+        opened = []
+        real_open = builtins.open
+
+        def recording_open(file, mode="r", *args, **kwargs):
+            if str(file).endswith(".md"):
+                opened.append((Path(file).name, "r" if "r" in mode else "w"))
+            return real_open(file, mode, *args, **kwargs)
+
+        with mock.patch.object(builtins, "open", recording_open):
+            self._run()
+
+        self.assertTrue(opened)
+        for entry in set(opened):
+            with self.subTest(entry=entry):
+                self.assertEqual(opened.count(entry), 1)
+
+    def test_group_markdown_is_parsed_once_for_all_hosting_files(self):
+        for index in range(5):
+            (self.category_dir / "Files" / "extra{}_8h.md".format(index)).write_text(
+                "# extra\n", encoding="utf-8"
+            )
+        # PARENT_close を 5 つの追加ファイルにも配置し、グループ md を 6 ファイルから参照させる
+        (self.xml_dir / "group__PARENT.xml").write_text(
+            GROUP_XML.format(
+                group="PARENT",
+                title="Parent",
+                inner='\n    <innergroup refid="group__CHILD">Child</innergroup>',
+            ).replace(
+                '<location file="src/other.h" line="20"/></memberdef>',
+                '<location file="src/other.h" line="20"/></memberdef>'
+                + "".join(
+                    '\n      <memberdef kind="function"><name>PARENT_close</name>'
+                    '<location file="src/extra{}.h" line="5"/></memberdef>'.format(index)
+                    for index in range(5)
+                ),
+            ),
+            encoding="utf-8",
+        )
+
+        parsed = []
+        real_parse = inject_groups.parse_group_md_sections
+
+        def recording_parse(content):
+            parsed.append(content.split("\n", 2)[1])
+            return real_parse(content)
+
+        with mock.patch.object(inject_groups, "parse_group_md_sections", recording_parse):
+            self._run()
+
+        self.assertEqual(parsed.count("title: Parent"), 1)
+        for index in range(5):
+            extra_md = (self.category_dir / "Files" / "extra{}_8h.md".format(index)).read_text(
+                encoding="utf-8"
+            )
+            self.assertIn("perfile__group__PARENT__extra{}_8h.md".format(index), extra_md)
+
+
+if __name__ == "__main__":
+    unittest.main()
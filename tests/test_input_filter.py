@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+BIN_DIR = Path(__file__).resolve().parents[1] / "bin"
+PYTHON_FILTER = BIN_DIR / "input-filter.py"
+FAST_FILTER = BIN_DIR / "input-filter.sh"
+
+SAMPLES = {
+    "plain.c": b"/** @brief sample */\nint calc(void);\n",
+    "no_trailing_newline.h": b"#define VALUE 1",
+    "empty.c": b"",
+    "japanese.md": "# 概要\n\n```c\nint x;\n```\n".encode("utf-8"),
+    "plantuml.md": b"# Diagram\n\n```plantuml\n@startuml\nA -> B\n@enduml\n```\n",
+    "crlf.c": b"int a;\r\nint b;\r\n",
+}
+
+
+@unittest.skipUnless(shutil.which("sh") and shutil.which("grep"), "sh and grep are required")
+class InputFilterTest(unittest.TestCase):
+    def _run(self, command, path):
+        return subprocess.run(command + [str(path)], check=True, capture_output=True).stdout
+
+    def test_fast_filter_output_is_identical_to_python_filter(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            for name, content in SAMPLES.items():
+                path = Path(temp_dir_text) / name
+                path.write_bytes(content)
+                with self.subTest(name=name):
+                    expected = self._run([sys.executable, str(PYTHON_FILTER)], path)
+                    actual = self._run(["sh", str(FAST_FILTER)], path)
+                    self.assertEqual(actual, expected)
+
+    def test_plantuml_fence_is_removed_through_fast_filter(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            path = Path(temp_dir_text) / "plantuml.md"
+            path.write_bytes(SAMPLES["plantuml.md"])
+
+            output = self._run(["sh", str(FAST_FILTER)], path).decode("utf-8")
+
+            self.assertNotIn("```plantuml", output)
+            self.assertIn("@startuml\nA -> B\n@enduml\n", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
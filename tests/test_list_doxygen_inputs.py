@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "bin" / "list-doxygen-inputs.py"
+SPEC = importlib.util.spec_from_file_location("list_doxygen_inputs", SCRIPT_PATH)
+list_doxygen_inputs = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = list_doxygen_inputs
+SPEC.loader.exec_module(list_doxygen_inputs)
+
+
+class ListDoxygenInputsTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(os.path.realpath(self.temp_dir.name))
+        self.rundir = self.root / "app" / "calc"
+        self.rundir.mkdir(parents=True)
+        self.shared = self.root / "shared"
+        for relpath in ("a.h", "a.txt", "sub/b.h", "obj/c.h", "skip/d.h"):
+            path = self.shared / relpath
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("", encoding="utf-8")
+        (self.rundir / "calc.c").write_text("", encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, text):
+        path = self.rundir / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def _list(self, *doxyfiles):
+        tags = list_doxygen_inputs.read_doxyfile_tags(doxyfiles)
+        return [
+            os.path.relpath(path, self.root)
+            for path in list_doxygen_inputs.list_input_files(str(self.rundir), tags)
+        ]
+
+    def test_lists_only_inputs_outside_rundir_with_patterns_and_excludes(self):
+        doxyfile = self._write(
+            "Doxyfile",
+            "INPUT = ./calc.c \\\\\n"
+            "        ../../shared\n"
+            "FILE_PATTERNS = *.h\n"
+            "RECURSIVE = YES\n"
+            "EXCLUDE = ../../shared/skip\n"
+            "EXCLUDE_PATTERNS = */obj/*\n",
+        )
+
+        self.assertEqual(self._list(doxyfile), ["shared/a.h", "shared/sub/b.h"])
+
+    def test_later_doxyfile_overrides_and_appends(self):
+        doxyfile = self._write("Doxyfile", "INPUT = ../../shared/sub\nRECURSIVE = NO\n")
+        part = self._write(
+            "Doxyfile.part",
+            'INPUT = "{}"\nINPUT += ../../shared/a.txt\nFILE_PATTERNS = *.h\n'.format(
+                self.shared
+            ),
+        )
+
+        self.assertEqual(self._list(doxyfile, part), ["shared/a.h", "shared/a.txt"])
+
+    def test_missing_doxyfile_part_is_ignored(self):
+        doxyfile = self._write("Doxyfile", "INPUT = .\n")
+
+        self.assertEqual(self._list(doxyfile, str(self.rundir / "Doxyfile.part")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "templates" / "merge-index-files.py"
+
+INDEX_FILES = (
+    "---\r\n"
+    "title: Files\r\n"
+    "page-break-before-heading: true\r\n"
+    "---\r\n"
+    "\r\n"
+    "# Files\r\n"
+    "\r\n"
+    "* 📁 calc/src\r\n"
+    "    * 📄 [calc/src/add.c](Files/add_8c.md#file-add.c) <br/>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Addition\r\n"
+    "    * 📁 calc/src/util\r\n"
+    "        * 📄 [calc/src/util/log.c](Files/log_8c.md#file-log.c)\r\n"
+)
+
+INDEX_PAGES = (
+    "---\n"
+    "title: Pages\n"
+    "---\n"
+    "\n"
+    "# Pages\n"
+    "\n"
+    "* 📁 [src](Pages/src/README.md) <br/>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Sources\n"
+    "    * 📄 [design.md](Pages/src/design.md)\n"
+    "    * 📄 [add.c](Pages/src/add.c.md)\n"
+)
+
+
+class MergeIndexFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.markdown_dir = Path(self.temp_dir.name)
+        self.files_path = self.markdown_dir / "index_files.md"
+        self.files_path.write_bytes(INDEX_FILES.encode("utf-8"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self):
+        subprocess.run(
+            [sys.executable, str(SCRIPT_PATH), str(self.markdown_dir)],
+            check=True,
+            capture_output=True,
+        )
+        return self.files_path.read_bytes().decode("utf-8")
+
+    def test_index_files_are_patched_and_merged_with_pages(self):
+        (self.markdown_dir / "index_pages.md").write_text(INDEX_PAGES, encoding="utf-8")
+
+        self.assertEqual(
+            self._run(),
+            "---\n"
+            "title: Files\n"
+            "page-break-before-heading: true\n"
+            "---\n"
+            "\n"
+            "# ファイルの一覧\n"
+            "\n"
+            "::: {.collapsible-list open-level=-1}\n"
+            "- 📁 [src](Files/src/README.md) <br/>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Sources\n"
+            "    - 📁 util\n"
+            "        - 📄 [log.c](Files/log_8c.md)\n"
+            "    - 📄 [add.c](Files/src/add.c.md) <br/>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Addition\n"
+            "    - 📄 [design.md](Files/src/design.md)\n"
+            ":::\n",
+        )
+
+    def test_index_files_are_only_patched_without_pages(self):
+        self.assertEqual(
+            self._run(),
+            INDEX_FILES.replace("calc/src/util/log.c", "log.c")
+            .replace("calc/src/add.c", "add.c")
+            .replace("📁 calc/src/util", "📁 util")
+            .replace("📁 calc/src", "📁 src")
+            .replace("#file-add.c", "")
+            .replace("#file-log.c", ""),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 
+import importlib.util
+import os
+import re
+import shutil
 import subprocess
+import sys
 import tempfile
 import unittest
 import xml.etree.ElementTree as ET
@@ -8,6 +13,68 @@ from pathlib import Path
 
 
 PREPROCESS_SCRIPT = Path(__file__).resolve().parents[1] / "templates" / "preprocess.sh"
+PREPROCESS_XML_SCRIPT = Path(__file__).resolve().parents[1] / "templates" / "preprocess-xml.py"
+sys.path.insert(0, str(PREPROCESS_XML_SCRIPT.parent))
+SPEC = importlib.util.spec_from_file_location("preprocess_xml", PREPROCESS_XML_SCRIPT)
+preprocess_xml = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = preprocess_xml
+SPEC.loader.exec_module(preprocess_xml)
+
+# preprocess-xml.py へ置き換える前の preprocess.sh の sed 連結。出力の一致を確認する基準とする。
+LEGACY_SED_PIPELINE = r"""
+sed -e 's|<parblock>||g' \
+    -e 's|</parblock>||g' \
+    "$1" | \
+sed -e 's|\s*<plantuml\([^>]*\)>|\n\n```plantuml\n@startuml\n|g' \
+    -e 's|</plantuml>|\n@enduml\n```|g' | \
+sed -e 's|<parametername direction="in">\([^<]*\)</parametername>|<parametername>\1 [in]</parametername>|g' \
+    -e 's|<parametername direction="out">\([^<]*\)</parametername>|<parametername>\1 [out]</parametername>|g' \
+    -e 's|<parametername direction="in,out">\([^<]*\)</parametername>|<parametername>\1 [in,out]</parametername>|g' \
+    -e 's|<parametername direction="in, out">\([^<]*\)</parametername>|<parametername>\1 [in,out]</parametername>|g' \
+    -e 's|<parametername direction="inout">\([^<]*\)</parametername>|<parametername>\1 [in,out]</parametername>|g' | \
+sed ':a;N;$!ba;s|<linebreak/>\n|!linebreak!|g' | \
+sed 's|<bold>\([a-zA-Z_][a-zA-Z0-9_]*\)</bold>|!dunder!\1!dunder!|g' | \
+sed ':loop; s|<name>\([^<]*\)__\([^<]*\)</name>|<name>\1!dunder!\2</name>|; t loop' | \
+sed ':loop; s|<title>\([^<]*\)__\([^<]*\)</title>|<title>\1!dunder!\2</title>|; t loop' | \
+sed -e 's|<sect1|<sect5|g' \
+    -e 's|</sect1>|</sect5>|g' \
+    -e 's|<sect2|<sect6|g' \
+    -e 's|</sect2>|</sect6>|g'
+"""
+
+GOLDEN_SAMPLES = {
+    "compound.xml": """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen>
+  <compounddef id="sample_8c" kind="file">
+    <compoundname>sample.c</compoundname>
+    <memberdef kind="function" id="f"><name>__do_work__</name><name>a___b</name> <name>x__y__z</name>
+      <param><declname>value</declname></param>
+      <detaileddescription>
+<para><parblock><para>first</para></parblock><bold>__attribute__</bold> <bold>not bold</bold> <bold>id_1</bold>
+<parameterlist kind="param"><parameteritem><parameternamelist><parametername direction="in">src</parametername></parameternamelist></parameteritem>
+<parameteritem><parameternamelist><parametername direction="out">dst</parametername><parametername direction="in,out">io</parametername></parameternamelist></parameteritem>
+<parameteritem><parameternamelist><parametername direction="in, out">a</parametername><parametername direction="inout">b</parametername><parametername direction="both">c</parametername></parameternamelist></parameteritem></parameterlist>
+line one<linebreak/>
+line two<linebreak/><linebreak/>
+<linebreak/> line three
+  \t <plantuml engine="uml">
+A -> B
+</plantuml>text<plantuml>C -> D</plantuml>
+<sect1 id="s1"><title>__init__ heading</title><sect2><title>plain</title></sect2></sect1>
+<sect10>keep</sect10>
+</para>
+      </detaileddescription>
+    </memberdef>
+  </compounddef>
+</doxygen>
+<linebreak/>
+""",
+    "crlf.xml": "<doxygen>\r\n<name>crlf__name</name><linebreak/>\r\n<linebreak/>\n</doxygen>\r\n",
+    "no_trailing_newline.xml": "<doxygen><name>a__b</name><linebreak/>\n<linebreak/>",
+    "single_line.xml": "<linebreak/>\n",
+    "empty.xml": "",
+    "japanese.xml": "<doxygen>\n<para>説明<linebreak/>\n続き　<plantuml>A</plantuml></para>\n<name>名前__識別子</name>\n</doxygen>\n",
+}
 
 
 class PreprocessTest(unittest.TestCase):
@@ -57,6 +124,82 @@ class PreprocessTest(unittest.TestCase):
                 ["first paragraph", "second paragraph"],
             )
 
+    def test_anonymous_enum_names_are_replaced_with_placeholders(self):
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            xml_dir = Path(temp_dir_text)
+            xml_path = xml_dir / "sample_8h.xml"
+            xml_path.write_text(
+                """<?xml version="1.0" encoding="UTF-8"?>
+<doxygen>
+  <memberdef kind="enum" id="e1"><name /><enumvalue><name>A</name></enumvalue></memberdef>
+  <memberdef kind="enum" id="e2"><name></name></memberdef>
+  <memberdef kind="function" id="f1"><name></name></memberdef>
+</doxygen>
+""",
+                encoding="utf-8",
+            )
+
+            subprocess.run(
+                [str(PREPROCESS_SCRIPT), str(xml_dir)],
+                check=True,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+            )
+
+            root = ET.fromstring(xml_path.read_text(encoding="utf-8"))
+            names = [memberdef.findtext("name") for memberdef in root.findall("memberdef")]
+            # placeholder の __ は後段のダブル アンダースコア保護で !dunder! になる
+            self.assertEqual(
+                names,
+                ["!dunder!anonymous_enum_1!dunder!", "!dunder!anonymous_enum_2!dunder!", ""],
+            )
+
+
+@unittest.skipUnless(shutil.which("sed") and shutil.which("bash"), "sed and bash are required")
+class PreprocessXmlGoldenTest(unittest.TestCase):
+    def _legacy_output(self, path, env):
+        return subprocess.run(
+            ["bash", "-c", LEGACY_SED_PIPELINE, "legacy", str(path)],
+            check=True,
+            capture_output=True,
+            env=env,
+        ).stdout
+
+    def _assert_matches_legacy(self, locale_name):
+        env = dict(os.environ, LC_ALL=locale_name)
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            xml_dir = Path(temp_dir_text)
+            expected = {}
+            for name, content in GOLDEN_SAMPLES.items():
+                path = xml_dir / name
+                path.write_bytes(content.encode("utf-8"))
+                expected[name] = self._legacy_output(path, env)
+
+            subprocess.run(
+                [sys.executable, str(PREPROCESS_XML_SCRIPT), str(xml_dir)],
+                check=True,
+                capture_output=True,
+                env=env,
+            )
+
+            for name in GOLDEN_SAMPLES:
+                with self.subTest(locale=locale_name, name=name):
+                    self.assertEqual((xml_dir / name).read_bytes(), expected[name])
+
+    def test_output_is_identical_to_legacy_sed_pipeline_in_c_locale(self):
+        self._assert_matches_legacy("C")
+
+    def test_output_is_identical_to_legacy_sed_pipeline_in_utf8_locale(self):
+        self._assert_matches_legacy("C.UTF-8")
+
+    def test_dunder_in_name_is_replaced_from_the_right(self):
+        pattern = preprocess_xml.compile_plantuml_open_re(False)
+        self.assertEqual(
+            preprocess_xml.transform_xml_text("<name>a___b</name>\n", pattern),
+            "<name>a_!dunder!b</name>\n",
+        )
+
 
 ANON_FILE_SCOPE_REFID = "namespace_0d0250021603150113202762263663111643702522"
 ANON_NESTED_REFID = "namespacesample_1_1detail_1_1_0d3641261771023030113170651721160400"
@@ -194,6 +337,14 @@ class StripAnonymousNamespacesTest(unittest.TestCase):
                 ],
             )
 
+    def test_trie_pattern_matches_exactly_the_given_refids(self):
+        refids = ["namespace_0d1", "namespace_0d12", "namespace_0d2", "namespacea_1_1_0d3", "x"]
+        pattern = re.compile("(?:{0})".format(preprocess_xml.build_trie_pattern(refids)))
+        candidates = refids + ["namespace_0d", "namespace_0d123", "namespace_0d3", "", "xx"]
+        for candidate in candidates:
+            with self.subTest(candidate=candidate):
+                self.assertEqual(bool(pattern.fullmatch(candidate)), candidate in refids)
+
     def test_references_to_anonymous_namespaces_are_removed(self):
         with tempfile.TemporaryDirectory() as temp_dir_text:
             xml_dir = Path(temp_dir_text)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "bin" / "publish-staged-dir.py"
+SPEC = importlib.util.spec_from_file_location("publish_staged_dir", SCRIPT_PATH)
+publish_staged_dir = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = publish_staged_dir
+SPEC.loader.exec_module(publish_staged_dir)
+
+
+class PublishStagedDirTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.stage_dir = self.root / "stage"
+        self.final_dir = self.root / "final"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_tree(self, base_dir, files):
+        for rel_path, text in files.items():
+            path = base_dir / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+    def _publish(self):
+        exit_code = publish_staged_dir.main(
+            ["publish-staged-dir.py", str(self.stage_dir), str(self.final_dir)]
+        )
+        self.assertEqual(exit_code, 0)
+
+    def test_new_final_dir_receives_whole_tree_and_manifest(self):
+        self._write_tree(self.stage_dir, {"index.html": "a", "sub/page.html": "b"})
+
+        self._publish()
+
+        self.assertFalse(self.stage_dir.exists())
+        self.assertEqual((self.final_dir / "sub" / "page.html").read_text(encoding="utf-8"), "b")
+        manifest = (self.final_dir / publish_staged_dir.MANIFEST_NAME).read_text(encoding="utf-8")
+        self.assertIn("  index.html\n", manifest)
+        self.assertIn("  sub/page.html\n", manifest)
+
+    def test_unchanged_files_keep_inode_and_changed_files_are_replaced(self):
+        self._write_tree(
+            self.final_dir,
+            {"same.html": "same", "changed.html": "old", "stale.html": "x", "gone/old.html": "y"},
+        )
+        same_inode = os.stat(self.final_dir / "same.html").st_ino
+        self._write_tree(
+            self.stage_dir,
+            {"same.html": "same", "changed.html": "new", "added/new.html": "z"},
+        )
+
+        self._publish()
+
+        self.assertEqual(os.stat(self.final_dir / "same.html").st_ino, same_inode)
+        self.assertEqual((self.final_dir / "changed.html").read_text(encoding="utf-8"), "new")
+        self.assertEqual((self.final_dir / "added" / "new.html").read_text(encoding="utf-8"), "z")
+        self.assertFalse((self.final_dir / "stale.html").exists())
+        self.assertFalse((self.final_dir / "gone").exists())
+        self.assertFalse((self.final_dir / publish_staged_dir.PENDING_MANIFEST_NAME).exists())
+        self.assertTrue((self.final_dir / publish_staged_dir.MANIFEST_NAME).is_file())
+
+    def test_file_and_directory_kind_changes_are_resolved(self):
+        self._write_tree(self.final_dir, {"node": "file", "dir/child.html": "c"})
+        self._write_tree(self.stage_dir, {"node/child.html": "n", "dir": "now a file"})
+
+        self._publish()
+
+        self.assertEqual((self.final_dir / "node" / "child.html").read_text(encoding="utf-8"), "n")
+        self.assertEqual((self.final_dir / "dir").read_text(encoding="utf-8"), "now a file")
+
+    def test_interrupted_publish_marker_is_replaced_on_next_run(self):
+        self._write_tree(self.final_dir, {"page.html": "old"})
+        (self.final_dir / publish_staged_dir.PENDING_MANIFEST_NAME).write_text("", encoding="utf-8")
+        self._write_tree(self.stage_dir, {"page.html": "new"})
+
+        self._publish()
+
+        self.assertEqual((self.final_dir / "page.html").read_text(encoding="utf-8"), "new")
+        self.assertFalse((self.final_dir / publish_staged_dir.PENDING_MANIFEST_NAME).exists())
+
+    def test_planned_publish_applies_without_hashing(self):
+        self._write_tree(self.final_dir, {"same.html": "same", "changed.html": "old", "stale.html": "x"})
+        self._write_tree(self.stage_dir, {"same.html": "same", "changed.html": "new", "empty/.keep": ""})
+        plan_path = self.root / "publish-plan"
+
+        exit_code = publish_staged_dir.main(
+            ["publish-staged-dir.py", "--plan", str(plan_path), str(self.stage_dir), str(self.final_dir)]
+        )
+        self.assertEqual(exit_code, 0)
+        # 計画では公開先を変更しない
+        self.assertEqual((self.final_dir / "changed.html").read_text(encoding="utf-8"), "old")
+        self.assertTrue((self.final_dir / "stale.html").exists())
+
+        with mock.patch.object(publish_staged_dir, "file_digest", side_effect=AssertionError("hashed")):
+            exit_code = publish_staged_dir.main(["publish-staged-dir.py", "--apply", str(plan_path)])
+        self.assertEqual(exit_code, 0)
+
+        self.assertEqual((self.final_dir / "changed.html").read_text(encoding="utf-8"), "new")
+        self.assertFalse((self.final_dir / "stale.html").exists())
+        self.assertTrue((self.final_dir / "empty" / ".keep").is_file())
+        self.assertFalse(self.stage_dir.exists())
+        self.assertTrue((self.final_dir / publish_staged_dir.MANIFEST_NAME).is_file())
+
+    def test_shared_publish_keeps_other_files_and_prune_removes_unreferenced(self):
+        self._write_tree(self.final_dir, {"app.old.js": "old", "app.other.js": "other"})
+        self._write_tree(self.stage_dir, {"app.new.js": "new"})
+        plan_path = self.root / "publish-plan"
+
+        for args in (
+            ["--plan", str(plan_path), "--shared", str(self.stage_dir), str(self.final_dir)],
+            ["--apply", str(plan_path)],
+        ):
+            self.assertEqual(publish_staged_dir.main(["publish-staged-dir.py"] + args), 0)
+
+        self.assertEqual(
+            sorted(path.name for path in self.final_dir.iterdir()),
+            ["app.new.js", "app.old.js", "app.other.js"],
+        )
+        self.assertFalse(self.stage_dir.exists())
+
+        # 公開済みのレポートが app.new.js を、ステージング中のレポートが app.other.js を参照する
+        self._write_tree(
+            self.root,
+            {
+                "pages/a/dependency/index.html": '<script src="../../assets/app.new.js"></script>',
+                "tmp/b/run.1/doxygen/dependency/index.html": '<script src="app.other.js"></script>',
+            },
+        )
+        exit_code = publish_staged_dir.main(
+            [
+                "publish-staged-dir.py",
+                "--prune",
+                str(self.final_dir),
+                str(self.root / "tmp" / "*" / "run.*" / "doxygen" / "dependency" / "index.html"),
+                str(self.root / "pages" / "*" / "dependency" / "index.html"),
+            ]
+        )
+        self.assertEqual(exit_code, 0)
+
+        self.assertEqual(
+            sorted(path.name for path in self.final_dir.iterdir()),
+            ["app.new.js", "app.other.js"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "templates" / "restructure-files.py"
+SPEC = importlib.util.spec_from_file_location("restructure_files", SCRIPT_PATH)
+restructure_files = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = restructure_files
+SPEC.loader.exec_module(restructure_files)
+
+
+class RestructureFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.docs_dir = Path(self.temp_dir.name)
+        self.files_dir = self.docs_dir / "Files"
+        self.files_dir.mkdir()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, rel, content):
+        path = self.docs_dir / rel
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def _run(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            restructure_files.restructure_files(str(self.docs_dir))
+
+    def test_files_are_moved_and_links_rewritten_in_one_pass(self):
+        self._write(
+            "Files/calc_2src_2add_8c.md",
+            "---\ntitle: add.c\n---\n\n<!-- generated -->\n# calc/src/add.c\n",
+        )
+        self._write("Files/my&#95;util_8h.md", "# lib/my&#95;util.h\n")
+        self._write("Files/first_8c.md", "# src/dup.c\n")
+        self._write("Files/second_8c.md", "# src/dup.c\n")
+        self._write(
+            "index_files.md",
+            "* [calc/src/add.c](Files/calc_2src_2add_8c.md#file-add.c)\n"
+            "* [my_util.h](Files/my&#95;util_8h.md)\n"
+            "* [dup.c](Files/second_8c.md)\n"
+            "* [other](Files/unknown_8c.md#file-other)\n",
+        )
+        self._write("index_groups.md", "[add](Files/calc_2src_2add_8c.md)\n")
+
+        self._run()
+
+        self.assertTrue((self.files_dir / "calc/src/add.c.md").is_file())
+        self.assertTrue((self.files_dir / "lib/my_util.h.md").is_file())
+        self.assertTrue((self.files_dir / "src/dup.c.md").is_file())
+        # 移動先が先行エントリと重なるものはスキップする
+        self.assertTrue((self.files_dir / "second_8c.md").is_file())
+        self.assertEqual(
+            (self.docs_dir / "index_files.md").read_text(encoding="utf-8"),
+            "* [calc/src/add.c](Files/calc/src/add.c.md)\n"
+            "* [my_util.h](Files/lib/my_util.h.md)\n"
+            "* [dup.c](Files/second_8c.md)\n"
+            "* [other](Files/unknown_8c.md#file-other)\n",
+        )
+        self.assertEqual(
+            (self.docs_dir / "index_groups.md").read_text(encoding="utf-8"),
+            "[add](Files/calc/src/add.c.md)\n",
+        )
+
+    def test_h1_scan_reads_only_the_head_of_the_file(self):
+        limit = restructure_files.H1_SCAN_BYTES
+        head_md = self._write("Files/head_8c.md", "# src/head.c\n" + "x" * (limit * 4))
+        late_md = self._write("Files/late_8c.md", "y" * limit + "\n# src/late.c\n")
+
+        self.assertEqual(restructure_files.extract_h1_path(head_md), "src/head.c")
+        self.assertIsNone(restructure_files.extract_h1_path(late_md))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+DOXYFW_ROOT = Path(__file__).resolve().parents[1]
+RUN_SCRIPT = DOXYFW_ROOT / "bin" / "run_doxyfw_make.sh"
+
+# Doxygen の代わりに起動回数を記録し、HTML を 1 ファイルだけ出力する。
+FAKE_DOXYGEN = """#!/bin/bash
+out_dir=$(awk -F '=' '/^OUTPUT_DIRECTORY/ {{ gsub(/[ \\t]/, "", $2); print $2 }}' "$1")
+echo "start $$" >> "{log}"
+sleep "${{FAKE_DOXYGEN_SLEEP:-0}}"
+mkdir -p "$out_dir/html"
+echo "generated" > "$out_dir/html/index.html"
+echo "end $$" >> "{log}"
+"""
+
+
+@unittest.skipUnless(
+    shutil.which("flock") and shutil.which("setsid") and shutil.which("sha256sum"),
+    "flock, setsid and sha256sum are required",
+)
+class RunDoxyfwMakeLockTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.bin_dir = self.root / "bin"
+        self.bin_dir.mkdir()
+        self.log_path = self.root / "doxygen.log"
+        fake_doxygen = self.bin_dir / "doxygen"
+        fake_doxygen.write_text(FAKE_DOXYGEN.format(log=self.log_path), encoding="utf-8")
+        fake_doxygen.chmod(0o755)
+        self.rundir = self.root / "app" / "calc" / "prod"
+        self.rundir.mkdir(parents=True)
+        (self.rundir / "calc.c").write_text("int calc(void);\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _env(self, sleep_seconds):
+        env = os.environ.copy()
+        env.update(
+            {
+                "PATH": "{}:/usr/bin:/bin".format(self.bin_dir),
+                "FAKE_DOXYGEN_SLEEP": str(sleep_seconds),
+                "MAKEFILE_DIR": str(DOXYFW_ROOT),
+                "WORKSPACE_DIR": str(self.root),
+                "INPUT_FILTER_ABS": str(DOXYFW_ROOT / "bin" / "input-filter.py"),
+                "DOXY_WARNING_COLORIZE": str(DOXYFW_ROOT / "bin" / "doxygen-warning-colorize-output.sh"),
+                "EXTRACT_DOXY_WARNINGS": str(DOXYFW_ROOT / "bin" / "extract_doxy_warnings.sh"),
+                "STAGED_DIR_PUBLISHER": str(DOXYFW_ROOT / "bin" / "publish-staged-dir.py"),
+                "DOXYGEN_INPUT_LISTER": str(DOXYFW_ROOT / "bin" / "list-doxygen-inputs.py"),
+                "DOXYGEN_RUNDIR": str(self.rundir),
+                "DOXYFILE_PART": str(self.rundir / "Doxyfile.part"),
+                "DOCS_DOXYGEN_DIR": str(self.root / "pages" / "doxygen" / "calc"),
+                "DOCS_DOXYBOOK2_DIR": str(self.root / "app" / "calc" / "docs" / "doxybook2"),
+                "DOXY_WARN_OUTPUT": str(self.root / "app" / "calc" / "doxy.warn"),
+                "DOXY_WARN_BASENAME": "doxy.warn",
+                "APP_DOCS_DIR": str(self.root / "app" / "calc" / "docs"),
+                "DOXYFW_TMP_ROOT": str(self.root / "tmp"),
+                "DOXYFW_LOCK_ROOT": str(self.root / "locks"),
+                "DOXYFW_RUNTIME_KEY": "calc",
+                "SKIP_MARKER": str(self.root / "skip_marker"),
+                "MARKDOWN_MAKE": "make",
+            }
+        )
+        return env
+
+    def _start(self, sleep_seconds=0):
+        return subprocess.Popen(
+            ["bash", str(RUN_SCRIPT)],
+            env=self._env(sleep_seconds),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    def _wait_for_log(self, text):
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if self.log_path.exists() and text in self.log_path.read_text(encoding="utf-8"):
+                return
+            time.sleep(0.05)
+        self.fail("fake doxygen did not log {!r}".format(text))
+
+    def test_waiting_run_with_same_inputs_reuses_published_output(self):
+        first = self._start(sleep_seconds=1)
+        self._wait_for_log("start")
+        waiting = [self._start(), self._start()]
+
+        outputs = []
+        for process in [first] + waiting:
+            output, _ = process.communicate(timeout=30)
+            outputs.append(output.decode("utf-8", errors="replace"))
+            self.assertEqual(process.returncode, 0, outputs[-1])
+
+        starts = self.log_path.read_text(encoding="utf-8").count("start")
+        self.assertEqual(starts, 1)
+        self.assertTrue(all("Reusing its output" in output for output in outputs[1:]))
+        published = self.root / "pages" / "doxygen" / "calc" / "html" / "index.html"
+        self.assertEqual(published.read_text(encoding="utf-8"), "generated\n")
+        self.assertFalse(list((self.root / "locks").glob("calc.ticket.*")))
+
+    def test_waiting_run_does_not_reuse_when_input_outside_rundir_changed(self):
+        external = self.root / "shared" / "include"
+        external.mkdir(parents=True)
+        header = external / "shared.h"
+        header.write_text("int shared(void);\n", encoding="utf-8")
+        (self.rundir / "Doxyfile.part").write_text(
+            "INPUT += {}\n".format(external), encoding="utf-8"
+        )
+
+        first = self._start(sleep_seconds=1)
+        self._wait_for_log("start")
+        header.write_text("int shared(int value);\n", encoding="utf-8")
+        waiting = self._start()
+
+        for process in (first, waiting):
+            output, _ = process.communicate(timeout=30)
+            self.assertEqual(process.returncode, 0, output)
+
+        starts = self.log_path.read_text(encoding="utf-8").count("start")
+        self.assertEqual(starts, 2)
+
+    def test_run_after_previous_completion_is_not_skipped(self):
+        for _ in range(2):
+            process = self._start()
+            output, _ = process.communicate(timeout=30)
+            self.assertEqual(process.returncode, 0, output)
+
+        starts = self.log_path.read_text(encoding="utf-8").count("start")
+        self.assertEqual(starts, 2)
+
+    def test_stale_ticket_of_killed_run_does_not_block(self):
+        lock_root = self.root / "locks"
+        lock_root.mkdir()
+        stale_ticket = lock_root / "calc.ticket.stale"
+        stale_ticket.write_text("", encoding="utf-8")
+        (lock_root / "calc.tail").write_text("{}\n".format(stale_ticket), encoding="utf-8")
+
+        process = self._start()
+        output, _ = process.communicate(timeout=30)
+
+        self.assertEqual(process.returncode, 0, output)
+        self.assertFalse(stale_ticket.exists())
+
+    def test_spin_lock_reclaims_stale_lock_without_flock(self):
+        # flock を除いたコマンドだけを PATH に置き、mkdir によるロックを使わせる
+        tools_dir = self.root / "tools"
+        tools_dir.mkdir()
+        for system_dir in ("/bin", "/usr/bin"):
+            for name in os.listdir(system_dir):
+                link = tools_dir / name
+                if name != "flock" and not os.path.lexists(link):
+                    link.symlink_to(os.path.join(system_dir, name))
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        stale_lock = self.root / "locks" / "calc.lock"
+        stale_lock.mkdir(parents=True)
+        (stale_lock / "pid").write_text("{}\n".format(dead.pid), encoding="utf-8")
+
+        env = self._env(0)
+        env["PATH"] = "{}:{}".format(self.bin_dir, tools_dir)
+        process = subprocess.Popen(
+            ["bash", str(RUN_SCRIPT)], env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        output, _ = process.communicate(timeout=30)
+
+        self.assertEqual(process.returncode, 0, output)
+        self.assertIn(b"Removing stale lock", output)
+        self.assertEqual(sorted(path.name for path in (self.root / "locks").glob("calc.lock*")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "bin" / "run-subcategories.py"
+SPEC = importlib.util.spec_from_file_location("run_subcategories", SCRIPT_PATH)
+run_subcategories = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = run_subcategories
+SPEC.loader.exec_module(run_subcategories)
+
+
+class RunSubcategoriesTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_doxyfile_parts_are_discovered_with_default_first(self):
+        for name in ("Doxyfile.part.public", "Doxyfile.part", "Doxyfile.part.internal", "Doxyfile"):
+            (self.root / name).write_text("", encoding="utf-8")
+
+        self.assertEqual(
+            run_subcategories.discover_subcategories(self.root),
+            ["", "internal", "public"],
+        )
+
+    def test_job_limit_honours_explicit_jobs_and_job_count(self):
+        self.assertEqual(run_subcategories.compute_job_limit(5, {"DOXYFW_JOBS": "1"}), 1)
+        self.assertEqual(run_subcategories.compute_job_limit(1, {}), 1)
+
+    def test_jobserver_fds_are_read_from_makeflags(self):
+        read_fd, write_fd = os.pipe()
+        try:
+            os.write(write_fd, b"+")
+            client = run_subcategories.JobServerClient.from_makeflags(
+                " -j4 --jobserver-auth={},{}".format(read_fd, write_fd)
+            )
+            self.assertTrue(client.enabled)
+            self.assertIsNone(client.acquire())
+            token = client.acquire()
+            self.assertEqual(token, b"+")
+            client.release(token)
+            self.assertEqual(os.read(read_fd, 1), b"+")
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_jobserver_is_disabled_without_makeflags(self):
+        client = run_subcategories.JobServerClient.from_makeflags("")
+        self.assertFalse(client.enabled)
+
+    def test_outputs_are_prefixed_and_exit_status_is_aggregated(self):
+        warn_path = self.root / "doxy_public.warn"
+        write_warnings = (
+            "import sys; open(sys.argv[1], 'w').write('a.c:1: warning: x\\n\\nb.c:2: warning: y\\n'); "
+            "print('bad'); sys.exit(3)"
+        )
+        # 以前の実行が残した警告ファイル。書き込む前に失敗したジョブでは数えない
+        stale_path = self.root / "doxy_internal.warn"
+        stale_path.write_text("old.c:1: warning: stale\n", encoding="utf-8")
+        stale_time = time.time() - 60
+        os.utime(stale_path, (stale_time, stale_time))
+        jobs = [
+            ("calc", [sys.executable, "-c", "print('hello')"], self.root / "doxy.warn"),
+            ("calc_public", [sys.executable, "-c", write_warnings, str(warn_path)], warn_path),
+            ("calc_internal", [sys.executable, "-c", "import sys; sys.exit(4)"], stale_path),
+        ]
+        output = io.StringIO()
+        summary = io.StringIO()
+
+        exit_code = run_subcategories.run_subcategories(
+            jobs,
+            2,
+            run_subcategories.JobServerClient(),
+            printer=run_subcategories.PrefixedPrinter(output),
+            summary_stream=summary,
+        )
+
+        self.assertEqual(exit_code, 3)
+        self.assertIn("[calc] hello\n", output.getvalue())
+        self.assertIn("[calc_public] bad\n", output.getvalue())
+        self.assertIn("calc_public: FAILED (exit 3) warnings=2", summary.getvalue())
+        self.assertIn("calc_internal: FAILED (exit 4) warnings=0", summary.getvalue())
+        self.assertIn("total=3 failed=2 warnings=2", summary.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()